@@ -1,12 +1,17 @@
 import sys
 import os
 import pandas as pd
+from functools import partial
 from pathlib import Path
 from subprocess import call
+from typing import Optional
+from typing import Tuple
 
 import click
 from data_pipeline.config import settings
+from data_pipeline.etl.fingerprint import run_stage
 from data_pipeline.etl.runner import etl_runner
+from data_pipeline.etl.runner import get_pipeline_stage
 from data_pipeline.etl.runner import score_generate
 from data_pipeline.etl.runner import score_geo
 from data_pipeline.etl.runner import score_geo_gistar_burd
@@ -26,12 +31,14 @@ from data_pipeline.etl.sources.tribal.etl_utils import (
     reset_data_directories as tribal_reset,
 )
 from data_pipeline.tile.generate import generate_tiles
-from data_pipeline.tile.generate_gistar_burd import generate_tiles_gistar_burd
-from data_pipeline.tile.generate_gistar_ind import generate_tiles_gistar_ind
-from data_pipeline.tile.generate_add_burd import generate_tiles_add_burd
-from data_pipeline.tile.generate_add_ind import generate_tiles_add_ind
 
 from data_pipeline.etl.score import constants
+from data_pipeline.etl.score.etl_score_geo import GEO_SCORE_LAYERS
+from data_pipeline.score.threshold_sweep import SWEEPABLE_THRESHOLDS
+from data_pipeline.score.threshold_sweep import load_score_input
+from data_pipeline.score.threshold_sweep import parse_threshold_values
+from data_pipeline.score.threshold_sweep import sweep_thresholds
+from data_pipeline.score.threshold_sweep import write_threshold_sweep
 from data_pipeline.utils import check_first_run
 from data_pipeline.utils import data_folder_cleanup
 from data_pipeline.utils import downloadable_cleanup
@@ -60,6 +67,20 @@ dataset_option = click.option(
     help="Name of dataset to run. If not provided, all datasets will be run.",
 )
 
+executor_option = click.option(
+    "--executor",
+    type=click.Choice(["thread", "process"]),
+    default="thread",
+    help="Run ETLs in threads of this process ('thread', the default) or in worker processes that are recycled after heavy ETLs ('process').",
+)
+
+incremental_option = click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only run the steps whose inputs (data sources, code, config or the outputs of earlier steps) changed since they last ran, using the cached data sources.",
+)
+
 data_source_option = click.option(
     "-s",
     "--data-source",
@@ -157,13 +178,31 @@ def pull_census_data(data_source: str):
     is_flag=True,
     help="Run ETLs sequentially instead of concurrently.",
 )
+@click.option(
+    "--memory-budget",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Memory, in MB, that ETLs running concurrently can use. Defaults to the ETL_MEMORY_BUDGET_MB setting, or all of the machine's memory.",
+)
 @dataset_option
 @use_cache_option
-def etl_run(dataset: str, use_cache: bool, no_concurrency: bool):
+@executor_option
+@incremental_option
+def etl_run(
+    dataset: str,
+    use_cache: bool,
+    no_concurrency: bool,
+    memory_budget: Optional[int],
+    executor: str,
+    incremental: bool = False,
+):
     """Run a specific or all ETL processes
 
     Args:
         dataset (str): Name of the ETL module to be run (optional)
+        memory_budget (int): Memory in MB that concurrent ETLs can use (optional)
+        executor (str): Run ETLs in threads or in worker processes (optional)
+        incremental (bool): Only run the ETLs whose inputs changed (optional)
 
     Returns:
         None
@@ -171,7 +210,14 @@ def etl_run(dataset: str, use_cache: bool, no_concurrency: bool):
     log_title("Run ETL")
 
     log_info("Running dataset(s)")
-    etl_runner(dataset, use_cache, no_concurrency)
+    etl_runner(
+        dataset,
+        use_cache,
+        no_concurrency,
+        memory_budget,
+        executor,
+        incremental,
+    )
 
     log_goodbye()
 
@@ -179,7 +225,13 @@ def etl_run(dataset: str, use_cache: bool, no_concurrency: bool):
 @cli.command(
     help="Generate Score",
 )
-def score_run():
+@click.option(
+    "--from-prepared",
+    default=False,
+    is_flag=True,
+    help="Calculate the score from the joined and ranked dataframe saved by the last score run with this flag, if the datasets, code and config it was prepared from did not change. Otherwise, the dataframe is prepared and saved for the next run.",
+)
+def score_run(from_prepared: bool = False):
     """CLI command to generate the score"""
     log_title("Score", "Generate Score")
 
@@ -187,7 +239,80 @@ def score_run():
     score_folder_cleanup()
 
     log_info("Generating score")
-    score_generate()
+    score_generate(from_prepared=from_prepared)
+
+    log_goodbye()
+
+
+def _parse_thresholds(ctx, param, value):
+    try:
+        return parse_threshold_values(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+@cli.command(
+    help="Calculate the score for every combination of some thresholds, and report the disadvantaged communities and the tracts that change",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    "thresholds",
+    multiple=True,
+    required=True,
+    callback=_parse_thresholds,
+    help=f"A threshold and the values to try, like LOW_INCOME_THRESHOLD=0.6,0.65; can be repeated. One of {', '.join(SWEEPABLE_THRESHOLDS)}.",
+)
+@click.option(
+    "--source",
+    "-s",
+    type=click.Path(),
+    default=constants.DATA_SCORE_CSV_FULL_FILE_PATH,
+    help="Path to the score file the score is calculated from. Defaults to the local score file.",
+)
+@click.option(
+    "--destination",
+    "-d",
+    type=click.Path(writable=True),
+    default=constants.DATA_SCORE_SWEEP_DIR,
+    help="Directory to write summary.csv and flipped_tracts.csv to. Defaults to the sweep directory of the score data.",
+)
+@click.option(
+    "--max-workers",
+    type=int,
+    default=None,
+    help="How many processes calculate the scores. Defaults to the number of CPUs; 1 calculates them in this process.",
+)
+def score_threshold_sweep(
+    thresholds: dict,
+    source: Path,
+    destination: Path,
+    max_workers: Optional[int],
+):
+    """CLI command to calculate the score with other thresholds
+
+    Args:
+        thresholds (dict): The values to try, by threshold name
+        source (Path): The score file to calculate the score from
+        destination (Path): The directory to write the results to
+        max_workers (int): How many processes calculate the scores (optional)
+
+    Returns:
+        None
+    """
+    log_title(
+        "Score Threshold Sweep", "Calculate the Score with Other Thresholds"
+    )
+
+    log_info("Loading the score input")
+    score_input_df = load_score_input(Path(source))
+
+    log_info("Calculating the scores")
+    sweep = sweep_thresholds(
+        score_input_df, thresholds, max_workers=max_workers
+    )
+    write_threshold_sweep(sweep, Path(destination))
+    log_info(f"Wrote the results to {destination}")
 
     log_goodbye()
 
@@ -245,7 +370,25 @@ def generate_score_post(data_source: str):
 
 @cli.command(help="Generate GeoJSON files with scores baked in")
 @data_source_option
-def geo_score(data_source: str):
+@click.option(
+    "-l",
+    "--layer",
+    "layers",
+    multiple=True,
+    type=click.Choice(list(GEO_SCORE_LAYERS)),
+    help="Layer to generate GeoJSON files for; can be repeated, and all layers are made from one load of the score and geometries. Defaults to 'default', the score layer.",
+)
+@click.option(
+    "--generate-tiles",
+    default=False,
+    is_flag=True,
+    help="Also generate the map tiles of the layers, without tippecanoe, from the same frames as the GeoJSON files.",
+)
+def geo_score(
+    data_source: str,
+    layers: Tuple[str, ...] = (),
+    generate_tiles: bool = False,
+):
     """CLI command to combine score with GeoJSON data and generate low and high files
 
     Args:
@@ -253,6 +396,8 @@ def geo_score(data_source: str):
                            Options:
                            - local: fetch census and score data from the local data directory
                            - aws: fetch census and score from AWS S3 J40 data repository
+        layers (Tuple[str, ...]): The layers to generate files for (optional)
+        generate_tiles (bool): Also generate the map tiles of the layers (optional)
 
     Returns:
         None
@@ -266,7 +411,11 @@ def geo_score(data_source: str):
     geo_score_folder_cleanup()
 
     log_info("Combining score with GeoJSON")
-    score_geo(data_source=data_source)
+    score_geo(
+        data_source=data_source,
+        layers=list(layers) or None,
+        generate_tiles=generate_tiles,
+    )
 
     log_goodbye()
 
@@ -419,7 +568,7 @@ def generate_map_tiles_gistar_burd(generate_tribal_layer):
     data_path = settings.APP_ROOT / "data"
 
     log_info("Generating Gi Star tiles")
-    generate_tiles_gistar_burd(data_path, generate_tribal_layer)
+    generate_tiles(data_path, generate_tribal_layer, layer="gistar_burd")
 
     log_goodbye()
 
@@ -441,7 +590,7 @@ def generate_map_tiles_gistar_ind(generate_tribal_layer):
     data_path = settings.APP_ROOT / "data"
 
     log_info("Generating Gi Star tiles")
-    generate_tiles_gistar_ind(data_path, generate_tribal_layer)
+    generate_tiles(data_path, generate_tribal_layer, layer="gistar_ind")
 
     log_goodbye()
 
@@ -464,7 +613,7 @@ def generate_map_tiles_add(generate_tribal_layer):
     data_path = settings.APP_ROOT / "data"
 
     log_info("Generating Additive tiles")
-    generate_tiles_add_burd(data_path, generate_tribal_layer)
+    generate_tiles(data_path, generate_tribal_layer, layer="add_burd")
 
     log_goodbye()
 
@@ -486,7 +635,7 @@ def generate_map_tiles_add_ind(generate_tribal_layer):
     data_path = settings.APP_ROOT / "data"
 
     log_info("Generating Additive Indicator tiles")
-    generate_tiles_add_ind(data_path, generate_tribal_layer)
+    generate_tiles(data_path, generate_tribal_layer, layer="add_ind")
 
     log_goodbye()
 
@@ -502,7 +651,15 @@ def generate_map_tiles_add_ind(generate_tribal_layer):
 )
 @data_source_option
 @use_cache_option
-def data_full_run(check: bool, data_source: str, use_cache: bool):
+@executor_option
+@incremental_option
+def data_full_run(
+    check: bool,
+    data_source: str,
+    use_cache: bool,
+    executor: str,
+    incremental: bool = False,
+):
     """CLI command to run ETL, score, JSON combine and generate tiles including tribal layer in one command
 
     Args:
@@ -511,6 +668,8 @@ def data_full_run(check: bool, data_source: str, use_cache: bool):
                            Options:
                            - local: fetch census and score data from the local data directory
                            - aws: fetch census and score from AWS S3 J40 data repository
+        executor (str): Run ETLs in threads or in worker processes (optional)
+        incremental (bool): Keep the data folders, and only run the steps whose inputs changed since they last ran (optional)
 
      Returns:
         None
@@ -530,36 +689,52 @@ def data_full_run(check: bool, data_source: str, use_cache: bool):
         sys.exit()
 
     else:
-        # Directory cleanup
-        log_info("Cleaning up data folders")
-        census_reset(data_path)
-        data_folder_cleanup()
-        downloadable_cleanup()
-        score_folder_cleanup()
-        geo_score_folder_cleanup()
-        temp_folder_cleanup()
-        tribal_reset(data_path)
+        if incremental:
+            # The outputs of the steps that are up to date are kept
+            use_cache = True
+        else:
+            # Directory cleanup
+            log_info("Cleaning up data folders")
+            census_reset(data_path)
+            data_folder_cleanup()
+            downloadable_cleanup()
+            score_folder_cleanup()
+            geo_score_folder_cleanup()
+            temp_folder_cleanup()
+            tribal_reset(data_path)
 
         log_info("Downloading census data")
-        etl_runner("census", use_cache)
+        etl_runner(
+            "census", use_cache, executor=executor, incremental=incremental
+        )
 
         log_info("Running all ETLs")
-        etl_runner(use_cache)
+        etl_runner(
+            use_cache=use_cache, executor=executor, incremental=incremental
+        )
 
         log_info("Generating score")
-        score_generate()
+        score_generate(incremental=incremental)
 
         log_info("Running post score")
-        score_post(data_source)
+        score_post(data_source, incremental=incremental)
 
         log_info("Combining score with census GeoJSON")
-        score_geo(data_source)
+        score_geo(data_source, incremental=incremental)
 
         log_info("Generating map tiles")
-        generate_tiles(data_path, False)
+        run_stage(
+            get_pipeline_stage("tiles"),
+            partial(generate_tiles, data_path, False),
+            incremental,
+        )
 
         log_info("Generating tribal map tiles")
-        generate_tiles(data_path, True)
+        run_stage(
+            get_pipeline_stage("tribal_tiles"),
+            partial(generate_tiles, data_path, True),
+            incremental,
+        )
 
         log_info("Completing pipeline")
         file = "first_run.txt"
@@ -613,7 +788,9 @@ def extract_data_sources(dataset: str, use_cache: bool):
     log_title("Fetch ETL Datasources")
 
     log_info("Fetching data source(s)")
-    extract_ds(dataset, use_cache)
+    invalidated = extract_ds(dataset, use_cache)
+    if invalidated:
+        log_info(f"ETLs to run again: {', '.join(invalidated)}")
 
     log_goodbye()
 
@@ -16,6 +16,8 @@ from data_pipeline.utils import get_module_logger
 from data_pipeline.utils import load_yaml_dict_from_file
 from data_pipeline.utils import remove_all_from_dir
 from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.fetcher import fetch_data_sources
+from data_pipeline.etl.source_cache import load_manifest
 
 logger = get_module_logger(__name__)
 
@@ -27,6 +29,16 @@ class ValidGeoLevel(enum.Enum):
     CENSUS_BLOCK_GROUP = enum.auto()
 
 
+class OutputFormat(enum.Enum):
+    """Enum used for indicating the file format of an ETL's output data.
+
+    The value is used as the extension of the output file.
+    """
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
 class ExtractTransformLoad(ABC):
     """
     A class used to instantiate an ETL object to retrieve and process data from
@@ -78,6 +90,11 @@ class ExtractTransformLoad(ABC):
     # COLUMNS_TO_KEEP is used to identify which columns to keep in the output df.
     COLUMNS_TO_KEEP: typing.List[str] = None
 
+    # OUTPUT_FORMAT is the file format `load` writes the output df in, and that
+    # `get_data_frame` reads it back from. Parquet keeps the column types and
+    # lets readers load only the columns they need.
+    OUTPUT_FORMAT: OutputFormat = OutputFormat.PARQUET
+
     # INPUT_GEOID_TRACT_FIELD_NAME is the field name that identifies the Census Tract ID
     # on the input file
     INPUT_GEOID_TRACT_FIELD_NAME: str = None
@@ -119,6 +136,10 @@ class ExtractTransformLoad(ABC):
     # the YAML files?
     LOAD_YAML_CONFIG: bool = False
 
+    # Should `extract` revalidate the cached data sources with their
+    # servers? The runner turns this off when it has just revalidated them.
+    REVALIDATE_DATA_SOURCES: bool = True
+
     # We use output_df as the final dataframe to use to write to the CSV
     # It is used on the "load" base class method
     output_df: pd.DataFrame = None
@@ -169,15 +190,28 @@ class ExtractTransformLoad(ABC):
     # This is a classmethod so it can be used by `get_data_frame` without
     # needing to create an instance of the class. This is a use case in `etl_score`.
     @classmethod
-    def _get_output_file_path(cls) -> pathlib.Path:
-        """Generate the output file path."""
+    def _get_output_file_path(
+        cls, output_format: Optional[OutputFormat] = None
+    ) -> pathlib.Path:
+        """Generate the output file path.
+
+        Uses `cls.OUTPUT_FORMAT` unless another output format is given.
+        """
         if cls.NAME is None:
             raise NotImplementedError(
                 f"Child ETL class needs to specify `cls.NAME` (currently "
                 f"{cls.NAME})."
             )
 
-        output_file_path = cls.DATA_PATH / "dataset" / f"{cls.NAME}" / "usa.csv"
+        if output_format is None:
+            output_format = cls.OUTPUT_FORMAT
+
+        output_file_path = (
+            cls.DATA_PATH
+            / "dataset"
+            / f"{cls.NAME}"
+            / f"usa.{output_format.value}"
+        )
         return output_file_path
 
     def get_sources_path(self) -> pathlib.Path:
@@ -195,11 +229,29 @@ class ExtractTransformLoad(ABC):
     def get_data_sources(self) -> [DataSource]:
         pass
 
-    def _fetch(self) -> None:
+    def _fetch(
+        self, use_cached_data_sources: bool = False
+    ) -> typing.List[DataSource]:
         """Fetch all data sources for this ETL. When data sources are fetched, they
-        are stored in a cache directory for consistency between runs."""
-        for ds in self.get_data_sources():
-            ds.fetch()
+        are stored in a cache directory for consistency between runs.
+
+        Data sources are fetched concurrently (see `data_pipeline.etl.fetcher`).
+        Returns the data sources that changed since they were last fetched."""
+        return fetch_data_sources(
+            self.get_data_sources(),
+            use_cache=use_cached_data_sources,
+            revalidate=self.REVALIDATE_DATA_SOURCES,
+        )
+
+    def has_unmanaged_source_cache(self) -> bool:
+        """Whether the data sources were cached before they had manifests.
+
+        Such a cache is used as is, as long as the sources directory has
+        anything in it, like it was before manifests were kept."""
+        return any(self.get_sources_path().iterdir()) and not any(
+            load_manifest(data_source)
+            for data_source in self.get_data_sources()
+        )
 
     def clear_data_source_cache(self) -> None:
         """Clears the cache for this ETLs data source(s)"""
@@ -211,18 +263,31 @@ class ExtractTransformLoad(ABC):
         data sources returned by get_data_sources.
 
         If use_cached_data_sources is true, this method attempts to use cached data
-        rather than re-downloading from the original source. The cache algorithm is very
-        simple: it just looks to see if the directory has any contents. If so, it uses
-        that content. If not, it downloads all data sources.
+        rather than re-downloading from the original source. Every data source has a
+        manifest of what was fetched for it, which decides whether its cached copy is
+        used as is, revalidated with the server, or fetched again (see
+        `data_pipeline.etl.source_cache`). Only the data sources that are missing or
+        have changed are downloaded.
 
         Subclasses should call super() before performing any work if they wish to take
         advantage of the automatic downloading and caching ability of this superclass.
         """
 
-        if use_cached_data_sources and any(self.get_sources_path().iterdir()):
-            logger.info(
-                f"Using cached data sources for {self.__class__.__name__}"
+        if use_cached_data_sources and self.has_unmanaged_source_cache():
+            logger.warning(
+                f"Using cached data sources for {self.__class__.__name__}, "
+                "which have no manifests; clear the cache to keep track of them"
             )
+        elif use_cached_data_sources:
+            changed = self._fetch(use_cached_data_sources=True)
+            if changed:
+                logger.info(
+                    f"{len(changed)} data source(s) changed for {self.__class__.__name__}"
+                )
+            else:
+                logger.info(
+                    f"Using cached data sources for {self.__class__.__name__}"
+                )
         else:
             self.clear_data_source_cache()
             self._fetch()
@@ -347,30 +412,71 @@ class ExtractTransformLoad(ABC):
 
         Data is written in the specified local data folder or remote AWS S3 bucket.
 
-        Uses the directory and the file name from `self._get_output_file_path`.
+        Uses the directory and the file name from `self._get_output_file_path`,
+        and the file format from `self.OUTPUT_FORMAT`. `float_format` only
+        applies to CSV output.
         """
-        logger.debug(f"Saving `{self.NAME}` CSV")
+        logger.debug(f"Saving `{self.NAME}` {self.OUTPUT_FORMAT.name}")
 
         # Create directory if necessary.
         output_file_path = self._get_output_file_path()
         output_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write nationwide csv
+        # Write nationwide file
+        if self.OUTPUT_FORMAT is OutputFormat.CSV:
+            self.output_df[self.COLUMNS_TO_KEEP].to_csv(
+                output_file_path, index=False, float_format=float_format
+            )
+        else:
+            self.output_df[self.COLUMNS_TO_KEEP].to_parquet(
+                output_file_path, index=False
+            )
+
+        logger.debug(f"File written to `{output_file_path}`.")
+
+    def export_csv(
+        self,
+        output_file_path: Optional[pathlib.Path] = None,
+        float_format=None,
+    ) -> pathlib.Path:
+        """Writes the transformed data as a CSV, whatever `self.OUTPUT_FORMAT` is.
+
+        This is for CSV downloadables; the pipeline itself reads the output
+        written by `load`.
+
+        Args:
+            output_file_path (pathlib.Path): where to write the CSV, which
+                defaults to the CSV output path of this ETL
+            float_format: passed on to `pd.DataFrame.to_csv`
+
+        Returns:
+            the path of the CSV
+        """
+        if output_file_path is None:
+            output_file_path = self._get_output_file_path(OutputFormat.CSV)
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.debug(f"Exporting `{self.NAME}` CSV to `{output_file_path}`")
         self.output_df[self.COLUMNS_TO_KEEP].to_csv(
             output_file_path, index=False, float_format=float_format
         )
-
-        logger.debug(f"File written to `{output_file_path}`.")
+        return output_file_path
 
     # This is a classmethod so it can be used without needing to create an instance of
     # the class. This is a use case in `etl_score`.
     @classmethod
-    def get_data_frame(cls) -> pd.DataFrame:
+    def get_data_frame(
+        cls, columns: Optional[typing.List[str]] = None
+    ) -> pd.DataFrame:
         """Return the output data frame for this class.
 
         Must be run after a full ETL process has been run for this class.
 
         If the ETL has been not run for this class, this will error.
+
+        Args:
+            columns (List[str]): only read these columns of the output (all
+                columns by default)
         """
         # Read in output file
         output_file_path = cls._get_output_file_path()
@@ -380,18 +486,25 @@ class ExtractTransformLoad(ABC):
                 f"No file found at `{output_file_path}`."
             )
 
+        # Not all outputs will have both a Census Block Group ID and a
+        # Tract ID, but these will be ignored if they're not present.
+        geo_fields = [cls.GEOID_FIELD_NAME, cls.GEOID_TRACT_FIELD_NAME]
+
         logger.debug(
-            f"Reading in CSV `{output_file_path}` for ETL of class `{cls}`."
-        )
-        output_df = pd.read_csv(
-            output_file_path,
-            dtype={
-                # Not all outputs will have both a Census Block Group ID and a
-                # Tract ID, but these will be ignored if they're not present.
-                cls.GEOID_FIELD_NAME: "string",
-                cls.GEOID_TRACT_FIELD_NAME: "string",
-            },
+            f"Reading in {cls.OUTPUT_FORMAT.name} `{output_file_path}` for ETL "
+            f"of class `{cls}`."
         )
+        if cls.OUTPUT_FORMAT is OutputFormat.CSV:
+            output_df = pd.read_csv(
+                output_file_path,
+                usecols=columns,
+                dtype={geo_field: "string" for geo_field in geo_fields},
+            )
+        else:
+            output_df = pd.read_parquet(output_file_path, columns=columns)
+            for geo_field in geo_fields:
+                if geo_field in output_df.columns:
+                    output_df[geo_field] = output_df[geo_field].astype("string")
 
         return output_df
 
@@ -19,11 +19,16 @@ that data to the destination.
 """
 
 from pathlib import Path
+from typing import Dict
 from typing import List
+from typing import Optional
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+
+import requests
 from data_pipeline.constants import NO_SSL_VERIFY
 
+from data_pipeline.etl.downloader import DownloadedFile
 from data_pipeline.etl.downloader import Downloader
 from data_pipeline.etl.sources.census_acs.etl_utils import (
     retrieve_census_acs_data,
@@ -47,7 +52,17 @@ class DataSource(ABC):
     destination: Path
 
     @abstractmethod
-    def fetch(self) -> None:
+    def fetch(
+        self,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
+        """Fetches the data source, downloading with `session` if given.
+
+        If `validators` (the ETag and/or Last-Modified date of the copy
+        fetched before) show that the data source has not changed, nothing is
+        fetched and None is returned; otherwise returns what was fetched.
+        """
         pass
 
 
@@ -57,16 +72,33 @@ class FileDataSource(DataSource):
 
     This single file will be fetched from the source and saved to a single
     destination.
+
+    Attributes:
+    expected_size : Optional[int]
+            the size of the file in bytes, checked when it is fetched
+    expected_sha256 : Optional[str]
+            the hex SHA-256 checksum of the file, checked when it is fetched
     """
 
-    def fetch(self) -> None:
+    expected_size: Optional[int] = None
+    expected_sha256: Optional[str] = None
+
+    def fetch(
+        self,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
         """Fetches a single file from a source and saves it to a destination."""
 
         self.destination.parent.mkdir(parents=True, exist_ok=True)
-        Downloader.download_file_from_url(
+        return Downloader.download_file(
             file_url=self.source,
             download_file_name=self.destination,
             verify=not NO_SSL_VERIFY,
+            expected_size=self.expected_size,
+            expected_sha256=self.expected_sha256,
+            session=session,
+            validators=validators,
         )
 
     def __str__(self):
@@ -78,15 +110,32 @@ class ZIPDataSource(DataSource):
     """A data source representing ZIP files.
 
     Zip files will be fetched and placed in the destination folder, then unzipped.
+
+    Attributes:
+    expected_size : Optional[int]
+            the size of the zip file in bytes, checked when it is fetched
+    expected_sha256 : Optional[str]
+            the hex SHA-256 checksum of the zip file, checked when it is fetched
     """
 
-    def fetch(self) -> None:
+    expected_size: Optional[int] = None
+    expected_sha256: Optional[str] = None
+
+    def fetch(
+        self,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
 
         self.destination.mkdir(parents=True, exist_ok=True)
-        Downloader.download_zip_file_from_url(
+        return Downloader.download_zip_file_from_url(
             file_url=self.source,
             unzipped_file_path=self.destination,
             verify=not NO_SSL_VERIFY,
+            expected_size=self.expected_size,
+            expected_sha256=self.expected_sha256,
+            session=session,
+            validators=validators,
         )
 
     def __str__(self):
@@ -106,8 +155,14 @@ class CensusDataSource(DataSource):
     data_path_for_fips_codes: Path
     acs_type: str
 
-    def fetch(self) -> None:
-
+    def fetch(
+        self,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
+        # The Census API is queried through the censusdata package, which
+        # manages its own connections and has no validators, so `session`
+        # and `validators` are not used.
         df = retrieve_census_acs_data(
             acs_year=self.acs_year,
             variables=self.variables,
@@ -121,5 +176,7 @@ class CensusDataSource(DataSource):
         # Write CSV representation of census data
         df.to_csv(self.destination, index=False)
 
+        return DownloadedFile.from_path(self.destination)
+
     def __str__(self):
         return f"Census – {self.acs_type}, {self.acs_year}"
@@ -1,16 +1,72 @@
+import hashlib
+import os
 import uuid
 import urllib3
 import requests
 import zipfile
 import shutil
 
+from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
+from typing import Dict
+from typing import Optional
 from data_pipeline.config import settings
 from data_pipeline.utils import get_module_logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = get_module_logger(__name__)
 
+# Downloads are streamed to disk in chunks of this many bytes
+DOWNLOAD_CHUNK_SIZE = 2**20
+
+# A download is written to `<file name>.part` and renamed when complete. The
+# ETag or Last-Modified date of a partial download is kept next to it, in
+# `<file name>.part.validator`, so that it can be resumed only if the remote
+# file has not changed since.
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX = ".part.validator"
+
+
+@dataclass
+class DownloadedFile:
+    """What was downloaded from a URL.
+
+    Attributes:
+    path : Path
+            where the file was saved
+    size : int
+            the size of the file, in bytes
+    sha256 : str
+            the hex SHA-256 checksum of the file
+    etag : Optional[str]
+            the ETag of the file on the server, if it sent one
+    last_modified : Optional[str]
+            the Last-Modified date of the file on the server, if it sent one
+    files : Dict[str, int]
+            the size of every file written, by path relative to the
+            destination (the file itself is "")
+    """
+
+    path: Path
+    size: int
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    files: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "DownloadedFile":
+        """Describes a file that was written locally rather than downloaded."""
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        size = path.stat().st_size
+        return cls(
+            path=path, size=size, sha256=sha256.hexdigest(), files={"": size}
+        )
+
 
 def _log_retry_failure(retry_state):
     logger.warning(
@@ -27,28 +83,95 @@ class Downloader:
         else settings.REQUESTS_DEFAULT_RETRIES
     )
 
+    @staticmethod
+    def create_session(pool_size: int) -> requests.Session:
+        """Creates a session that keeps up to `pool_size` connections open per host.
+
+        A session can be shared by threads downloading at the same time, and
+        passed to the download methods so that they reuse its connections.
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @classmethod
+    def download_file_from_url(
+        cls,
+        file_url: str,
+        download_file_name: Path,
+        verify: bool = True,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ) -> Path:
+        """Downloads a file from a remote URL location and returns the file location.
+
+        See `download_file` for how the file is downloaded.
+
+        Args:
+                file_url (str): URL where the zip file is located
+                download_file_name (pathlib.Path): file path where the file will be downloaded (called downloaded.zip by default)
+                verify (bool): A flag to check if the certificate is valid. If truthy, an invalid certificate will throw an
+                error (optional, default to False)
+                expected_size (int): size of the file in bytes, checked once downloaded (optional)
+                expected_sha256 (str): hex SHA-256 checksum of the file, checked once downloaded (optional)
+                session (requests.Session): session to download with, to reuse its connections (optional)
+
+        Returns:
+                pathlib.Path: the path of the downloaded file
+
+        """
+        return cls.download_file(
+            file_url=file_url,
+            download_file_name=download_file_name,
+            verify=verify,
+            expected_size=expected_size,
+            expected_sha256=expected_sha256,
+            session=session,
+        ).path
+
     @classmethod
     @retry(
         stop=stop_after_attempt(num_retries),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         before_sleep=_log_retry_failure,
     )
-    def download_file_from_url(
+    def download_file(
         cls,
         file_url: str,
         download_file_name: Path,
         verify: bool = True,
-    ) -> str:
-        """Downloads a file from a remote URL location and returns the file location.
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
+        """Downloads a file from a remote URL location and describes what was downloaded.
+
+        The file is streamed to a partial file next to `download_file_name`,
+        which is renamed once the download is complete and verified, so
+        `download_file_name` is never left half written. If a download fails,
+        the next attempt resumes the partial file with an HTTP Range request
+        when the server supports it and the remote file has not changed.
+
+        With `validators` (the ETag and/or Last-Modified date of a copy
+        downloaded before), the download is conditional: if the server says
+        the file has not changed, nothing is downloaded and None is returned.
 
         Args:
                 file_url (str): URL where the zip file is located
                 download_file_name (pathlib.Path): file path where the file will be downloaded (called downloaded.zip by default)
                 verify (bool): A flag to check if the certificate is valid. If truthy, an invalid certificate will throw an
                 error (optional, default to False)
+                expected_size (int): size of the file in bytes, checked once downloaded (optional)
+                expected_sha256 (str): hex SHA-256 checksum of the file, checked once downloaded (optional)
+                session (requests.Session): session to download with, to reuse its connections (optional)
+                validators (Dict[str, str]): "ETag" and/or "Last-Modified" of a previous download (optional)
 
         Returns:
-                None
+                DownloadedFile: what was downloaded, or None if the file has not changed
 
         """
         # disable https warning
@@ -61,45 +184,184 @@ class Downloader:
             if "REQUEST_TIMEOUT" in settings
             else settings.REQUESTS_DEFAULT_TIMOUT
         )
-        response = requests.get(file_url, verify=verify, timeout=timeout)
-        if response.status_code == 200:
-            file_contents = response.content
-            logger.debug("Downloaded.")
-        else:
+        partial_path = download_file_name.with_name(
+            download_file_name.name + PARTIAL_DOWNLOAD_SUFFIX
+        )
+        validator_path = download_file_name.with_name(
+            download_file_name.name + PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX
+        )
+
+        downloaded_file = cls._stream_to_partial_file(
+            file_url=file_url,
+            partial_path=partial_path,
+            validator_path=validator_path,
+            verify=verify,
+            timeout=timeout,
+            session=session,
+            validators=validators,
+        )
+        if downloaded_file is None:
+            logger.debug(f"Not modified since the last download: {file_url}")
+            return None
+        logger.debug("Downloaded.")
+
+        problems = []
+        if expected_size is not None and downloaded_file.size != expected_size:
+            problems.append(
+                f"size {downloaded_file.size} instead of {expected_size} bytes"
+            )
+        if (
+            expected_sha256 is not None
+            and downloaded_file.sha256 != expected_sha256.lower()
+        ):
+            problems.append(
+                f"SHA-256 {downloaded_file.sha256} instead of {expected_sha256}"
+            )
+        if problems:
+            # Start over on the next attempt rather than resume a bad file
+            partial_path.unlink()
+            validator_path.unlink(missing_ok=True)
             # pylint: disable-next=broad-exception-raised
             raise Exception(
-                f"HTTP response {response.status_code} from url {file_url}. Info: {response.content}"
+                f"Downloaded file from url {file_url} has {' and '.join(problems)}"
             )
 
-        # Write the contents to disk.
-        file = open(download_file_name, "wb")
-        file.write(file_contents)
-        file.close()
+        os.replace(partial_path, download_file_name)
+        validator_path.unlink(missing_ok=True)
 
-        return download_file_name
+        downloaded_file.path = download_file_name
+        downloaded_file.files = {"": downloaded_file.size}
+        return downloaded_file
+
+    @staticmethod
+    def _stream_to_partial_file(
+        file_url: str,
+        partial_path: Path,
+        validator_path: Path,
+        verify: bool,
+        timeout: float,
+        session: Optional[requests.Session],
+        validators: Optional[Dict[str, str]],
+    ) -> Optional[DownloadedFile]:
+        """Streams a URL to `partial_path`, resuming it if possible.
+
+        Returns:
+                DownloadedFile: the size, checksum and validators of the partial
+                file, or None if `validators` show that the file has not changed
+        """
+        headers = {
+            # Ranges and sizes refer to the bytes of the file itself
+            "Accept-Encoding": "identity",
+        }
+        resume_from = (
+            partial_path.stat().st_size if partial_path.is_file() else 0
+        )
+        if validators:
+            if validators.get("ETag"):
+                headers["If-None-Match"] = validators["ETag"]
+            if validators.get("Last-Modified"):
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+        elif resume_from and validator_path.is_file():
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = validator_path.read_text(encoding="utf-8")
+
+        get = session.get if session is not None else requests.get
+        response = get(
+            file_url,
+            verify=verify,
+            timeout=timeout,
+            stream=True,
+            headers=headers,
+        )
+        with response:
+            if response.status_code == 304 and validators:
+                return None
+            if response.status_code == 206 and "Range" in headers:
+                logger.debug(
+                    f"Resuming download of {file_url} after {resume_from} bytes"
+                )
+                mode = "ab"
+            elif response.status_code == 200:
+                mode = "wb"
+                # Only strong validators can be used to resume a download
+                validator = response.headers.get("ETag")
+                if validator is None or validator.startswith("W/"):
+                    validator = response.headers.get("Last-Modified")
+                if validator:
+                    validator_path.write_text(validator, encoding="utf-8")
+                else:
+                    validator_path.unlink(missing_ok=True)
+            else:
+                if response.status_code == 416:
+                    # The partial file is not a prefix of the remote file
+                    partial_path.unlink(missing_ok=True)
+                    validator_path.unlink(missing_ok=True)
+                # pylint: disable-next=broad-exception-raised
+                raise Exception(
+                    f"HTTP response {response.status_code} from url {file_url}. Info: {response.content}"
+                )
+
+            sha256 = hashlib.sha256()
+            if mode == "ab":
+                with open(partial_path, "rb") as partial_file:
+                    for chunk in iter(
+                        lambda: partial_file.read(DOWNLOAD_CHUNK_SIZE), b""
+                    ):
+                        sha256.update(chunk)
+
+            received = 0
+            with open(partial_path, mode) as partial_file:
+                for chunk in response.iter_content(
+                    chunk_size=DOWNLOAD_CHUNK_SIZE
+                ):
+                    partial_file.write(chunk)
+                    sha256.update(chunk)
+                    received += len(chunk)
+
+            content_length = response.headers.get("Content-Length")
+            if content_length is not None and received != int(content_length):
+                # pylint: disable-next=broad-exception-raised
+                raise Exception(
+                    f"Download from url {file_url} stopped after {received} of {content_length} bytes"
+                )
+
+            return DownloadedFile(
+                path=partial_path,
+                size=partial_path.stat().st_size,
+                sha256=sha256.hexdigest(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
 
     @classmethod
-    @retry(
-        stop=stop_after_attempt(num_retries),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        before_sleep=_log_retry_failure,
-    )
     def download_zip_file_from_url(
         cls,
         file_url: str,
         unzipped_file_path: Path,
         verify: bool = True,
-    ) -> None:
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Optional[DownloadedFile]:
         """Downloads a zip file from a remote URL location and unzips it in a specific directory, removing the temporary file after
 
+        The zip file is downloaded to the same temporary directory on every
+        attempt of `download_file`, so a failed download is resumed.
+
         Args:
                 file_url (str): URL where the zip file is located
                 unzipped_file_path (pathlib.Path): directory and name of the extracted file
                 verify (bool): A flag to check if the certificate is valid. If truthy, an invalid certificate will throw an
                 error (optional, default to False)
+                expected_size (int): size of the zip file in bytes (optional)
+                expected_sha256 (str): hex SHA-256 checksum of the zip file (optional)
+                session (requests.Session): session to download with, to reuse its connections (optional)
+                validators (Dict[str, str]): "ETag" and/or "Last-Modified" of a previous download (optional)
 
         Returns:
-                None
+                DownloadedFile: the zip file that was downloaded, with the files
+                extracted from it, or None if it has not changed
 
         """
         # dir_id allows us to evade race conditions on parallel ETLs
@@ -113,14 +375,28 @@ class Downloader:
             / "download.zip"
         )
 
-        zip_file_path = Downloader.download_file_from_url(
-            file_url=file_url,
-            download_file_name=zip_download_path,
-            verify=verify,
-        )
+        try:
+            downloaded_file = Downloader.download_file(
+                file_url=file_url,
+                download_file_name=zip_download_path,
+                verify=verify,
+                expected_size=expected_size,
+                expected_sha256=expected_sha256,
+                session=session,
+                validators=validators,
+            )
 
-        with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-            zip_ref.extractall(unzipped_file_path)
+            if downloaded_file is not None:
+                with zipfile.ZipFile(downloaded_file.path, "r") as zip_ref:
+                    zip_ref.extractall(unzipped_file_path)
+                    downloaded_file.files = {
+                        member.filename: member.file_size
+                        for member in zip_ref.infolist()
+                        if not member.is_dir()
+                    }
+                downloaded_file.path = unzipped_file_path
+        finally:
+            # cleanup temporary file and directory
+            shutil.rmtree(zip_download_path.parent, ignore_errors=True)
 
-        # cleanup temporary file and directory
-        shutil.rmtree(zip_download_path.parent)
+        return downloaded_file
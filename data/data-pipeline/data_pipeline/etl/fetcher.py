@@ -0,0 +1,131 @@
+"""Fetches many data sources at once.
+
+Data sources are fetched by a bounded pool of threads that share one pooled
+`requests.Session`, so that connections to a host are reused between
+downloads. No more than `max_per_host` data sources are fetched from the same
+host at a time, and hosts take turns, so that a long list of files from one
+server (e.g. the state TIGER files of the census ETL) neither overloads it nor
+holds up the data sources on other hosts.
+
+Data sources go through `data_pipeline.etl.source_cache`, so with the cache
+enabled only the data sources that are missing or have changed are
+downloaded again.
+"""
+import collections
+import concurrent.futures
+import typing
+import urllib.parse
+
+from data_pipeline.config import settings
+from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.downloader import Downloader
+from data_pipeline.etl.source_cache import fetch_data_source
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+
+def get_data_source_host(data_source: DataSource) -> str:
+    """Returns the host a data source is fetched from ("" if it has no URL)."""
+    return urllib.parse.urlparse(data_source.source or "").netloc
+
+
+def fetch_data_sources(
+    data_sources: typing.List[DataSource],
+    max_workers: typing.Optional[int] = None,
+    max_per_host: typing.Optional[int] = None,
+    use_cache: bool = False,
+    revalidate: bool = True,
+) -> typing.List[DataSource]:
+    """Fetches data sources concurrently.
+
+    If a data source cannot be fetched, the others are still fetched, and
+    the first exception is raised again once they are done.
+
+    Args:
+        data_sources (List[DataSource]): the data sources to fetch
+        max_workers (int): how many data sources can be fetched at the same
+            time (defaults to `settings.DATA_SOURCE_FETCH_MAX_WORKERS`)
+        max_per_host (int): how many data sources can be fetched from the
+            same host at the same time (defaults to
+            `settings.DATA_SOURCE_FETCH_MAX_PER_HOST`)
+        use_cache (bool): use the cached copies of data sources that are
+            still valid (see `data_pipeline.etl.source_cache`)
+        revalidate (bool): revalidate the cached copies with their servers,
+            rather than use them as they are
+
+    Returns:
+        List[DataSource]: the data sources that changed since they were last
+        fetched
+    """
+    if max_workers is None:
+        max_workers = int(settings.get("DATA_SOURCE_FETCH_MAX_WORKERS", 8))
+    if max_per_host is None:
+        max_per_host = int(settings.get("DATA_SOURCE_FETCH_MAX_PER_HOST", 4))
+
+    # Data sources waiting to be fetched, by host, in their original order
+    pending: typing.Dict[
+        str, typing.Deque[DataSource]
+    ] = collections.OrderedDict()
+    for data_source in data_sources:
+        pending.setdefault(
+            get_data_source_host(data_source), collections.deque()
+        ).append(data_source)
+    running: typing.Dict[concurrent.futures.Future, DataSource] = {}
+    running_per_host: typing.Counter[str] = collections.Counter()
+    changed: typing.List[DataSource] = []
+    error: typing.Optional[BaseException] = None
+
+    logger.debug(
+        f"Fetching {len(data_sources)} data source(s) from {len(pending)} "
+        f"host(s), {max_workers} at a time and {max_per_host} per host"
+    )
+
+    session = Downloader.create_session(pool_size=max_per_host)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            while pending or running:
+                # Start one data source per host in turn until the pool or
+                # every host with pending data sources is busy.
+                started = True
+                while started and len(running) < max_workers:
+                    started = False
+                    for host in list(pending):
+                        if len(running) >= max_workers:
+                            break
+                        if running_per_host[host] >= max_per_host:
+                            continue
+                        data_source = pending[host].popleft()
+                        if not pending[host]:
+                            del pending[host]
+                        future = executor.submit(
+                            fetch_data_source,
+                            data_source,
+                            session=session,
+                            use_cache=use_cache,
+                            revalidate=revalidate,
+                        )
+                        running[future] = data_source
+                        running_per_host[host] += 1
+                        started = True
+
+                finished, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in finished:
+                    data_source = running.pop(future)
+                    running_per_host[get_data_source_host(data_source)] -= 1
+                    try:
+                        if future.result():
+                            changed.append(data_source)
+                    except Exception as e:  # pylint: disable=broad-except
+                        logger.error(f"Could not fetch {data_source}: {e}")
+                        error = error or e
+    finally:
+        session.close()
+
+    if error is not None:
+        raise error
+    return changed
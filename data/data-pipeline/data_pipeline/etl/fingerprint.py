@@ -0,0 +1,206 @@
+"""Fingerprints pipeline stages so that unchanged stages can be skipped.
+
+The fingerprint of a stage (an ETL, the score, the post score, the geo score or
+the map tiles) is a hash of everything its outputs are made from:
+
+- the code of the stage and the pipeline code shared by every stage;
+- the config YAMLs;
+- the manifests of the data sources it fetches (see
+  `data_pipeline.etl.source_cache`);
+- the fingerprints of the stages whose outputs it reads;
+- its parameters (e.g. where the score stages get census data from).
+
+A stage records its fingerprint in `FINGERPRINTS_PATH` after it runs. In
+incremental mode a stage is skipped when its fingerprint has not changed and its
+outputs are still there. Because a stage's fingerprint includes the ones of
+the stages it reads from, a stage that runs again changes the fingerprint of
+everything downstream of it, which then runs again too.
+"""
+import dataclasses
+import functools
+import hashlib
+import json
+import typing
+from pathlib import Path
+
+from data_pipeline.config import settings
+from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.source_cache import load_manifest
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+FINGERPRINTS_PATH = settings.DATA_PATH / "fingerprints"
+
+APP_ROOT = Path(settings.APP_ROOT)
+
+# Code that every stage depends on
+SHARED_CODE_PATHS = [
+    APP_ROOT / "etl" / "base.py",
+    APP_ROOT / "etl" / "score" / "constants.py",
+    APP_ROOT / "etl" / "score" / "etl_utils.py",
+    APP_ROOT / "score" / "field_names.py",
+    APP_ROOT / "utils.py",
+]
+
+# Configuration that every stage depends on
+CONFIG_PATHS = [
+    APP_ROOT / "etl" / "score" / "config",
+    APP_ROOT / "content" / "config",
+]
+
+
+@dataclasses.dataclass
+class Stage:
+    """A step of the pipeline, and what its outputs are made from.
+
+    Attributes:
+    name : str
+            the name of the stage, unique in the pipeline
+    code_paths : List[Path]
+            the files and directories of the code of the stage
+    upstream : List[str]
+            the names of the stages whose outputs the stage reads
+    outputs : List[Path]
+            the files or directories the stage writes, which must exist for
+            the stage to be skipped
+    data_sources : List[DataSource]
+            the data sources the stage fetches
+    parameters : Dict[str, str]
+            the options the stage runs with that change its outputs
+    """
+
+    name: str
+    code_paths: typing.List[Path]
+    upstream: typing.List[str] = dataclasses.field(default_factory=list)
+    outputs: typing.List[Path] = dataclasses.field(default_factory=list)
+    data_sources: typing.List[DataSource] = dataclasses.field(
+        default_factory=list
+    )
+    parameters: typing.Dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_file(path: Path, modified_ns: int) -> str:
+    """Hashes a file; `modified_ns` is only there to invalidate the cache."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def hash_paths(paths: typing.Iterable[Path]) -> str:
+    """Hashes the contents of files, and of the files in directories.
+
+    Files are identified by their path relative to `APP_ROOT`, so the hash
+    does not depend on where the pipeline is installed.
+    """
+    files = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(
+                file
+                for file in path.rglob("*")
+                if file.is_file() and "__pycache__" not in file.parts
+            )
+        elif path.is_file():
+            files.add(path)
+
+    digest = hashlib.sha256()
+    for file in sorted(files):
+        try:
+            name = file.relative_to(APP_ROOT).as_posix()
+        except ValueError:
+            name = file.as_posix()
+        digest.update(name.encode())
+        digest.update(_hash_file(file, file.stat().st_mtime_ns).encode())
+    return digest.hexdigest()
+
+
+def _get_fingerprint_path(name: str, fingerprints_path: Path) -> Path:
+    return fingerprints_path / f"{name}.json"
+
+
+def load_fingerprint(
+    name: str, fingerprints_path: Path = FINGERPRINTS_PATH
+) -> typing.Optional[str]:
+    """Reads the fingerprint recorded the last time a stage ran."""
+    path = _get_fingerprint_path(name, fingerprints_path)
+    if not path.is_file():
+        return None
+    try:
+        with open(path, encoding="utf-8") as fingerprint_file:
+            return json.load(fingerprint_file)["fingerprint"]
+    except (OSError, ValueError, KeyError):
+        logger.warning(f"Ignoring unreadable stage fingerprint {path}")
+        return None
+
+
+def compute_fingerprint(
+    stage: Stage, fingerprints_path: Path = FINGERPRINTS_PATH
+) -> str:
+    """Computes the fingerprint of a stage from its current inputs."""
+    manifests = [
+        load_manifest(data_source) for data_source in stage.data_sources
+    ]
+    inputs = {
+        "code": hash_paths(SHARED_CODE_PATHS + stage.code_paths),
+        "config": hash_paths(CONFIG_PATHS),
+        "data_sources": [
+            manifest.sha256 if manifest is not None else None
+            for manifest in manifests
+        ],
+        "upstream": {
+            name: load_fingerprint(name, fingerprints_path)
+            for name in stage.upstream
+        },
+        "parameters": stage.parameters,
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def record_fingerprint(
+    stage: Stage, fingerprints_path: Path = FINGERPRINTS_PATH
+) -> None:
+    """Records the fingerprint of a stage that just ran."""
+    path = _get_fingerprint_path(stage.name, fingerprints_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fingerprint_file:
+        json.dump(
+            {
+                "fingerprint": compute_fingerprint(stage, fingerprints_path),
+                "upstream": stage.upstream,
+            },
+            fingerprint_file,
+            indent=2,
+        )
+
+
+def is_up_to_date(
+    stage: Stage, fingerprints_path: Path = FINGERPRINTS_PATH
+) -> bool:
+    """Whether a stage's inputs are unchanged since it last ran, and its outputs still there."""
+    recorded = load_fingerprint(stage.name, fingerprints_path)
+    return (
+        recorded is not None
+        and all(output.exists() for output in stage.outputs)
+        and recorded == compute_fingerprint(stage, fingerprints_path)
+    )
+
+
+def run_stage(
+    stage: Stage,
+    run: typing.Callable[[], None],
+    incremental: bool = False,
+    fingerprints_path: Path = FINGERPRINTS_PATH,
+) -> bool:
+    """Runs a stage, unless it is up to date and `incremental` is set.
+
+    Returns:
+        bool: whether the stage ran
+    """
+    if incremental and is_up_to_date(stage, fingerprints_path):
+        logger.info(f"Skipping {stage.name}: its inputs have not changed")
+        return False
+    run()
+    record_fingerprint(stage, fingerprints_path)
+    return True
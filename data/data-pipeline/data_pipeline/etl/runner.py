@@ -1,23 +1,26 @@
-import concurrent.futures
 import importlib
 import time
 import typing
 import os
 
+from functools import partial
 from functools import reduce
+from pathlib import Path
 
 from data_pipeline.etl.score.etl_score import ScoreETL
+from data_pipeline.etl.score.etl_score_geo import GEO_SCORE_LAYERS
 from data_pipeline.etl.score.etl_score_geo import GeoScoreETL
-from data_pipeline.etl.score.etl_score_geo_gistar_burd import GeoScoreGIStarBurdETL
-from data_pipeline.etl.score.etl_score_geo_gistar_ind import GeoScoreGIStarIndETL
-from data_pipeline.etl.score.etl_score_geo_add_burd import GeoScoreAddBurdETL
-from data_pipeline.etl.score.etl_score_geo_add_ind import GeoScoreAddIndETL
 from data_pipeline.etl.score.etl_score_post import PostScoreETL
+from data_pipeline.tile.generate import generate_score_tiles_from_frames
 from data_pipeline.utils import get_module_logger
 from data_pipeline.etl.base import ExtractTransformLoad
 from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.fetcher import fetch_data_sources
+from data_pipeline.etl.score import constants as score_constants
 
 from . import constants
+from . import fingerprint
+from . import scheduler
 
 logger = get_module_logger(__name__)
 
@@ -59,13 +62,136 @@ def _get_dataset(dataset: dict) -> ExtractTransformLoad:
     return etl_instance
 
 
-def _run_one_dataset(dataset: dict, use_cache: bool = False) -> None:
-    """Runs one etl process."""
+def _get_dataset_stage(
+    dataset: dict, etl_instance: typing.Optional[ExtractTransformLoad] = None
+) -> fingerprint.Stage:
+    """Returns the pipeline stage of an etl process (see `data_pipeline.etl.fingerprint`)"""
+    if etl_instance is None:
+        etl_instance = _get_dataset(dataset)
+
+    # New-style ETLs have a NAME that their output path derives from, older
+    # ones set an OUTPUT_PATH
+    if etl_instance.NAME is not None:
+        outputs = [etl_instance._get_output_file_path()]
+    elif getattr(etl_instance, "OUTPUT_PATH", None) is not None:
+        outputs = [Path(etl_instance.OUTPUT_PATH)]
+    else:
+        outputs = []
+
+    return fingerprint.Stage(
+        name=dataset["name"],
+        code_paths=[
+            fingerprint.APP_ROOT / "etl" / "sources" / dataset["module_dir"]
+        ],
+        upstream=list(dataset.get("dependencies", [])),
+        outputs=outputs,
+        data_sources=etl_instance.get_data_sources(),
+    )
+
+
+def get_pipeline_stage(
+    name: str,
+    data_source: str = "local",
+    layers: typing.Optional[typing.List[str]] = None,
+) -> fingerprint.Stage:
+    """Returns a stage of the pipeline that runs after the etl processes
+
+    Args:
+        name (str): One of "score", "score_prepared", "score_post", "score_geo", "tiles" and "tribal_tiles"
+        data_source (str): Source for the census data of the score stages (optional)
+        layers (List[str]): The geo score layers the "score_geo" stage makes (optional)
+
+    Returns:
+        fingerprint.Stage
+    """
+    app_root = fingerprint.APP_ROOT
+    layers = layers or ["default"]
+    stages = {
+        "score": fingerprint.Stage(
+            name="score",
+            code_paths=[
+                app_root / "etl" / "score" / "etl_score.py",
+                app_root / "score",
+            ],
+            upstream=[dataset["name"] for dataset in constants.DATASET_LIST],
+            outputs=[score_constants.DATA_SCORE_CSV_FULL_FILE_PATH],
+        ),
+        # The dataframe the score is calculated from, which does not depend on
+        # the score code, so that changes to the score can be tried on it
+        "score_prepared": fingerprint.Stage(
+            name="score_prepared",
+            code_paths=[app_root / "etl" / "score" / "etl_score.py"],
+            upstream=[dataset["name"] for dataset in constants.DATASET_LIST],
+            outputs=[score_constants.DATA_SCORE_PREPARED_FILE_PATH],
+        ),
+        "score_post": fingerprint.Stage(
+            name="score_post",
+            code_paths=[
+                app_root / "etl" / "score" / "etl_score_post.py",
+                app_root / "content",
+            ],
+            upstream=["score"],
+            outputs=[
+                score_constants.DATA_SCORE_CSV_TILES_FILE_PATH,
+                score_constants.SCORE_DOWNLOADABLE_DIR,
+            ],
+            parameters={"data_source": str(data_source)},
+        ),
+        "score_geo": fingerprint.Stage(
+            name="score_geo",
+            code_paths=[
+                app_root / "etl" / "score" / "etl_score_geo.py",
+                app_root / "etl" / "sources" / "tract_simplification.py",
+            ],
+            upstream=["score_post", "census"],
+            outputs=[
+                score_constants.DATA_SCORE_DIR
+                / "geojson"
+                / GEO_SCORE_LAYERS[layer].directory
+                for layer in layers
+            ]
+            + [
+                score_constants.DATA_SCORE_DIR / "geoparquet",
+                score_constants.DATA_SCORE_DIR / "flatgeobuf",
+            ],
+            parameters={
+                "data_source": str(data_source),
+                "layers": ",".join(layers),
+            },
+        ),
+        "tiles": fingerprint.Stage(
+            name="tiles",
+            code_paths=[app_root / "tile"],
+            upstream=["score_geo"],
+            outputs=[score_constants.DATA_SCORE_TILES_DIR / "default"],
+        ),
+        "tribal_tiles": fingerprint.Stage(
+            name="tribal_tiles",
+            code_paths=[app_root / "tile"],
+            upstream=["tribal"],
+            outputs=[score_constants.DATA_PATH / "tribal" / "tiles"],
+        ),
+    }
+    if name not in stages:
+        raise ValueError(f"Invalid pipeline stage {name}")
+    return stages[name]
+
+
+def _run_one_dataset(
+    dataset: dict, use_cache: bool = False, revalidate: bool = True
+) -> None:
+    """Runs one etl process.
+
+    With `revalidate` False, the cached data sources that are all there are
+    used without asking their servers whether they changed, because they were
+    just revalidated.
+    """
 
     start_time = time.time()
 
     logger.info(f"Running ETL for {dataset['name']}")
     etl_instance = _get_dataset(dataset)
+    etl_instance.REVALIDATE_DATA_SOURCES = revalidate
 
     # run extract
     logger.debug(f"Extracting {dataset['name']}")
@@ -87,6 +213,9 @@ def _run_one_dataset(dataset: dict, use_cache: bool = False) -> None:
     logger.debug(f"Cleaning up {dataset['name']}")
     etl_instance.cleanup()
 
+    # record what the outputs were made from, for incremental runs
+    fingerprint.record_fingerprint(_get_dataset_stage(dataset, etl_instance))
+
     logger.info(f"Finished ETL for dataset {dataset['name']}")
     logger.debug(
         f"Execution time for ETL for dataset {dataset['name']} was {time.time() - start_time}s"
@@ -97,59 +226,87 @@ def etl_runner(
     dataset_to_run: str = None,
     use_cache: bool = False,
     no_concurrency: bool = False,
+    memory_budget_mb: typing.Optional[float] = None,
+    executor: str = scheduler.THREAD_EXECUTOR,
+    incremental: bool = False,
 ) -> None:
     """Runs all etl processes or a specific one
 
+    Datasets run concurrently as soon as the datasets they depend on have
+    run, as long as their expected memory use fits in the memory budget (see
+    `data_pipeline.etl.scheduler`).
+
+    In incremental mode, the cached data sources are revalidated first, and
+    only the datasets whose inputs changed since they last ran – and the
+    datasets that depend on them – run again (see
+    `data_pipeline.etl.fingerprint`).
+
     Args:
         dataset_to_run (str): Run a specific ETL process. If missing, runs all processes (optional)
         use_cache (bool): Use the cached data sources – if they exist – rather than downloading them all from scratch
+        no_concurrency (bool): Run one ETL process at a time (optional)
+        memory_budget_mb (float): How much memory, in MB, the ETL processes
+            running at the same time can use; defaults to
+            `settings.ETL_MEMORY_BUDGET_MB` or the machine's memory (optional)
+        executor (str): Run the ETL processes in threads ("thread", the
+            default) or in worker processes ("process") (optional)
+        incremental (bool): Only run the ETL processes whose inputs changed, using the cached data sources (optional)
 
     Returns:
         None
     """
     dataset_list = _get_datasets_to_run(dataset_to_run)
+    if incremental:
+        use_cache = True
+        dataset_list = _get_out_of_date_datasets(dataset_list)
+        if not dataset_list:
+            logger.info("All ETLs are up to date")
+            return
+
+    max_workers = 1 if no_concurrency else os.cpu_count()
+    scheduler.run_jobs(
+        datasets=dataset_list,
+        # In incremental mode, the data sources were just revalidated
+        run_job=partial(
+            _run_one_dataset, use_cache=use_cache, revalidate=not incremental
+        ),
+        max_workers=max_workers,
+        memory_budget_mb=memory_budget_mb,
+        executor=executor,
+    )
+
+
+def _get_out_of_date_datasets(
+    dataset_list: typing.List[dict],
+) -> typing.List[dict]:
+    """Returns the datasets that need to run again, in the order of `dataset_list`
 
-    # Because we are memory constrained on our infrastructure,
-    # we split datasets into those that are not memory intensive
-    # (is_memory_intensive == False) and thereby can be safely
-    # run in parallel, and those that require more RAM and thus
-    # should be run sequentially. The is_memory_intensive_flag is
-    # set manually in constants.py based on experience running
-    # the pipeline
-    concurrent_datasets = [
-        dataset
+    A dataset needs to run again when its inputs changed since it last ran,
+    its outputs are missing, or a dataset it depends on needs to run again.
+    """
+    _fetch_data_sources(dataset_list, use_cache=True)
+
+    out_of_date = set()
+    for dataset in scheduler.get_job_order(dataset_list):
+        if any(
+            dependency in out_of_date
+            for dependency in dataset.get("dependencies", [])
+        ) or not fingerprint.is_up_to_date(_get_dataset_stage(dataset)):
+            out_of_date.add(dataset["name"])
+
+    skipped = [
+        dataset["name"]
         for dataset in dataset_list
-        if not dataset["is_memory_intensive"]
+        if dataset["name"] not in out_of_date
     ]
-    high_memory_datasets = [
-        dataset for dataset in dataset_list if dataset["is_memory_intensive"]
+    if skipped:
+        logger.info(
+            f"Skipping {len(skipped)} up to date ETL(s): {', '.join(skipped)}"
+        )
+    return [
+        dataset for dataset in dataset_list if dataset["name"] in out_of_date
     ]
 
-    max_workers = 1 if no_concurrency else os.cpu_count()
-    if concurrent_datasets:
-        logger.info(f"Running concurrent ETL jobs on {max_workers} thread(s)")
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=max_workers
-        ) as executor:
-            futures = {
-                executor.submit(
-                    _run_one_dataset, dataset=dataset, use_cache=use_cache
-                )
-                for dataset in concurrent_datasets
-            }
-
-            for fut in concurrent.futures.as_completed(futures):
-                # Calling result will raise an exception if one occurred.
-                # Otherwise, the exceptions are silently ignored.
-                fut.result()
-
-    # Note: these high-memory datasets also usually require the Census GeoJSON to be
-    # generated, and one of them requires the Tribal GeoJSON to be generated.
-    if high_memory_datasets:
-        logger.info("Running high-memory ETL jobs")
-        for dataset in high_memory_datasets:
-            _run_one_dataset(dataset=dataset, use_cache=use_cache)
-
 
 def get_data_sources(dataset_to_run: str = None) -> [DataSource]:
 
@@ -170,16 +327,57 @@ def get_data_sources(dataset_to_run: str = None) -> [DataSource]:
 
 def extract_data_sources(
     dataset_to_run: str = None, use_cache: bool = False
-) -> None:
+) -> typing.List[str]:
+    """Fetches the data sources of all etl processes (or a specific one) at once
 
-    dataset_list = _get_datasets_to_run(dataset_to_run)
+    The data sources of every ETL are fetched together, concurrently (see
+    `data_pipeline.etl.fetcher`), and cached for the ETLs to use.
+
+    Args:
+        dataset_to_run (str): Fetch the data sources of a specific ETL process. If missing, fetches them for all processes (optional)
+        use_cache (bool): Keep the cached data sources that are still valid rather than downloading them again (optional)
 
+    Returns:
+        List[str]: the names of the ETL processes whose data sources changed, and that need to run again
+    """
+    return _fetch_data_sources(
+        _get_datasets_to_run(dataset_to_run), use_cache=use_cache
+    )
+
+
+def _fetch_data_sources(
+    dataset_list: typing.List[dict], use_cache: bool = False
+) -> typing.List[str]:
+    """Fetches the data sources of datasets; see `extract_data_sources`"""
+    # The ETL that uses each data source
+    etl_names: typing.Dict[int, str] = {}
+    sources = []
     for dataset in dataset_list:
         etl_instance = _get_dataset(dataset)
+        if not use_cache:
+            etl_instance.clear_data_source_cache()
+        elif etl_instance.has_unmanaged_source_cache():
+            logger.info(
+                f"Using cached data sources for {etl_instance.__class__.__name__}"
+            )
+            continue
+        for source in etl_instance.get_data_sources():
+            etl_names[id(source)] = dataset["name"]
+            sources.append(source)
+
+    logger.info(f"Fetching {len(sources)} data source(s)")
+    changed_sources = fetch_data_sources(sources, use_cache=use_cache)
+
+    invalidated = []
+    for source in changed_sources:
+        if etl_names[id(source)] not in invalidated:
+            invalidated.append(etl_names[id(source)])
+    if invalidated:
         logger.info(
-            f"Extracting data set for {etl_instance.__class__.__name__}"
+            f"Data sources changed for {len(invalidated)} ETL(s): "
+            f"{', '.join(invalidated)}"
         )
-        etl_instance.extract(use_cache)
+    return invalidated
 
 
 def clear_data_source_cache(dataset_to_run: str = None) -> None:
@@ -194,28 +392,43 @@ def clear_data_source_cache(dataset_to_run: str = None) -> None:
         etl_instance.clear_data_source_cache()
 
 
-def score_generate() -> None:
+def score_generate(
+    incremental: bool = False, from_prepared: bool = False
+) -> None:
     """Generates the score and saves it on the local data directory
 
     Args:
-        None
+        incremental (bool): Skip generating the score if its inputs did not change since it was last generated (optional)
+        from_prepared (bool): Generate the score from the prepared dataframe saved by the last run with from_prepared, if the datasets, code and config it was prepared from did not change, and save it otherwise (optional)
 
     Returns:
         None
     """
 
-    # Score Gen
-    start_time = time.time()
-    score_gen = ScoreETL()
-    score_gen.extract()
-    score_gen.transform()
-    score_gen.load()
-    logger.debug(
-        f"Execution time for Score Generation was {time.time() - start_time}s"
-    )
+    def run() -> None:
+        # Score Gen
+        start_time = time.time()
+        # The prepared dataframe is only saved and read back with
+        # from_prepared, so other runs do not pay for writing it
+        score_gen = ScoreETL(
+            prepared_fingerprint=fingerprint.compute_fingerprint(
+                get_pipeline_stage("score_prepared")
+            )
+            if from_prepared
+            else None,
+            from_prepared=from_prepared,
+        )
+        score_gen.extract()
+        score_gen.transform()
+        score_gen.load()
+        logger.debug(
+            f"Execution time for Score Generation was {time.time() - start_time}s"
+        )
 
+    fingerprint.run_stage(get_pipeline_stage("score"), run, incremental)
 
-def score_post(data_source: str = "local") -> None:
+
+def score_post(data_source: str = "local", incremental: bool = False) -> None:
     """Posts the score files to the local directory
 
     Args:
@@ -223,23 +436,35 @@ def score_post(data_source: str = "local") -> None:
                            Options:
                            - local (default): fetch census data from the local data directory
                            - aws: fetch census from AWS S3 J40 data repository
+        incremental (bool): Skip posting the score if its inputs did not change since it was last posted (optional)
 
     Returns:
         None
     """
-    # Post Score Processing
-    start_time = time.time()
-    score_post = PostScoreETL(data_source=data_source)
-    score_post.extract()
-    score_post.transform()
-    score_post.load()
-    score_post.cleanup()
-    logger.debug(
-        f"Execution time for Score Post was {time.time() - start_time}s"
+
+    def run() -> None:
+        # Post Score Processing
+        start_time = time.time()
+        score_post = PostScoreETL(data_source=data_source)
+        score_post.extract()
+        score_post.transform()
+        score_post.load()
+        score_post.cleanup()
+        logger.debug(
+            f"Execution time for Score Post was {time.time() - start_time}s"
+        )
+
+    fingerprint.run_stage(
+        get_pipeline_stage("score_post", data_source), run, incremental
     )
 
 
-def score_geo(data_source: str = "local") -> None:
+def score_geo(
+    data_source: str = "local",
+    incremental: bool = False,
+    layers: typing.Optional[typing.List[str]] = None,
+    generate_tiles: bool = False,
+) -> None:
     """Generates the geojson files with score data baked in
 
     Args:
@@ -247,24 +472,43 @@ def score_geo(data_source: str = "local") -> None:
                            Options:
                            - local (default): fetch census data from the local data directory
                            - aws: fetch census from AWS S3 J40 data repository
+        incremental (bool): Skip generating the geojson files if their inputs did not change since they were last generated (optional)
+        layers (List[str]): The layers to generate geojson files for (see `GEO_SCORE_LAYERS`); defaults to the score layer (optional)
+        generate_tiles (bool): Also generate the map tiles of the layers, without tippecanoe, from the frames the geojson files are written from (optional)
 
     Returns:
         None
     """
 
-    # Score Geo
-    start_time = time.time()
-    score_geo = GeoScoreETL(data_source=data_source)
-    score_geo.extract()
-    score_geo.transform()
-    score_geo.load()
-    logger.debug(
-        f"Execution time for Score Geo was {time.time() - start_time}s"
-    )
+    def run() -> None:
+        # Score Geo
+        start_time = time.time()
+        score_geo = GeoScoreETL(data_source=data_source, layers=layers)
+        score_geo.extract()
+        score_geo.transform()
+        score_geo.load()
+        if generate_tiles:
+            generate_score_tiles_from_frames(
+                score_constants.DATA_PATH, score_geo
+            )
+        logger.debug(
+            f"Execution time for Score Geo was {time.time() - start_time}s"
+        )
+
+    stage = get_pipeline_stage("score_geo", data_source, layers)
+    if generate_tiles:
+        stage.outputs += [
+            score_constants.DATA_SCORE_TILES_DIR
+            / GEO_SCORE_LAYERS[layer].tiles_directory
+            for layer in layers or ["default"]
+        ]
+        stage.code_paths += [fingerprint.APP_ROOT / "tile"]
+        stage.parameters["generate_tiles"] = "true"
+    fingerprint.run_stage(stage, run, incremental)
 
 
 def score_geo_gistar_burd(data_source: str = "local") -> None:
-    """Generates the geojson files with score data baked in
+    """Generates the geojson files with GI star burden scores baked in
 
     Args:
         data_source (str): Source for the census data (optional)
@@ -275,19 +519,11 @@ def score_geo_gistar_burd(data_source: str = "local") -> None:
     Returns:
         None
     """
+    score_geo(data_source, layers=["gistar_burd"])
 
-    # Score Geo
-    start_time = time.time()
-    score_geo_gistar_burd= GeoScoreGIStarBurdETL(data_source=data_source)
-    score_geo_gistar_burd.extract()
-    score_geo_gistar_burd.transform()
-    score_geo_gistar_burd.load()
-    logger.debug(
-        f"Execution time for Score Geo GI star burden was {time.time() - start_time}s"
-    )
 
 def score_geo_gistar_ind(data_source: str = "local") -> None:
-    """Generates the geojson files with score data baked in
+    """Generates the geojson files with GI star indicator scores baked in
 
     Args:
         data_source (str): Source for the census data (optional)
@@ -298,19 +534,11 @@ def score_geo_gistar_ind(data_source: str = "local") -> None:
     Returns:
         None
     """
+    score_geo(data_source, layers=["gistar_ind"])
 
-    # Score Geo
-    start_time = time.time()
-    score_geo_gistar_ind= GeoScoreGIStarIndETL(data_source=data_source)
-    score_geo_gistar_ind.extract()
-    score_geo_gistar_ind.transform()
-    score_geo_gistar_ind.load()
-    logger.debug(
-        f"Execution time for Score Geo GI star Indicator was {time.time() - start_time}s"
-    )
 
 def score_geo_add_burd(data_source: str = "local") -> None:
-    """Generates the geojson files with score data baked in
+    """Generates the geojson files with additive burden scores baked in
 
     Args:
         data_source (str): Source for the census data (optional)
@@ -321,19 +549,11 @@ def score_geo_add_burd(data_source: str = "local") -> None:
     Returns:
         None
     """
+    score_geo(data_source, layers=["add_burd"])
 
-    # Score Geo
-    start_time = time.time()
-    score_geo_add_burd = GeoScoreAddBurdETL(data_source=data_source)
-    score_geo_add_burd.extract()
-    score_geo_add_burd.transform()
-    score_geo_add_burd.load()
-    logger.debug(
-        f"Execution time for Score Geo Additive Burdens was {time.time() - start_time}s"
-    )
 
 def score_geo_add_ind(data_source: str = "local") -> None:
-    """Generates the geojson files with score data baked in
+    """Generates the geojson files with additive indicator scores baked in
 
     Args:
         data_source (str): Source for the census data (optional)
@@ -344,16 +564,7 @@ def score_geo_add_ind(data_source: str = "local") -> None:
     Returns:
         None
     """
-
-    # Score Geo
-    start_time = time.time()
-    score_geo_add_ind = GeoScoreAddIndETL(data_source=data_source)
-    score_geo_add_ind.extract()
-    score_geo_add_ind.transform()
-    score_geo_add_ind.load()
-    logger.debug(
-        f"Execution time for Score Geo Additive Indicators was {time.time() - start_time}s"
-    )
+    score_geo(data_source, layers=["add_ind"])
 
 
 def _find_dataset_index(dataset_list, key, value):
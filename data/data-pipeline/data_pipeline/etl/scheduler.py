@@ -0,0 +1,495 @@
+"""Runs ETL jobs in dependency order while staying under a memory budget.
+
+Every dataset in `constants.DATASET_LIST` declares the datasets it needs to
+have run first (`dependencies`). Jobs whose dependencies are done are started
+as long as the memory they are expected to use fits in the budget that the
+running jobs leave free. The expected memory of a job is the peak memory it
+used the last time it ran (saved in `PEAK_MEMORY_PATH`), falling back to its
+`memory_estimate_mb` or to `settings.ETL_DEFAULT_MEMORY_ESTIMATE_MB`.
+
+Jobs run either in threads of this process (the default) or, with the
+"process" executor, in worker processes. A worker process is shut down after a
+job that used more than `settings.ETL_WORKER_RECYCLE_MB`, or after it has run
+`settings.ETL_WORKER_MAX_JOBS` jobs, so that memory left fragmented by heavy
+ETLs goes back to the operating system instead of staying with the pipeline.
+"""
+import concurrent.futures
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import threading
+import traceback
+import typing
+from pathlib import Path
+
+from data_pipeline.config import settings
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PEAK_MEMORY_PATH = settings.DATA_PATH / "etl_peak_memory.json"
+
+# How often the memory monitor samples the memory used by this process.
+MEMORY_SAMPLE_INTERVAL_SECONDS = 0.25
+
+THREAD_EXECUTOR = "thread"
+PROCESS_EXECUTOR = "process"
+EXECUTORS = (THREAD_EXECUTOR, PROCESS_EXECUTOR)
+
+# Worker processes are started fresh rather than forked, so they do not
+# inherit the scheduler's threads and locks.
+WORKER_START_METHOD = "spawn"
+
+# Name of the job running in this worker process, added to its log messages.
+_worker_job_name: typing.Optional[str] = None
+
+
+def get_rss_mb() -> float:
+    """Returns the memory currently used (resident set size) by this process, in MB."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        # Not on Linux: fall back to the peak memory of the process so far.
+        return get_max_rss_mb()
+
+
+def get_max_rss_mb() -> float:
+    """Returns the peak memory (resident set size) of this process so far, in MB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    if sys.platform == "darwin":
+        return max_rss / 2**20
+    return max_rss / 2**10
+
+
+def get_memory_budget_mb() -> float:
+    """Returns the configured memory budget for ETL jobs, in MB.
+
+    `settings.ETL_MEMORY_BUDGET_MB` sets the budget; when it is not set (or 0)
+    the budget is the physical memory of the machine.
+    """
+    memory_budget_mb = float(settings.get("ETL_MEMORY_BUDGET_MB", 0) or 0)
+    if memory_budget_mb > 0:
+        return memory_budget_mb
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2**20
+
+
+def load_peak_memory(path: Path = PEAK_MEMORY_PATH) -> typing.Dict[str, float]:
+    """Reads the peak memory (in MB) measured for each dataset in previous runs."""
+    if not path.is_file():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as peak_memory_file:
+            return json.load(peak_memory_file)
+    except (OSError, ValueError):
+        logger.warning(f"Ignoring unreadable ETL peak memory file {path}")
+        return {}
+
+
+def save_peak_memory(
+    peak_memory: typing.Dict[str, float], path: Path = PEAK_MEMORY_PATH
+) -> None:
+    """Writes the peak memory (in MB) measured for each dataset."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as peak_memory_file:
+        json.dump(peak_memory, peak_memory_file, indent=2, sort_keys=True)
+
+
+class MemoryMonitor:
+    """Samples the memory of this process while jobs run in its threads.
+
+    Jobs running in threads share one process, so the memory a job is charged
+    with is how far the process memory rose above where it was when the job
+    started. Jobs that overlap are charged for each other's memory, which
+    errs on the side of overestimating.
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._jobs: typing.Dict[str, typing.List[float]] = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "MemoryMonitor":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _update(self) -> None:
+        rss_mb = get_rss_mb()
+        with self._lock:
+            for baseline_and_peak in self._jobs.values():
+                baseline_and_peak[1] = max(baseline_and_peak[1], rss_mb)
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._update()
+
+    @contextlib.contextmanager
+    def track(self, name: str) -> typing.Iterator[typing.Dict[str, float]]:
+        """Tracks the memory of a job while in this context.
+
+        Yields a dictionary whose `peak_mb` is set to the memory the job used
+        when the context exits, and `baseline_mb` to the memory the process
+        used when the job started.
+        """
+        result = {"baseline_mb": 0.0, "peak_mb": 0.0}
+        rss_mb = get_rss_mb()
+        with self._lock:
+            self._jobs[name] = [rss_mb, rss_mb]
+        try:
+            yield result
+        finally:
+            self._update()
+            with self._lock:
+                baseline_mb, peak_mb = self._jobs.pop(name)
+            result["baseline_mb"] = baseline_mb
+            result["peak_mb"] = peak_mb - baseline_mb
+
+
+def get_job_order(datasets: typing.List[dict]) -> typing.List[dict]:
+    """Sorts datasets so that every dataset comes after its dependencies.
+
+    Dependencies that are not in `datasets` are assumed to have run already
+    (e.g. the census ETL, which is run on its own first). Otherwise the order
+    of `datasets` is kept.
+
+    Raises:
+        ValueError: if the dependencies have a cycle
+    """
+    names = {dataset["name"] for dataset in datasets}
+    done: typing.Set[str] = set()
+    ordered: typing.List[dict] = []
+    remaining = list(datasets)
+    while remaining:
+        ready = [
+            dataset
+            for dataset in remaining
+            if all(
+                dependency in done or dependency not in names
+                for dependency in dataset.get("dependencies", [])
+            )
+        ]
+        if not ready:
+            raise ValueError(
+                "ETL dependencies have a cycle between: "
+                f"{', '.join(dataset['name'] for dataset in remaining)}"
+            )
+        ordered.extend(ready)
+        done.update(dataset["name"] for dataset in ready)
+        remaining = [dataset for dataset in remaining if dataset not in ready]
+    return ordered
+
+
+def _log_record_factory(
+    make_record: typing.Callable[..., logging.LogRecord]
+) -> typing.Callable[..., logging.LogRecord]:
+    """Wraps a log record factory to prefix messages with the worker's job."""
+
+    def make_worker_record(*args, **kwargs) -> logging.LogRecord:
+        record = make_record(*args, **kwargs)
+        if _worker_job_name is not None:
+            record.msg = f"[{_worker_job_name} pid {os.getpid()}] {record.msg}"
+        return record
+
+    return make_worker_record
+
+
+def _init_worker() -> None:
+    """Sets up a worker process so its log messages say which job wrote them.
+
+    The record factory is used by every logger, including the ones created
+    by ETL modules that the job imports later.
+    """
+    logging.setLogRecordFactory(
+        _log_record_factory(logging.getLogRecordFactory())
+    )
+
+
+def _run_job_in_worker(
+    run_job: typing.Callable[[dict], None], dataset: dict
+) -> float:
+    """Runs a job in a worker process and returns its peak memory, in MB.
+
+    The whole worker process is charged to the job, since nothing else runs
+    in it. Exceptions that cannot be sent back to the scheduler (because they
+    cannot be pickled) are replaced by a `RuntimeError` with the same message
+    and traceback.
+    """
+    global _worker_job_name  # pylint: disable=global-statement
+    _worker_job_name = dataset["name"]
+    try:
+        with MemoryMonitor() as monitor, monitor.track(
+            dataset["name"]
+        ) as memory:
+            run_job(dataset)
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:  # pylint: disable=broad-except
+            raise RuntimeError(
+                f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+            ) from None
+        raise
+    finally:
+        _worker_job_name = None
+    return memory["baseline_mb"] + memory["peak_mb"]
+
+
+class _ThreadWorkers:
+    """Runs jobs in threads of this process, measured by a `MemoryMonitor`."""
+
+    def __init__(
+        self, run_job: typing.Callable[[dict], None], max_workers: int
+    ):
+        self._run_job = run_job
+        self._monitor = MemoryMonitor()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers
+        )
+
+    def __enter__(self) -> "_ThreadWorkers":
+        self._monitor.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._executor.shutdown(wait=True)
+        self._monitor.__exit__(*args)
+
+    def _run_and_measure(self, dataset: dict) -> float:
+        with self._monitor.track(dataset["name"]) as memory:
+            self._run_job(dataset)
+        return memory["peak_mb"]
+
+    def submit(self, dataset: dict) -> concurrent.futures.Future:
+        """Starts a job; the future's result is its peak memory, in MB."""
+        return self._executor.submit(self._run_and_measure, dataset)
+
+    def release(
+        self,
+        future: concurrent.futures.Future,
+        peak_mb: typing.Optional[float],
+    ) -> None:
+        """Called when the job of `future` is done (`peak_mb` is None if it failed)."""
+
+
+class _ProcessWorkers:
+    """Runs jobs in worker processes, one job at a time per process.
+
+    Each worker is a single-process `ProcessPoolExecutor`. When a job is done
+    its worker is kept for the next job, unless the job failed, used at least
+    `recycle_mb` of memory or the worker has run `max_jobs_per_worker` jobs;
+    then the worker is shut down and its memory given back to the operating
+    system.
+    """
+
+    def __init__(
+        self,
+        run_job: typing.Callable[[dict], None],
+        recycle_mb: float,
+        max_jobs_per_worker: int,
+    ):
+        self._run_job = run_job
+        self.recycle_mb = recycle_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._context = multiprocessing.get_context(WORKER_START_METHOD)
+        # Idle workers, with how many jobs each has run
+        self._idle: typing.List[
+            typing.Tuple[concurrent.futures.ProcessPoolExecutor, int]
+        ] = []
+        self._busy: typing.Dict[
+            concurrent.futures.Future,
+            typing.Tuple[concurrent.futures.ProcessPoolExecutor, int],
+        ] = {}
+        self.recycled = 0
+
+    def __enter__(self) -> "_ProcessWorkers":
+        return self
+
+    def __exit__(self, *args) -> None:
+        for worker, _ in self._idle + list(self._busy.values()):
+            worker.shutdown(wait=True)
+        self._idle.clear()
+        self._busy.clear()
+
+    def submit(self, dataset: dict) -> concurrent.futures.Future:
+        """Starts a job; the future's result is its peak memory, in MB."""
+        if self._idle:
+            worker, jobs_run = self._idle.pop()
+        else:
+            worker = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._context,
+                initializer=_init_worker,
+            )
+            jobs_run = 0
+        future = worker.submit(_run_job_in_worker, self._run_job, dataset)
+        self._busy[future] = (worker, jobs_run + 1)
+        return future
+
+    def release(
+        self,
+        future: concurrent.futures.Future,
+        peak_mb: typing.Optional[float],
+    ) -> None:
+        """Keeps or recycles the worker of a finished job.
+
+        Args:
+            future (Future): the finished job
+            peak_mb (float): the job's peak memory, or None if it failed
+        """
+        worker, jobs_run = self._busy.pop(future)
+        if (
+            peak_mb is None
+            or peak_mb >= self.recycle_mb
+            or jobs_run >= self.max_jobs_per_worker
+        ):
+            logger.debug(f"Recycling ETL worker after {jobs_run} job(s)")
+            worker.shutdown(wait=True)
+            self.recycled += 1
+        else:
+            self._idle.append((worker, jobs_run))
+
+
+def run_jobs(
+    datasets: typing.List[dict],
+    run_job: typing.Callable[[dict], None],
+    max_workers: int,
+    memory_budget_mb: typing.Optional[float] = None,
+    peak_memory_path: Path = PEAK_MEMORY_PATH,
+    executor: str = THREAD_EXECUTOR,
+) -> None:
+    """Runs `run_job` for every dataset, in dependency order and within budget.
+
+    A job is started when all its dependencies have finished, a worker is free
+    and its expected memory fits in what is left of the budget. A job that is
+    expected to use more than the whole budget runs on its own. The peak memory
+    of every job that finishes is saved for the next run.
+
+    If a job raises, no more jobs are started; the running ones are waited
+    for and the exception is raised again. With the "process" executor,
+    `run_job` and the datasets must be picklable (e.g. a module-level function
+    or a `functools.partial` of one).
+
+    Args:
+        datasets (List[dict]): the datasets to run, from `constants.DATASET_LIST`
+        run_job (Callable): runs one dataset
+        max_workers (int): how many jobs can run at the same time
+        memory_budget_mb (float): how much memory the jobs can use together
+            (defaults to `get_memory_budget_mb()`)
+        peak_memory_path (Path): where peak memory measurements are kept
+        executor (str): "thread" to run jobs in threads of this process or
+            "process" to run them in worker processes
+
+    Returns:
+        None
+    """
+    if memory_budget_mb is None:
+        memory_budget_mb = get_memory_budget_mb()
+    default_estimate_mb = float(
+        settings.get("ETL_DEFAULT_MEMORY_ESTIMATE_MB", 1024)
+    )
+    peak_memory = load_peak_memory(peak_memory_path)
+
+    def expected_memory_mb(dataset: dict) -> float:
+        return peak_memory.get(
+            dataset["name"],
+            dataset.get("memory_estimate_mb", default_estimate_mb),
+        )
+
+    pending = get_job_order(datasets)
+    names = {dataset["name"] for dataset in pending}
+    done: typing.Set[str] = set()
+    # The dataset and the memory reserved for it, for every running job
+    running: typing.Dict[
+        concurrent.futures.Future, typing.Tuple[dict, float]
+    ] = {}
+    reserved_mb = 0.0
+    error: typing.Optional[BaseException] = None
+
+    if executor == PROCESS_EXECUTOR:
+        workers = _ProcessWorkers(
+            run_job,
+            recycle_mb=float(settings.get("ETL_WORKER_RECYCLE_MB", 2048)),
+            max_jobs_per_worker=int(settings.get("ETL_WORKER_MAX_JOBS", 10)),
+        )
+    elif executor == THREAD_EXECUTOR:
+        workers = _ThreadWorkers(run_job, max_workers=max_workers)
+    else:
+        raise ValueError(
+            f"Unknown ETL executor {executor!r}, expected one of {EXECUTORS}"
+        )
+
+    logger.info(
+        f"Running {len(pending)} ETL job(s) on {max_workers} {executor}(s) "
+        f"with a memory budget of {memory_budget_mb:.0f} MB"
+    )
+
+    with workers:
+        while pending or running:
+            if error is None:
+                ready = [
+                    dataset
+                    for dataset in pending
+                    if all(
+                        dependency in done or dependency not in names
+                        for dependency in dataset.get("dependencies", [])
+                    )
+                ]
+                # Start the biggest jobs first so that smaller ones can fill
+                # the remaining budget around them.
+                for dataset in sorted(
+                    ready, key=expected_memory_mb, reverse=True
+                ):
+                    if len(running) >= max_workers:
+                        break
+                    needed_mb = expected_memory_mb(dataset)
+                    if running and reserved_mb + needed_mb > memory_budget_mb:
+                        continue
+                    logger.debug(
+                        f"Starting ETL job {dataset['name']} "
+                        f"(expected {needed_mb:.0f} MB, "
+                        f"{memory_budget_mb - reserved_mb:.0f} MB free)"
+                    )
+                    running[workers.submit(dataset)] = (dataset, needed_mb)
+                    reserved_mb += needed_mb
+                    pending.remove(dataset)
+
+            if not running:
+                break
+
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in finished:
+                dataset, needed_mb = running.pop(future)
+                reserved_mb -= needed_mb
+                try:
+                    peak_mb = future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error(f"ETL job {dataset['name']} failed")
+                    workers.release(future, None)
+                    error = error or e
+                    continue
+                workers.release(future, peak_mb)
+                done.add(dataset["name"])
+                peak_memory[dataset["name"]] = round(peak_mb, 1)
+                logger.debug(
+                    f"ETL job {dataset['name']} used {peak_mb:.0f} MB at peak"
+                )
+
+    save_peak_memory(peak_memory, peak_memory_path)
+
+    if error is not None:
+        raise error
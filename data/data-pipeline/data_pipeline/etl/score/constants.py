@@ -39,6 +39,9 @@ DATA_SCORE_CSV_DIR = DATA_SCORE_DIR / "csv"
 DATA_SCORE_CSV_FULL_DIR = DATA_SCORE_CSV_DIR / "full"
 # MISSING PARQUET
 DATA_SCORE_CSV_FULL_FILE_PATH = DATA_SCORE_CSV_FULL_DIR / "usa_score.parquet"
+# The joined and percentile-ranked dataframe the score is calculated from
+DATA_SCORE_PREPARED_DIR = DATA_SCORE_DIR / "prepared"
+DATA_SCORE_PREPARED_FILE_PATH = DATA_SCORE_PREPARED_DIR / "usa_prepared.arrow"
 # MISSING USA_COUNTIES CSV. I put usa csv in there, but not sure if its right
 FULL_SCORE_CSV_FULL_PLUS_COUNTIES_FILE_PATH = (
     DATA_SCORE_CSV_FULL_DIR / "usa_counties.csv"
@@ -53,6 +56,11 @@ DATA_SCORE_JSON_INDEX_FILE_PATH = (
     DATA_SCORE_CSV_TILES_PATH / "tile_indexes.json"
 )
 
+## GeoJSON
+# Decimal places kept in the coordinates of the score GeoJSON files; 7 is
+# about a centimeter, finer than the deepest zoom the tiles are made for
+GEOJSON_COORDINATE_PRECISION = 7
+
 ## Tile path
 # Have the tiles here in high and low dirs
 DATA_SCORE_TILES_DIR = DATA_SCORE_DIR / "tiles"
@@ -61,6 +69,10 @@ DATA_SCORE_TILES_DIR = DATA_SCORE_DIR / "tiles"
 # No idea what this search is for or where it comes from. I made my own SEARCH dir here
 DATA_TILES_SEARCH_DIR = DATA_SCORE_DIR / "search"
 
+## Threshold sweeps
+# The what-if sweeps of the score thresholds are written here
+DATA_SCORE_SWEEP_DIR = DATA_SCORE_DIR / "sweep"
+
 # I don't think we need to worry about downloadable paths for now...
 # Downloadable paths
 if not os.environ.get("J40_VERSION_LABEL_STRING"):
@@ -1,18 +1,33 @@
 import functools
+import time
 from dataclasses import dataclass
+from typing import Dict
 from typing import List
+from typing import Optional
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from data_pipeline.etl.base import ExtractTransformLoad
 from data_pipeline.etl.score import constants
+from data_pipeline.etl.score.prepared_score import load_prepared_score
+from data_pipeline.etl.score.prepared_score import save_prepared_score
+from data_pipeline.etl.sources.cdc_life_expectancy.etl import CDCLifeExpectancy
+from data_pipeline.etl.sources.cdc_places.etl import CDCPlacesETL
 from data_pipeline.etl.sources.census_acs.etl import CensusACSETL
+from data_pipeline.etl.sources.doe_energy_burden.etl import DOEEnergyBurden
 from data_pipeline.etl.sources.dot_travel_composite.etl import (
     TravelCompositeETL,
 )
 from data_pipeline.etl.sources.eamlis.etl import AbandonedMineETL
+from data_pipeline.etl.sources.ejscreen.etl import EJSCREENETL
 from data_pipeline.etl.sources.fsf_flood_risk.etl import FloodRiskETL
 from data_pipeline.etl.sources.fsf_wildfire_risk.etl import WildfireRiskETL
+from data_pipeline.etl.sources.geocorr.etl import GeoCorrETL
+from data_pipeline.etl.sources.historic_redlining.etl import (
+    HistoricRedliningETL,
+)
+from data_pipeline.etl.sources.hud_housing.etl import HudHousingETL
 from data_pipeline.etl.sources.national_risk_index.etl import (
     NationalRiskIndexETL,
 )
@@ -29,8 +44,21 @@ logger = get_module_logger(__name__)
 
 
 class ScoreETL(ExtractTransformLoad):
-    def __init__(self):
+    def __init__(
+        self,
+        prepared_fingerprint: Optional[str] = None,
+        from_prepared: bool = False,
+    ):
+        """
+        Args:
+            prepared_fingerprint (str): The fingerprint of what the prepared dataframe is made from; when set, the prepared dataframe is saved with it (optional)
+            from_prepared (bool): Calculate the score from the prepared dataframe saved with the same fingerprint, if there is one, instead of the datasets (optional)
+        """
         # Define some global parameters
+        self.prepared_fingerprint = prepared_fingerprint
+        self.from_prepared = from_prepared
+        # Whether `df` is the prepared dataframe, loaded by `extract`
+        self._is_prepared = False
 
         # dataframes
         self.df: pd.DataFrame
@@ -64,37 +92,20 @@ class ScoreETL(ExtractTransformLoad):
         )  # we have all prerequisite sources locally as a result of running the ETLs
 
     def extract(self, use_cached_data_sources: bool = False) -> None:
+        if self.from_prepared and self._load_prepared_df():
+            return
 
-        # EJSCreen csv Load
-        ejscreen_csv = constants.DATA_PATH / "dataset" / "ejscreen" / "usa.csv"
-        self.ejscreen_df = pd.read_csv(
-            ejscreen_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        # EJSCreen Load
+        self.ejscreen_df = EJSCREENETL.get_data_frame()
 
         # Load census data
         self.census_acs_df = CensusACSETL.get_data_frame()
 
         # Load HUD housing data
-        hud_housing_csv = (
-            constants.DATA_PATH / "dataset" / "hud_housing" / "usa.csv"
-        )
-        self.hud_housing_df = pd.read_csv(
-            hud_housing_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.hud_housing_df = HudHousingETL.get_data_frame()
 
         # Load CDC Places data
-        cdc_places_csv = (
-            constants.DATA_PATH / "dataset" / "cdc_places" / "usa.csv"
-        )
-        self.cdc_places_df = pd.read_csv(
-            cdc_places_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.cdc_places_df = CDCPlacesETL.get_data_frame()
 
         # Load census AMI data
         census_acs_median_incomes_csv = (
@@ -110,24 +121,10 @@ class ScoreETL(ExtractTransformLoad):
         )
 
         # Load CDC life expectancy data
-        cdc_life_expectancy_csv = (
-            constants.DATA_PATH / "dataset" / "cdc_life_expectancy" / "usa.csv"
-        )
-        self.cdc_life_expectancy_df = pd.read_csv(
-            cdc_life_expectancy_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.cdc_life_expectancy_df = CDCLifeExpectancy.get_data_frame()
 
         # Load DOE energy burden data
-        doe_energy_burden_csv = (
-            constants.DATA_PATH / "dataset" / "doe_energy_burden" / "usa.csv"
-        )
-        self.doe_energy_burden_df = pd.read_csv(
-            doe_energy_burden_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.doe_energy_burden_df = DOEEnergyBurden.get_data_frame()
 
         # Load FEMA national risk index data
         self.national_risk_index_df = NationalRiskIndexETL.get_data_frame()
@@ -154,14 +151,7 @@ class ScoreETL(ExtractTransformLoad):
         self.tribal_overlap_df = TribalOverlapETL.get_data_frame()
 
         # Load GeoCorr Urban Rural Map
-        geocorr_urban_rural_csv = (
-            constants.DATA_PATH / "dataset" / "geocorr" / "usa.csv"
-        )
-        self.geocorr_urban_rural_df = pd.read_csv(
-            geocorr_urban_rural_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.geocorr_urban_rural_df = GeoCorrETL.get_data_frame()
 
         # Load decennial census data
         census_decennial_csv = (
@@ -187,15 +177,7 @@ class ScoreETL(ExtractTransformLoad):
         )
 
         # Load HRS data
-        hrs_csv = (
-            constants.DATA_PATH / "dataset" / "historic_redlining" / "usa.csv"
-        )
-
-        self.hrs_df = pd.read_csv(
-            hrs_csv,
-            dtype={self.GEOID_TRACT_FIELD_NAME: "string"},
-            low_memory=False,
-        )
+        self.hrs_df = HistoricRedliningETL.get_data_frame()
 
         national_tract_csv = constants.DATA_CENSUS_CSV_FILE_PATH
         self.national_tract_df = pd.read_csv(
@@ -223,38 +205,97 @@ class ScoreETL(ExtractTransformLoad):
             columns={
                 field_names.FINAL_SCORE_N_BOOLEAN: field_names.FINAL_SCORE_N_BOOLEAN_V1_0,
             }
-        )  
+        )
 
-    def _join_tract_dfs(self, census_tract_dfs: list) -> pd.DataFrame:
-        logger.debug("Joining Census Tract dataframes")
+    def _join_tract_dfs(
+        self, census_tract_dfs: Dict[str, pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Outer joins the census tract dataframes on the tract ID.
+
+        All dataframes are aligned to one shared index of every tract ID (in
+        the order the IDs first appear) and then concatenated once, instead of
+        merging them one after the other. The result is the same as chaining
+        `pd.merge(..., how="outer")` over the dataframes in order.
 
-        def merge_function(
-            left: pd.DataFrame, right: pd.DataFrame
-        ) -> pd.DataFrame:
-            """This is a custom function that merges two dataframes.
+        Args:
+            census_tract_dfs (Dict[str, pd.DataFrame]): the dataframes to join,
+                by name (used for logging)
 
-            It provides some logging as additional helpful context for error handling.
-            """
-            try:
-                df = pd.merge(
+        Returns:
+            the joined dataframe, with the tract ID as a column
+        """
+        logger.debug("Joining Census Tract dataframes")
+        start_time = time.time()
+
+        names = list(census_tract_dfs)
+        dfs = list(census_tract_dfs.values())
+        value_columns = [
+            column
+            for df in dfs
+            for column in df.columns
+            if column != self.GEOID_TRACT_FIELD_NAME
+        ]
+        if len(value_columns) != len(set(value_columns)):
+            # Columns with the same name in more than one dataframe get
+            # suffixed by `pd.merge`, so keep doing exactly that.
+            logger.warning(
+                "Some census tract dataframes share column names; joining "
+                "them with pd.merge"
+            )
+            census_tract_df = functools.reduce(
+                lambda left, right: pd.merge(
                     left=left,
                     right=right,
                     on=self.GEOID_TRACT_FIELD_NAME,
                     how="outer",
+                ),
+                dfs,
+            )
+        else:
+            tract_ids = pd.Index(
+                pd.concat(
+                    [df[self.GEOID_TRACT_FIELD_NAME] for df in dfs],
+                    ignore_index=True,
+                ).unique(),
+                name=self.GEOID_TRACT_FIELD_NAME,
+            )
+
+            aligned_dfs = []
+            for name, df in zip(names, dfs):
+                source_start_time = time.time()
+                aligned_df = df.set_index(self.GEOID_TRACT_FIELD_NAME).reindex(
+                    tract_ids
                 )
-            except Exception as e:
-                # Note: it'd be nice to log the name of the dataframe, but that's not accessible in this scope.
-                logger.warning(
-                    f"Exception encountered while merging dataframe `right` that has the following columns: {','.join(right.columns)}"
+                aligned_dfs.append(aligned_df)
+                logger.debug(
+                    f"Aligned `{name}` ({len(df)} tracts, "
+                    f"{len(aligned_df.columns)} columns) in "
+                    f"{time.time() - source_start_time:.2f}s, using "
+                    f"{aligned_df.memory_usage(deep=True).sum() / 2**20:.1f} MB"
                 )
-                raise e
 
-            return df
+            census_tract_df = pd.concat(aligned_dfs, axis=1).reset_index()
+
+            # Keep the column order and tract ID type of a chain of merges.
+            census_tract_df = census_tract_df[
+                list(dfs[0].columns)
+                + [
+                    column
+                    for df in dfs[1:]
+                    for column in df.columns
+                    if column != self.GEOID_TRACT_FIELD_NAME
+                ]
+            ]
+            census_tract_df[self.GEOID_TRACT_FIELD_NAME] = census_tract_df[
+                self.GEOID_TRACT_FIELD_NAME
+            ].astype(dfs[0][self.GEOID_TRACT_FIELD_NAME].dtype)
 
-        # Just a note -- it would be faster (I think) to set geoid10_tract as the index and  then concat all frames 1x
-        census_tract_df = functools.reduce(
-            merge_function,
-            census_tract_dfs,
+        logger.debug(
+            f"Joined {len(dfs)} census tract dataframes into "
+            f"{census_tract_df.shape[0]} tracts and "
+            f"{census_tract_df.shape[1]} columns in "
+            f"{time.time() - start_time:.2f}s, using "
+            f"{census_tract_df.memory_usage(deep=True).sum() / 2**20:.1f} MB"
         )
 
         # Sanity check the join.
@@ -272,7 +313,6 @@ class ScoreETL(ExtractTransformLoad):
     ) -> None:
         """Check an individual data frame for census tract data quality checks."""
 
-        # Note: it'd be nice to log the name of the dataframe directly, but that's not accessible in this scope.
         dataframe_descriptor = (
             f"dataframe `{df_name}`"
             if df_name
@@ -301,6 +341,60 @@ class ScoreETL(ExtractTransformLoad):
                 f"Too many rows in the join: {len(df_to_check)} in {dataframe_descriptor}"
             )
 
+    @staticmethod
+    def _rank_percentiles(
+        values: np.ndarray, ascending: np.ndarray
+    ) -> np.ndarray:
+        """Ranks each column of a 2-D block of values as percentiles.
+
+        This is the same as calling `Series.rank(pct=True, ascending=...)` on
+        every column, bit for bit: tied values get the average of their ranks,
+        and the ranks are divided by the number of values in the column. NaN
+        values are left out of the ranking and stay NaN, so masking a value to
+        NaN drops it from its column's percentile.
+
+        Args:
+            values (np.ndarray): the (rows, columns) block of float values to rank
+            ascending (np.ndarray): for each column, whether low values get low percentiles
+
+        Returns:
+            np.ndarray: the percentiles, in the same shape as `values`
+        """
+        # Each column is ranked as a contiguous row of the transposed block
+        values = np.where(ascending, values, -values).T.copy()
+        row_count = values.shape[1]
+        # NaN values sort last
+        order = np.argsort(values, axis=1)
+        sorted_values = np.take_along_axis(values, order, axis=1)
+        is_missing = np.isnan(sorted_values)
+
+        # Each run of tied values spans from the first to the last position
+        # of its run, and gets the average of the ranks in between
+        positions = np.arange(row_count)
+        starts_run = np.ones(values.shape, dtype=bool)
+        starts_run[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+        ends_run = np.ones(values.shape, dtype=bool)
+        ends_run[:, :-1] = starts_run[:, 1:]
+        run_start = np.maximum.accumulate(
+            np.where(starts_run, positions, 0), axis=1
+        )
+        run_end = np.minimum.accumulate(
+            np.where(ends_run, positions, row_count)[:, ::-1], axis=1
+        )[:, ::-1]
+        # As 1-based ranks, the average of a run is (start + end) / 2, which
+        # is what `rank` gets from the sum of the run's ranks over its length
+        average_rank = (run_start + run_end + 2).astype(np.float64) / 2
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sorted_percentiles = np.where(
+                is_missing,
+                np.nan,
+                average_rank / (~is_missing).sum(axis=1, keepdims=True),
+            )
+        percentiles = np.empty(values.shape, dtype=np.float64)
+        np.put_along_axis(percentiles, order, sorted_percentiles, axis=1)
+        return percentiles.T
+
     @staticmethod
     def _add_percentiles_to_df(
         df: pd.DataFrame,
@@ -320,43 +414,26 @@ class ScoreETL(ExtractTransformLoad):
         reverse percentile use case. In that use case, `input_column_name` may be
         something like "3rd grade reading proficiency" and `output_column_name_root`
         may be something like "Low 3rd grade reading proficiency".
-        """
-
-        # We have two potential options for assessing how to calculate percentiles.
-        # For the vast majority of columns, we will simply calculate percentiles overall.
-        # However, for Linguistic Isolation and Agricultural  Value Loss, there exist conditions
-        # for which we drop out tracts from consideration in the percentile. More details on those
-        # are below, for them, we provide a list of tracts to not include.
-        # Because of the fancy transformations below, I have removed the urban / rural percentiles,
-        # which are now deprecated.
-        if not drop_tracts:
-            # Create the "basic" percentile.
-            ## note: I believe this is less performant than if we made a bunch of these PFS columns
-            ## and then concatenated the list. For the refactor!
-            df[
-                f"{output_column_name_root}"
-                f"{field_names.PERCENTILE_FIELD_SUFFIX}"
-            ] = df[input_column_name].rank(pct=True, ascending=ascending)
 
-        else:
-            tmp_series = df[input_column_name].where(
-                ~df[field_names.GEOID_TRACT_FIELD].isin(drop_tracts),
+        Tracts in `drop_tracts` are left out of the percentile, and get NaN.
+        `_prepare_initial_df` ranks all of its columns at once with
+        `_rank_percentiles` instead.
+        """
+        values = df[input_column_name].to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        if drop_tracts:
+            values = np.where(
+                df[field_names.GEOID_TRACT_FIELD].isin(drop_tracts).to_numpy(),
                 np.nan,
+                values,
             )
-            logger.debug(
-                f"Creating special case column for percentiles from {input_column_name}"
-            )
-            df[
-                f"{output_column_name_root}"
-                f"{field_names.PERCENTILE_FIELD_SUFFIX}"
-            ] = tmp_series.rank(ascending=ascending, pct=True)
-
-            # Check that "drop tracts" were dropped (quicker than creating a fixture?)
-            assert df[df[field_names.GEOID_TRACT_FIELD].isin(drop_tracts)][
-                f"{output_column_name_root}"
-                f"{field_names.PERCENTILE_FIELD_SUFFIX}"
-            ].isna().sum() == len(drop_tracts), "Not all tracts were dropped"
-
+        percentiles = ScoreETL._rank_percentiles(
+            values[:, np.newaxis], np.array([ascending])
+        )
+        df[
+            f"{output_column_name_root}{field_names.PERCENTILE_FIELD_SUFFIX}"
+        ] = percentiles[:, 0]
         return df
 
     # TODO Move a lot of this to the ETL part of the pipeline
@@ -364,32 +441,32 @@ class ScoreETL(ExtractTransformLoad):
         logger.debug("Preparing initial dataframe")
 
         # Join all the data sources that use census tracts
-        census_tract_dfs = [
-            self.census_acs_df,
-            self.hud_housing_df,
-            self.cdc_places_df,
-            self.cdc_life_expectancy_df,
-            self.doe_energy_burden_df,
-            self.ejscreen_df,
-            self.geocorr_urban_rural_df,
-            self.national_risk_index_df,
-            self.census_acs_median_incomes_df,
-            self.census_decennial_df,
-            self.census_2010_df,
-            self.hrs_df,
-            self.dot_travel_disadvantage_df,
-            self.fsf_flood_df,
-            self.fsf_fire_df,
-            self.nature_deprived_df,
-            self.eamlis_df,
-            self.fuds_df,
-            self.tribal_overlap_df,
-            self.v1_0_score_results_df,
-        ]
+        census_tract_dfs = {
+            "census_acs": self.census_acs_df,
+            "hud_housing": self.hud_housing_df,
+            "cdc_places": self.cdc_places_df,
+            "cdc_life_expectancy": self.cdc_life_expectancy_df,
+            "doe_energy_burden": self.doe_energy_burden_df,
+            "ejscreen": self.ejscreen_df,
+            "geocorr_urban_rural": self.geocorr_urban_rural_df,
+            "national_risk_index": self.national_risk_index_df,
+            "census_acs_median_incomes": self.census_acs_median_incomes_df,
+            "census_decennial": self.census_decennial_df,
+            "census_2010": self.census_2010_df,
+            "hrs": self.hrs_df,
+            "dot_travel_disadvantage": self.dot_travel_disadvantage_df,
+            "fsf_flood": self.fsf_flood_df,
+            "fsf_fire": self.fsf_fire_df,
+            "nature_deprived": self.nature_deprived_df,
+            "eamlis": self.eamlis_df,
+            "fuds": self.fuds_df,
+            "tribal_overlap": self.tribal_overlap_df,
+            "v1_0_score_results": self.v1_0_score_results_df,
+        }
 
         # Sanity check each data frame before merging.
-        for df in census_tract_dfs:
-            self._census_tract_df_sanity_check(df_to_check=df)
+        for df_name, df in census_tract_dfs.items():
+            self._census_tract_df_sanity_check(df_to_check=df, df_name=df_name)
 
         census_tract_df = self._join_tract_dfs(census_tract_dfs)
 
@@ -611,66 +688,72 @@ class ScoreETL(ExtractTransformLoad):
         #     For *Traffic Barriers*, we want to exclude low population tracts, which may have high burden because they are
         #     low population alone. We set this low population constant in the if statement.
 
-        for numeric_column in numeric_columns:
-            drop_tracts = []
-            if (
-                numeric_column
-                == field_names.EXPECTED_AGRICULTURE_LOSS_RATE_FIELD
-            ):
-                drop_tracts = df_copy[
-                    ~df_copy[field_names.AGRICULTURAL_VALUE_BOOL_FIELD]
-                    .astype(bool)
-                    .fillna(False)
-                ][field_names.GEOID_TRACT_FIELD].to_list()
-                logger.debug(
-                    f"Dropping {len(drop_tracts)} tracts from Agricultural Value Loss"
-                )
-            elif numeric_column == field_names.LINGUISTIC_ISO_FIELD:
-                drop_tracts = df_copy[
-                    # 72 is the FIPS code for Puerto Rico
-                    df_copy[field_names.GEOID_TRACT_FIELD].str.startswith("72")
-                ][field_names.GEOID_TRACT_FIELD].to_list()
-                logger.debug(
-                    f"Dropping {len(drop_tracts)} tracts from Linguistic Isolation"
-                )
+        # Tracts are dropped from a column's percentile with a mask of the
+        # rows to leave out.
+        agricultural_value_mask = (
+            ~df_copy[field_names.AGRICULTURAL_VALUE_BOOL_FIELD]
+            .astype(bool)
+            .fillna(False)
+        ).to_numpy()
+        # 72 is the FIPS code for Puerto Rico
+        puerto_rico_mask = (
+            df_copy[field_names.GEOID_TRACT_FIELD]
+            .str.startswith("72", na=False)
+            .to_numpy()
+        )
+        # Not having any people appears to be correlated with transit burden, but also doesn't represent
+        # on the ground need. For now, we remove these tracts from the percentile calculation.
+        # Similarly, we want to exclude low population tracts from FEMA's index
+        low_population = 20
+        low_population_mask = (
+            df_copy[field_names.TOTAL_POP_FIELD].fillna(0) <= low_population
+        ).to_numpy()
+        drop_tract_masks = {
+            field_names.EXPECTED_AGRICULTURE_LOSS_RATE_FIELD: agricultural_value_mask,
+            field_names.LINGUISTIC_ISO_FIELD: puerto_rico_mask,
+            field_names.DOT_TRAVEL_BURDEN_FIELD: low_population_mask,
+            field_names.EXPECTED_POPULATION_LOSS_RATE_FIELD: low_population_mask,
+        }
+        for column_name, mask in drop_tract_masks.items():
+            logger.debug(
+                f"Dropping {mask.sum()} tracts from the percentile of {column_name}"
+            )
 
-            elif numeric_column in [
-                field_names.DOT_TRAVEL_BURDEN_FIELD,
-                field_names.EXPECTED_POPULATION_LOSS_RATE_FIELD,
-            ]:
-                # Not having any people appears to be correlated with transit burden, but also doesn't represent
-                # on the ground need. For now, we remove these tracts from the percentile calculation.ß
-                # Similarly, we want to exclude low population tracts from FEMA's index
-                low_population = 20
-                drop_tracts = df_copy[
-                    df_copy[field_names.TOTAL_POP_FIELD].fillna(0)
-                    <= low_population
-                ][field_names.GEOID_TRACT_FIELD].to_list()
-                logger.debug(
-                    f"Dropping {len(drop_tracts)} tracts from DOT traffic burden"
-                )
+        # For the numeric columns the input name and output name root are the
+        # same. For reversed percentiles, for instance for 3rd grade reading
+        # level (score from 0-500), the reversed percentiles are named
+        # `Low 3rd grade reading level (percentile)`.
+        input_column_names = numeric_columns + [
+            rp.field_name for rp in reverse_percentiles
+        ]
+        output_column_names = [
+            f"{column_name}{field_names.PERCENTILE_FIELD_SUFFIX}"
+            for column_name in numeric_columns
+            + [rp.low_field_name for rp in reverse_percentiles]
+        ]
+        ascending = np.array(
+            [True] * len(numeric_columns) + [False] * len(reverse_percentiles)
+        )
 
-            df_copy = self._add_percentiles_to_df(
-                df=df_copy,
-                input_column_name=numeric_column,
-                # For this use case, the input name and output name root are the same.
-                output_column_name_root=numeric_column,
-                ascending=True,
-                drop_tracts=drop_tracts,
-            )
+        values = df_copy[input_column_names].to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        for column_index, column_name in enumerate(input_column_names):
+            if column_name in drop_tract_masks:
+                values[drop_tract_masks[column_name], column_index] = np.nan
 
-        # Create reversed percentiles for these fields
-        for reverse_percentile in reverse_percentiles:
-            # Calculate reverse percentiles
-            # For instance, for 3rd grade reading level (score from 0-500),
-            # calculate reversed percentiles and give the result the name
-            # `Low 3rd grade reading level (percentile)`.
-            df_copy = self._add_percentiles_to_df(
-                df=df_copy,
-                input_column_name=reverse_percentile.field_name,
-                output_column_name_root=reverse_percentile.low_field_name,
-                ascending=False,
-            )
+        percentiles_df = pd.DataFrame(
+            self._rank_percentiles(values, ascending),
+            index=df_copy.index,
+            columns=output_column_names,
+        )
+        df_copy = pd.concat(
+            [
+                df_copy.drop(columns=output_column_names, errors="ignore"),
+                percentiles_df,
+            ],
+            axis=1,
+        )
 
         # Special logic: create a combined population field.
         # We sometimes run analytics on "population", and this makes a single field
@@ -714,9 +797,46 @@ class ScoreETL(ExtractTransformLoad):
 
         return df
 
+    def _load_prepared_df(self) -> bool:
+        """Loads the prepared dataframe saved with the same fingerprint, and
+        returns whether there was one."""
+        prepared = load_prepared_score(
+            constants.DATA_SCORE_PREPARED_FILE_PATH, self.prepared_fingerprint
+        )
+        if prepared is None:
+            logger.info(
+                "No up to date prepared score, preparing it from the datasets"
+            )
+            return False
+        self.df, metadata = prepared
+        self.ISLAND_DEMOGRAPHIC_BACKFILL_FIELDS = metadata[
+            "island_demographic_backfill_fields"
+        ]
+        self._is_prepared = True
+        return True
+
+    def _save_prepared_df(self) -> None:
+        try:
+            save_prepared_score(
+                self.df,
+                constants.DATA_SCORE_PREPARED_FILE_PATH,
+                self.prepared_fingerprint,
+                {
+                    "island_demographic_backfill_fields": self.ISLAND_DEMOGRAPHIC_BACKFILL_FIELDS
+                },
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OSError) as e:
+            # The prepared score only saves time, so the score does not fail
+            # without it
+            logger.warning(f"Could not save the prepared score: {e}")
+
     def transform(self) -> None:
-        # prepare the df with the right CBG/tract IDs, column names/types, and percentiles
-        self.df = self._prepare_initial_df()
+        # prepare the df with the right CBG/tract IDs, column names/types, and percentiles,
+        # unless it was loaded from the prepared score by `extract`
+        if not self._is_prepared:
+            self.df = self._prepare_initial_df()
+            if self.prepared_fingerprint is not None:
+                self._save_prepared_df()
 
         # calculate scores
         self.df = ScoreRunner(df=self.df).calculate_scores()
@@ -1,77 +1,215 @@
 import concurrent.futures
+import functools
+import io
 import math
+import multiprocessing
 import os
+import shutil
+import typing
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 from data_pipeline.content.schemas.download_schemas import CSVConfig
 from data_pipeline.etl.base import ExtractTransformLoad
 from data_pipeline.etl.score import constants
 from data_pipeline.etl.score.etl_utils import check_score_data_source
+from data_pipeline.etl.score.geojson_writer import write_geojson
+from data_pipeline.etl.score.geoparquet_writer import write_flatgeobuf
+from data_pipeline.etl.score.geoparquet_writer import write_geoparquet
+from data_pipeline.etl.score.shapefile_writer import write_shapefile_to_zip
 from data_pipeline.etl.sources.census.etl_utils import check_census_data_source
+from data_pipeline.etl.sources.tract_simplification import get_simplified_tracts
 from data_pipeline.score import field_names
+from data_pipeline.utils import compression
 from data_pipeline.utils import get_module_logger
 from data_pipeline.utils import load_dict_from_yaml_object_fields
 from data_pipeline.utils import load_yaml_dict_from_file
-from data_pipeline.utils import zip_files
+from data_pipeline.utils import write_zip_member
+from data_pipeline.utils import zip_archives
 from data_pipeline.etl.datasource import DataSource
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import unary_union
 
 logger = get_module_logger(__name__)
 
 
+@dataclass
+class GeoScoreLayer:
+    """A metric the score GeoJSON files can be made for.
+
+    The high zoom file of every layer has all the tile fields of every tract.
+    In the low zoom file, tracts are bucketed and dissolved by the layer's
+    metric, which is the only field kept.
+
+    Attributes:
+    score_field : str
+            the field of the tile score CSV that the layer is made from
+    rename_to : str
+            the name of that field in the low zoom file
+    directory : str
+            the directory of the files, under `data/score/geojson`
+    tiles_directory : str
+            the directory of the map tiles, under `data/score/tiles`
+    file_suffix : str
+            appended to the names of the files ("usa-high{file_suffix}.json")
+    """
+
+    score_field: str
+    rename_to: str
+    directory: str
+    tiles_directory: str
+    file_suffix: str = ""
+
+
+GEO_SCORE_LAYERS = {
+    "default": GeoScoreLayer(
+        score_field=constants.TILES_SCORE_COLUMNS[
+            field_names.FINAL_SCORE_N_BOOLEAN
+        ],
+        rename_to="SCORE",
+        directory="default",
+        tiles_directory="default/legacy",
+    ),
+    "gistar_burd": GeoScoreLayer(
+        score_field=constants.TILES_SCORE_COLUMNS[field_names.PSIM_BURDEN],
+        rename_to="P_BURD",
+        directory="gistar/burd",
+        tiles_directory="gistar/burd",
+        file_suffix="-gistar-burd",
+    ),
+    "gistar_ind": GeoScoreLayer(
+        score_field=constants.TILES_SCORE_COLUMNS[field_names.PSIM_INDICATOR],
+        rename_to="P_IND",
+        directory="gistar/ind",
+        tiles_directory="gistar/ind",
+        file_suffix="-gistar-ind",
+    ),
+    "add_burd": GeoScoreLayer(
+        score_field=constants.TILES_SCORE_COLUMNS[field_names.CATEGORY_COUNT],
+        rename_to="CC",
+        directory="add/burd",
+        tiles_directory="add/burd",
+        file_suffix="-add-burd",
+    ),
+    "add_ind": GeoScoreLayer(
+        score_field=constants.TILES_SCORE_COLUMNS[field_names.THRESHOLD_COUNT],
+        rename_to="TC",
+        directory="add/ind",
+        tiles_directory="add/ind",
+        file_suffix="-add-ind",
+    ),
+}
+
+
+def _dissolve_by_bucket(
+    tracts: gpd.GeoDataFrame, bucket_field: str
+) -> gpd.GeoSeries:
+    """Unions the geometries of tracts by bucket, in a worker process."""
+    return tracts[[bucket_field, "geometry"]].dissolve(by=bucket_field).geometry
+
+
+def _union_parts(parts: typing.List[BaseGeometry]) -> BaseGeometry:
+    """Unions the dissolved parts of a bucket from different states.
+
+    States do not overlap and share their borders, so the parts form a
+    coverage, which shapely 2 can union much faster than a generic union.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    coverage_union_all = getattr(shapely, "coverage_union_all", None)
+    if coverage_union_all is not None:
+        return coverage_union_all(parts)
+    return unary_union(parts)
+
+
 class GeoScoreETL(ExtractTransformLoad):
     """
     A class used to generate per state and national GeoJson files with the score baked in
+
+    The geometries and scores are read and merged once, and the low zoom
+    files of every layer (see `GEO_SCORE_LAYERS`) are made from them in
+    parallel.
     """
 
-    def __init__(self, data_source: str = None):
+    def __init__(
+        self,
+        data_source: str = None,
+        layers: typing.Optional[typing.List[str]] = None,
+    ):
         self.DATA_SOURCE = data_source
-        self.SCORE_GEOJSON_PATH = self.DATA_PATH / "score" / "geojson" / "default"
+        self.LAYERS = list(layers or ["default"])
+        unknown_layers = set(self.LAYERS) - set(GEO_SCORE_LAYERS)
+        if unknown_layers:
+            raise ValueError(
+                f"Unknown geo score layer(s): {', '.join(sorted(unknown_layers))}"
+            )
+
+        self.SCORE_GEOJSON_ROOT = self.DATA_PATH / "score" / "geojson"
+        self.SCORE_GEOJSON_PATH = self.SCORE_GEOJSON_ROOT / "default"
         self.SCORE_LOW_GEOJSON = self.SCORE_GEOJSON_PATH / "usa-low.json"
         self.SCORE_HIGH_GEOJSON = self.SCORE_GEOJSON_PATH / "usa-high.json"
 
         self.SCORE_SHP_PATH = self.DATA_PATH / "score" / "shapefile"
         self.SCORE_SHP_FILE = self.SCORE_SHP_PATH / "usa.shp"
 
+        # The high zoom score, in formats that can be read a region at a time
+        self.SCORE_GEOPARQUET_FILE = (
+            self.DATA_PATH / "score" / "geoparquet" / "usa-high.parquet"
+        )
+        self.SCORE_FLATGEOBUF_FILE = (
+            self.DATA_PATH / "score" / "flatgeobuf" / "usa-high.fgb"
+        )
+
         self.SCORE_CSV_PATH = self.DATA_PATH / "score" / "csv"
         self.TILE_SCORE_CSV = self.SCORE_CSV_PATH / "tiles" / "usa.csv"
 
         self.CENSUS_USA_GEOJSON = constants.DATA_CENSUS_GEOJSON_FILE_PATH
 
-        # Import the shortened name for Score N to be used on tiles.
-        # We should no longer be using PFS
-
-        ## TODO: We really should not have this any longer changing
-        self.TARGET_SCORE_SHORT_FIELD = constants.TILES_SCORE_COLUMNS[
-            field_names.FINAL_SCORE_N_BOOLEAN
-        ]
-        self.TARGET_SCORE_RENAME_TO = "SCORE"
-
         # Import the shortened name for tract ("GTF") that's used on the tiles.
         self.TRACT_SHORT_FIELD = constants.TILES_SCORE_COLUMNS[
             field_names.GEOID_TRACT_FIELD
         ]
         self.GEOMETRY_FIELD_NAME = "geometry"
         self.LAND_FIELD_NAME = "ALAND10"
-        # Add these names up here!!
-        # self.PSIM_BURDEN = "P_BURD"
-        # self.PSIM_INDICATOR = "P_IND"
-        # self.THRESHOLD_COUNT = "TC"
-        # self.CATEGORY_COUNT = "CC"
-        # self.BURDEN_ID: "ID_BURD"
-        # self.INDICATOR_ID: "ID_IND"
 
         # We will adjust this upwards while there is some fractional value
         # in the score. This is a starting value.
         self.NUMBER_OF_BUCKETS = 10
         self.HOMOGENEITY_THRESHOLD = 200
         self.HIGH_LOW_ZOOM_CENSUS_TRACT_THRESHOLD = 150
+        # How many processes dissolve the buckets of tracts, state by state
+        self.DISSOLVE_MAX_WORKERS = os.cpu_count() or 1
+        # Whether the tracts are simplified for the zooms of the high and low
+        # zoom files (see `tract_simplification`). The shapefile, GeoParquet
+        # and FlatGeobuf files always have the full geometry.
+        self.SIMPLIFY_GEOMETRY = True
 
         self.geojson_usa_df: gpd.GeoDataFrame
+        # The tracts the high and low zoom files are made from, if they
+        # differ from the full tracts
+        self.geojson_usa_high_df: typing.Optional[gpd.GeoDataFrame] = None
+        self.geojson_usa_low_df: typing.Optional[gpd.GeoDataFrame] = None
         self.score_usa_df: pd.DataFrame
+        # The score with the full geometry, for the downloadable files
         self.geojson_score_usa_high: gpd.GeoDataFrame
-        self.geojson_score_usa_low: gpd.GeoDataFrame
+        # The score with the geometry of the high zoom file and its tiles
+        self.geojson_score_usa_high_tiles: gpd.GeoDataFrame
+        # The low zoom frame of each layer
+        self.geojson_score_usa_lows: typing.Dict[str, gpd.GeoDataFrame] = {}
+
+    def get_geojson_paths(self, layer: str) -> typing.Tuple[Path, Path]:
+        """Returns the high and low zoom GeoJSON files of a layer"""
+        geo_score_layer = GEO_SCORE_LAYERS[layer]
+        geojson_path = self.SCORE_GEOJSON_ROOT / geo_score_layer.directory
+        return (
+            geojson_path / f"usa-high{geo_score_layer.file_suffix}.json",
+            geojson_path / f"usa-low{geo_score_layer.file_suffix}.json",
+        )
 
     def get_data_sources(self) -> [DataSource]:
         return (
@@ -92,20 +230,27 @@ class GeoScoreETL(ExtractTransformLoad):
             score_data_source=self.DATA_SOURCE,
         )
 
+        columns = [
+            self.GEOID_FIELD_NAME,
+            self.GEOMETRY_FIELD_NAME,
+            self.LAND_FIELD_NAME,
+        ]
         logger.info("Reading US GeoJSON")
         full_geojson_usa_df = gpd.read_parquet(
-            self.CENSUS_USA_GEOJSON,
-            columns=[
-                self.GEOID_FIELD_NAME,
-                self.GEOMETRY_FIELD_NAME,
-                self.LAND_FIELD_NAME,
-            ],
+            self.CENSUS_USA_GEOJSON, columns=columns
         )
 
         # We only want to keep tracts to visualize that have non-0 land
         self.geojson_usa_df = full_geojson_usa_df[
             full_geojson_usa_df[self.LAND_FIELD_NAME] > 0
         ]
+        if self.SIMPLIFY_GEOMETRY:
+            logger.info("Reading US GeoJSON simplified for high and low zooms")
+            simplified_usa_dfs = get_simplified_tracts(
+                self.CENSUS_USA_GEOJSON, ["high", "low"], columns=columns
+            )
+            self.geojson_usa_high_df = simplified_usa_dfs["high"]
+            self.geojson_usa_low_df = simplified_usa_dfs["low"]
 
         logger.info("Reading tile score CSV")
         self.score_usa_df = pd.read_csv(
@@ -163,58 +308,130 @@ class GeoScoreETL(ExtractTransformLoad):
         # logger.warning("geojson_score_usa_high total rows: %s", len(self.geojson_score_usa_high))
 
 
-        usa_simplified = self.geojson_score_usa_high[
-            [
-                self.TARGET_SCORE_SHORT_FIELD,
-                self.GEOMETRY_FIELD_NAME,
-            ]
-        ].reset_index()
-
-        usa_tracts = usa_simplified.rename(
-            columns={self.TARGET_SCORE_SHORT_FIELD: self.TARGET_SCORE_RENAME_TO}
-        )
+        # The high zoom file and its tiles are made from tracts simplified
+        # for their zooms
+        self.geojson_score_usa_high_tiles = self.geojson_score_usa_high
+        if self.geojson_usa_high_df is not None:
+            self.geojson_score_usa_high_tiles = (
+                self.geojson_score_usa_high.copy(deep=False)
+            )
+            self.geojson_score_usa_high_tiles[
+                self.GEOMETRY_FIELD_NAME
+            ] = self._get_tract_geometry(
+                self.geojson_score_usa_high.index.to_series(),
+                self.geojson_usa_high_df,
+            )
 
-        logger.info("Converting GeoJSON into GeoDataFrame with tracts")
+        # Every layer is made from the same tracts, with their own metric
         usa_tracts = gpd.GeoDataFrame(
-            usa_tracts,
-            columns=[
-                self.TARGET_SCORE_RENAME_TO,
-                self.GEOMETRY_FIELD_NAME,
-                self.GEOID_FIELD_NAME,
-            ],
+            self.geojson_score_usa_high_tiles[
+                list(
+                    dict.fromkeys(
+                        GEO_SCORE_LAYERS[layer].score_field
+                        for layer in self.LAYERS
+                    )
+                )
+                + [self.GEOMETRY_FIELD_NAME]
+            ].reset_index(),
             crs="EPSG:4326",
         )
-
-        logger.debug("Creating buckets from tracts")
-        usa_bucketed, keep_high_zoom_df = self._create_buckets_from_tracts(
-            usa_tracts, self.NUMBER_OF_BUCKETS
+        if self.geojson_usa_low_df is not None:
+            # The low zoom files are made from tracts simplified further
+            usa_tracts[self.GEOMETRY_FIELD_NAME] = self._get_tract_geometry(
+                usa_tracts[self.GEOID_FIELD_NAME], self.geojson_usa_low_df
+            )
+        layer_tracts = {
+            layer: usa_tracts[
+                [
+                    GEO_SCORE_LAYERS[layer].score_field,
+                    self.GEOMETRY_FIELD_NAME,
+                    self.GEOID_FIELD_NAME,
+                ]
+            ].rename(
+                columns={
+                    GEO_SCORE_LAYERS[layer].score_field: GEO_SCORE_LAYERS[
+                        layer
+                    ].rename_to
+                }
+            )
+            for layer in self.LAYERS
+        }
+
+        # Dissolving is CPU bound, so the buckets of every layer are
+        # dissolved state by state in a pool of processes
+        executor = None
+        if self.DISSOLVE_MAX_WORKERS > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.DISSOLVE_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        try:
+            self.geojson_score_usa_lows = {
+                layer: self._create_low_zoom_frame(
+                    layer_tracts[layer],
+                    GEO_SCORE_LAYERS[layer].rename_to,
+                    executor,
+                )
+                for layer in self.LAYERS
+            }
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _get_tract_geometry(
+        self, geoids: pd.Series, tracts_df: gpd.GeoDataFrame
+    ) -> gpd.GeoSeries:
+        """Returns the geometry of tracts in `tracts_df`, aligned to `geoids`"""
+        return gpd.GeoSeries(
+            geoids.map(
+                tracts_df.set_index(self.GEOID_FIELD_NAME)[
+                    self.GEOMETRY_FIELD_NAME
+                ]
+            ),
+            crs=tracts_df.crs,
         )
-        logger.warning("usa_bucketed: %s", len(usa_bucketed))
-        logger.warning("keep_high_zoom_df: %s", len(keep_high_zoom_df))
 
-        logger.debug("Aggregating buckets")
-        usa_aggregated = self._aggregate_buckets(usa_bucketed, agg_func="mean")
+    def _create_low_zoom_frame(
+        self,
+        usa_tracts: gpd.GeoDataFrame,
+        score_field: str,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+    ) -> gpd.GeoDataFrame:
+        """Buckets and dissolves tracts by `score_field` for the low zoom file
 
-        logger.debug("Breaking up polygons")
-        compressed = self._breakup_multipolygons(
-            usa_aggregated, self.NUMBER_OF_BUCKETS
+        Args:
+            usa_tracts (GeoDataFrame): the tracts, with their GEOID10, geometry and `score_field`
+            score_field (str): the metric to bucket tracts by
+            executor (Executor): where to dissolve buckets state by state; dissolves them here if None (optional)
+
+        Returns:
+            GeoDataFrame: the score field and geometry of the dissolved buckets, and of the tracts kept as they are
+        """
+        logger.debug(f"Creating {score_field} buckets from tracts")
+        usa_bucketed, keep_high_zoom_df = self._create_buckets_from_tracts(
+            usa_tracts, score_field
         )
+        logger.debug(f"usa_bucketed: {len(usa_bucketed)}")
+        logger.debug(f"keep_high_zoom_df: {len(keep_high_zoom_df)}")
 
-        self.geojson_score_usa_low = self._join_high_and_low_zoom_frames(
-            compressed, keep_high_zoom_df
+        logger.debug(f"Aggregating {score_field} buckets")
+        usa_aggregated = self._aggregate_buckets(
+            usa_bucketed, score_field, agg_func="mean", executor=executor
         )
 
-        # Ensure the new columns got added
-        logger.debug(f"Columns in low zoom GeoJSON: {self.geojson_score_usa_low.columns}")
+        logger.debug(f"Breaking up {score_field} polygons")
+        compressed = self._breakup_multipolygons(usa_aggregated, score_field)
 
-        # round to 2 decimals
-        self.geojson_score_usa_low = self.geojson_score_usa_low.round(
-            {self.TARGET_SCORE_RENAME_TO: 2}
+        geojson_score_usa_low = self._join_high_and_low_zoom_frames(
+            compressed, keep_high_zoom_df, score_field
         )
 
+        # round to 2 decimals
+        return geojson_score_usa_low.round({score_field: 2})
+
     def _create_buckets_from_tracts(
-        self, initial_state_tracts: gpd.GeoDataFrame, num_buckets: int
-    ):
+        self, initial_state_tracts: gpd.GeoDataFrame, score_field: str
+    ) -> typing.Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
         # Assert statement for null geometries
         assert initial_state_tracts["geometry"].notnull().all(), "Some geometries are null at bucket creation!"
 
@@ -236,35 +453,30 @@ class GeoScoreETL(ExtractTransformLoad):
 
         # Then we assign buckets only to tracts that do not get "kept" at high zoom
         state_tracts = initial_state_tracts[~keep_high_zoom].copy()
-        state_tracts[f"{self.TARGET_SCORE_RENAME_TO}_bucket"] = np.arange(
-            len(state_tracts)
-        )
+        state_tracts[f"{score_field}_bucket"] = np.arange(len(state_tracts))
         # assign tracts to buckets by score
-        state_tracts = state_tracts.sort_values(
-            self.TARGET_SCORE_RENAME_TO, ascending=True
-        )
+        state_tracts = state_tracts.sort_values(score_field, ascending=True)
         score_bucket = []
-        bucket_size = math.ceil(
-            len(state_tracts.index) / self.NUMBER_OF_BUCKETS
-        )
+        number_of_buckets = self.NUMBER_OF_BUCKETS
+        bucket_size = math.ceil(len(state_tracts.index) / number_of_buckets)
 
         # This just increases the number of buckets so they are more
         # homogeneous. It's not actually necessary :shrug:
         while (
-            state_tracts[self.TARGET_SCORE_RENAME_TO].sum() % bucket_size
+            state_tracts[score_field].sum() % bucket_size
             > self.HOMOGENEITY_THRESHOLD
         ):
-            self.NUMBER_OF_BUCKETS += 1
+            number_of_buckets += 1
             bucket_size = math.ceil(
-                len(state_tracts.index) / self.NUMBER_OF_BUCKETS
+                len(state_tracts.index) / number_of_buckets
             )
 
         logger.debug(
-            f"The number of buckets has increased to {self.NUMBER_OF_BUCKETS}"
+            f"The number of buckets has increased to {number_of_buckets}"
         )
         for i in range(len(state_tracts.index)):
             score_bucket.extend([math.floor(i / bucket_size)])
-        state_tracts[f"{self.TARGET_SCORE_RENAME_TO}_bucket"] = score_bucket
+        state_tracts[f"{score_field}_bucket"] = score_bucket
 
         logger.debug(f"Columns in state_tracts before aggregation: {state_tracts.columns}")
         logger.debug(f"Sample data in state_tracts: {state_tracts.head()}")
@@ -272,82 +484,126 @@ class GeoScoreETL(ExtractTransformLoad):
         return state_tracts, initial_state_tracts[keep_high_zoom]
 
     def _aggregate_buckets(
-        self, state_tracts: gpd.GeoDataFrame, agg_func: str
+        self,
+        state_tracts: gpd.GeoDataFrame,
+        score_field: str,
+        agg_func: str,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
     ) -> gpd.GeoDataFrame:
-        keep_cols = [
-            self.TARGET_SCORE_RENAME_TO,
-            f"{self.TARGET_SCORE_RENAME_TO}_bucket",
-            self.GEOMETRY_FIELD_NAME,
-        ]
+        bucket_field = f"{score_field}_bucket"
 
         assert state_tracts["geometry"].notnull().all(), "Null geometry before dissolve!"
 
-        #  We dissolve all other tracts by their score bucket
-        # state_dissolve = state_tracts[keep_cols].dissolve(
-        #     by=f"{self.TARGET_SCORE_RENAME_TO}_bucket", aggfunc=agg_func
-        # )
-
-        #  We dissolve all other tracts by their score bucket
-        state_dissolve = state_tracts[keep_cols].dissolve(
-            by=f"{self.TARGET_SCORE_RENAME_TO}_bucket", aggfunc=agg_func
+        #  We dissolve all other tracts by their score bucket. The scores
+        #  are aggregated at once, and the geometries are unioned state by
+        #  state, then the states of each bucket together.
+        bucket_scores = state_tracts.groupby(bucket_field)[score_field].agg(
+            agg_func
         )
+        states = state_tracts[self.GEOID_FIELD_NAME].str[:2]
+        state_groups = [
+            state_group[[bucket_field, self.GEOMETRY_FIELD_NAME]]
+            for _, state_group in state_tracts.groupby(states)
+        ]
+        if executor is None:
+            state_parts = [
+                _dissolve_by_bucket(state_group, bucket_field)
+                for state_group in state_groups
+            ]
+        else:
+            state_parts = list(
+                executor.map(
+                    _dissolve_by_bucket,
+                    state_groups,
+                    [bucket_field] * len(state_groups),
+                )
+            )
+        bucket_parts = pd.concat(state_parts)
+        bucket_geometries = {
+            bucket: _union_parts(parts.tolist())
+            for bucket, parts in bucket_parts.groupby(level=0)
+        }
+
+        state_dissolve = gpd.GeoDataFrame(
+            {
+                self.GEOMETRY_FIELD_NAME: gpd.GeoSeries(
+                    bucket_geometries, crs=state_tracts.crs
+                ),
+                score_field: bucket_scores,
+            },
+            crs=state_tracts.crs,
+        ).rename_axis(bucket_field)
 
         assert state_dissolve["geometry"].notnull().all(), "Null geometry after dissolve!"
 
         logger.debug(f"Columns in state dissolve: {state_dissolve.columns}")
         logger.debug(f"Sample data in state dissolve (aggregated buckets): {state_dissolve.head()}")
 
-
         return state_dissolve
 
     def _breakup_multipolygons(
-        self, state_bucketed_df: gpd.GeoDataFrame, num_buckets: int
+        self, state_bucketed_df: gpd.GeoDataFrame, score_field: str
     ) -> gpd.GeoDataFrame:
-
-        compressed = []
-        for i in range(num_buckets):
-            for j in range(
-                len(state_bucketed_df[self.GEOMETRY_FIELD_NAME][i].geoms)
-            ):
-                compressed.append(
-                    [
-                        state_bucketed_df[self.TARGET_SCORE_RENAME_TO][i],
-                        state_bucketed_df[self.GEOMETRY_FIELD_NAME][i].geoms[j],
-                    ]
-                )
-        return compressed
+        # Each polygon of a bucket becomes its own feature, in bucket order
+        return (
+            state_bucketed_df[[score_field, self.GEOMETRY_FIELD_NAME]]
+            .explode(index_parts=False)
+            .reset_index(drop=True)
+        )
 
     def _join_high_and_low_zoom_frames(
-        self, compressed: list, keep_high_zoom_df: gpd.GeoDataFrame
+        self,
+        compressed: gpd.GeoDataFrame,
+        keep_high_zoom_df: gpd.GeoDataFrame,
+        score_field: str,
     ) -> gpd.GeoDataFrame:
         keep_columns = [
-            self.TARGET_SCORE_RENAME_TO,
+            score_field,
             self.GEOMETRY_FIELD_NAME,
         ]
-        compressed_geodf = gpd.GeoDataFrame(
-            compressed,
-            columns=keep_columns,
-            crs="EPSG:4326",
+        return pd.concat(
+            [compressed[keep_columns], keep_high_zoom_df[keep_columns]]
         )
-        return pd.concat([compressed_geodf, keep_high_zoom_df[keep_columns]])
 
     def load(self) -> None:
         # Create separate threads to run each write to disk.
         def write_high_to_file():
-            logger.info("Writing usa-high (~9 minutes)")
-
-            self.geojson_score_usa_high.to_file(
-                filename=self.SCORE_HIGH_GEOJSON,
-                driver="GeoJSON",
+            # The high zoom file is the same for every layer, so it is
+            # written once and copied
+            high_geojson_paths = [
+                self.get_geojson_paths(layer)[0] for layer in self.LAYERS
+            ]
+            logger.info(f"Writing {high_geojson_paths[0].name}")
+            write_geojson(
+                self.geojson_score_usa_high_tiles,
+                high_geojson_paths[0],
+                precision=constants.GEOJSON_COORDINATE_PRECISION,
             )
+            for high_geojson_path in high_geojson_paths[1:]:
+                shutil.copyfile(high_geojson_paths[0], high_geojson_path)
             logger.info("Completed writing usa-high")
 
-        def write_low_to_file():
-            logger.info("Writing usa-low (~9 minutes)")
-            self.geojson_score_usa_low.to_file(
-                filename=self.SCORE_LOW_GEOJSON, driver="GeoJSON"
+        def write_high_to_spatial_files():
+            # These are the same for every layer, and have the full geometry
+            logger.info(f"Writing {self.SCORE_GEOPARQUET_FILE.name}")
+            write_geoparquet(
+                self.geojson_score_usa_high, self.SCORE_GEOPARQUET_FILE
             )
-            logger.info("Completed writing usa-low")
+            logger.info(f"Writing {self.SCORE_FLATGEOBUF_FILE.name}")
+            write_flatgeobuf(
+                self.geojson_score_usa_high, self.SCORE_FLATGEOBUF_FILE
+            )
+            logger.info("Completed writing usa-high GeoParquet and FlatGeobuf")
+
+        def write_low_to_file(layer: str):
+            low_geojson_path = self.get_geojson_paths(layer)[1]
+            logger.info(f"Writing {low_geojson_path.name}")
+            write_geojson(
+                self.geojson_score_usa_lows[layer],
+                low_geojson_path,
+                precision=constants.GEOJSON_COORDINATE_PRECISION,
+            )
+            logger.info(f"Completed writing {low_geojson_path.name}")
 
         def create_esri_codebook(codebook) -> pd.DataFrame:
             """temporary: helper to make a codebook for esri shapefile only"""
@@ -393,10 +649,15 @@ class GeoScoreETL(ExtractTransformLoad):
 
             return codebook
 
-        def combine_esri_codebook_with_original_codebook(esri_codebook_df):
+        def combine_esri_codebook_with_original_codebook(
+            esri_codebook_df,
+        ) -> bytes:
             """Combines the ESRI codebook generated above with the original codebook generated
             during score-post. Essentially we want to include the shapefile column name in the
-            original codebook."""
+            original codebook.
+
+            The original codebook is read once and left as score-post wrote it; the combined
+            codebook is returned as CSV, to be put in the shapefile zip files."""
 
             logger.info("Combining ESRI codebook with original codebook")
 
@@ -406,9 +667,9 @@ class GeoScoreETL(ExtractTransformLoad):
                 low_memory=False,
             )
 
-            # if we've already combined these files in the past, go ahead and remove the columns so we can do it again
-            original_codebook_df.drop(
-                "shapefile_label", axis=1, errors="ignore", inplace=True
+            # in case the codebook was combined by an earlier version of this step, remove the columns so we can do it again
+            original_codebook_df = original_codebook_df.drop(
+                "shapefile_label", axis=1, errors="ignore"
             )
 
             # add the esri (shapefile) columns to the original codebook by joining the two dataframes
@@ -433,13 +694,10 @@ class GeoScoreETL(ExtractTransformLoad):
             shapefile_col = combined_codebook_df.pop("shapefile_column")
             combined_codebook_df.insert(2, "shapefile_label", shapefile_col)
 
-            # save the combined codebook
-            combined_codebook_df.to_csv(
-                constants.SCORE_DOWNLOADABLE_CODEBOOK_FILE_PATH, index=False
-            )
             logger.info(
                 "Completed combining ESRI codebook with original codebook"
             )
+            return combined_codebook_df.to_csv(index=False).encode("utf-8")
 
         def write_esri_shapefile():
             logger.info("Producing ESRI shapefiles")
@@ -465,64 +723,71 @@ class GeoScoreETL(ExtractTransformLoad):
                 if new_col != column:
                     renaming_map[column] = new_col
 
-            self.geojson_score_usa_high.rename(columns=renaming_map).to_file(
-                self.SCORE_SHP_FILE
+            # The codebook is combined once, in memory, and the same CSV is
+            # put in both zip files
+            esri_codebook_df = create_esri_codebook(codebook)
+            codebook_csv = combine_esri_codebook_with_original_codebook(
+                esri_codebook_df
             )
+            codebook_name = constants.SCORE_DOWNLOADABLE_CODEBOOK_FILE_PATH.name
+
+            # The shapefile is written straight into the zip file, which is
+            # built in memory since it is also put in the versioned zip file
+            arcgis_zip = io.BytesIO()
+            with zipfile.ZipFile(arcgis_zip, "w") as zip_file:
+                write_shapefile_to_zip(
+                    self.geojson_score_usa_high.rename(columns=renaming_map),
+                    zip_file,
+                    self.SCORE_SHP_FILE.stem,
+                    compress_type=compression,
+                )
+                write_zip_member(zip_file, codebook_name, codebook_csv)
+            arcgis_zip_bytes = arcgis_zip.getvalue()
             logger.info("Completed writing shapefile")
 
-            esri_codebook_df = create_esri_codebook(codebook)
-            combine_esri_codebook_with_original_codebook(esri_codebook_df)
-
             arcgis_zip_file_path = self.SCORE_SHP_PATH / "usa.zip"
-            arcgis_files = []
-            for file in os.listdir(self.SCORE_SHP_PATH):
-                # don't remove __init__ files as they conserve dir structure
-                if file != "__init__.py":
-                    arcgis_files.append(self.SCORE_SHP_PATH / file)
-            arcgis_files.append(constants.SCORE_DOWNLOADABLE_CODEBOOK_FILE_PATH)
-            zip_files(arcgis_zip_file_path, arcgis_files)
+            partial_path = arcgis_zip_file_path.with_name(
+                arcgis_zip_file_path.name + ".part"
+            )
+            partial_path.write_bytes(arcgis_zip_bytes)
+            os.replace(partial_path, arcgis_zip_file_path)
             logger.info("Completed zipping shapefiles")
 
             # Per #1557:
             # Zip file that contains the shapefiles, codebook and checksum file.
-            # Normally we get the codebook file path using this constant:
-            # - codebook_path = constants.SCORE_DOWNLOADABLE_CODEBOOK_FILE_PATH
-            # However since we generate it on a separate script (etl_score_post)
-            # the time stamp can be generated again, and thus the file is not found.
-            # So we grab it from the downloadable dir and if we don't find it, it
-            # means we haven't run etl_score_post, and continue
-
-            logger.info("Getting codebook from downloadable dir")
-            codebook_path = None
-            for file in os.listdir(constants.SCORE_DOWNLOADABLE_DIR):
-                if "codebook" in file:
-                    codebook_path = constants.SCORE_DOWNLOADABLE_DIR / file
-
-            if codebook_path:
-                version_shapefile_codebook_zip_path = (
-                    constants.SCORE_VERSIONING_SHAPEFILE_CODEBOOK_FILE_PATH
-                )
-                readme_path = constants.SCORE_VERSIONING_README_FILE_PATH
+            # The shapefile zip file is stored in it as it is.
+            logger.info("Compressing shapefile and codebook files")
+            zip_archives(
+                {
+                    constants.SCORE_VERSIONING_SHAPEFILE_CODEBOOK_FILE_PATH: [
+                        (arcgis_zip_file_path.name, arcgis_zip_bytes),
+                        (codebook_name, codebook_csv),
+                        constants.SCORE_VERSIONING_README_FILE_PATH,
+                    ]
+                }
+            )
 
-                logger.info("Compressing shapefile and codebook files")
-                files_to_compress = [
-                    arcgis_zip_file_path,
-                    codebook_path,
-                    readme_path,
-                ]
-                zip_files(
-                    version_shapefile_codebook_zip_path, files_to_compress
-                )
+        for layer in self.LAYERS:
+            self.get_geojson_paths(layer)[0].parent.mkdir(
+                parents=True, exist_ok=True
+            )
+        for path in [
+            self.SCORE_GEOPARQUET_FILE,
+            self.SCORE_FLATGEOBUF_FILE,
+            self.SCORE_SHP_FILE,
+        ]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        tasks = [write_high_to_file, write_high_to_spatial_files] + [
+            functools.partial(write_low_to_file, layer) for layer in self.LAYERS
+        ]
+        # The shapefile has the fields of the high zoom file, and is only
+        # made with the default layer
+        if "default" in self.LAYERS:
+            tasks.append(write_esri_shapefile)
 
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(task)
-                for task in [
-                    write_high_to_file,
-                    write_low_to_file,
-                    write_esri_shapefile,
-                ]
-            }
+            futures = {executor.submit(task) for task in tasks}
 
             for fut in concurrent.futures.as_completed(futures):
                 # Calling result will raise an exception if one occurred.
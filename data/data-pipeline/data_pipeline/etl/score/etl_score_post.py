@@ -11,14 +11,16 @@ from data_pipeline.content.schemas.download_schemas import CSVConfig
 from data_pipeline.content.schemas.download_schemas import ExcelConfig
 from data_pipeline.etl.base import ExtractTransformLoad
 from data_pipeline.etl.score.etl_utils import create_codebook
+from data_pipeline.etl.score.excel_writer import write_excel
 from data_pipeline.etl.score.etl_utils import floor_series
+from data_pipeline.etl.score.score_dtypes import compact_score_df
 from data_pipeline.etl.sources.census.etl_utils import check_census_data_source
 from data_pipeline.score import field_names
 from data_pipeline.utils import column_list_from_yaml_object_fields
 from data_pipeline.utils import get_module_logger
 from data_pipeline.utils import load_dict_from_yaml_object_fields
 from data_pipeline.utils import load_yaml_dict_from_file
-from data_pipeline.utils import zip_files
+from data_pipeline.utils import zip_archives
 from data_pipeline.etl.datasource import DataSource
 from data_pipeline.etl.downloader import Downloader
 
@@ -110,7 +112,7 @@ class PostScoreETL(ExtractTransformLoad):
             int, errors="ignore"
         )
 
-        return df
+        return compact_score_df(df)
 
     def _extract_census_geojson(self, geo_path: Path) -> gpd.GeoDataFrame:
         """
@@ -244,7 +246,7 @@ class PostScoreETL(ExtractTransformLoad):
         ].is_unique, "Merging state/county data introduced duplicate rows"
         # set the score to the new df
         # logger.debug(f"Available columns in score_county_state_merged_df: {score_county_state_merged.columns}")
-        return score_county_state_merged
+        return compact_score_df(score_county_state_merged)
 
     def _create_tile_data(
         self,
@@ -279,11 +281,13 @@ class PostScoreETL(ExtractTransformLoad):
         float_cols = [
             col
             for col, col_dtype in score_tiles.dtypes.items()
-            if col_dtype == np.dtype("float64")
+            if pd.api.types.is_float_dtype(col_dtype)
         ]
         scale_factor = 10 ** constants.TILES_ROUND_NUM_DECIMALS
+        # Round in float64, since the compact float32 columns of the score
+        # lose whole numbers once they are scaled up
         score_tiles[float_cols] = (
-            score_tiles[float_cols] * scale_factor
+            score_tiles[float_cols].astype(float64) * scale_factor
         ).apply(np.floor) / scale_factor
 
         logger.debug("Adding fields for island areas and Puerto Rico")
@@ -360,7 +364,7 @@ class PostScoreETL(ExtractTransformLoad):
             ):
                 # Convert percentages from fractions between 0 and 1 to an integer
                 # from 0 to 100.
-                df_100 = df[column] * 100
+                df_100 = df[column].astype(float64) * 100
                 df_int = np.floor(
                     pd.to_numeric(df_100, errors="coerce")
                 ).astype("Int64")
@@ -372,9 +376,9 @@ class PostScoreETL(ExtractTransformLoad):
             ):
                 # Convert loss rates by multiplying by 100 (they are percents)
                 # and then rounding appropriately.
-                df_100 = df[column] * 100
+                df_100 = df[column].astype(float64) * 100
                 df[column] = floor_series(
-                    series=df_100.astype(float64),
+                    series=df_100,
                     number_of_decimals=config_object[
                         self.yaml_global_config_rounding_num
                     ][self.yaml_fields_type_loss_rate_percentage_label],
@@ -498,42 +502,32 @@ class PostScoreETL(ExtractTransformLoad):
             "excel_config"
         ]["default_column_width"]
 
-        # Create a Pandas Excel writer using XlsxWriter as the engine.
-        with pd.ExcelWriter(  # pylint: disable=abstract-class-instantiated
-            # (https://github.com/PyCQA/pylint/issues/3060)
+        # The fields of every sheet are projected from the score at once, and
+        # each sheet's columns are taken from the same frame
+        fields = {}
+        for sheet in excel_csv_config["sheets"]:
+            for field in sheet["fields"]:
+                fields.setdefault(field["score_name"], field)
+        projected_df = self._create_downloadable_data(
+            score_df=excel_df,
+            fields_object=list(fields.values()),
+            config_object=excel_csv_config["global_config"],
+        )
+
+        # Stream the sheets to the Excel file, with bold headers and no index
+        # column at the left of the output dataframe.
+        write_excel(
+            {
+                sheet[self.yaml_excel_sheet_label]: projected_df[
+                    column_list_from_yaml_object_fields(
+                        yaml_object=sheet["fields"], target_field="label"
+                    )
+                ]
+                for sheet in excel_csv_config["sheets"]
+            },
             excel_path,
-            engine="xlsxwriter",
-        ) as writer:
-
-            for sheet in excel_csv_config["sheets"]:
-                excel_df = self._create_downloadable_data(
-                    score_df=self.output_score_county_state_merged_df,
-                    fields_object=sheet["fields"],
-                    config_object=excel_csv_config["global_config"],
-                )
-                # Convert the dataframe to an XlsxWriter Excel object. We also turn off the
-                # index column at the left of the output dataframe.
-                excel_df.to_excel(
-                    writer,
-                    sheet_name=sheet[self.yaml_excel_sheet_label],
-                    index=False,
-                )
-
-                # Get the xlsxwriter workbook and worksheet objects.
-                workbook = writer.book
-                worksheet = writer.sheets[sheet[self.yaml_excel_sheet_label]]
-
-                # set header format
-                header_format = workbook.add_format(
-                    {"bold": True, "text_wrap": True, "valign": "bottom"}
-                )
-
-                # write headers
-                for col_num, value in enumerate(excel_df.columns.array):
-                    worksheet.write(0, col_num, value, header_format)
-
-                num_cols = len(excel_df.columns)
-                worksheet.set_column(0, num_cols - 1, num_excel_cols_width)
+            column_width=num_excel_cols_width,
+        )
 
         return excel_csv_config
 
@@ -627,25 +621,24 @@ class PostScoreETL(ExtractTransformLoad):
         codebook_df.to_csv(codebook_path, index=False)
 
         # zip assets
-        logger.debug("Compressing csv files")
-        files_to_compress = [csv_path, codebook_path, readme_path]
-        zip_files(csv_zip_path, files_to_compress)
-
-        logger.debug("Compressing xls files")
-        files_to_compress = [excel_path, codebook_path, readme_path]
-        zip_files(xls_zip_path, files_to_compress)
-
         # Per #1557
-        # zip file that contains the .xls, .csv, .pdf, tech support document, checksum file
-        logger.debug("Compressing data and documentation files")
-        files_to_compress = [
-            excel_path,
-            csv_path,
-            score_downloadable_pdf_file_path,
-            score_downloadable_tsd_file_path,
-            readme_path,
-        ]
-        zip_files(version_data_documentation_zip_path, files_to_compress)
+        # The data and documentation zip file contains the .xls, .csv, .pdf,
+        # tech support document and checksum file. The zip files are
+        # written in parallel.
+        logger.debug("Compressing csv, xls and documentation files")
+        zip_archives(
+            {
+                csv_zip_path: [csv_path, codebook_path, readme_path],
+                xls_zip_path: [excel_path, codebook_path, readme_path],
+                version_data_documentation_zip_path: [
+                    excel_path,
+                    csv_path,
+                    score_downloadable_pdf_file_path,
+                    score_downloadable_tsd_file_path,
+                    readme_path,
+                ],
+            }
+        )
 
     def _load_search_tract_data(self, output_path: Path):
         """Write the Census tract search data."""
@@ -0,0 +1,187 @@
+"""Writes DataFrames to Excel workbooks quickly, a sheet per worker process.
+
+`DataFrame.to_excel` builds a styled cell object for every value and keeps
+the whole sheet in memory until the workbook is closed, which is slow for
+the downloadable score. Here each sheet is streamed with xlsxwriter's
+`constant_memory` mode: the way each column is written is worked out once,
+and rows are written in order and flushed as they go.
+
+An Excel workbook is a zip file with a part per sheet. In `constant_memory`
+mode strings are written inline, so a sheet's part does not depend on the
+other sheets. Each worker process writes a workbook with every sheet, and
+fills in only its own; the parts of the sheets are then put together into
+one workbook.
+"""
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import re
+import typing
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# The parts of a workbook's sheets, numbered from 1
+_SHEET_PART = re.compile(r"xl/worksheets/sheet(\d+)\.xml")
+
+# Like `to_excel`, infinite numbers are written as text
+_INFINITY_TEXT = {math.inf: "inf", -math.inf: "-inf"}
+
+
+def _get_column_writer(
+    worksheet, values: pd.Series
+) -> typing.Tuple[typing.Callable, list]:
+    """Returns how to write the values of a column, and the values to write,
+    with None for empty cells."""
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(values):
+        write = worksheet.write_boolean
+        cells = values.to_numpy(dtype=object)
+    elif pd.api.types.is_numeric_dtype(values):
+        numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+        infinite = np.isinf(numbers)
+        if infinite.any():
+            # Only the infinite numbers of the column are written as text
+            cells = numbers.astype(object)
+            cells[infinite] = [
+                _INFINITY_TEXT[number] for number in numbers[infinite]
+            ]
+
+            def write(row, column, value):
+                if isinstance(value, str):
+                    return worksheet.write_string(row, column, value)
+                return worksheet.write_number(row, column, value)
+
+        else:
+            write = worksheet.write_number
+            # Whole numbers stay ints, like `to_excel` writes them
+            cells = (
+                values.to_numpy(dtype=object)
+                if pd.api.types.is_integer_dtype(values)
+                else numbers.astype(object)
+            )
+    else:
+
+        def write(row, column, value):
+            if isinstance(value, (bool, np.bool_)):
+                return worksheet.write_boolean(row, column, bool(value))
+            if isinstance(value, (int, float, np.number)):
+                return worksheet.write_number(row, column, value)
+            return worksheet.write_string(row, column, str(value))
+
+        cells = values.to_numpy(dtype=object)
+    cells = np.where(missing, None, cells)
+    return write, cells.tolist()
+
+
+def _write_workbook(
+    path: Path,
+    sheet_names: typing.List[str],
+    sheet_index: int,
+    sheet_df: pd.DataFrame,
+    column_width: float,
+) -> Path:
+    """Writes a workbook with every sheet, where only one of them has its
+    rows."""
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    # Every workbook has the same formats, made in the same order, so that
+    # their sheets refer to the same styles
+    header_format = workbook.add_format(
+        {"bold": True, "text_wrap": True, "valign": "bottom"}
+    )
+    for index, sheet_name in enumerate(sheet_names):
+        worksheet = workbook.add_worksheet(sheet_name)
+        if index != sheet_index:
+            continue
+
+        worksheet.set_column(0, len(sheet_df.columns) - 1, column_width)
+        worksheet.write_row(0, 0, list(sheet_df.columns), header_format)
+        writers, columns = zip(
+            *(
+                _get_column_writer(worksheet, sheet_df[column])
+                for column in sheet_df.columns
+            )
+        )
+        for row_number, row in enumerate(zip(*columns), start=1):
+            for column_number, value in enumerate(row):
+                if value is not None:
+                    writers[column_number](row_number, column_number, value)
+    workbook.close()
+    return path
+
+
+def write_excel(
+    sheets: typing.Dict[str, pd.DataFrame],
+    excel_path: Path,
+    column_width: float,
+    max_workers: typing.Optional[int] = None,
+) -> None:
+    """Writes DataFrames to the sheets of an Excel workbook.
+
+    Each sheet has a bold header row of its column names, and no index.
+
+    Args:
+        sheets (Dict[str, DataFrame]): the rows of each sheet, by sheet name
+        excel_path (Path): the workbook to write
+        column_width (float): the width of every column
+        max_workers (int): how many processes write sheets; defaults to the number of CPUs, and 1 writes them in this process (optional)
+
+    Returns:
+        None
+    """
+    if not sheets:
+        raise ValueError("An Excel workbook needs at least one sheet")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(sheets))
+    sheet_names = list(sheets)
+    sheet_dfs = list(sheets.values())
+    partial_paths = [
+        excel_path.with_name(f"{excel_path.name}.{index}.part")
+        for index in range(len(sheets))
+    ]
+    jobs = [
+        (path, sheet_names, index, sheet_dfs[index], column_width)
+        for index, path in enumerate(partial_paths)
+    ]
+
+    try:
+        if max_workers <= 1:
+            for job in jobs:
+                _write_workbook(*job)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                for future in [
+                    executor.submit(_write_workbook, *job) for job in jobs
+                ]:
+                    future.result()
+
+        if len(jobs) == 1:
+            os.replace(jobs[0][0], excel_path)
+            return
+
+        # The first workbook has every part but the other sheets
+        combined_path = excel_path.with_name(excel_path.name + ".part")
+        with zipfile.ZipFile(partial_paths[0]) as first_workbook:
+            with zipfile.ZipFile(combined_path, "w") as workbook:
+                for info in first_workbook.infolist():
+                    match = _SHEET_PART.fullmatch(info.filename)
+                    source_path = partial_paths[
+                        int(match.group(1)) - 1 if match else 0
+                    ]
+                    with zipfile.ZipFile(source_path) as source:
+                        workbook.writestr(info, source.read(info.filename))
+        os.replace(combined_path, excel_path)
+    finally:
+        for path in partial_paths:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,338 @@
+"""Writes GeoDataFrames to GeoJSON quickly, a chunk of features at a time.
+
+`GeoDataFrame.to_file(driver="GeoJSON")` goes through OGR one feature at a
+time, which takes minutes for the national score files. Here geometries are
+decoded from WKB with numpy and encoded with the C JSON encoder, and each
+property column is encoded at once according to its type, so a chunk of
+features is serialized in a few calls and written out before the next one is
+built. Encoding the coordinates takes most of the time, so the geometries of
+upcoming chunks are encoded in worker processes while a chunk is written.
+
+The files are standard GeoJSON FeatureCollections, named and with a CRS like
+the ones OGR writes.
+"""
+import collections
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import os
+import struct
+import typing
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# How many features are serialized at a time
+GEOJSON_CHUNK_SIZE = 10_000
+
+# WKB geometry types
+_POINT = 1
+_LINE_STRING = 2
+_POLYGON = 3
+_MULTI_POINT = 4
+_MULTI_LINE_STRING = 5
+_MULTI_POLYGON = 6
+_GEOMETRY_COLLECTION = 7
+
+_GEOJSON_TYPES = {
+    _POINT: "Point",
+    _LINE_STRING: "LineString",
+    _POLYGON: "Polygon",
+    _MULTI_POINT: "MultiPoint",
+    _MULTI_LINE_STRING: "MultiLineString",
+    _MULTI_POLYGON: "MultiPolygon",
+    _GEOMETRY_COLLECTION: "GeometryCollection",
+}
+
+# EWKB flags
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+
+class _WKBReader:
+    """Decodes one WKB geometry into a GeoJSON geometry object."""
+
+    def __init__(self, wkb: bytes, precision: typing.Optional[int]):
+        self.wkb = wkb
+        self.precision = precision
+        self.offset = 0
+
+    def _read_uint32(self, byte_order: str) -> int:
+        (value,) = struct.unpack_from(byte_order + "I", self.wkb, self.offset)
+        self.offset += 4
+        return value
+
+    def _read_coordinates(
+        self, count: int, dimensions: int, has_z: bool, byte_order: str
+    ) -> list:
+        coordinates = np.frombuffer(
+            self.wkb,
+            dtype=byte_order + "f8",
+            count=count * dimensions,
+            offset=self.offset,
+        ).reshape(count, dimensions)
+        self.offset += 8 * count * dimensions
+        # GeoJSON has no M coordinate
+        coordinates = coordinates[:, : 3 if has_z else 2]
+        if self.precision is not None:
+            coordinates = coordinates.round(self.precision)
+        return coordinates.tolist()
+
+    def read(self) -> typing.Optional[dict]:
+        byte_order = "<" if self.wkb[self.offset] == 1 else ">"
+        self.offset += 1
+        geometry_type = self._read_uint32(byte_order)
+
+        has_z = bool(geometry_type & _EWKB_Z)
+        has_m = bool(geometry_type & _EWKB_M)
+        if geometry_type & _EWKB_SRID:
+            self.offset += 4
+        geometry_type &= 0x0FFFFFFF
+        # ISO WKB adds 1000 for Z, 2000 for M and 3000 for ZM
+        iso_dimensions, geometry_type = divmod(geometry_type, 1000)
+        has_z = has_z or iso_dimensions in (1, 3)
+        has_m = has_m or iso_dimensions in (2, 3)
+        dimensions = 2 + has_z + has_m
+
+        if geometry_type not in _GEOJSON_TYPES:
+            raise ValueError(f"Unsupported WKB geometry type {geometry_type}")
+
+        if geometry_type == _POINT:
+            coordinates = self._read_coordinates(
+                1, dimensions, has_z, byte_order
+            )[0]
+            if any(np.isnan(coordinates)):
+                # An empty point
+                return None
+        elif geometry_type == _LINE_STRING:
+            coordinates = self._read_coordinates(
+                self._read_uint32(byte_order), dimensions, has_z, byte_order
+            )
+        elif geometry_type == _POLYGON:
+            coordinates = [
+                self._read_coordinates(
+                    self._read_uint32(byte_order),
+                    dimensions,
+                    has_z,
+                    byte_order,
+                )
+                for _ in range(self._read_uint32(byte_order))
+            ]
+        else:
+            parts = [self.read() for _ in range(self._read_uint32(byte_order))]
+            if geometry_type == _GEOMETRY_COLLECTION:
+                return {
+                    "type": "GeometryCollection",
+                    "geometries": [part for part in parts if part is not None],
+                }
+            coordinates = [
+                part["coordinates"] for part in parts if part is not None
+            ]
+
+        return {
+            "type": _GEOJSON_TYPES[geometry_type],
+            "coordinates": coordinates,
+        }
+
+
+def wkb_to_geojson(
+    wkb: typing.Optional[bytes], precision: typing.Optional[int] = None
+) -> str:
+    """Encodes a WKB geometry as a GeoJSON geometry.
+
+    Args:
+        wkb (bytes): the geometry, as (ISO or extended) WKB; None for a missing geometry
+        precision (int): how many decimal places to round coordinates to; keeps them all if None (optional)
+
+    Returns:
+        str: the GeoJSON geometry object, or "null"
+    """
+    if wkb is None:
+        return "null"
+    return json.dumps(_WKBReader(bytes(wkb), precision).read())
+
+
+def _encode_column(values: pd.Series) -> typing.List[str]:
+    """Encodes the values of a column as JSON, missing values as null."""
+    if pd.api.types.is_bool_dtype(values) and not values.hasnans:
+        return np.where(values.to_numpy(bool), "true", "false").tolist()
+    if pd.api.types.is_integer_dtype(values) and not values.hasnans:
+        return list(map(str, values.to_numpy("int64").tolist()))
+    if pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(
+        values
+    ):
+        numbers = values.to_numpy("float64", na_value=np.nan)
+        encoded = np.array(list(map(repr, numbers.tolist())), dtype=object)
+        encoded[~np.isfinite(numbers)] = "null"
+        return encoded.tolist()
+
+    encoded = []
+    for value in values.tolist():
+        if value is None or (
+            isinstance(value, float) and not np.isfinite(value)
+        ):
+            encoded.append("null")
+        elif value is pd.NA or value is pd.NaT:
+            encoded.append("null")
+        elif isinstance(value, (bool, int, str)):
+            encoded.append(json.dumps(value, ensure_ascii=False))
+        elif isinstance(value, np.generic):
+            encoded.append(json.dumps(value.item(), ensure_ascii=False))
+        else:
+            encoded.append(json.dumps(str(value), ensure_ascii=False))
+    return encoded
+
+
+def _get_crs_member(gdf: gpd.GeoDataFrame) -> typing.Optional[dict]:
+    if gdf.crs is None:
+        return None
+    epsg = gdf.crs.to_epsg()
+    if epsg == 4326:
+        name = "urn:ogc:def:crs:OGC:1.3:CRS84"
+    elif epsg is not None:
+        name = f"urn:ogc:def:crs:EPSG::{epsg}"
+    else:
+        return None
+    return {"type": "name", "properties": {"name": name}}
+
+
+def _encode_geometries(
+    wkbs: typing.List[typing.Optional[bytes]],
+    precision: typing.Optional[int],
+) -> typing.List[str]:
+    return [wkb_to_geojson(wkb, precision) for wkb in wkbs]
+
+
+def _encode_chunks(
+    gdf: gpd.GeoDataFrame,
+    precision: typing.Optional[int],
+    chunk_size: int,
+    max_workers: int,
+) -> typing.Iterator[typing.Tuple[gpd.GeoDataFrame, typing.List[str]]]:
+    """Yields the chunks of a GeoDataFrame with their encoded geometries, in order.
+
+    With more than one worker, geometries are encoded in worker processes,
+    no more than two chunks per worker ahead of the chunk being written.
+    """
+    chunks = (
+        gdf.iloc[start : start + chunk_size]
+        for start in range(0, len(gdf), chunk_size)
+    )
+    if max_workers <= 1:
+        for chunk in chunks:
+            yield chunk, _encode_geometries(
+                chunk.geometry.to_wkb().tolist(), precision
+            )
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        pending: typing.Deque = collections.deque()
+        for chunk in chunks:
+            pending.append(
+                (
+                    chunk,
+                    executor.submit(
+                        _encode_geometries,
+                        chunk.geometry.to_wkb().tolist(),
+                        precision,
+                    ),
+                )
+            )
+            if len(pending) >= 2 * max_workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def write_geojson(
+    gdf: gpd.GeoDataFrame,
+    path: Path,
+    precision: typing.Optional[int] = None,
+    chunk_size: int = GEOJSON_CHUNK_SIZE,
+    max_workers: typing.Optional[int] = None,
+) -> None:
+    """Writes a GeoDataFrame to a GeoJSON file.
+
+    Features are written `chunk_size` at a time, to a temporary file that
+    replaces `path` once it is complete.
+
+    Args:
+        gdf (GeoDataFrame): the features to write
+        path (Path): the GeoJSON file to write
+        precision (int): how many decimal places to round coordinates to; keeps them all if None (optional)
+        chunk_size (int): how many features are serialized at a time (optional)
+        max_workers (int): how many processes encode geometries; defaults to the number of CPUs, and 1 encodes them in this process (optional)
+
+    Returns:
+        None
+    """
+    path = Path(path)
+    # Like `to_file`, the index is written as properties unless it is a
+    # plain integer index
+    if (
+        isinstance(gdf.index, pd.MultiIndex)
+        or gdf.index.name is not None
+        or not pd.api.types.is_integer_dtype(gdf.index)
+    ):
+        gdf = gdf.reset_index()
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    # Worker processes are only worth starting for more than one chunk
+    max_workers = min(max_workers, math.ceil(len(gdf) / chunk_size))
+
+    geometry_name = gdf.geometry.name
+    property_names = [
+        column for column in gdf.columns if column != geometry_name
+    ]
+    property_keys = [
+        json.dumps(str(name), ensure_ascii=False) + ": "
+        for name in property_names
+    ]
+
+    header = {"type": "FeatureCollection", "name": path.stem}
+    crs = _get_crs_member(gdf)
+    if crs is not None:
+        header["crs"] = crs
+    header_json = json.dumps(header, ensure_ascii=False)
+
+    partial_path = path.with_name(path.name + ".part")
+    with open(partial_path, "w", encoding="utf-8") as geojson_file:
+        geojson_file.write(header_json[:-1] + ', "features": [\n')
+        first_chunk = True
+        for chunk, geometries in _encode_chunks(
+            gdf, precision, chunk_size, max_workers
+        ):
+            columns = [_encode_column(chunk[name]) for name in property_names]
+            features = []
+            for i, geometry in enumerate(geometries):
+                properties = ", ".join(
+                    key + column[i]
+                    for key, column in zip(property_keys, columns)
+                )
+                features.append(
+                    '{"type": "Feature", "properties": {'
+                    + properties
+                    + '}, "geometry": '
+                    + geometry
+                    + "}"
+                )
+            if not first_chunk:
+                geojson_file.write(",\n")
+            first_chunk = False
+            geojson_file.write(",\n".join(features))
+        geojson_file.write("\n]}\n")
+    os.replace(partial_path, path)
+
+    logger.debug(f"Wrote {len(gdf)} features to {path}")
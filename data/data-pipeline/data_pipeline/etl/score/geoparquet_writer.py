@@ -0,0 +1,197 @@
+"""Writes the score geometry in formats that can be read a region at a time.
+
+Reading any part of the national GeoJSON files means parsing all of them.
+Here the high zoom score frame is also written as GeoParquet and FlatGeobuf,
+with the tracts in the order of a Hilbert curve through their bounding
+boxes, so that tracts near each other are stored near each other:
+
+- The GeoParquet file is written in small row groups, with a `bbox` column of
+  each tract's bounds. A row group's statistics of the `bbox` column say
+  which region it covers, so reading a bounding box, like a state's, skips
+  the row groups outside of it (see `read_geoparquet`).
+- The FlatGeobuf file has a packed Hilbert R-tree spatial index, which GDAL,
+  `geopandas.read_file(bbox=...)` and web clients use to read a region over
+  HTTP range requests.
+"""
+import inspect
+import os
+import typing
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pyarrow.compute as pc
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# How many tracts are stored in each row group of the GeoParquet files. Row
+# groups are the unit a bounding box read skips, so smaller ones skip more
+# of the nation, at the cost of a larger footer.
+GEOPARQUET_ROW_GROUP_SIZE = 2_000
+
+# The name of the column of each row's bounds, as in GeoParquet 1.1
+BBOX_COLUMN = "bbox"
+
+# How finely the Hilbert curve the rows are ordered by is divided
+_HILBERT_LEVEL = 16
+
+
+def _hilbert_distance(
+    x: np.ndarray, y: np.ndarray, total_bounds: np.ndarray
+) -> np.ndarray:
+    """Returns the distance along a Hilbert curve of points, for geopandas
+    without `GeoSeries.hilbert_distance`."""
+    side = 2**_HILBERT_LEVEL - 1
+    xmin, ymin, xmax, ymax = total_bounds
+    x = ((x - xmin) / max(xmax - xmin, 1e-12) * side).astype(np.int64)
+    y = ((y - ymin) / max(ymax - ymin, 1e-12) * side).astype(np.int64)
+    distance = np.zeros(len(x), dtype=np.int64)
+    s = 2 ** (_HILBERT_LEVEL - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant, so the curve is continuous
+        flip = ~ry & rx
+        x = np.where(flip, side - x, x)
+        y = np.where(flip, side - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s //= 2
+    return distance
+
+
+def sort_spatially(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Orders rows along a Hilbert curve through their bounding boxes.
+
+    Rows without a geometry are put last.
+
+    Args:
+        gdf (GeoDataFrame): the rows to order
+
+    Returns:
+        GeoDataFrame: the same rows, in spatial order
+    """
+    has_geometry = (gdf.geometry.notna() & ~gdf.geometry.is_empty).to_numpy()
+    geometry = gdf.geometry[has_geometry]
+    total_bounds = geometry.total_bounds
+    if hasattr(geometry, "hilbert_distance"):
+        distance = geometry.hilbert_distance(
+            total_bounds=total_bounds, level=_HILBERT_LEVEL
+        ).to_numpy()
+    else:
+        bounds = geometry.bounds.to_numpy()
+        distance = _hilbert_distance(
+            (bounds[:, 0] + bounds[:, 2]) / 2,
+            (bounds[:, 1] + bounds[:, 3]) / 2,
+            total_bounds,
+        )
+    order = np.concatenate(
+        [
+            np.flatnonzero(has_geometry)[np.argsort(distance, kind="stable")],
+            np.flatnonzero(~has_geometry),
+        ]
+    )
+    return gdf.iloc[order]
+
+
+def _to_parquet_writes_bbox() -> bool:
+    return (
+        "write_covering_bbox"
+        in inspect.signature(gpd.GeoDataFrame.to_parquet).parameters
+    )
+
+
+def write_geoparquet(
+    gdf: gpd.GeoDataFrame,
+    path: Path,
+    row_group_size: int = GEOPARQUET_ROW_GROUP_SIZE,
+) -> None:
+    """Writes a GeoDataFrame to GeoParquet, in spatial order with a `bbox`
+    column, so it can be read a bounding box at a time.
+
+    The index is written as a column if it is named, and left out if not.
+
+    Args:
+        gdf (GeoDataFrame): the rows to write
+        path (Path): the GeoParquet file to write
+        row_group_size (int): how many rows are stored in each row group (optional)
+
+    Returns:
+        None
+    """
+    gdf = sort_spatially(
+        gdf.reset_index() if gdf.index.name is not None else gdf
+    )
+    kwargs = {"index": False, "row_group_size": row_group_size}
+    if _to_parquet_writes_bbox():
+        kwargs["write_covering_bbox"] = True
+    else:
+        bounds = gdf.geometry.bounds
+        gdf = gdf.assign(
+            **{
+                BBOX_COLUMN: [
+                    dict(zip(["xmin", "ymin", "xmax", "ymax"], row))
+                    for row in bounds.itertuples(index=False)
+                ]
+            }
+        )
+
+    partial_path = path.with_name(path.name + ".part")
+    gdf.to_parquet(partial_path, **kwargs)
+    os.replace(partial_path, path)
+
+
+def read_geoparquet(
+    path: Path,
+    bbox: typing.Optional[typing.Tuple[float, float, float, float]] = None,
+    columns: typing.Optional[typing.List[str]] = None,
+) -> gpd.GeoDataFrame:
+    """Reads the rows of a GeoParquet file written by `write_geoparquet`
+    whose bounds intersect a bounding box.
+
+    Args:
+        path (Path): the GeoParquet file
+        bbox (Tuple[float, float, float, float]): the (xmin, ymin, xmax, ymax) to read the rows of; reads every row if None (optional)
+        columns (List[str]): the columns to read, besides the geometry; reads them all if None (optional)
+
+    Returns:
+        GeoDataFrame
+    """
+    if columns is not None and "geometry" not in columns:
+        columns = list(columns) + ["geometry"]
+    kwargs = {}
+    if bbox is not None:
+        xmin, ymin, xmax, ymax = bbox
+        kwargs["filters"] = (
+            (pc.field(BBOX_COLUMN, "xmin") <= xmax)
+            & (pc.field(BBOX_COLUMN, "xmax") >= xmin)
+            & (pc.field(BBOX_COLUMN, "ymin") <= ymax)
+            & (pc.field(BBOX_COLUMN, "ymax") >= ymin)
+        )
+    gdf = gpd.read_parquet(path, columns=columns, **kwargs)
+    return gdf.drop(columns=BBOX_COLUMN, errors="ignore")
+
+
+def write_flatgeobuf(gdf: gpd.GeoDataFrame, path: Path) -> None:
+    """Writes a GeoDataFrame to FlatGeobuf, with a spatial index.
+
+    The index is written as a column if it is named, and left out if not.
+
+    Args:
+        gdf (GeoDataFrame): the rows to write
+        path (Path): the FlatGeobuf file to write
+
+    Returns:
+        None
+    """
+    gdf = gdf.reset_index() if gdf.index.name is not None else gdf
+    # FlatGeobuf has no null geometries, and its index is only written if
+    # every feature has one
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+    # GDAL writes a directory of layers to a path without the .fgb suffix
+    partial_path = path.with_name(path.stem + ".part" + path.suffix)
+    gdf.to_file(
+        partial_path, driver="FlatGeobuf", index=False, SPATIAL_INDEX="YES"
+    )
+    os.replace(partial_path, path)
@@ -0,0 +1,110 @@
+"""Saves the prepared score dataframe, so that the score can be calculated
+again without joining the datasets and ranking their percentiles.
+
+The dataframe `ScoreETL` prepares is written as an uncompressed Arrow IPC
+file, which is read back by memory mapping it. Arrow reads an object column
+of booleans without missing values back as bool, so the pandas dtype of every
+column is saved with it and restored, and the score is calculated from the
+same dtypes as when the datasets are joined. The file records the fingerprint of what the dataframe was prepared from
+(see `data_pipeline.etl.fingerprint`), and is only read back while that
+fingerprint is unchanged.
+"""
+import json
+import os
+import typing
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# The key of the schema metadata the fingerprint is saved under
+PREPARED_SCORE_METADATA_KEY = b"data_pipeline.prepared_score"
+
+
+def save_prepared_score(
+    df: pd.DataFrame,
+    path: Path,
+    fingerprint: str,
+    metadata: typing.Optional[dict] = None,
+) -> None:
+    """Writes a prepared score dataframe to an uncompressed Arrow IPC file.
+
+    Args:
+        df (pd.DataFrame): the prepared score dataframe
+        path (Path): the file to write
+        fingerprint (str): the fingerprint of what the dataframe was prepared from
+        metadata (dict): other values to save with the dataframe, which must be JSON serializable (optional)
+
+    Returns:
+        None
+    """
+    logger.debug(f"Saving the prepared score to {path}")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            PREPARED_SCORE_METADATA_KEY: json.dumps(
+                {
+                    "fingerprint": fingerprint,
+                    "dtypes": df.dtypes.astype(str).to_dict(),
+                    "metadata": metadata or {},
+                }
+            ).encode(),
+        }
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(path.name + ".part")
+    with pa.OSFile(str(partial_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(partial_path, path)
+
+
+def load_prepared_score(
+    path: Path, fingerprint: str
+) -> typing.Optional[typing.Tuple[pd.DataFrame, dict]]:
+    """Reads a prepared score dataframe written by `save_prepared_score`.
+
+    Returns None if there is no file at path, or if it was prepared from
+    inputs with a different fingerprint, so the caller can prepare it again.
+
+    Args:
+        path (Path): the file to read
+        fingerprint (str): the fingerprint of what the dataframe must have been prepared from
+
+    Returns:
+        Tuple[pd.DataFrame, dict]: the prepared score dataframe, and the other values saved with it
+    """
+    if not path.is_file():
+        logger.debug(f"No prepared score found at {path}")
+        return None
+
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        saved = json.loads(
+            (reader.schema.metadata or {})[PREPARED_SCORE_METADATA_KEY]
+        )
+    except (pa.ArrowInvalid, OSError, KeyError, ValueError):
+        logger.warning(f"Ignoring unreadable prepared score {path}")
+        return None
+    if saved.get("fingerprint") != fingerprint:
+        logger.warning(
+            f"Ignoring prepared score at {path}: it was prepared from other "
+            "datasets, code or config"
+        )
+        return None
+
+    logger.debug(f"Loading the prepared score from {path}")
+    df = reader.read_all().to_pandas()
+    dtypes = {
+        column: dtype
+        for column, dtype in saved.get("dtypes", {}).items()
+        if str(df[column].dtype) != dtype
+    }
+    if dtypes:
+        df = df.astype(dtypes)
+    return df, saved.get("metadata", {})
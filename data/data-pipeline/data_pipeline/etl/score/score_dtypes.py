@@ -0,0 +1,171 @@
+"""The compact dtypes of the national score dataframe.
+
+The score is calculated with float64 columns, and with object columns of
+booleans that hold None for missing values. Once it is calculated, the ETLs
+downstream of it only read, merge and write it, so they hold it with smaller
+dtypes. The dtype of a column comes from the field names and the YAML
+configs:
+
+- the booleans are nullable booleans, a byte and a mask per value instead of
+  a pointer to a Python object;
+- the state and county names are categories;
+- the floats are float32 where every value is a whole number that float32
+  holds exactly (populations, counts and flags), so that they print, round
+  and compare as they did. Any other float stays float64, since its last
+  digits make it to the downloadable files.
+
+The tract ID is unique per row, so it stays a string: as a category it would
+take the same strings and their codes.
+
+Sums of the float32 columns overflow their precision, so aggregate them as
+float64.
+"""
+import functools
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from data_pipeline.content.schemas.download_schemas import CSVConfig
+from data_pipeline.content.schemas.download_schemas import ExcelConfig
+from data_pipeline.etl.base import ExtractTransformLoad
+from data_pipeline.etl.score.schemas.datasets import DatasetsConfig
+from data_pipeline.score import field_names
+from data_pipeline.utils import get_module_logger
+from data_pipeline.utils import load_yaml_dict_from_file
+
+logger = get_module_logger(__name__)
+
+BOOLEAN_DTYPE = "boolean"
+CATEGORY_DTYPE = "category"
+
+# The columns of the score that are booleans with missing values
+BOOLEAN_FIELDS = [
+    field_names.AML_BOOLEAN,
+    field_names.IMPUTED_INCOME_FLAG_FIELD_NAME,
+    field_names.ELIGIBLE_FUDS_BINARY_FIELD_NAME,
+    field_names.HISTORIC_REDLINING_SCORE_EXCEEDED,
+    field_names.IS_TRIBAL_DAC,
+    field_names.FINAL_SCORE_N_BOOLEAN_V1_0,
+]
+
+# The columns that repeat a few values over every tract
+CATEGORICAL_FIELDS = [
+    field_names.STATE_FIELD,
+    field_names.COUNTY_FIELD,
+    "State Abbreviation",
+]
+
+# The largest whole number float32 holds exactly, along with all those below
+FLOAT32_MAX_EXACT_INTEGER = 2**24
+
+
+@functools.lru_cache(maxsize=None)
+def get_score_dtypes() -> Dict[str, str]:
+    """Returns the compact dtype of the boolean and categorical columns of
+    the score, from the field names and the YAML configs.
+
+    Returns:
+        Dict[str, str]: the dtype of each column, by column name
+    """
+    dtypes = {field_name: BOOLEAN_DTYPE for field_name in BOOLEAN_FIELDS}
+
+    datasets_config = load_yaml_dict_from_file(
+        ExtractTransformLoad.DATASET_CONFIG_PATH / "datasets.yml",
+        DatasetsConfig,
+    )
+    for dataset in datasets_config["datasets"]:
+        for load_field in dataset["load_fields"]:
+            if load_field["field_type"] == "bool":
+                dtypes[load_field["long_name"]] = BOOLEAN_DTYPE
+
+    csv_config = load_yaml_dict_from_file(
+        ExtractTransformLoad.CONTENT_CONFIG / "csv.yml", CSVConfig
+    )
+    excel_config = load_yaml_dict_from_file(
+        ExtractTransformLoad.CONTENT_CONFIG / "excel.yml", ExcelConfig
+    )
+    download_fields = csv_config["fields"] + [
+        field for sheet in excel_config["sheets"] for field in sheet["fields"]
+    ]
+    for field in download_fields:
+        if field["format"] == "bool":
+            dtypes[field["score_name"]] = BOOLEAN_DTYPE
+
+    dtypes.update(
+        {field_name: CATEGORY_DTYPE for field_name in CATEGORICAL_FIELDS}
+    )
+    return dtypes
+
+
+def _is_boolean_column(series: pd.Series) -> bool:
+    return series.dtype == object and pd.api.types.infer_dtype(
+        series, skipna=True
+    ) in ("boolean", "empty")
+
+
+def _is_exact_in_float32(series: pd.Series) -> bool:
+    values = series.to_numpy()
+    values = values[~np.isnan(values)]
+    return bool(
+        (np.abs(values) <= FLOAT32_MAX_EXACT_INTEGER).all()
+        and (values == np.floor(values)).all()
+    )
+
+
+def compact_score_dtypes(df: pd.DataFrame) -> Dict[str, str]:
+    """Returns the compact dtype of each column of a score dataframe that
+    does not have it yet.
+
+    Args:
+        df (pd.DataFrame): a score dataframe
+
+    Returns:
+        Dict[str, str]: the compact dtype of each column to convert, by column name
+    """
+    score_dtypes = get_score_dtypes()
+    dtypes = {}
+    for column, series in df.items():
+        dtype = score_dtypes.get(column)
+        if dtype == BOOLEAN_DTYPE and _is_boolean_column(series):
+            dtypes[column] = BOOLEAN_DTYPE
+        elif dtype == CATEGORY_DTYPE and series.dtype == object:
+            dtypes[column] = CATEGORY_DTYPE
+        elif series.dtype == np.float64 and _is_exact_in_float32(series):
+            dtypes[column] = "float32"
+    return dtypes
+
+
+def compact_score_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the columns of a score dataframe to their compact dtypes.
+
+    The values of the dataframe are unchanged; see the module docstring for
+    the dtypes.
+
+    Args:
+        df (pd.DataFrame): a score dataframe
+
+    Returns:
+        pd.DataFrame: the score dataframe with compact dtypes
+    """
+    dtypes = compact_score_dtypes(df)
+    if not dtypes:
+        return df
+
+    memory_before = df.memory_usage(deep=True).sum() / 2**20
+    # The dataframe is built again at once, rather than with `astype`, so
+    # that its columns are consolidated into a block per dtype
+    df = pd.DataFrame(
+        {
+            column: series.astype(dtypes[column])
+            if column in dtypes
+            else series
+            for column, series in df.items()
+        },
+        index=df.index,
+    )
+    logger.debug(
+        f"Converted {len(dtypes)} score columns to compact dtypes, from "
+        f"{memory_before:.1f} MB to "
+        f"{df.memory_usage(deep=True).sum() / 2**20:.1f} MB"
+    )
+    return df
@@ -0,0 +1,298 @@
+"""Writes GeoDataFrames as ESRI shapefiles straight into zip archives.
+
+A shapefile is several files, so GDAL can only write one to disk, where it
+would then be read back to be zipped. Here the members of the shapefile are
+encoded in memory and streamed into an open `zipfile.ZipFile`: the `.shp`
+polygons and their `.shx` index, the `.dbf` attributes a chunk of rows at a
+time, and the `.prj` and `.cpg` files.
+
+Only polygons and multipolygons are written, like the score tracts; rows
+without a geometry get a null shape.
+"""
+import datetime
+import struct
+import typing
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from data_pipeline.utils import get_module_logger
+from shapely.geometry import MultiPolygon
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+
+logger = get_module_logger(__name__)
+
+# How many rows of the .dbf file are encoded at a time
+DBF_CHUNK_SIZE = 10_000
+
+_NULL_SHAPE = 0
+_POLYGON_SHAPE = 5
+
+# The widths and decimals of the .dbf fields, as OGR makes them
+_INTEGER_WIDTH = 18
+_REAL_WIDTH = 24
+_REAL_DECIMALS = 15
+_MAX_CHARACTER_WIDTH = 254
+
+
+def _polygon_record(
+    geometry: typing.Union[Polygon, MultiPolygon, None]
+) -> typing.Tuple[bytes, typing.Optional[np.ndarray]]:
+    """Encodes the content of a .shp record, and returns it with its bounds."""
+    if geometry is None or geometry.is_empty:
+        return struct.pack("<i", _NULL_SHAPE), None
+    if isinstance(geometry, Polygon):
+        polygons = [geometry]
+    elif isinstance(geometry, MultiPolygon):
+        polygons = list(geometry.geoms)
+    else:
+        raise ValueError(
+            f"Shapefiles can only have polygons, not {geometry.geom_type}"
+        )
+
+    # Shapefile exterior rings are clockwise, and holes counterclockwise
+    rings = []
+    for polygon in polygons:
+        polygon = orient(polygon, sign=-1.0)
+        rings.append(np.asarray(polygon.exterior.coords)[:, :2])
+        rings.extend(
+            np.asarray(interior.coords)[:, :2] for interior in polygon.interiors
+        )
+    points = np.concatenate(rings)
+    parts = np.cumsum([0] + [len(ring) for ring in rings[:-1]])
+    bounds = np.concatenate([points.min(axis=0), points.max(axis=0)])
+    return (
+        struct.pack("<i4d2i", _POLYGON_SHAPE, *bounds, len(rings), len(points))
+        + parts.astype("<i4").tobytes()
+        + points.astype("<f8").tobytes()
+    ), bounds
+
+
+def _shp_header(file_length: int, bounds: np.ndarray) -> bytes:
+    """Encodes the header of a .shp or .shx file; lengths are in bytes."""
+    return struct.pack(
+        ">7i", 9994, 0, 0, 0, 0, 0, file_length // 2
+    ) + struct.pack("<2i4d4d", 1000, _POLYGON_SHAPE, *bounds, 0, 0, 0, 0)
+
+
+def _write_shp(
+    zip_file: zipfile.ZipFile,
+    name: str,
+    geometry: gpd.GeoSeries,
+    compress_type: int,
+) -> None:
+    records = []
+    total_bounds = np.array([np.inf, np.inf, -np.inf, -np.inf])
+    for geometry_ in geometry:
+        content, bounds = _polygon_record(geometry_)
+        records.append(content)
+        if bounds is not None:
+            total_bounds[:2] = np.minimum(total_bounds[:2], bounds[:2])
+            total_bounds[2:] = np.maximum(total_bounds[2:], bounds[2:])
+    if not np.isfinite(total_bounds).all():
+        total_bounds = np.zeros(4)
+
+    lengths = np.array([len(content) for content in records], dtype=np.int64)
+    # Each record has an 8 byte header before its content
+    offsets = 100 + np.concatenate([[0], np.cumsum(lengths + 8)[:-1]])
+    shp_length = 100 + int((lengths + 8).sum())
+
+    with zip_file.open(
+        _zip_info(f"{name}.shp", compress_type), "w", force_zip64=True
+    ) as shp_file:
+        shp_file.write(_shp_header(shp_length, total_bounds))
+        for number, content in enumerate(records, start=1):
+            shp_file.write(struct.pack(">2i", number, len(content) // 2))
+            shp_file.write(content)
+
+    index = np.empty((len(records), 2), dtype=">i4")
+    index[:, 0] = offsets // 2
+    index[:, 1] = lengths // 2
+    zip_file.writestr(
+        f"{name}.shx",
+        _shp_header(100 + 8 * len(records), total_bounds) + index.tobytes(),
+        compress_type=compress_type,
+    )
+
+
+def _zip_info(member_name: str, compress_type: int) -> zipfile.ZipInfo:
+    """Describes a zip member that is streamed into the archive."""
+    info = zipfile.ZipInfo(member_name, datetime.datetime.now().timetuple()[:6])
+    info.compress_type = compress_type
+    return info
+
+
+def _dbf_field(
+    values: pd.Series,
+) -> typing.Tuple[str, int, int, typing.Callable[[pd.Series], np.ndarray]]:
+    """Returns the type, width and decimals of a .dbf field, and a function
+    that encodes the values of a chunk of rows as fixed width bytes."""
+    non_null = values.dropna()
+    if pd.api.types.is_bool_dtype(values) or (
+        values.dtype == object
+        and len(non_null)
+        and non_null.map(
+            lambda value: isinstance(value, (bool, np.bool_))
+        ).all()
+    ):
+
+        def encode_logical(chunk: pd.Series) -> np.ndarray:
+            encoded = np.full(len(chunk), b"?", dtype="S1")
+            known = chunk.notna().to_numpy()
+            encoded[known] = np.where(
+                chunk[known].astype(bool).to_numpy(), b"T", b"F"
+            )
+            return encoded
+
+        return "L", 1, 0, encode_logical
+
+    if pd.api.types.is_integer_dtype(values) or pd.api.types.is_float_dtype(
+        values
+    ):
+        if pd.api.types.is_integer_dtype(values):
+            width, decimals = _INTEGER_WIDTH, 0
+        else:
+            width, decimals = _REAL_WIDTH, _REAL_DECIMALS
+
+        def format_number(number: float) -> bytes:
+            formatted = b"%.*f" % (decimals, number)
+            # Numbers too long for the field are written in scientific
+            # notation, which dBase readers parse as well
+            if len(formatted) > width:
+                formatted = b"%.*e" % (width - 8, number)
+            return formatted.rjust(width)
+
+        def encode_number(chunk: pd.Series) -> np.ndarray:
+            numbers = chunk.to_numpy("float64", na_value=np.nan)
+            finite = np.isfinite(numbers)
+            encoded = np.full(len(chunk), b" " * width, dtype=f"S{width}")
+            encoded[finite] = [
+                format_number(number) for number in numbers[finite].tolist()
+            ]
+            return encoded
+
+        return "N", width, decimals, encode_number
+
+    def to_bytes(value) -> bytes:
+        if value is None or value is pd.NA or value is pd.NaT:
+            return b""
+        if isinstance(value, float) and np.isnan(value):
+            return b""
+        if isinstance(value, np.generic):
+            value = value.item()
+        # Values too long for a field are cut, at a whole character
+        return (
+            str(value)
+            .encode("utf-8")[:_MAX_CHARACTER_WIDTH]
+            .decode("utf-8", errors="ignore")
+            .encode("utf-8")
+        )
+
+    width = max([1] + [len(to_bytes(value)) for value in non_null.tolist()])
+
+    def encode_character(chunk: pd.Series) -> np.ndarray:
+        return np.array(
+            [to_bytes(value).ljust(width) for value in chunk.tolist()],
+            dtype=f"S{width}",
+        )
+
+    return "C", width, 0, encode_character
+
+
+def _write_dbf(
+    zip_file: zipfile.ZipFile,
+    name: str,
+    attributes: pd.DataFrame,
+    compress_type: int,
+    chunk_size: int,
+) -> None:
+    fields = []
+    for column in attributes.columns:
+        field_name = str(column).encode("ascii")
+        if len(field_name) > 10:
+            raise ValueError(
+                f"Shapefile field names have up to 10 characters: {column}"
+            )
+        fields.append((field_name, *_dbf_field(attributes[column])))
+
+    record_length = 1 + sum(width for _, _, width, _, _ in fields)
+    header_length = 32 + 32 * len(fields) + 1
+    today = datetime.date.today()
+    header = struct.pack(
+        "<4BIHH20x",
+        3,
+        today.year - 1900,
+        today.month,
+        today.day,
+        len(attributes),
+        header_length,
+        record_length,
+    )
+    for field_name, field_type, width, decimals, _ in fields:
+        header += struct.pack(
+            "<11sc4xBB14x",
+            field_name,
+            field_type.encode("ascii"),
+            width,
+            decimals,
+        )
+    header += b"\r"
+
+    with zip_file.open(
+        _zip_info(f"{name}.dbf", compress_type), "w", force_zip64=True
+    ) as dbf_file:
+        dbf_file.write(header)
+        for start in range(0, len(attributes), chunk_size):
+            chunk = attributes.iloc[start : start + chunk_size]
+            records = np.full(len(chunk), b" ", dtype="S1")
+            for (_, _, width, _, encode), column in zip(fields, chunk.columns):
+                records = np.char.add(records, encode(chunk[column]))
+            # Every value is its field's width, so each record is
+            # `record_length` bytes
+            dbf_file.write(records.astype(f"S{record_length}").tobytes())
+        dbf_file.write(b"\x1a")
+
+
+def write_shapefile_to_zip(
+    gdf: gpd.GeoDataFrame,
+    zip_file: zipfile.ZipFile,
+    name: str,
+    compress_type: int = zipfile.ZIP_DEFLATED,
+    chunk_size: int = DBF_CHUNK_SIZE,
+) -> None:
+    """Writes a GeoDataFrame as a shapefile, into an open zip archive.
+
+    Like `to_file`, the index is written as a field if it is named.
+
+    Args:
+        gdf (GeoDataFrame): the polygons to write; field names have to be 10 characters or less
+        zip_file (ZipFile): the archive to add the `.shp`, `.shx`, `.dbf`, `.prj` and `.cpg` members to
+        name (str): the name of the shapefile's members, without an extension
+        compress_type (int): how the members are compressed (optional)
+        chunk_size (int): how many rows of attributes are encoded at a time (optional)
+
+    Returns:
+        None
+    """
+    if gdf.index.name is not None:
+        gdf = gdf.reset_index()
+    geometry_name = gdf.geometry.name
+
+    _write_shp(zip_file, name, gdf.geometry, compress_type)
+    _write_dbf(
+        zip_file,
+        name,
+        gdf.drop(columns=geometry_name),
+        compress_type,
+        chunk_size,
+    )
+    if gdf.crs is not None:
+        zip_file.writestr(
+            f"{name}.prj",
+            gdf.crs.to_wkt("WKT1_ESRI"),
+            compress_type=compress_type,
+        )
+    zip_file.writestr(f"{name}.cpg", "UTF-8", compress_type=compress_type)
+    logger.debug(f"Wrote {len(gdf)} shapes to {name}.shp")
@@ -0,0 +1,122 @@
+# pylint: disable=W0212
+## Above disables warning about access to underscore-prefixed methods
+import functools
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+from data_pipeline.etl.score.etl_score import ScoreETL
+from data_pipeline.score import field_names
+
+
+def _tract_dfs() -> dict:
+    rng = np.random.default_rng(seed=40)
+    tract_ids = np.array([f"{i:011d}" for i in rng.permutation(300)])
+
+    tract_dfs = {}
+    for i in range(6):
+        tract_count = int(rng.integers(1, 300))
+        df = pd.DataFrame(
+            {
+                field_names.GEOID_TRACT_FIELD: pd.array(
+                    rng.choice(tract_ids, size=tract_count, replace=False),
+                    dtype="string",
+                ),
+                f"int {i}": rng.integers(0, 10, tract_count),
+                f"bool {i}": rng.random(tract_count) < 0.5,
+                f"float {i}": rng.random(tract_count),
+                f"str {i}": np.where(rng.random(tract_count) < 0.5, "x", None),
+            }
+        )
+        # The tract ID is not always the first column
+        if i % 2:
+            df = df[[f"int {i}", field_names.GEOID_TRACT_FIELD, f"float {i}"]]
+        tract_dfs[f"df {i}"] = df
+    return tract_dfs
+
+
+def _merge_tract_dfs(tract_dfs: dict) -> pd.DataFrame:
+    return functools.reduce(
+        lambda left, right: pd.merge(
+            left, right, on=field_names.GEOID_TRACT_FIELD, how="outer"
+        ),
+        tract_dfs.values(),
+    )
+
+
+def test_join_tract_dfs_matches_merge():
+    tract_dfs = _tract_dfs()
+
+    actual = ScoreETL()._join_tract_dfs(tract_dfs)
+
+    pdt.assert_frame_equal(
+        actual, _merge_tract_dfs(tract_dfs), check_exact=True
+    )
+
+
+def test_join_tract_dfs_with_shared_columns_matches_merge():
+    tract_dfs = _tract_dfs()
+    tract_dfs["df 1"] = tract_dfs["df 1"].rename(columns={"float 1": "float 0"})
+
+    actual = ScoreETL()._join_tract_dfs(tract_dfs)
+
+    pdt.assert_frame_equal(
+        actual, _merge_tract_dfs(tract_dfs), check_exact=True
+    )
+
+
+def test_rank_percentiles_matches_rank():
+    rng = np.random.default_rng(seed=40)
+    row_count = 500
+    df = pd.DataFrame(
+        {
+            # Many ties
+            "small ints": rng.integers(0, 5, row_count).astype(float),
+            "floats": rng.random(row_count),
+            "with nan": np.where(
+                rng.random(row_count) < 0.3,
+                np.nan,
+                rng.integers(0, 20, row_count),
+            ),
+            "with inf": np.where(
+                rng.random(row_count) < 0.1, np.inf, rng.random(row_count)
+            ),
+            "signed zeros": np.where(rng.random(row_count) < 0.5, 0.0, -0.0),
+            "all nan": np.full(row_count, np.nan),
+        }
+    )
+    ascending = np.array([True, False, True, False, True, False])
+
+    actual = ScoreETL._rank_percentiles(df.to_numpy(), ascending)
+
+    for column_index, column in enumerate(df.columns):
+        expected = df[column].rank(
+            pct=True, ascending=bool(ascending[column_index])
+        )
+        np.testing.assert_array_equal(actual[:, column_index], expected)
+
+
+def test_add_percentiles_to_df_drops_tracts():
+    df = pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: ["1", "2", "3", "4", "5"],
+            "to_rank": [3.0, 1.0, 3.0, np.nan, 2.0],
+        }
+    )
+
+    actual = ScoreETL._add_percentiles_to_df(
+        df=df,
+        input_column_name="to_rank",
+        output_column_name_root="low to_rank",
+        drop_tracts=["2"],
+        ascending=False,
+    )
+
+    pdt.assert_series_equal(
+        actual["low to_rank" + field_names.PERCENTILE_FIELD_SUFFIX],
+        df["to_rank"]
+        .where(df[field_names.GEOID_TRACT_FIELD] != "2")
+        .rank(pct=True, ascending=False)
+        .rename("low to_rank" + field_names.PERCENTILE_FIELD_SUFFIX),
+        check_exact=True,
+    )
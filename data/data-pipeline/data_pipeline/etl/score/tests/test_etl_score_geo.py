@@ -0,0 +1,254 @@
+import json
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.etl.score import constants
+from data_pipeline.etl.score.etl_score_geo import GeoScoreETL
+from data_pipeline.etl.score.geoparquet_writer import read_geoparquet
+from shapely.geometry import box
+
+
+def _geo_score_etl(layers, dissolve_max_workers=1):
+    # The tracts in Alabama and Alaska are bucketed, the 5 in Wyoming are
+    # kept as is
+    geoids = [f"01001{i:06d}" for i in range(200)]
+    geoids += [f"02001{i:06d}" for i in range(160)]
+    geoids += [f"56001{i:06d}" for i in range(5)]
+    etl = GeoScoreETL(layers=layers)
+    etl.DISSOLVE_MAX_WORKERS = dissolve_max_workers
+    etl.geojson_usa_df = gpd.GeoDataFrame(
+        {
+            "GEOID10": geoids,
+            # Tracts do not touch, so that buckets dissolve to multipolygons
+            "geometry": [
+                box(2 * i, 0, 2 * i + 1, 1) for i in range(len(geoids))
+            ],
+        },
+        crs="EPSG:4326",
+    )
+    etl.score_usa_df = pd.DataFrame(
+        {
+            "GTF": geoids,
+            "SN_C": np.arange(len(geoids)) % 3 == 0,
+            "P_BURD": np.linspace(0, 1, len(geoids)),
+            "TC": np.arange(len(geoids)) % 7,
+        }
+    )
+    return etl
+
+
+def test_transform_makes_a_low_zoom_frame_per_layer():
+    etl = _geo_score_etl(["default", "gistar_burd", "add_ind"])
+
+    etl.transform()
+
+    assert len(etl.geojson_score_usa_high) == 365
+    assert list(etl.geojson_score_usa_lows) == [
+        "default",
+        "gistar_burd",
+        "add_ind",
+    ]
+    for layer, field in [
+        ("default", "SCORE"),
+        ("gistar_burd", "P_BURD"),
+        ("add_ind", "TC"),
+    ]:
+        low = etl.geojson_score_usa_lows[layer]
+        assert list(low.columns) == [field, "geometry"]
+        # Buckets of tracts that do not touch, and the Wyoming tracts
+        assert len(low) == 365
+        assert sum(geometry.area for geometry in low.geometry) == 365
+
+
+def test_single_layer_matches_the_same_layer_made_with_others():
+    alone = _geo_score_etl(["gistar_burd"])
+    alone.transform()
+    together = _geo_score_etl(["default", "gistar_burd"])
+    together.transform()
+
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(alone.geojson_score_usa_lows["gistar_burd"]),
+        pd.DataFrame(together.geojson_score_usa_lows["gistar_burd"]),
+    )
+
+
+def test_buckets_are_dissolved_the_same_in_parallel():
+    serial = _geo_score_etl(["default", "gistar_burd"])
+    serial.transform()
+    parallel = _geo_score_etl(["default", "gistar_burd"], 2)
+    parallel.transform()
+
+    for layer in ["default", "gistar_burd"]:
+        serial_low = serial.geojson_score_usa_lows[layer]
+        parallel_low = parallel.geojson_score_usa_lows[layer]
+        pd.testing.assert_series_equal(
+            serial_low.iloc[:, 0], parallel_low.iloc[:, 0]
+        )
+        assert serial_low.geometry.geom_equals(parallel_low.geometry).all()
+
+
+def test_buckets_spanning_states_are_unioned():
+    etl = _geo_score_etl(["gistar_burd"])
+    etl.NUMBER_OF_BUCKETS = 2
+    etl.HOMOGENEITY_THRESHOLD = 1000
+    tracts = etl.geojson_usa_df.assign(P_BURD=etl.score_usa_df["P_BURD"])
+
+    bucketed, _ = etl._create_buckets_from_tracts(tracts, "P_BURD")
+    aggregated = etl._aggregate_buckets(bucketed, "P_BURD", agg_func="mean")
+
+    # P_BURD increases with the tract number, so the second bucket has the
+    # last tracts in Alabama and all of Alaska
+    assert list(aggregated.index) == [0, 1]
+    assert aggregated["P_BURD"].tolist() == pytest.approx(
+        bucketed.groupby("P_BURD_bucket")["P_BURD"].mean().tolist()
+    )
+    assert [len(geometry.geoms) for geometry in aggregated.geometry] == [
+        180,
+        180,
+    ]
+
+
+def test_load_writes_the_files_of_every_layer(tmp_path):
+    etl = _geo_score_etl(["gistar_burd", "add_ind"])
+    etl.SCORE_GEOJSON_ROOT = tmp_path
+    etl.SCORE_GEOPARQUET_FILE = tmp_path / "geoparquet" / "usa-high.parquet"
+    etl.SCORE_FLATGEOBUF_FILE = tmp_path / "flatgeobuf" / "usa-high.fgb"
+    etl.transform()
+
+    etl.load()
+
+    for layer in ["gistar_burd", "add_ind"]:
+        high, low = etl.get_geojson_paths(layer)
+        assert len(json.loads(high.read_text())["features"]) == 365
+        assert len(json.loads(low.read_text())["features"]) == 365
+    assert (
+        etl.get_geojson_paths("gistar_burd")[0].read_bytes()
+        == etl.get_geojson_paths("add_ind")[0].read_bytes()
+    )
+    # The high zoom score can be read a state at a time
+    wyoming_bbox = (720, 0, 730, 1)
+    for wyoming in [
+        read_geoparquet(etl.SCORE_GEOPARQUET_FILE, bbox=wyoming_bbox),
+        gpd.read_file(etl.SCORE_FLATGEOBUF_FILE, bbox=wyoming_bbox),
+    ]:
+        assert sorted(wyoming["GEOID10"]) == [f"56001{i:06d}" for i in range(5)]
+    assert len(read_geoparquet(etl.SCORE_GEOPARQUET_FILE)) == 365
+
+
+def test_load_packages_the_shapefile_in_memory(tmp_path, monkeypatch):
+    codebook_path = tmp_path / "downloadable" / "2.0-codebook.csv"
+    codebook_path.parent.mkdir()
+    codebook = "csv_label,excel_label,Description\nGTF,GTF,Census tract ID\n"
+    codebook_path.write_text(codebook)
+    versioned_zip_path = tmp_path / "downloadable" / "shapefile-codebook.zip"
+    monkeypatch.setattr(
+        constants, "SCORE_DOWNLOADABLE_CODEBOOK_FILE_PATH", codebook_path
+    )
+    monkeypatch.setattr(
+        constants,
+        "SCORE_VERSIONING_SHAPEFILE_CODEBOOK_FILE_PATH",
+        versioned_zip_path,
+    )
+    etl = _geo_score_etl(["default"])
+    etl.SCORE_GEOJSON_ROOT = tmp_path / "geojson"
+    etl.SCORE_GEOPARQUET_FILE = tmp_path / "geoparquet" / "usa-high.parquet"
+    etl.SCORE_FLATGEOBUF_FILE = tmp_path / "flatgeobuf" / "usa-high.fgb"
+    etl.SCORE_SHP_PATH = tmp_path / "shapefile"
+    etl.SCORE_SHP_FILE = etl.SCORE_SHP_PATH / "usa.shp"
+    etl.transform()
+
+    etl.load()
+
+    # Nothing but the zip file is written, and score-post's codebook is
+    # left as it is
+    assert [path.name for path in etl.SCORE_SHP_PATH.iterdir()] == ["usa.zip"]
+    assert codebook_path.read_text() == codebook
+    with zipfile.ZipFile(etl.SCORE_SHP_PATH / "usa.zip") as arcgis_zip:
+        assert sorted(arcgis_zip.namelist()) == [
+            "2.0-codebook.csv",
+            "usa.cpg",
+            "usa.dbf",
+            "usa.prj",
+            "usa.shp",
+            "usa.shx",
+        ]
+        combined_codebook = pd.read_csv(arcgis_zip.open("2.0-codebook.csv"))
+    assert "shapefile_label" in combined_codebook.columns
+    shapefile = gpd.read_file(f"zip://{etl.SCORE_SHP_PATH / 'usa.zip'}!usa.shp")
+    assert len(shapefile) == 365
+    assert shapefile.geometry.geom_equals(
+        etl.geojson_score_usa_high.geometry.reset_index(drop=True)
+    ).all()
+    with zipfile.ZipFile(versioned_zip_path) as versioned_zip:
+        assert (
+            versioned_zip.getinfo("usa.zip").compress_type == zipfile.ZIP_STORED
+        )
+        assert (
+            versioned_zip.read("usa.zip")
+            == (etl.SCORE_SHP_PATH / "usa.zip").read_bytes()
+        )
+        assert versioned_zip.read("2.0-codebook.csv") == (
+            combined_codebook.to_csv(index=False).encode()
+        )
+
+
+def test_geojson_paths():
+    etl = GeoScoreETL(layers=["default", "add_burd"])
+
+    high, low = etl.get_geojson_paths("add_burd")
+
+    assert (
+        high
+        == etl.SCORE_GEOJSON_ROOT / "add" / "burd" / "usa-high-add-burd.json"
+    )
+    assert (
+        low == etl.SCORE_GEOJSON_ROOT / "add" / "burd" / "usa-low-add-burd.json"
+    )
+    assert etl.get_geojson_paths("default") == (
+        etl.SCORE_HIGH_GEOJSON,
+        etl.SCORE_LOW_GEOJSON,
+    )
+
+
+def test_unknown_layer():
+    with pytest.raises(ValueError, match="GIS_BURD"):
+        GeoScoreETL(layers=["GIS_BURD"])
+
+
+def test_zoom_files_are_made_from_the_simplified_tracts(tmp_path):
+    etl = _geo_score_etl(["gistar_burd"])
+    etl.SCORE_GEOJSON_ROOT = tmp_path
+    etl.SCORE_GEOPARQUET_FILE = tmp_path / "geoparquet" / "usa-high.parquet"
+    etl.SCORE_FLATGEOBUF_FILE = tmp_path / "flatgeobuf" / "usa-high.fgb"
+    # Three quarters and half as wide as the full tracts
+    etl.geojson_usa_high_df = etl.geojson_usa_df.assign(
+        geometry=[
+            box(2 * i, 0, 2 * i + 0.75, 1)
+            for i in range(len(etl.geojson_usa_df))
+        ]
+    )
+    etl.geojson_usa_low_df = etl.geojson_usa_df.assign(
+        geometry=[
+            box(2 * i, 0, 2 * i + 0.5, 1)
+            for i in range(len(etl.geojson_usa_df))
+        ]
+    )
+
+    etl.transform()
+    etl.load()
+
+    def total_area(gdf):
+        return sum(geometry.area for geometry in gdf.geometry)
+
+    high_geojson_path, _ = etl.get_geojson_paths("gistar_burd")
+    assert total_area(gpd.read_file(high_geojson_path)) == 365 * 0.75
+    low = etl.geojson_score_usa_lows["gistar_burd"]
+    assert len(low) == 365
+    assert total_area(low) == 365 / 2
+    # The downloadable files have the full geometry
+    assert total_area(read_geoparquet(etl.SCORE_GEOPARQUET_FILE)) == 365
+    assert total_area(gpd.read_file(etl.SCORE_FLATGEOBUF_FILE)) == 365
+    assert total_area(etl.geojson_score_usa_high) == 365
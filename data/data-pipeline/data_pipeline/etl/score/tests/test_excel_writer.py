@@ -0,0 +1,82 @@
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from data_pipeline.etl.score.excel_writer import write_excel
+
+
+@pytest.fixture
+def score_df():
+    return pd.DataFrame(
+        {
+            "Census tract 2010 ID": [
+                "01001020100",
+                "01001020200",
+                "72001956300",
+            ],
+            "County Name": ["Autauga County", None, "Adjuntas Municipio"],
+            "Identified as disadvantaged": [True, False, True],
+            "Total population": pd.array([1993, pd.NA, 12], dtype="Int64"),
+            "Energy burden (percentile)": [0.12, np.nan, np.inf],
+            "Tract-level redlining": [True, None, False],
+        }
+    )
+
+
+def _read_excel(path, sheet_name=0):
+    return pd.read_excel(
+        path, sheet_name=sheet_name, dtype={"Census tract 2010 ID": str}
+    )
+
+
+def test_write_excel_matches_to_excel(score_df, tmp_path):
+    write_excel({"Data": score_df}, tmp_path / "fast.xlsx", column_width=30)
+    with pd.ExcelWriter(  # pylint: disable=abstract-class-instantiated
+        tmp_path / "to_excel.xlsx", engine="xlsxwriter"
+    ) as writer:
+        score_df.to_excel(writer, sheet_name="Data", index=False)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "fast.xlsx",
+        "to_excel.xlsx",
+    ]
+    pd.testing.assert_frame_equal(
+        _read_excel(tmp_path / "fast.xlsx"),
+        _read_excel(tmp_path / "to_excel.xlsx"),
+    )
+    worksheet = openpyxl.load_workbook(tmp_path / "fast.xlsx")["Data"]
+    assert worksheet["A1"].font.bold
+    assert worksheet.column_dimensions["A"].width == pytest.approx(30, abs=1)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_excel_sheets(score_df, tmp_path, max_workers):
+    path = tmp_path / "communities.xlsx"
+    sheets = {
+        "Data": score_df,
+        "Counties": score_df[["County Name"]].dropna(),
+        "Tracts": score_df[["Census tract 2010 ID", "Total population"]],
+    }
+
+    write_excel(sheets, path, column_width=30, max_workers=max_workers)
+
+    assert [child.name for child in tmp_path.iterdir()] == [path.name]
+    written = _read_excel(path, sheet_name=None)
+    assert list(written) == list(sheets)
+    for sheet_name, sheet_df in sheets.items():
+        assert list(written[sheet_name].columns) == list(sheet_df.columns)
+        assert len(written[sheet_name]) == len(sheet_df)
+    assert list(written["Tracts"]["Census tract 2010 ID"]) == list(
+        score_df["Census tract 2010 ID"]
+    )
+    assert list(written["Counties"]["County Name"]) == [
+        "Autauga County",
+        "Adjuntas Municipio",
+    ]
+    # Only the first sheet is selected when the workbook is opened
+    workbook = openpyxl.load_workbook(path)
+    assert [sheet.sheet_view.tabSelected for sheet in workbook] == [
+        True,
+        None,
+        None,
+    ]
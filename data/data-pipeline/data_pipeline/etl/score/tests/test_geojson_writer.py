@@ -0,0 +1,118 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.etl.score.geojson_writer import wkb_to_geojson
+from data_pipeline.etl.score.geojson_writer import write_geojson
+from shapely import wkb
+from shapely.geometry import GeometryCollection
+from shapely.geometry import LineString
+from shapely.geometry import MultiPolygon
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.geometry import mapping
+from shapely.geometry import shape
+
+
+@pytest.fixture
+def score_gdf():
+    square = Polygon(
+        [(0, 0), (1, 0), (1, 1), (0, 1)],
+        holes=[[(0.25, 0.25), (0.75, 0.25), (0.75, 0.75)]],
+    )
+    return gpd.GeoDataFrame(
+        {
+            "GEOID10": ["01001020100", "01001020200", "72001956300"],
+            "SN_C": [True, False, True],
+            "TC": [3, 0, 12],
+            "EBF_PFS": [0.123456789, np.nan, 1.0],
+            "TA": ["Tribe é", None, "Other"],
+        },
+        geometry=[
+            square,
+            MultiPolygon([square, Polygon([(2, 2), (3, 2), (3, 3.123456789)])]),
+            None,
+        ],
+        crs="EPSG:4326",
+    )
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        Point(-122.4194155, 37.7749295),
+        Point(1, 2, 3),
+        LineString([(0, 0), (1, 1), (2, 0)]),
+        GeometryCollection([Point(0, 0), LineString([(0, 0), (1, 1)])]),
+    ],
+)
+def test_wkb_to_geojson_matches_geo_interface(geometry):
+    for byte_order in (0, 1):
+        encoded = wkb_to_geojson(
+            wkb.dumps(geometry, big_endian=byte_order == 0)
+        )
+        assert shape(json.loads(encoded)).equals(geometry)
+
+
+def test_wkb_to_geojson_rounds_coordinates():
+    encoded = json.loads(
+        wkb_to_geojson(wkb.dumps(Point(-122.41941553, 37.77492951)), 3)
+    )
+    assert encoded == {"type": "Point", "coordinates": [-122.419, 37.775]}
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_geojson(score_gdf, tmp_path, max_workers):
+    path = tmp_path / "usa-high.json"
+
+    write_geojson(score_gdf, path, chunk_size=2, max_workers=max_workers)
+
+    with open(path, encoding="utf-8") as geojson_file:
+        written = json.load(geojson_file)
+    assert written["type"] == "FeatureCollection"
+    assert written["name"] == "usa-high"
+    assert (
+        written["crs"]["properties"]["name"] == "urn:ogc:def:crs:OGC:1.3:CRS84"
+    )
+    expected = score_gdf.__geo_interface__["features"]
+    assert len(written["features"]) == len(expected)
+    for feature, expected_feature in zip(written["features"], expected):
+        assert feature["properties"] == expected_feature["properties"]
+        if expected_feature["geometry"] is None:
+            assert feature["geometry"] is None
+        else:
+            assert shape(feature["geometry"]).equals(
+                shape(expected_feature["geometry"])
+            )
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_write_geojson_with_precision(score_gdf, tmp_path):
+    path = tmp_path / "usa-low.json"
+
+    write_geojson(score_gdf, path, precision=2)
+
+    with open(path, encoding="utf-8") as geojson_file:
+        written = json.load(geojson_file)
+    assert written["features"][1]["geometry"]["coordinates"][1][0][2] == [
+        3.0,
+        3.12,
+    ]
+    assert written["features"][0]["properties"]["EBF_PFS"] == 0.123456789
+    assert shape(written["features"][0]["geometry"]).equals(
+        shape(mapping(score_gdf.geometry[0]))
+    )
+
+
+def test_write_geojson_writes_named_index(score_gdf, tmp_path):
+    path = tmp_path / "usa-high.json"
+
+    write_geojson(score_gdf.set_index("GEOID10"), path)
+
+    with open(path, encoding="utf-8") as geojson_file:
+        written = json.load(geojson_file)
+    assert [
+        feature["properties"]["GEOID10"] for feature in written["features"]
+    ] == score_gdf["GEOID10"].tolist()
@@ -0,0 +1,86 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from data_pipeline.etl.score import geoparquet_writer
+from shapely.geometry import box
+
+
+@pytest.fixture
+def score_gdf():
+    # A 16 x 16 grid of tracts, in row order, and a tract without geometry
+    return gpd.GeoDataFrame(
+        {
+            "GEOID10": [f"01001{i:06d}" for i in range(257)],
+            "SN_C": [i % 2 == 0 for i in range(257)],
+            "TC": np.arange(257),
+        },
+        geometry=[
+            box(i % 16, i // 16, i % 16 + 1, i // 16 + 1) for i in range(256)
+        ]
+        + [None],
+        crs="EPSG:4326",
+    ).set_index("GEOID10")
+
+
+def test_sort_spatially(score_gdf):
+    ordered = geoparquet_writer.sort_spatially(score_gdf)
+
+    assert sorted(ordered.index) == sorted(score_gdf.index)
+    assert ordered.geometry.iloc[-1] is None
+    # Consecutive tracts are neighbours, as they are along a Hilbert curve
+    bounds = ordered.geometry.iloc[:-1].bounds
+    steps = bounds.diff().iloc[1:].abs()
+    assert (steps["minx"] <= 1).all() and (steps["miny"] <= 1).all()
+
+
+def test_sort_spatially_without_hilbert_distance(score_gdf, monkeypatch):
+    expected = geoparquet_writer.sort_spatially(score_gdf)
+    monkeypatch.delattr(
+        gpd.base.GeoPandasBase, "hilbert_distance", raising=False
+    )
+
+    assert list(geoparquet_writer.sort_spatially(score_gdf).index) == list(
+        expected.index
+    )
+
+
+def test_write_geoparquet(score_gdf, tmp_path):
+    path = tmp_path / "usa-high.parquet"
+
+    geoparquet_writer.write_geoparquet(score_gdf, path, row_group_size=50)
+
+    assert not list(tmp_path.glob("*.part"))
+    assert pq.ParquetFile(path).metadata.num_row_groups == 6
+    everything = geoparquet_writer.read_geoparquet(path)
+    assert list(everything.columns) == ["GEOID10", "SN_C", "TC", "geometry"]
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(everything.set_index("GEOID10").sort_index()),
+        pd.DataFrame(score_gdf),
+        check_like=True,
+    )
+
+    corner = geoparquet_writer.read_geoparquet(
+        path, bbox=(0.5, 0.5, 2.5, 1.5), columns=["GEOID10"]
+    )
+    assert list(corner.columns) == ["GEOID10", "geometry"]
+    assert sorted(corner["GEOID10"]) == [
+        f"01001{i:06d}" for i in [0, 1, 2, 16, 17, 18]
+    ]
+
+
+def test_write_flatgeobuf(score_gdf, tmp_path):
+    path = tmp_path / "usa-high.fgb"
+
+    geoparquet_writer.write_flatgeobuf(score_gdf, path)
+    # The file is replaced when it is written again
+    geoparquet_writer.write_flatgeobuf(score_gdf, path)
+
+    assert path.is_file()
+    assert [child.name for child in tmp_path.iterdir()] == ["usa-high.fgb"]
+    assert len(gpd.read_file(path)) == 256
+    corner = gpd.read_file(path, bbox=(0.5, 0.5, 2.5, 1.5))
+    assert sorted(corner["GEOID10"]) == [
+        f"01001{i:06d}" for i in [0, 1, 2, 16, 17, 18]
+    ]
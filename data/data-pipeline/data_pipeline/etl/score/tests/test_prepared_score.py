@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from data_pipeline.etl.score import constants
+from data_pipeline.etl.score.etl_score import ScoreETL
+from data_pipeline.etl.score.prepared_score import load_prepared_score
+from data_pipeline.etl.score.prepared_score import save_prepared_score
+from data_pipeline.score import field_names
+
+
+def _prepared_df():
+    return pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: ["01001020100", "72001956300", None],
+            field_names.TOTAL_POP_FIELD: [1200.0, np.nan, 35.0],
+            field_names.PM25_FIELD
+            + field_names.PERCENTILE_FIELD_SUFFIX: [
+                0.5,
+                1.0,
+                np.nan,
+            ],
+            field_names.AML_BOOLEAN: [True, None, False],
+            "count": np.array([1, 2, 3], dtype=np.int64),
+            "flag": [True, False, True],
+            # Arrow reads it back as bool
+            "object_flag": pd.Series([True, False, True], dtype=object),
+        }
+    )
+
+
+def test_prepared_score_round_trip(tmp_path):
+    path = tmp_path / "prepared" / "usa_prepared.arrow"
+    save_prepared_score(_prepared_df(), path, "abc", {"fields": ["a", "b"]})
+
+    df, metadata = load_prepared_score(path, "abc")
+
+    pd.testing.assert_frame_equal(df, _prepared_df(), check_exact=True)
+    assert type(df["object_flag"][0]) is bool
+    assert metadata == {"fields": ["a", "b"]}
+    assert not path.with_name(path.name + ".part").exists()
+
+
+def test_prepared_score_with_other_fingerprint_is_not_loaded(tmp_path):
+    path = tmp_path / "usa_prepared.arrow"
+    save_prepared_score(_prepared_df(), path, "abc")
+
+    assert load_prepared_score(path, "def") is None
+    assert load_prepared_score(tmp_path / "missing.arrow", "abc") is None
+
+
+def test_other_arrow_files_are_not_loaded(tmp_path):
+    path = tmp_path / "usa_prepared.arrow"
+    table = pa.Table.from_pandas(_prepared_df(), preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    assert load_prepared_score(path, "abc") is None
+
+    path.write_bytes(b"not an arrow file")
+    assert load_prepared_score(path, "abc") is None
+
+
+def test_score_etl_extracts_prepared_score(tmp_path, monkeypatch):
+    path = tmp_path / "usa_prepared.arrow"
+    monkeypatch.setattr(constants, "DATA_SCORE_PREPARED_FILE_PATH", path)
+    backfill_fields = [
+        field_names.PERCENT_BLACK_FIELD_NAME
+        + field_names.ISLAND_AREA_BACKFILL_SUFFIX
+    ]
+    save_prepared_score(
+        _prepared_df(),
+        path,
+        "abc",
+        {"island_demographic_backfill_fields": backfill_fields},
+    )
+
+    score_etl = ScoreETL(prepared_fingerprint="abc", from_prepared=True)
+    score_etl.extract()
+
+    pd.testing.assert_frame_equal(score_etl.df, _prepared_df())
+    assert score_etl.ISLAND_DEMOGRAPHIC_BACKFILL_FIELDS == backfill_fields
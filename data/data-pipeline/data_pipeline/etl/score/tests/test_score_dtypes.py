@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from data_pipeline.etl.score.score_dtypes import compact_score_df
+from data_pipeline.etl.score.score_dtypes import get_score_dtypes
+from data_pipeline.score import field_names
+
+
+def _score_df():
+    return pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: ["01001020100", "01001020200", "72"],
+            field_names.AML_BOOLEAN: [True, None, False],
+            field_names.STATE_FIELD: ["Alabama", "Alabama", None],
+            field_names.TOTAL_POP_FIELD: [1200.0, np.nan, 35.0],
+            field_names.PM25_FIELD
+            + field_names.PERCENTILE_FIELD_SUFFIX: [0.5, 1.0, np.nan],
+            "Large count": [2.0**25, 0.0, 1.0],
+            "flag": [True, False, True],
+        }
+    )
+
+
+def test_get_score_dtypes():
+    score_dtypes = get_score_dtypes()
+
+    assert score_dtypes[field_names.IS_TRIBAL_DAC] == "boolean"
+    # From the YAML configs
+    assert score_dtypes[field_names.AGRICULTURAL_VALUE_BOOL_FIELD] == "boolean"
+    assert score_dtypes[field_names.SCORE_N_COMMUNITIES] == "boolean"
+    assert score_dtypes[field_names.COUNTY_FIELD] == "category"
+    assert field_names.GEOID_TRACT_FIELD not in score_dtypes
+
+
+def test_compact_score_df():
+    df = compact_score_df(_score_df())
+
+    assert df.dtypes.to_dict() == {
+        field_names.GEOID_TRACT_FIELD: np.dtype(object),
+        field_names.AML_BOOLEAN: pd.BooleanDtype(),
+        field_names.STATE_FIELD: pd.CategoricalDtype(["Alabama"]),
+        field_names.TOTAL_POP_FIELD: np.dtype(np.float32),
+        field_names.PM25_FIELD
+        + field_names.PERCENTILE_FIELD_SUFFIX: np.dtype(np.float64),
+        "Large count": np.dtype(np.float64),
+        "flag": np.dtype(bool),
+    }
+    # The values are written as they were
+    assert df.to_csv(index=False) == _score_df().to_csv(index=False)
+
+
+def test_compact_score_df_is_idempotent():
+    df = compact_score_df(_score_df())
+
+    assert compact_score_df(df) is df
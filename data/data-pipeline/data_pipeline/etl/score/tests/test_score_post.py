@@ -11,6 +11,7 @@ from data_pipeline.content.schemas.download_schemas import CSVConfig
 from data_pipeline.etl.score import constants
 from data_pipeline.utils import load_yaml_dict_from_file
 from data_pipeline.etl.score.etl_score_post import PostScoreETL
+from data_pipeline.etl.score.score_dtypes import compact_score_df
 
 # See conftest.py for all fixtures used in these tests
 
@@ -77,8 +78,7 @@ def test_create_score_data(
         score_transformed_expected,
     )
     pdt.assert_frame_equal(
-        score_data_actual,
-        score_data_expected,
+        score_data_actual, compact_score_df(score_data_expected)
     )
 
 
@@ -0,0 +1,88 @@
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from data_pipeline.etl.score.shapefile_writer import write_shapefile_to_zip
+from shapely.geometry import MultiPolygon
+from shapely.geometry import Polygon
+
+
+@pytest.fixture
+def score_gdf():
+    square = Polygon(
+        [(0, 0), (1, 0), (1, 1), (0, 1)],
+        holes=[[(0.25, 0.25), (0.75, 0.25), (0.75, 0.75)]],
+    )
+    return gpd.GeoDataFrame(
+        {
+            "GEOID10": ["01001020100", "01001020200", "72001956300"],
+            "SN_C": [True, False, True],
+            "TC": [3, 0, 12],
+            "EBF_PFS": [0.123456789, np.nan, 1e30],
+            "TA": ["Tribe é", None, "é" * 200],
+        },
+        geometry=[
+            square,
+            MultiPolygon([square, Polygon([(2, 2), (3, 2), (3, 3.123456789)])]),
+            None,
+        ],
+        crs="EPSG:4326",
+    ).set_index("GEOID10")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 10])
+def test_write_shapefile_to_zip(score_gdf, tmp_path, chunk_size):
+    path = tmp_path / "usa.zip"
+
+    with zipfile.ZipFile(path, "w") as zip_file:
+        write_shapefile_to_zip(
+            score_gdf, zip_file, "usa", chunk_size=chunk_size
+        )
+
+    with zipfile.ZipFile(path) as zip_file:
+        assert zip_file.namelist() == [
+            "usa.shp",
+            "usa.shx",
+            "usa.dbf",
+            "usa.prj",
+            "usa.cpg",
+        ]
+        assert {info.compress_type for info in zip_file.infolist()} == {
+            zipfile.ZIP_DEFLATED
+        }
+    shapefile = gpd.read_file(f"zip://{path}!usa.shp")
+    assert shapefile.crs == score_gdf.crs
+    assert list(shapefile.columns) == [
+        "GEOID10",
+        "SN_C",
+        "TC",
+        "EBF_PFS",
+        "TA",
+        "geometry",
+    ]
+    assert list(shapefile["GEOID10"]) == list(score_gdf.index)
+    assert list(shapefile["SN_C"]) == [True, False, True]
+    assert list(shapefile["TC"]) == [3, 0, 12]
+    assert shapefile["EBF_PFS"][0] == 0.123456789
+    assert np.isnan(shapefile["EBF_PFS"][1])
+    assert shapefile["EBF_PFS"][2] == pytest.approx(1e30)
+    # Strings are cut to the longest a field can be, at a whole character
+    assert shapefile["TA"][0] == "Tribe é"
+    assert shapefile["TA"][2] == "é" * 127
+    assert (
+        shapefile.geometry[:2]
+        .geom_equals(score_gdf.geometry[:2].reset_index(drop=True))
+        .all()
+    )
+    assert shapefile.geometry[2] is None
+
+
+def test_long_field_names(score_gdf, tmp_path):
+    with zipfile.ZipFile(tmp_path / "usa.zip", "w") as zip_file:
+        with pytest.raises(ValueError, match="Total_population"):
+            write_shapefile_to_zip(
+                score_gdf.rename(columns={"TC": "Total_population"}),
+                zip_file,
+                "usa",
+            )
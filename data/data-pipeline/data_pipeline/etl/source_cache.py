@@ -0,0 +1,225 @@
+"""Keeps track of cached data sources with a manifest per data source.
+
+When a data source is fetched, a manifest records where it came from, the
+size and SHA-256 of what was downloaded, the ETag and Last-Modified date the
+server sent, and the size of every file written to its destination. The
+manifest is kept in a `.manifests` directory next to the destination.
+
+With the cache enabled, each data source is then either:
+
+- reused as is, when its files are all there and its content is pinned by an
+  `expected_sha256` that matches the manifest, or when it cannot be
+  revalidated (e.g. Census API data sources, or servers that gave neither an
+  ETag nor a Last-Modified date);
+- revalidated with a conditional GET when its files are all there and the
+  server gave an ETag or Last-Modified date, and only downloaded again if the
+  server says it changed. If the server cannot be reached, the cached copy is
+  used;
+- fetched again otherwise.
+
+A data source has changed when the SHA-256 of what is fetched differs from the
+one in its manifest; only the ETLs that use changed data sources need to run
+again.
+"""
+import dataclasses
+import enum
+import hashlib
+import json
+import time
+import typing
+from pathlib import Path
+
+import requests
+from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.datasource import FileDataSource
+from data_pipeline.etl.datasource import ZIPDataSource
+from data_pipeline.etl.downloader import DownloadedFile
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+MANIFESTS_DIRECTORY_NAME = ".manifests"
+
+
+class CacheDecision(enum.Enum):
+    """What to do with the cached copy of a data source."""
+
+    REUSE = "reuse"
+    REVALIDATE = "revalidate"
+    REFETCH = "refetch"
+
+
+@dataclasses.dataclass
+class SourceManifest:
+    """What was fetched for a data source, and when.
+
+    Attributes:
+    source : Optional[str]
+            the URL the data source was fetched from
+    size : int
+            the size of what was downloaded, in bytes
+    sha256 : str
+            the hex SHA-256 checksum of what was downloaded
+    etag : Optional[str]
+            the ETag the server sent
+    last_modified : Optional[str]
+            the Last-Modified date the server sent
+    files : Dict[str, int]
+            the size of every file written, by path relative to the
+            destination (the destination itself is "")
+    fetched_at : float
+            when the data source was fetched, as a UNIX timestamp
+    """
+
+    source: typing.Optional[str]
+    size: int
+    sha256: str
+    etag: typing.Optional[str] = None
+    last_modified: typing.Optional[str] = None
+    files: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_downloaded_file(
+        cls, data_source: DataSource, downloaded_file: DownloadedFile
+    ) -> "SourceManifest":
+        return cls(
+            source=data_source.source,
+            size=downloaded_file.size,
+            sha256=downloaded_file.sha256,
+            etag=downloaded_file.etag,
+            last_modified=downloaded_file.last_modified,
+            files=dict(downloaded_file.files),
+            fetched_at=time.time(),
+        )
+
+    def is_intact(self, destination: Path) -> bool:
+        """Whether every file written for the data source is still there, unchanged in size."""
+        for relative_path, size in self.files.items():
+            path = destination / relative_path
+            if not path.is_file() or path.stat().st_size != size:
+                return False
+        return bool(self.files)
+
+
+def get_manifest_path(data_source: DataSource) -> Path:
+    """Returns where the manifest of a data source is kept.
+
+    Several data sources can share a destination (e.g. ZIP files extracted in
+    the same directory), so the manifest is named after both the
+    destination and the source URL.
+    """
+    key = hashlib.sha256(
+        f"{data_source.source}\n{data_source.destination.name}".encode()
+    ).hexdigest()[:16]
+    return (
+        data_source.destination.parent
+        / MANIFESTS_DIRECTORY_NAME
+        / f"{data_source.destination.name}-{key}.json"
+    )
+
+
+def load_manifest(data_source: DataSource) -> typing.Optional[SourceManifest]:
+    """Reads the manifest of a data source, if it has a valid one."""
+    path = get_manifest_path(data_source)
+    if not path.is_file():
+        return None
+    try:
+        with open(path, encoding="utf-8") as manifest_file:
+            manifest = SourceManifest(**json.load(manifest_file))
+    except (OSError, ValueError, TypeError):
+        logger.warning(f"Ignoring unreadable data source manifest {path}")
+        return None
+    if manifest.source != data_source.source:
+        return None
+    return manifest
+
+
+def save_manifest(data_source: DataSource, manifest: SourceManifest) -> None:
+    """Writes the manifest of a data source."""
+    path = get_manifest_path(data_source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(dataclasses.asdict(manifest), manifest_file, indent=2)
+
+
+def get_cache_decision(
+    data_source: DataSource, manifest: typing.Optional[SourceManifest]
+) -> CacheDecision:
+    """Decides whether the cached copy of a data source can be used."""
+    if manifest is None or not manifest.is_intact(data_source.destination):
+        return CacheDecision.REFETCH
+    expected_sha256 = getattr(data_source, "expected_sha256", None)
+    if expected_sha256 is not None:
+        if expected_sha256.lower() == manifest.sha256:
+            return CacheDecision.REUSE
+        return CacheDecision.REFETCH
+    if isinstance(data_source, (FileDataSource, ZIPDataSource)) and (
+        manifest.etag or manifest.last_modified
+    ):
+        return CacheDecision.REVALIDATE
+    return CacheDecision.REUSE
+
+
+def fetch_data_source(
+    data_source: DataSource,
+    session: typing.Optional[requests.Session] = None,
+    use_cache: bool = False,
+    revalidate: bool = True,
+) -> bool:
+    """Fetches a data source, unless its cached copy can be used.
+
+    Args:
+        data_source (DataSource): the data source to fetch
+        session (requests.Session): session to download with (optional)
+        use_cache (bool): whether the cached copy can be used, if it is
+            still valid (optional)
+        revalidate (bool): whether to revalidate the cached copy with the
+            server; when False, it is used as is if its files are all there
+            (optional)
+
+    Returns:
+        bool: whether the data source changed since it was last fetched
+    """
+    manifest = load_manifest(data_source)
+    decision = (
+        get_cache_decision(data_source, manifest)
+        if use_cache
+        else CacheDecision.REFETCH
+    )
+    if decision is CacheDecision.REVALIDATE and not revalidate:
+        decision = CacheDecision.REUSE
+
+    if decision is CacheDecision.REUSE:
+        logger.debug(f"Using cached data source {data_source}")
+        return False
+
+    if decision is CacheDecision.REVALIDATE:
+        try:
+            downloaded_file = data_source.fetch(
+                session=session,
+                validators={
+                    "ETag": manifest.etag,
+                    "Last-Modified": manifest.last_modified,
+                },
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(
+                f"Could not revalidate data source {data_source}, using the "
+                f"cached copy: {e}"
+            )
+            return False
+    else:
+        downloaded_file = data_source.fetch(session=session)
+    if downloaded_file is None:
+        logger.debug(f"Cached data source {data_source} is up to date")
+        return False
+
+    save_manifest(
+        data_source,
+        SourceManifest.from_downloaded_file(data_source, downloaded_file),
+    )
+    changed = manifest is None or manifest.sha256 != downloaded_file.sha256
+    if changed:
+        logger.debug(f"Data source {data_source} changed")
+    return changed
@@ -6,6 +6,7 @@ import geopandas as gpd
 import pandas as pd
 from data_pipeline.etl.base import ExtractTransformLoad
 from data_pipeline.etl.sources.census.etl_utils import get_state_fips_codes
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
 from data_pipeline.utils import get_module_logger
 from data_pipeline.etl.datasource import DataSource
 from data_pipeline.etl.datasource import ZIPDataSource
@@ -26,6 +27,7 @@ class CensusETL(ExtractTransformLoad):
     GEOJSON_PATH = ExtractTransformLoad.DATA_PATH / "census" / "geojson"
     NATIONAL_TRACT_CSV_PATH = CSV_BASE_PATH / "us.csv"
     NATIONAL_TRACT_JSON_PATH = GEOJSON_BASE_PATH / "us_geo.parquet"
+    NATIONAL_TRACT_ADJACENCY_PATH = GEOJSON_BASE_PATH / "us_tract_adjacency.npz"
     GEOID_TRACT_FIELD_NAME: str = "GEOID10"
 
     def __init__(self):
@@ -188,11 +190,11 @@ class CensusETL(ExtractTransformLoad):
                         ]
                     )
 
-    def _load_national_geojson(self):
+    def _load_national_geojson(self) -> gpd.GeoDataFrame:
         """Create national geojson
 
         Returns:
-            None
+            the national tract geodataframe
         """
         logger.debug("Loading National GeoJson")
 
@@ -216,9 +218,22 @@ class CensusETL(ExtractTransformLoad):
             self.GEOID_TRACT_FIELD_NAME
         ].astype(str, errors="ignore")
         usa_df.to_parquet(self.NATIONAL_TRACT_JSON_PATH)
+        return usa_df
+
+    def _load_national_tract_adjacency(self, usa_df: gpd.GeoDataFrame):
+        """Create the national tract adjacency from the national geometry
+
+        Returns:
+            None
+        """
+        logger.debug("Saving national tract adjacency")
+        TractAdjacency.from_geodataframe(
+            usa_df, geoid_field=self.GEOID_TRACT_FIELD_NAME
+        ).save(self.NATIONAL_TRACT_ADJACENCY_PATH)
 
     def load(self) -> None:
-        """Create state CSVs, National CSV, and National GeoJSON
+        """Create state CSVs, National CSV, National GeoJSON and the
+        national tract adjacency
 
         Returns:
             None
@@ -230,6 +245,7 @@ class CensusETL(ExtractTransformLoad):
             self._load_into_state_csvs(fips_code)
 
         self._load_national_csv()
-        self._load_national_geojson()
+        usa_df = self._load_national_geojson()
+        self._load_national_tract_adjacency(usa_df)
 
         logger.debug("Census data complete")
@@ -1,13 +1,16 @@
 import os
 from collections import namedtuple
+from typing import Optional
 
 import geopandas as gpd
 import pandas as pd
 from data_pipeline.config import settings
 from data_pipeline.etl.base import ExtractTransformLoad
+from data_pipeline.etl.sources.census.etl import CensusETL
 from data_pipeline.etl.sources.census_acs.etl_imputations import (
     calculate_income_measures,
 )
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
 from data_pipeline.score import field_names
 from data_pipeline.utils import get_module_logger
 from data_pipeline.utils import unzip_file_from_url
@@ -434,6 +437,7 @@ class CensusACSETL(ExtractTransformLoad):
 
         self.df: pd.DataFrame
         self.geo_df: gpd.GeoDataFrame
+        self.tract_adjacency: Optional[TractAdjacency] = None
 
     def get_data_sources(self) -> [DataSource]:
         # Define the variables to retrieve
@@ -519,6 +523,12 @@ class CensusACSETL(ExtractTransformLoad):
             self.DATA_PATH / "census" / "geojson" / "us_geo.parquet",
         )
 
+        # Use the national tract adjacency saved by the census ETL when it is
+        # available, so it does not have to be recomputed here.
+        self.tract_adjacency = TractAdjacency.load(
+            CensusETL.NATIONAL_TRACT_ADJACENCY_PATH
+        )
+
     def transform(self) -> None:
         df = self.df
 
@@ -529,6 +539,13 @@ class CensusACSETL(ExtractTransformLoad):
             usa_geo_df=self.geo_df,
         )
 
+        # Otherwise build the tract adjacency once; it is kept on the instance
+        # so other neighbor-based calculations can reuse it.
+        if self.tract_adjacency is None:
+            self.tract_adjacency = TractAdjacency.from_geodataframe(
+                df, geoid_field=field_names.GEOID_TRACT_FIELD
+            )
+
         # Rename some fields.
         df = df.rename(
             columns={
@@ -806,6 +823,7 @@ class CensusACSETL(ExtractTransformLoad):
             geo_df=df,
             geoid_field=field_names.GEOID_TRACT_FIELD,
             minimum_population_required_for_imputation=self.MINIMUM_POPULATION_REQUIRED_FOR_IMPUTATION,
+            tract_adjacency=self.tract_adjacency,
         )
 
         logger.debug("Calculating with imputed values")
@@ -1,10 +1,14 @@
 from typing import Any
 from typing import List
 from typing import NamedTuple
+from typing import Optional
 from typing import Tuple
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+from data_pipeline.etl.sources.tract_adjacency import segment_means
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
 from data_pipeline.score import field_names
 from data_pipeline.utils import get_module_logger
 
@@ -13,34 +17,30 @@ from data_pipeline.utils import get_module_logger
 logger = get_module_logger(__name__)
 
 
-def _get_fips_mask(
-    geo_df: gpd.GeoDataFrame,
-    row: gpd.GeoSeries,
+def _get_fips_means(
+    values: pd.DataFrame,
+    geoids: pd.Series,
     fips_digits: int,
-    geoid_field: str = "GEOID10_TRACT",
-) -> pd.Series:
-    return (
-        geo_df[geoid_field].str[:fips_digits] == row[geoid_field][:fips_digits]
-    )
-
-
-def _get_neighbor_mask(
-    geo_df: gpd.GeoDataFrame, row: gpd.GeoSeries
-) -> pd.Series:
-    """Returns neighboring tracts."""
-    return geo_df["geometry"].touches(row["geometry"])
-
-
-def _choose_best_mask(
-    geo_df: gpd.GeoDataFrame,
-    masks_in_priority_order: List[pd.Series],
-    column_to_impute: str,
-) -> pd.Series:
-    for mask in masks_in_priority_order:
-        if any(geo_df[mask][column_to_impute].notna()):
-            return mask
-    # pylint: disable-next=broad-exception-raised
-    raise Exception("No mask found")
+) -> pd.DataFrame:
+    """Returns, for every row, the mean of each column over all the tracts
+    that share the first `fips_digits` of the tract ID (5 for the county, 2
+    for the state), skipping nulls."""
+    codes, uniques = pd.factorize(geoids.str[:fips_digits])
+    # Sort rows by FIPS prefix, keeping the original order within each
+    # prefix, so each prefix is one consecutive segment
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    segment_lengths = np.bincount(codes[order], minlength=len(uniques))
+
+    means = {}
+    for column in values.columns:
+        column_values = values[column].to_numpy(dtype=float, na_value=np.nan)
+        fips_means = np.append(
+            segment_means(column_values[order], segment_lengths), np.nan
+        )
+        # Rows without a FIPS code (code -1) get the trailing null
+        means[column] = fips_means[codes]
+    return pd.DataFrame(means, index=values.index, columns=values.columns)
 
 
 def _prepare_dataframe_for_imputation(
@@ -101,17 +101,28 @@ def calculate_income_measures(
     geoid_field: str,
     population_field: str = field_names.TOTAL_POP_FIELD,
     minimum_population_required_for_imputation: int = 1,
+    tract_adjacency: Optional[TractAdjacency] = None,
 ) -> pd.DataFrame:
     """Impute values based on geographic neighbors
 
     We only want to check neighbors a single time, so all variables
     that we impute get imputed here.
 
+    Each imputed value is the mean of the raw value over the best available
+    set of tracts: the tracts that touch the tract, then the tracts in the
+    same county, then the tracts in the same state. A set is used when at
+    least one of its tracts has a raw value. All three sets of means are
+    computed for every tract and variable at once from the tract adjacency,
+    instead of with a geometry query per tract.
+
     Takes in:
         required:
             impute_var_named_tup_list: list of named tuples (imputed field, raw field)
             geo_df: geo dataframe that already has the census shapefiles merged
             geoid field: tract level ID
+        optional:
+            tract_adjacency: a prebuilt adjacency covering the tracts in geo_df.
+                If not passed, it is built from the geometry of geo_df.
 
     Returns: non-geometry pd.DataFrame
     """
@@ -124,38 +135,36 @@ def calculate_income_measures(
         minimum_population_required_for_imputation=minimum_population_required_for_imputation,
     )
 
-    # Iterate through the dataframe to impute in place
-    ## TODO: We should probably convert this to a spatial join now that we are doing >1 imputation and it's taking a lot
-    ## of time, but thinking through how to do this while maintaining the masking will take some time. I think the best
-    ## way would be to (1) spatial join to all neighbors, and then (2) iterate to take the "smallest" set of neighbors...
-    ## but haven't implemented it yet.
-    for index, row in geo_df.iterrows():
-        if row[geoid_field] in tract_list:
-            neighbor_mask = _get_neighbor_mask(geo_df, row)
-            county_mask = _get_fips_mask(
-                geo_df=geo_df, row=row, fips_digits=5, geoid_field=geoid_field
-            )
-            ## TODO: Did CEQ decide to cut this?
-            state_mask = _get_fips_mask(
-                geo_df=geo_df, row=row, fips_digits=2, geoid_field=geoid_field
-            )
+    if tract_adjacency is None:
+        tract_adjacency = TractAdjacency.from_geodataframe(
+            geo_df, geoid_field=geoid_field
+        )
 
-            # Impute fields for every row missing at least one value using the best possible set of neighbors
-            # Note that later, we will pull raw.fillna(imputed), so the mechanics of this step aren't critical
-            for impute_var_pair in impute_var_named_tup_list:
-                mask_to_use = _choose_best_mask(
-                    geo_df=geo_df,
-                    masks_in_priority_order=[
-                        neighbor_mask,
-                        county_mask,
-                        state_mask,
-                    ],
-                    column_to_impute=impute_var_pair.raw_field_name,
-                )
+    raw_fields = [
+        impute_var_pair.raw_field_name
+        for impute_var_pair in impute_var_named_tup_list
+    ]
+    geoids = geo_df[geoid_field]
+    raw_values = geo_df[raw_fields].apply(pd.to_numeric).astype(float)
+
+    # Impute fields for every row missing at least one value using the best possible set of neighbors
+    # Note that later, we will pull raw.fillna(imputed), so the mechanics of this step aren't critical
+    logger.debug("Calculating neighbor, county and state means")
+    imputed_values = (
+        tract_adjacency.neighbor_mean(geoids, raw_values)
+        .fillna(_get_fips_means(raw_values, geoids, fips_digits=5))
+        .fillna(_get_fips_means(raw_values, geoids, fips_digits=2))
+    )
 
-                geo_df.loc[index, impute_var_pair.imputed_field_name] = geo_df[
-                    mask_to_use
-                ][impute_var_pair.raw_field_name].mean()
+    rows_to_impute = geoids.isin(tract_list)
+    if imputed_values[rows_to_impute].isna().any(axis=None):
+        # pylint: disable-next=broad-exception-raised
+        raise Exception("No mask found")
+
+    for impute_var_pair in impute_var_named_tup_list:
+        geo_df.loc[
+            rows_to_impute, impute_var_pair.imputed_field_name
+        ] = imputed_values.loc[rows_to_impute, impute_var_pair.raw_field_name]
 
     logger.debug("Casting geodataframe as a typical dataframe")
     # get rid of the geometry column and cast as a typical df
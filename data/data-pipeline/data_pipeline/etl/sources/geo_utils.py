@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional
 
 import geopandas as gpd
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
 from data_pipeline.etl.sources.tribal.etl import TribalETL
 from data_pipeline.utils import get_module_logger
 
@@ -33,6 +34,31 @@ def get_tract_geojson(
     return tract_data
 
 
+@lru_cache()
+def get_tract_adjacency(
+    _tract_data_path: Optional[Path] = None,
+) -> TractAdjacency:
+    """Loads the national tract adjacency saved by the census ETL.
+
+    If it is missing or out of date, it is rebuilt from the tract geometry
+    (and saved again when using the national tract geometry).
+    """
+    if _tract_data_path is None:
+        tract_adjacency = TractAdjacency.load(
+            CensusETL.NATIONAL_TRACT_ADJACENCY_PATH
+        )
+        if tract_adjacency is not None:
+            return tract_adjacency
+
+    logger.debug("Building tract adjacency from tract geometry")
+    tract_adjacency = TractAdjacency.from_geodataframe(
+        get_tract_geojson(_tract_data_path)
+    )
+    if _tract_data_path is None:
+        tract_adjacency.save(CensusETL.NATIONAL_TRACT_ADJACENCY_PATH)
+    return tract_adjacency
+
+
 @lru_cache()
 def get_tribal_geojson(
     _tribal_data_path: Optional[Path] = None,
@@ -0,0 +1,241 @@
+"""Census tract adjacency: which tracts share a boundary with which.
+
+The adjacency is computed once with a spatial index and stored as a
+compressed sparse row (CSR) neighbor list, so that callers that need
+"the neighbors of every tract" (income imputation, donut hole scoring)
+can work on whole columns at a time instead of running a geometry
+predicate against the full national table for every tract.
+
+`CensusETL.load` saves the national adjacency next to the national tract
+parquet so it only has to be computed once per census run.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from typing import Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from data_pipeline.score import field_names
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+
+@dataclass
+class TractAdjacency:
+    """A CSR neighbor list of census tracts.
+
+    Attributes:
+    geoids : np.ndarray
+            the tract ID of every node in the graph
+    indptr : np.ndarray
+            offsets into `indices`, of length len(geoids) + 1. The neighbors of
+            geoids[i] are geoids[indices[indptr[i]:indptr[i + 1]]]
+    indices : np.ndarray
+            node positions of the neighbors of each tract
+    land_area : np.ndarray
+            the land area of every tract, when the geometry it was built from
+            has one (optional)
+    """
+
+    # Bump this whenever the way the adjacency is computed or stored changes,
+    # so that previously saved adjacency files get rebuilt.
+    FORMAT_VERSION = 1
+
+    geoids: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    land_area: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_pairs(
+        cls,
+        geoids: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        land_area: Optional[np.ndarray] = None,
+    ) -> "TractAdjacency":
+        """Builds the CSR neighbor list from (node, neighbor) position pairs."""
+        order = np.lexsort((right, left))
+        left, right = left[order], right[order]
+        indptr = np.zeros(len(geoids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(left, minlength=len(geoids)), out=indptr[1:])
+        return cls(
+            geoids=np.asarray(geoids, dtype=object),
+            indptr=indptr,
+            indices=right.astype(np.int64),
+            land_area=land_area,
+        )
+
+    @classmethod
+    def from_geodataframe(
+        cls, geo_df: gpd.GeoDataFrame, geoid_field: str = "GEOID10_TRACT"
+    ) -> "TractAdjacency":
+        """Builds the adjacency of the tracts in geo_df.
+
+        Two tracts are neighbors when their geometries touch, which is the
+        same predicate as `GeoSeries.touches`. Tracts with a missing or empty
+        geometry have no neighbors.
+        """
+        logger.debug(f"Building tract adjacency for {len(geo_df)} tracts")
+        geometry = geo_df.geometry.reset_index(drop=True)
+        has_geometry = (geometry.notna() & ~geometry.is_empty).to_numpy()
+        positions = np.flatnonzero(has_geometry)
+        geometry = geometry[has_geometry].reset_index(drop=True)
+
+        left, right = geometry.sindex.query_bulk(geometry, predicate="touches")
+        left, right = positions[left], positions[right]
+        not_self = left != right
+
+        land_area = None
+        if field_names.LAND_AREA_FIELD in geo_df.columns:
+            land_area = _to_float_array(geo_df[field_names.LAND_AREA_FIELD])
+
+        adjacency = cls.from_pairs(
+            geoids=geo_df[geoid_field].astype(str).to_numpy(),
+            left=left[not_self],
+            right=right[not_self],
+            land_area=land_area,
+        )
+        logger.debug(
+            f"Found {len(adjacency.indices)} tract adjacencies (directed)"
+        )
+        return adjacency
+
+    def save(self, path: Path) -> None:
+        """Writes the adjacency to an uncompressed numpy archive."""
+        logger.debug(f"Saving tract adjacency to {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "version": np.array(self.FORMAT_VERSION),
+            "geoids": self.geoids.astype(str),
+            "indptr": self.indptr,
+            "indices": self.indices,
+        }
+        if self.land_area is not None:
+            arrays["land_area"] = self.land_area
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TractAdjacency"]:
+        """Reads an adjacency written by `save`.
+
+        Returns None if there is no file at path or if it was written by a
+        different version of this class, so the caller can rebuild it.
+        """
+        if not path.is_file():
+            logger.debug(f"No tract adjacency found at {path}")
+            return None
+
+        with np.load(path, allow_pickle=False) as arrays:
+            version = int(arrays["version"])
+            if version != cls.FORMAT_VERSION:
+                logger.warning(
+                    f"Ignoring tract adjacency at {path}: it is version "
+                    f"{version}, expected {cls.FORMAT_VERSION}"
+                )
+                return None
+
+            logger.debug(f"Loading tract adjacency from {path}")
+            return cls(
+                geoids=arrays["geoids"].astype(object),
+                indptr=arrays["indptr"],
+                indices=arrays["indices"],
+                land_area=(
+                    arrays["land_area"] if "land_area" in arrays else None
+                ),
+            )
+
+    def neighbor_pairs(
+        self, geoids: pd.Series
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns every (tract, neighbor) pair of rows where both tracts are in geoids.
+
+        Args:
+            geoids (pd.Series): tract IDs of a dataframe, which must be unique
+
+        Returns:
+            two arrays of row positions into `geoids`: the tract and its neighbor
+        """
+        geoid_index = pd.Index(geoids.astype(str))
+        if not geoid_index.is_unique:
+            raise ValueError("Tract IDs must be unique to look up neighbors")
+
+        node_rows = geoid_index.get_indexer(self.geoids)
+        nodes = np.repeat(np.arange(len(self.geoids)), np.diff(self.indptr))
+        left, right = node_rows[nodes], node_rows[self.indices]
+        both_present = (left >= 0) & (right >= 0)
+        return left[both_present], right[both_present]
+
+    def neighbor_mean(
+        self, geoids: pd.Series, values: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Averages values over the neighbors of each tract.
+
+        This is a sparse product of the adjacency and the values that skips
+        nulls, so a tract whose neighbors are all null (or that has no
+        neighbors) gets a null mean.
+
+        Args:
+            geoids (pd.Series): tract IDs of the rows of `values`
+            values (pd.DataFrame): numeric columns to average
+
+        Returns:
+            a dataframe shaped like `values` with the neighbor means
+        """
+        left, right = self.neighbor_pairs(geoids)
+        order = np.lexsort((right, left))
+        left, right = left[order], right[order]
+        neighbor_counts = np.bincount(left, minlength=len(values))
+
+        return pd.DataFrame(
+            {
+                column: segment_means(
+                    _to_float_array(values[column])[right], neighbor_counts
+                )
+                for column in values.columns
+            },
+            index=values.index,
+            columns=values.columns,
+        )
+
+
+def _to_float_array(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series).to_numpy(dtype=float, na_value=np.nan)
+
+
+def segment_means(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Means of consecutive segments of values, skipping nulls.
+
+    The segments are summed exactly the way `pd.Series.mean` sums them (nulls
+    count as zero in a pairwise sum), so each result is bit-identical to
+    calling `.mean()` on that segment. Segments with no values are null.
+
+    Args:
+        values (np.ndarray): the values of all segments, one after the other
+        lengths (np.ndarray): the length of each segment
+
+    Returns:
+        an array with one mean per segment
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    not_null = ~np.isnan(values)
+    filled = np.where(not_null, values, 0.0)
+
+    sums = np.zeros(len(lengths))
+    counts = np.zeros(len(lengths))
+    # Gathering segments of the same length into the rows of a matrix lets
+    # numpy sum each row contiguously, i.e. with the same pairwise summation
+    # as a one dimensional sum.
+    for length in np.unique(lengths[lengths > 0]):
+        segments = np.flatnonzero(lengths == length)
+        positions = starts[segments, np.newaxis] + np.arange(length)
+        sums[segments] = filled[positions].sum(axis=1)
+        counts[segments] = not_null[positions].sum(axis=1)
+
+    with np.errstate(invalid="ignore"):
+        return sums / counts
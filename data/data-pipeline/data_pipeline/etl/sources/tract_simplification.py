@@ -0,0 +1,186 @@
+"""Census tract geometry simplified for the zooms of the map tiles.
+
+TIGER tract boundaries have far more vertices than can be seen at the zooms
+the map is tiled at, and the geo score GeoJSON files and tippecanoe's work
+grow with them. Here the national tracts are simplified once per zoom band,
+to half a tile unit at the band's highest zoom, so nothing visible is lost.
+
+Tracts are simplified as a coverage: a boundary shared by two tracts is
+simplified once, the same way for both, so simplification opens no gaps or
+overlaps between tracts and the low zoom buckets still dissolve cleanly.
+
+The simplified tracts are cached next to the national tract parquet, and
+rebuilt when it is newer than them.
+"""
+import os
+import typing
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+from data_pipeline.utils import get_module_logger
+from shapely.ops import linemerge
+from shapely.ops import polygonize
+from shapely.ops import unary_union
+
+logger = get_module_logger(__name__)
+
+# Bump this whenever the way the tracts are simplified or stored changes, so
+# that previously cached tracts get rebuilt.
+FORMAT_VERSION = 1
+
+# The highest zoom of the map tiles made from each band of tracts
+ZOOM_BANDS = {"high": 11, "low": 7}
+
+# The size of a map tile, in tile units
+TILE_EXTENT = 4096
+
+
+def get_tolerance(max_zoom: int) -> float:
+    """Returns half a tile unit at a zoom, in degrees of longitude.
+
+    Args:
+        max_zoom (int): the highest zoom the simplified geometry is shown at
+
+    Returns:
+        float
+    """
+    return 360 / (2**max_zoom * TILE_EXTENT) / 2
+
+
+def _simplify_coverage_by_arcs(
+    geometry: gpd.GeoSeries, tolerance: float
+) -> gpd.GeoSeries:
+    """Simplifies a coverage arc by arc, for shapely without coverage_simplify.
+
+    The boundaries of the polygons are split into arcs between the points
+    where more than two polygons meet, each arc is simplified once, and the
+    polygons are rebuilt from the faces of the simplified arcs. A polygon
+    that keeps no face is simplified on its own instead.
+    """
+    has_geometry = (geometry.notna() & ~geometry.is_empty).to_numpy()
+    boundaries = unary_union(list(geometry[has_geometry].boundary))
+    arcs = linemerge(boundaries)
+    arcs = [
+        arc.simplify(tolerance, preserve_topology=True)
+        for arc in getattr(arcs, "geoms", [arcs])
+    ]
+    faces = gpd.GeoSeries(list(polygonize(arcs)), crs=geometry.crs)
+
+    # Each face belongs to the polygon its interior point is in
+    positions = pd.Series(range(len(geometry)))[has_geometry].to_numpy()
+    tree_geometry = geometry[has_geometry].reset_index(drop=True)
+    face_positions, polygon_positions = tree_geometry.sindex.query_bulk(
+        faces.representative_point(), predicate="within"
+    )
+    face_groups = (
+        pd.Series(face_positions)
+        .groupby(positions[polygon_positions])
+        .agg(list)
+    )
+
+    simplified = []
+    for position, polygon in enumerate(geometry):
+        if position in face_groups.index:
+            simplified.append(
+                unary_union(list(faces.iloc[face_groups[position]]))
+            )
+        elif polygon is None or polygon.is_empty:
+            simplified.append(polygon)
+        else:
+            simplified.append(
+                polygon.simplify(tolerance, preserve_topology=True)
+            )
+    return gpd.GeoSeries(simplified, index=geometry.index, crs=geometry.crs)
+
+
+def simplify_coverage(
+    geometry: gpd.GeoSeries, tolerance: float
+) -> gpd.GeoSeries:
+    """Simplifies polygons that share their boundaries, keeping them shared.
+
+    Args:
+        geometry (GeoSeries): polygons that do not overlap, like census tracts
+        tolerance (float): how far the simplified boundaries can be from the original ones, in the units of the geometry's CRS
+
+    Returns:
+        GeoSeries: the simplified polygons, with the same index
+    """
+    coverage_simplify = getattr(shapely, "coverage_simplify", None)
+    if coverage_simplify is None:
+        return _simplify_coverage_by_arcs(geometry, tolerance)
+
+    has_geometry = (geometry.notna() & ~geometry.is_empty).to_numpy()
+    simplified = geometry.copy()
+    simplified[has_geometry] = coverage_simplify(
+        geometry[has_geometry].to_numpy(), tolerance
+    )
+    return simplified
+
+
+def get_simplified_tracts_path(tract_data_path: Path, band: str) -> Path:
+    """Returns where the tracts of a band are cached
+
+    Args:
+        tract_data_path (Path): the national tract parquet
+        band (str): one of `ZOOM_BANDS`
+
+    Returns:
+        Path
+    """
+    return tract_data_path.with_name(
+        f"{tract_data_path.stem}_simplified_{band}_v{FORMAT_VERSION}.parquet"
+    )
+
+
+def get_simplified_tracts(
+    tract_data_path: Path,
+    bands: typing.List[str],
+    columns: typing.Optional[typing.List[str]] = None,
+) -> typing.Dict[str, gpd.GeoDataFrame]:
+    """Loads the national tracts simplified for each zoom band.
+
+    Bands that are not cached, or whose cache is older than the national
+    tracts, are simplified and cached again.
+
+    Args:
+        tract_data_path (Path): the national tract parquet
+        bands (List[str]): the zoom bands to load (see `ZOOM_BANDS`)
+        columns (List[str]): the columns to load; loads them all if None (optional)
+
+    Returns:
+        Dict[str, GeoDataFrame]: the tracts of each band
+    """
+    unknown_bands = set(bands) - set(ZOOM_BANDS)
+    if unknown_bands:
+        raise ValueError(
+            f"Unknown zoom band(s): {', '.join(sorted(unknown_bands))}"
+        )
+
+    source_mtime = tract_data_path.stat().st_mtime_ns
+    tracts = {}
+    source_df = None
+    for band in bands:
+        path = get_simplified_tracts_path(tract_data_path, band)
+        if path.is_file() and path.stat().st_mtime_ns >= source_mtime:
+            logger.debug(f"Loading {band} zoom tracts from {path}")
+            tracts[band] = gpd.read_parquet(path, columns=columns)
+            continue
+
+        if source_df is None:
+            source_df = gpd.read_parquet(tract_data_path)
+        tolerance = get_tolerance(ZOOM_BANDS[band])
+        logger.info(
+            f"Simplifying tracts for zooms up to {ZOOM_BANDS[band]} "
+            f"(tolerance {tolerance:.2e})"
+        )
+        band_df = source_df.copy()
+        band_df[band_df.geometry.name] = simplify_coverage(
+            source_df.geometry, tolerance
+        )
+        partial_path = path.with_name(path.name + ".part")
+        band_df.to_parquet(partial_path)
+        os.replace(partial_path, path)
+        tracts[band] = band_df if columns is None else band_df[columns]
+    return tracts
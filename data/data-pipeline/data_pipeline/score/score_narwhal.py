@@ -1,4 +1,8 @@
+from typing import Dict
+from typing import List
+from typing import Optional
 from typing import Tuple
+from typing import Union
 
 import data_pipeline.etl.score.constants as constants
 import data_pipeline.score.field_names as field_names
@@ -12,9 +16,19 @@ from data_pipeline.utils import get_module_logger
 
 logger = get_module_logger(__name__)
 
+ColumnValues = Union[np.ndarray, pd.Series]
+
 
 class ScoreNarwhal(Score):
-    """Score N, aka Narwhal."""
+    """Score N, aka Narwhal.
+
+    The indicators are evaluated as boolean NumPy masks. The masks that every
+    factor uses (low income, island areas and the FIPS codes that some
+    thresholds skip) are computed once per score, and the percentiles of all
+    of the burden indicators are compared to their threshold as one block.
+    The columns the factors add are collected as they are computed, and added
+    to the score dataframe together.
+    """
 
     LOW_INCOME_THRESHOLD: float = 0.65  # this is the low income threshold that gets compared against the other indicators. It is a percentile rank
     MAX_COLLEGE_ATTENDANCE_THRESHOLD: float = 0.20
@@ -28,14 +42,175 @@ class ScoreNarwhal(Score):
     LOW_INCOME_THRESHOLD_DONUT: float = 0.50
     SCORE_THRESHOLD_DONUT: float = 1.00
 
+    # The fields whose percentiles are compared to the
+    # ENVIRONMENTAL_BURDEN_THRESHOLD
+    BURDEN_PERCENTILE_FIELDS: List[str] = [
+        # Climate
+        field_names.EXPECTED_POPULATION_LOSS_RATE_FIELD,
+        field_names.EXPECTED_AGRICULTURE_LOSS_RATE_FIELD,
+        field_names.EXPECTED_BUILDING_LOSS_RATE_FIELD,
+        field_names.FUTURE_FLOOD_RISK_FIELD,
+        field_names.FUTURE_WILDFIRE_RISK_FIELD,
+        # Energy
+        field_names.ENERGY_BURDEN_FIELD,
+        field_names.PM25_FIELD,
+        # Transportation
+        field_names.DIESEL_FIELD,
+        field_names.DOT_TRAVEL_BURDEN_FIELD,
+        field_names.TRAFFIC_FIELD,
+        # Housing
+        field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_FIELD,
+        field_names.LEAD_PAINT_FIELD,
+        field_names.HOUSING_BURDEN_FIELD,
+        field_names.TRACT_PERCENT_NON_NATURAL_FIELD_NAME,
+        # Pollution
+        field_names.RMP_FIELD,
+        field_names.NPL_FIELD,
+        field_names.TSDF_FIELD,
+        # Water
+        field_names.WASTEWATER_FIELD,
+        field_names.UST_FIELD,
+        # Health
+        field_names.DIABETES_FIELD,
+        field_names.ASTHMA_FIELD,
+        field_names.HEART_DISEASE_FIELD,
+        field_names.LOW_LIFE_EXPECTANCY_FIELD,
+        # Workforce
+        field_names.UNEMPLOYMENT_FIELD,
+        field_names.LOW_MEDIAN_INCOME_AS_PERCENT_OF_AMI_FIELD,
+        field_names.LINGUISTIC_ISO_FIELD,
+        field_names.POVERTY_LESS_THAN_100_FPL_FIELD,
+        field_names.LOW_CENSUS_DECENNIAL_AREA_MEDIAN_INCOME_PERCENT_FIELD_2019,
+    ]
+
+    # The columns of the score dataframe that the score is calculated from
+    INPUT_FIELDS: List[str] = [
+        field_names.GEOID_TRACT_FIELD,
+        field_names.POVERTY_LESS_THAN_200_FPL_IMPUTED_FIELD,
+        field_names.POVERTY_LESS_THAN_200_FPL_IMPUTED_FIELD
+        + field_names.PERCENTILE_FIELD_SUFFIX,
+        field_names.CENSUS_DECENNIAL_ADJUSTED_POVERTY_LESS_THAN_200_FPL_FIELD_2019,
+        field_names.MEDIAN_HOUSE_VALUE_FIELD
+        + field_names.PERCENTILE_FIELD_SUFFIX,
+        field_names.HISTORIC_REDLINING_SCORE_EXCEEDED,
+        field_names.ELIGIBLE_FUDS_BINARY_FIELD_NAME,
+        field_names.AML_BOOLEAN,
+        field_names.HIGH_SCHOOL_ED_FIELD,
+        field_names.CENSUS_DECENNIAL_HIGH_SCHOOL_ED_FIELD_2019,
+        field_names.CENSUS_DECENNIAL_UNEMPLOYMENT_FIELD_2019,
+        field_names.CENSUS_UNEMPLOYMENT_FIELD_2010,
+        field_names.CENSUS_DECENNIAL_POVERTY_LESS_THAN_100_FPL_FIELD_2019,
+        field_names.CENSUS_POVERTY_LESS_THAN_100_FPL_FIELD_2010,
+        field_names.IS_TRIBAL_DAC,
+        field_names.PERCENT_OF_TRIBAL_AREA_IN_TRACT,
+        field_names.FINAL_SCORE_N_BOOLEAN_V1_0,
+    ] + [
+        burden_field_name + field_names.PERCENTILE_FIELD_SUFFIX
+        for burden_field_name in BURDEN_PERCENTILE_FIELDS
+    ]
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        super().__init__(df)
+        # The columns computed but not added to `df` yet, in the order they
+        # were computed. When None, columns are added as they are computed.
+        self._columns: Optional[Dict[str, ColumnValues]] = None
+        # Whether each tract is in some FIPS codes, by those codes
+        self._fips_masks: Dict[Union[str, tuple], np.ndarray] = {}
+        self._low_income: Optional[np.ndarray] = None
+        self._burden_thresholds_exceeded: Optional[np.ndarray] = None
+
+    def _set_column(self, column_name: str, values: ColumnValues) -> None:
+        if self._columns is None:
+            self.df[column_name] = values
+        else:
+            self._columns[column_name] = values
+
+    def _get_column(self, column_name: str) -> np.ndarray:
+        if self._columns is not None and column_name in self._columns:
+            return np.asarray(self._columns[column_name])
+        return self.df[column_name].to_numpy()
+
+    def _add_columns_to_df(self) -> None:
+        """Adds the columns that have been computed to `df`, at once."""
+        columns, self._columns = self._columns, None
+        new_columns = {}
+        for column_name, values in columns.items():
+            if column_name in self.df.columns:
+                self.df[column_name] = values
+            else:
+                new_columns[column_name] = values
+        self.df = pd.concat(
+            [self.df, pd.DataFrame(new_columns, index=self.df.index)], axis=1
+        )
+
+    @staticmethod
+    def _as_mask(values: pd.Series) -> np.ndarray:
+        """Returns a column of booleans as a mask, where missing values are
+        False."""
+        return values.fillna(False).to_numpy(dtype=bool)
+
+    def _get_fips_mask(self, fips_codes: Union[str, list, tuple]) -> np.ndarray:
+        """Returns whether each tract is in any of the FIPS codes."""
+        fips_codes = (
+            fips_codes if isinstance(fips_codes, str) else tuple(fips_codes)
+        )
+        if fips_codes not in self._fips_masks:
+            self._fips_masks[fips_codes] = (
+                self.df[field_names.GEOID_TRACT_FIELD]
+                .str.startswith(fips_codes)
+                .to_numpy(dtype=bool)
+            )
+        return self._fips_masks[fips_codes]
+
+    def _get_low_income(self) -> np.ndarray:
+        if self._low_income is None:
+            self._low_income = self._as_mask(
+                self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+            )
+        return self._low_income
+
+    def _get_burden_threshold_exceeded(self, field_name: str) -> np.ndarray:
+        """Returns whether the percentile of a field is at or above the
+        ENVIRONMENTAL_BURDEN_THRESHOLD, for each tract.
+
+        The percentiles of all of the BURDEN_PERCENTILE_FIELDS are compared
+        the first time, into a boolean matrix with a column per field.
+        """
+        if self._burden_thresholds_exceeded is None:
+            percentiles = self.df[
+                [
+                    burden_field_name + field_names.PERCENTILE_FIELD_SUFFIX
+                    for burden_field_name in self.BURDEN_PERCENTILE_FIELDS
+                ]
+            ].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._burden_thresholds_exceeded = np.asfortranarray(
+                percentiles >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+            )
+        return self._burden_thresholds_exceeded[
+            :, self.BURDEN_PERCENTILE_FIELDS.index(field_name)
+        ]
+
+    def _get_numeric_column(self, column_name: str) -> np.ndarray:
+        return self.df[column_name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _set_criterion_columns(
+        self, indicators: Dict[str, np.ndarray], criterion: np.ndarray
+    ) -> List[np.ndarray]:
+        """Sets a column for each indicator, of whether a tract meets both the
+        indicator and a criterion like low income, and returns them."""
+        columns = []
+        for column_name, indicator in indicators.items():
+            columns.append(indicator & criterion)
+            self._set_column(column_name, columns[-1])
+        return columns
+
     def _combine_island_areas_with_states_and_set_thresholds(
         self,
-        df: pd.DataFrame,
         column_from_island_areas: str,
         column_from_decennial_census: str,
         combined_column_name: str,
         threshold_cutoff_for_island_areas: float,
-    ) -> Tuple[pd.DataFrame, str]:
+    ) -> Tuple[str, np.ndarray]:
         """Steps to set thresholds for island areas.
 
         This function is fairly logically complicated. It takes the following steps:
@@ -53,6 +228,8 @@ class ScoreNarwhal(Score):
         The stateside decennial census stopped asking economic comparisons,
         so this is as close to apples-to-apples as we get. We use 5-year ACS for data
         robustness over 1-year ACS.
+
+        Returns the name of the threshold column, and its values.
         """
         # Create the combined field.
         # TODO: move this combined field percentile calculation to `etl_score`,
@@ -60,9 +237,10 @@ class ScoreNarwhal(Score):
         # There should only be one entry in either 2009 or 2019 fields, not one in both.
         # But just to be safe, we take the mean and ignore null values so if there
         # *were* entries in both, this result would make sense.
-        df[combined_column_name] = df[
+        combined = self.df[
             [column_from_island_areas, column_from_decennial_census]
         ].mean(axis=1, skipna=True)
+        self._set_column(combined_column_name, combined)
 
         # Create a percentile field for use in the Islands / PR visualization
         # TODO: move this code
@@ -74,25 +252,26 @@ class ScoreNarwhal(Score):
             + field_names.ISLAND_AREAS_PERCENTILE_ADJUSTMENT_FIELD
             + field_names.PERCENTILE_FIELD_SUFFIX
         )
-        df[return_series_name] = np.where(
-            df[column_from_decennial_census].isna(),
-            df[combined_column_name].rank(pct=True),
+        percentiles = np.where(
+            self.df[column_from_decennial_census].isna(),
+            combined.rank(pct=True),
             np.nan,
         )
+        self._set_column(return_series_name, percentiles)
 
         threshold_column_name = (
             f"{column_from_island_areas} exceeds "
             f"{threshold_cutoff_for_island_areas*100:.0f}th percentile"
         )
+        threshold_exceeded = percentiles >= threshold_cutoff_for_island_areas
+        self._set_column(threshold_column_name, threshold_exceeded)
 
-        df[threshold_column_name] = (
-            df[return_series_name] >= threshold_cutoff_for_island_areas
-        )
-
-        return df, threshold_column_name
+        return threshold_column_name, threshold_exceeded
 
     def _increment_total_eligibility_exceeded(
-        self, columns_for_subset: list, skip_fips: tuple = ()
+        self,
+        eligibility: List[np.ndarray],
+        skip_fips: Union[str, tuple] = (),
     ) -> None:
         """
         Increments the total eligible factors for a given tract
@@ -103,20 +282,15 @@ class ScoreNarwhal(Score):
         without overriding any values in the data.
         THIS IS A TEMPORARY FIX.
         """
+        exceeded = np.sum(eligibility, axis=0, dtype=np.int64)
         if skip_fips:
-            self.df[field_names.THRESHOLD_COUNT] += np.where(
-                self.df[field_names.GEOID_TRACT_FIELD].str.startswith(
-                    skip_fips
-                ),
-                0,
-                self.df[columns_for_subset].sum(axis=1, skipna=True),
-            )
-        else:
-            self.df[field_names.THRESHOLD_COUNT] += self.df[
-                columns_for_subset
-            ].sum(axis=1, skipna=True)
+            exceeded = np.where(self._get_fips_mask(skip_fips), 0, exceeded)
+        self._set_column(
+            field_names.THRESHOLD_COUNT,
+            self._get_column(field_names.THRESHOLD_COUNT) + exceeded,
+        )
 
-    def _climate_factor(self) -> bool:
+    def _climate_factor(self) -> np.ndarray:
         # In Xth percentile or above for FEMA’s Risk Index (Source: FEMA
         # AND
         # Low income: In Nth percentile or above for percent of block group population
@@ -124,112 +298,69 @@ class ScoreNarwhal(Score):
         # poverty level and there is low higher ed attendance
         # Source: Census's American Community Survey
 
-        climate_eligibility_columns = [
-            field_names.EXPECTED_POPULATION_LOSS_RATE_LOW_INCOME_FIELD,
-            field_names.EXPECTED_AGRICULTURE_LOSS_RATE_LOW_INCOME_FIELD,
-            field_names.EXPECTED_BUILDING_LOSS_RATE_LOW_INCOME_FIELD,
-            field_names.HIGH_FUTURE_FLOOD_RISK_LOW_INCOME_FIELD,
-            field_names.HIGH_FUTURE_WILDFIRE_RISK_LOW_INCOME_FIELD,
-        ]
-
-        # TODO: When we refactor this... it's the same code over and over and over again
-        # We should make a function, _get_all_columns(), that returns all three of these columns
-
-        self.df[
-            field_names.EXPECTED_POPULATION_LOSS_EXCEEDS_PCTILE_THRESHOLD
-        ] = (
-            self.df[
-                field_names.EXPECTED_POPULATION_LOSS_RATE_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        expected_population_loss = self._get_burden_threshold_exceeded(
+            field_names.EXPECTED_POPULATION_LOSS_RATE_FIELD
         )
-
-        self.df[
-            field_names.EXPECTED_AGRICULTURAL_LOSS_EXCEEDS_PCTILE_THRESHOLD
-        ] = (
-            self.df[
-                field_names.EXPECTED_AGRICULTURE_LOSS_RATE_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        expected_agricultural_loss = self._get_burden_threshold_exceeded(
+            field_names.EXPECTED_AGRICULTURE_LOSS_RATE_FIELD
         )
-
-        self.df[field_names.EXPECTED_BUILDING_LOSS_EXCEEDS_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.EXPECTED_BUILDING_LOSS_RATE_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        expected_building_loss = self._get_burden_threshold_exceeded(
+            field_names.EXPECTED_BUILDING_LOSS_RATE_FIELD
         )
-
-        self.df[field_names.HIGH_FUTURE_FLOOD_RISK_FIELD] = (
-            self.df[
-                field_names.FUTURE_FLOOD_RISK_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        high_future_flood_risk = self._get_burden_threshold_exceeded(
+            field_names.FUTURE_FLOOD_RISK_FIELD
         )
-
-        self.df[field_names.HIGH_FUTURE_WILDFIRE_RISK_FIELD] = (
-            self.df[
-                field_names.FUTURE_WILDFIRE_RISK_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        high_future_wildfire_risk = self._get_burden_threshold_exceeded(
+            field_names.FUTURE_WILDFIRE_RISK_FIELD
         )
-
-        self.df[field_names.CLIMATE_THRESHOLD_EXCEEDED] = (
-            self.df[
-                field_names.EXPECTED_POPULATION_LOSS_EXCEEDS_PCTILE_THRESHOLD
-            ]
-            | self.df[
-                field_names.EXPECTED_AGRICULTURAL_LOSS_EXCEEDS_PCTILE_THRESHOLD
-            ]
-            | self.df[
-                field_names.EXPECTED_BUILDING_LOSS_EXCEEDS_PCTILE_THRESHOLD
-            ]
-            | self.df[field_names.HIGH_FUTURE_WILDFIRE_RISK_FIELD]
-            | self.df[field_names.HIGH_FUTURE_FLOOD_RISK_FIELD]
+        self._set_column(
+            field_names.EXPECTED_POPULATION_LOSS_EXCEEDS_PCTILE_THRESHOLD,
+            expected_population_loss,
         )
-
-        self.df[field_names.EXPECTED_POPULATION_LOSS_RATE_LOW_INCOME_FIELD] = (
-            self.df[
-                field_names.EXPECTED_POPULATION_LOSS_EXCEEDS_PCTILE_THRESHOLD
-            ]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.EXPECTED_AGRICULTURAL_LOSS_EXCEEDS_PCTILE_THRESHOLD,
+            expected_agricultural_loss,
         )
-
-        self.df[field_names.EXPECTED_AGRICULTURE_LOSS_RATE_LOW_INCOME_FIELD] = (
-            self.df[
-                field_names.EXPECTED_AGRICULTURAL_LOSS_EXCEEDS_PCTILE_THRESHOLD
-            ]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.EXPECTED_BUILDING_LOSS_EXCEEDS_PCTILE_THRESHOLD,
+            expected_building_loss,
         )
-
-        self.df[field_names.EXPECTED_BUILDING_LOSS_RATE_LOW_INCOME_FIELD] = (
-            self.df[field_names.EXPECTED_BUILDING_LOSS_EXCEEDS_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.HIGH_FUTURE_FLOOD_RISK_FIELD, high_future_flood_risk
+        )
+        self._set_column(
+            field_names.HIGH_FUTURE_WILDFIRE_RISK_FIELD,
+            high_future_wildfire_risk,
         )
 
-        self.df[field_names.HIGH_FUTURE_FLOOD_RISK_LOW_INCOME_FIELD] = (
-            self.df[field_names.HIGH_FUTURE_FLOOD_RISK_FIELD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.CLIMATE_THRESHOLD_EXCEEDED,
+            expected_population_loss
+            | expected_agricultural_loss
+            | expected_building_loss
+            | high_future_wildfire_risk
+            | high_future_flood_risk,
         )
 
-        self.df[field_names.HIGH_FUTURE_WILDFIRE_RISK_LOW_INCOME_FIELD] = (
-            self.df[field_names.HIGH_FUTURE_WILDFIRE_RISK_FIELD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        climate_eligibility = self._set_criterion_columns(
+            {
+                field_names.EXPECTED_POPULATION_LOSS_RATE_LOW_INCOME_FIELD: expected_population_loss,
+                field_names.EXPECTED_AGRICULTURE_LOSS_RATE_LOW_INCOME_FIELD: expected_agricultural_loss,
+                field_names.EXPECTED_BUILDING_LOSS_RATE_LOW_INCOME_FIELD: expected_building_loss,
+                field_names.HIGH_FUTURE_FLOOD_RISK_LOW_INCOME_FIELD: high_future_flood_risk,
+                field_names.HIGH_FUTURE_WILDFIRE_RISK_LOW_INCOME_FIELD: high_future_wildfire_risk,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            climate_eligibility_columns,
+            climate_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[climate_eligibility_columns].any(axis="columns")
+        return np.logical_or.reduce(climate_eligibility)
 
-    def _energy_factor(self) -> bool:
+    def _energy_factor(self) -> np.ndarray:
         # In Xth percentile or above for DOE’s energy cost burden score (Source: LEAD Score)
         # AND
         # Low income: In Nth percentile or above for percent of block group population
@@ -237,49 +368,35 @@ class ScoreNarwhal(Score):
         # poverty level and has low higher ed attendance.
         # Source: Census's American Community Survey
 
-        energy_eligibility_columns = [
-            field_names.PM25_EXPOSURE_LOW_INCOME_FIELD,
-            field_names.ENERGY_BURDEN_LOW_INCOME_FIELD,
-        ]
-
-        self.df[field_names.ENERGY_BURDEN_EXCEEDS_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.ENERGY_BURDEN_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        energy_burden = self._get_burden_threshold_exceeded(
+            field_names.ENERGY_BURDEN_FIELD
         )
-
-        self.df[field_names.PM25_EXCEEDS_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.PM25_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        pm25 = self._get_burden_threshold_exceeded(field_names.PM25_FIELD)
+        self._set_column(
+            field_names.ENERGY_BURDEN_EXCEEDS_PCTILE_THRESHOLD, energy_burden
         )
+        self._set_column(field_names.PM25_EXCEEDS_PCTILE_THRESHOLD, pm25)
 
-        self.df[field_names.ENERGY_THRESHOLD_EXCEEDED] = (
-            self.df[field_names.ENERGY_BURDEN_EXCEEDS_PCTILE_THRESHOLD]
-            | self.df[field_names.PM25_EXCEEDS_PCTILE_THRESHOLD]
+        self._set_column(
+            field_names.ENERGY_THRESHOLD_EXCEEDED, energy_burden | pm25
         )
 
-        self.df[field_names.PM25_EXPOSURE_LOW_INCOME_FIELD] = (
-            self.df[field_names.PM25_EXCEEDS_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
-        )
-
-        self.df[field_names.ENERGY_BURDEN_LOW_INCOME_FIELD] = (
-            self.df[field_names.ENERGY_BURDEN_EXCEEDS_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        energy_eligibility = self._set_criterion_columns(
+            {
+                field_names.PM25_EXPOSURE_LOW_INCOME_FIELD: pm25,
+                field_names.ENERGY_BURDEN_LOW_INCOME_FIELD: energy_burden,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            energy_eligibility_columns,
+            energy_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[energy_eligibility_columns].any(axis="columns")
+        return np.logical_or.reduce(energy_eligibility)
 
-    def _transportation_factor(self) -> bool:
+    def _transportation_factor(self) -> np.ndarray:
         # In Xth percentile or above for diesel particulate matter (Source: EPA National Air Toxics Assessment (NATA)
         # or
         # In Xth percentile or above for PM 2.5 (Source: EPA, Office of Air and Radiation (OAR) fusion of model and monitor data)]
@@ -293,63 +410,43 @@ class ScoreNarwhal(Score):
         # poverty level and has a low percent of higher ed students.
         # Source: Census's American Community Survey
 
-        transportion_eligibility_columns = [
-            field_names.DIESEL_PARTICULATE_MATTER_LOW_INCOME_FIELD,
-            field_names.TRAFFIC_PROXIMITY_LOW_INCOME_FIELD,
-            field_names.DOT_TRAVEL_BURDEN_LOW_INCOME_FIELD,
-        ]
-
-        self.df[field_names.DIESEL_EXCEEDS_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.DIESEL_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        diesel = self._get_burden_threshold_exceeded(field_names.DIESEL_FIELD)
+        dot_travel_burden = self._get_burden_threshold_exceeded(
+            field_names.DOT_TRAVEL_BURDEN_FIELD
         )
-
-        self.df[field_names.DOT_BURDEN_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.DOT_TRAVEL_BURDEN_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        traffic_proximity = self._get_burden_threshold_exceeded(
+            field_names.TRAFFIC_FIELD
         )
-
-        self.df[field_names.TRAFFIC_PROXIMITY_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.TRAFFIC_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-
-        self.df[field_names.TRAFFIC_THRESHOLD_EXCEEDED] = (
-            self.df[field_names.TRAFFIC_PROXIMITY_PCTILE_THRESHOLD]
-            | self.df[field_names.DIESEL_EXCEEDS_PCTILE_THRESHOLD]
-            | self.df[field_names.DOT_BURDEN_PCTILE_THRESHOLD]
+        self._set_column(field_names.DIESEL_EXCEEDS_PCTILE_THRESHOLD, diesel)
+        self._set_column(
+            field_names.DOT_BURDEN_PCTILE_THRESHOLD, dot_travel_burden
         )
-
-        self.df[field_names.DIESEL_PARTICULATE_MATTER_LOW_INCOME_FIELD] = (
-            self.df[field_names.DIESEL_EXCEEDS_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.TRAFFIC_PROXIMITY_PCTILE_THRESHOLD, traffic_proximity
         )
 
-        self.df[field_names.TRAFFIC_PROXIMITY_LOW_INCOME_FIELD] = (
-            self.df[field_names.TRAFFIC_PROXIMITY_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.TRAFFIC_THRESHOLD_EXCEEDED,
+            traffic_proximity | diesel | dot_travel_burden,
         )
 
-        self.df[field_names.DOT_TRAVEL_BURDEN_LOW_INCOME_FIELD] = (
-            self.df[field_names.DOT_BURDEN_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        transportation_eligibility = self._set_criterion_columns(
+            {
+                field_names.DIESEL_PARTICULATE_MATTER_LOW_INCOME_FIELD: diesel,
+                field_names.TRAFFIC_PROXIMITY_LOW_INCOME_FIELD: traffic_proximity,
+                field_names.DOT_TRAVEL_BURDEN_LOW_INCOME_FIELD: dot_travel_burden,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            transportion_eligibility_columns,
+            transportation_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[transportion_eligibility_columns].any(axis="columns")
+        return np.logical_or.reduce(transportation_eligibility)
 
-    def _housing_factor(self) -> bool:
+    def _housing_factor(self) -> np.ndarray:
         # (
         # In Xth percentile or above for lead paint (Source: Census's American Community Survey’s
         # percent of housing units built pre-1960, used as an indicator of potential lead paint exposure in homes)
@@ -365,100 +462,99 @@ class ScoreNarwhal(Score):
         # Source: Census's American Community Survey
 
         ## Additionally, we look to see if HISTORIC_REDLINING_SCORE_EXCEEDED is True and the tract is also low income
-
-        housing_eligibility_columns = [
-            field_names.LEAD_PAINT_MEDIAN_HOUSE_VALUE_LOW_INCOME_FIELD,
-            field_names.HOUSING_BURDEN_LOW_INCOME_FIELD,
-            field_names.HISTORIC_REDLINING_SCORE_EXCEEDED_LOW_INCOME_FIELD,
-            field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_LOW_INCOME_FIELD,
-            field_names.NON_NATURAL_LOW_INCOME_FIELD_NAME,
-        ]
+        low_income = self._get_low_income()
 
         # Historic disinvestment
-        self.df[
-            field_names.HISTORIC_REDLINING_SCORE_EXCEEDED_LOW_INCOME_FIELD
-        ] = (
-            self.df[field_names.HISTORIC_REDLINING_SCORE_EXCEEDED]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        (historic_redlining_low_income,) = self._set_criterion_columns(
+            {
+                field_names.HISTORIC_REDLINING_SCORE_EXCEEDED_LOW_INCOME_FIELD: self._as_mask(
+                    self.df[field_names.HISTORIC_REDLINING_SCORE_EXCEEDED]
+                )
+            },
+            low_income,
         )
 
         # Kitchen / plumbing
-        self.df[field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        no_kitchen_or_indoor_plumbing = self._get_burden_threshold_exceeded(
+            field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_FIELD
         )
-
-        self.df[field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_LOW_INCOME_FIELD] = (
-            self.df[field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_PCTILE_THRESHOLD,
+            no_kitchen_or_indoor_plumbing,
+        )
+        (
+            no_kitchen_or_indoor_plumbing_low_income,
+        ) = self._set_criterion_columns(
+            {
+                field_names.NO_KITCHEN_OR_INDOOR_PLUMBING_LOW_INCOME_FIELD: no_kitchen_or_indoor_plumbing
+            },
+            low_income,
         )
 
         # Lead paint
-        self.df[field_names.LEAD_PAINT_PROXY_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.LEAD_PAINT_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        lead_paint_proxy = self._get_burden_threshold_exceeded(
+            field_names.LEAD_PAINT_FIELD
         ) & (
-            self.df[
+            self._get_numeric_column(
                 field_names.MEDIAN_HOUSE_VALUE_FIELD
                 + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
+            )
             <= self.MEDIAN_HOUSE_VALUE_THRESHOLD
         )
-
-        self.df[field_names.LEAD_PAINT_MEDIAN_HOUSE_VALUE_LOW_INCOME_FIELD] = (
-            self.df[field_names.LEAD_PAINT_PROXY_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.LEAD_PAINT_PROXY_PCTILE_THRESHOLD, lead_paint_proxy
+        )
+        (lead_paint_low_income,) = self._set_criterion_columns(
+            {
+                field_names.LEAD_PAINT_MEDIAN_HOUSE_VALUE_LOW_INCOME_FIELD: lead_paint_proxy
+            },
+            low_income,
         )
 
         # Housing burden
-        self.df[field_names.HOUSING_BURDEN_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.HOUSING_BURDEN_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        housing_burden = self._get_burden_threshold_exceeded(
+            field_names.HOUSING_BURDEN_FIELD
         )
-        self.df[field_names.HOUSING_BURDEN_LOW_INCOME_FIELD] = (
-            self.df[field_names.HOUSING_BURDEN_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.HOUSING_BURDEN_PCTILE_THRESHOLD, housing_burden
+        )
+        (housing_burden_low_income,) = self._set_criterion_columns(
+            {field_names.HOUSING_BURDEN_LOW_INCOME_FIELD: housing_burden},
+            low_income,
         )
 
         # High non-natural space
-        self.df[field_names.NON_NATURAL_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.TRACT_PERCENT_NON_NATURAL_FIELD_NAME
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        non_natural = self._get_burden_threshold_exceeded(
+            field_names.TRACT_PERCENT_NON_NATURAL_FIELD_NAME
         )
-        self.df[field_names.NON_NATURAL_LOW_INCOME_FIELD_NAME] = (
-            self.df[field_names.NON_NATURAL_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(field_names.NON_NATURAL_PCTILE_THRESHOLD, non_natural)
+        (non_natural_low_income,) = self._set_criterion_columns(
+            {field_names.NON_NATURAL_LOW_INCOME_FIELD_NAME: non_natural},
+            low_income,
         )
 
         # any of the burdens
-        self.df[
-            field_names.HOUSING_THREHSOLD_EXCEEDED
-        ] = self.df[  # we need this to include all of the ones that are intersected with low income in order to properly calculate the total score.
-            housing_eligibility_columns
-        ].any(
-            axis="columns"
+        # we need this to include all of the ones that are intersected with low income in order to properly calculate the total score.
+        housing_eligibility = [
+            lead_paint_low_income,
+            housing_burden_low_income,
+            historic_redlining_low_income,
+            no_kitchen_or_indoor_plumbing_low_income,
+            non_natural_low_income,
+        ]
+        housing_threshold_exceeded = np.logical_or.reduce(housing_eligibility)
+        self._set_column(
+            field_names.HOUSING_THREHSOLD_EXCEEDED, housing_threshold_exceeded
         )
 
         self._increment_total_eligibility_exceeded(
-            housing_eligibility_columns,
+            housing_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[field_names.HOUSING_THREHSOLD_EXCEEDED]
+        return housing_threshold_exceeded
 
-    def _pollution_factor(self) -> bool:
+    def _pollution_factor(self) -> np.ndarray:
         # Proximity to Risk Management Plan sites is > X
         # AND
         # Low income: In Nth percentile or above for percent of block group population
@@ -466,81 +562,51 @@ class ScoreNarwhal(Score):
         # poverty level and has a low percent of higher ed students.
         # Source: Census's American Community Survey
 
-        pollution_eligibility_columns = [
-            field_names.RMP_LOW_INCOME_FIELD,  # include low income in these fields because they help calculate the overall score
-            field_names.SUPERFUND_LOW_INCOME_FIELD,
-            field_names.HAZARDOUS_WASTE_LOW_INCOME_FIELD,
-            field_names.AML_LOW_INCOME_FIELD,
-            field_names.ELIGIBLE_FUDS_LOW_INCOME_FIELD,
-        ]
-
-        self.df[field_names.RMP_PCTILE_THRESHOLD] = (
-            self.df[field_names.RMP_FIELD + field_names.PERCENTILE_FIELD_SUFFIX]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-
-        self.df[field_names.NPL_PCTILE_THRESHOLD] = (
-            self.df[field_names.NPL_FIELD + field_names.PERCENTILE_FIELD_SUFFIX]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-
-        self.df[field_names.TSDF_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.TSDF_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
+        rmp = self._get_burden_threshold_exceeded(field_names.RMP_FIELD)
+        npl = self._get_burden_threshold_exceeded(field_names.NPL_FIELD)
+        tsdf = self._get_burden_threshold_exceeded(field_names.TSDF_FIELD)
+        self._set_column(field_names.RMP_PCTILE_THRESHOLD, rmp)
+        self._set_column(field_names.NPL_PCTILE_THRESHOLD, npl)
+        self._set_column(field_names.TSDF_PCTILE_THRESHOLD, tsdf)
 
-        self.df[field_names.ELIGIBLE_FUDS_FILLED_IN_FIELD_NAME] = self.df[
+        eligible_fuds_filled_in = self.df[
             field_names.ELIGIBLE_FUDS_BINARY_FIELD_NAME
         ].fillna(False)
-
-        self.df[field_names.AML_BOOLEAN_FILLED_IN] = self.df[
-            field_names.AML_BOOLEAN
-        ].fillna(False)
-
-        self.df[field_names.POLLUTION_THRESHOLD_EXCEEDED] = self.df[
-            [
-                field_names.RMP_PCTILE_THRESHOLD,
-                field_names.NPL_PCTILE_THRESHOLD,
-                field_names.TSDF_PCTILE_THRESHOLD,
-                field_names.AML_BOOLEAN_FILLED_IN,
-                field_names.ELIGIBLE_FUDS_FILLED_IN_FIELD_NAME,
-            ]
-        ].any(axis="columns")
-
-        # individual series-by-series
-        self.df[field_names.RMP_LOW_INCOME_FIELD] = (
-            self.df[field_names.RMP_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
-        )
-        self.df[field_names.SUPERFUND_LOW_INCOME_FIELD] = (
-            self.df[field_names.NPL_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
-        )
-        self.df[field_names.HAZARDOUS_WASTE_LOW_INCOME_FIELD] = (
-            self.df[field_names.TSDF_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        aml_filled_in = self.df[field_names.AML_BOOLEAN].fillna(False)
+        self._set_column(
+            field_names.ELIGIBLE_FUDS_FILLED_IN_FIELD_NAME,
+            eligible_fuds_filled_in,
         )
+        self._set_column(field_names.AML_BOOLEAN_FILLED_IN, aml_filled_in)
+        eligible_fuds = self._as_mask(eligible_fuds_filled_in)
+        aml = self._as_mask(aml_filled_in)
 
-        self.df[field_names.AML_LOW_INCOME_FIELD] = (
-            self.df[field_names.AML_BOOLEAN_FILLED_IN]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.POLLUTION_THRESHOLD_EXCEEDED,
+            rmp | npl | tsdf | aml | eligible_fuds,
         )
 
-        self.df[field_names.ELIGIBLE_FUDS_LOW_INCOME_FIELD] = (
-            self.df[field_names.ELIGIBLE_FUDS_BINARY_FIELD_NAME]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        # individual series-by-series
+        # include low income in these fields because they help calculate the overall score
+        pollution_eligibility = self._set_criterion_columns(
+            {
+                field_names.RMP_LOW_INCOME_FIELD: rmp,
+                field_names.SUPERFUND_LOW_INCOME_FIELD: npl,
+                field_names.HAZARDOUS_WASTE_LOW_INCOME_FIELD: tsdf,
+                field_names.AML_LOW_INCOME_FIELD: aml,
+                field_names.ELIGIBLE_FUDS_LOW_INCOME_FIELD: eligible_fuds,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            pollution_eligibility_columns,
+            pollution_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[pollution_eligibility_columns].any(axis="columns")
+        return np.logical_or.reduce(pollution_eligibility)
 
-    def _water_factor(self) -> bool:
+    def _water_factor(self) -> np.ndarray:
         # In Xth percentile or above for wastewater discharge (Source: EPA Risk-Screening Environmental Indicators (RSEI) Model)
         # AND
         # Low income: In Nth percentile or above for percent of block group population
@@ -548,45 +614,34 @@ class ScoreNarwhal(Score):
         # poverty level and has a low percent of higher ed students
         # Source: Census's American Community Survey
 
-        eligibility_columns = [
-            field_names.WASTEWATER_DISCHARGE_LOW_INCOME_FIELD,
-            field_names.UST_LOW_INCOME_FIELD,
-        ]
-
-        self.df[field_names.WASTEWATER_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.WASTEWATER_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-        self.df[field_names.UST_PCTILE_THRESHOLD] = (
-            self.df[field_names.UST_FIELD + field_names.PERCENTILE_FIELD_SUFFIX]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-
-        self.df[field_names.WASTEWATER_DISCHARGE_LOW_INCOME_FIELD] = (
-            self.df[field_names.WASTEWATER_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        wastewater = self._get_burden_threshold_exceeded(
+            field_names.WASTEWATER_FIELD
         )
+        ust = self._get_burden_threshold_exceeded(field_names.UST_FIELD)
+        self._set_column(field_names.WASTEWATER_PCTILE_THRESHOLD, wastewater)
+        self._set_column(field_names.UST_PCTILE_THRESHOLD, ust)
 
-        self.df[field_names.UST_LOW_INCOME_FIELD] = (
-            self.df[field_names.UST_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        eligibility = self._set_criterion_columns(
+            {
+                field_names.WASTEWATER_DISCHARGE_LOW_INCOME_FIELD: wastewater,
+                field_names.UST_LOW_INCOME_FIELD: ust,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            eligibility_columns,
+            eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        self.df[field_names.WATER_THRESHOLD_EXCEEDED] = self.df[
-            eligibility_columns
-        ].any(axis=1)
+        water_threshold_exceeded = np.logical_or.reduce(eligibility)
+        self._set_column(
+            field_names.WATER_THRESHOLD_EXCEEDED, water_threshold_exceeded
+        )
 
-        return self.df[field_names.WATER_THRESHOLD_EXCEEDED]
+        return water_threshold_exceeded
 
-    def _health_factor(self) -> bool:
+    def _health_factor(self) -> np.ndarray:
         # In Xth percentile or above for diabetes (Source: CDC Places)
         # or
         # In Xth percentile or above for asthma (Source: CDC Places)
@@ -600,76 +655,49 @@ class ScoreNarwhal(Score):
         # poverty level and has a low percent of higher ed students
         # Source: Census's American Community Survey
 
-        health_eligibility_columns = [
-            field_names.DIABETES_LOW_INCOME_FIELD,
-            field_names.ASTHMA_LOW_INCOME_FIELD,
-            field_names.HEART_DISEASE_LOW_INCOME_FIELD,
-            field_names.LOW_LIFE_EXPECTANCY_LOW_INCOME_FIELD,
-        ]
-
-        self.df[field_names.DIABETES_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.DIABETES_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
-
-        self.df[field_names.ASTHMA_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.ASTHMA_FIELD + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        diabetes = self._get_burden_threshold_exceeded(
+            field_names.DIABETES_FIELD
         )
-
-        self.df[field_names.HEART_DISEASE_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.HEART_DISEASE_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        asthma = self._get_burden_threshold_exceeded(field_names.ASTHMA_FIELD)
+        heart_disease = self._get_burden_threshold_exceeded(
+            field_names.HEART_DISEASE_FIELD
         )
-
-        self.df[field_names.LOW_LIFE_EXPECTANCY_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.LOW_LIFE_EXPECTANCY_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        low_life_expectancy = self._get_burden_threshold_exceeded(
+            field_names.LOW_LIFE_EXPECTANCY_FIELD
         )
-
-        self.df[field_names.HEALTH_THRESHOLD_EXCEEDED] = (
-            (
-                self.df[field_names.DIABETES_PCTILE_THRESHOLD]
-                | self.df[field_names.ASTHMA_PCTILE_THRESHOLD]
-            )
-            | self.df[field_names.HEART_DISEASE_PCTILE_THRESHOLD]
-        ) | self.df[field_names.LOW_LIFE_EXPECTANCY_PCTILE_THRESHOLD]
-
-        self.df[field_names.DIABETES_LOW_INCOME_FIELD] = (
-            self.df[field_names.DIABETES_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(field_names.DIABETES_PCTILE_THRESHOLD, diabetes)
+        self._set_column(field_names.ASTHMA_PCTILE_THRESHOLD, asthma)
+        self._set_column(
+            field_names.HEART_DISEASE_PCTILE_THRESHOLD, heart_disease
         )
-        self.df[field_names.ASTHMA_LOW_INCOME_FIELD] = (
-            self.df[field_names.ASTHMA_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+        self._set_column(
+            field_names.LOW_LIFE_EXPECTANCY_PCTILE_THRESHOLD,
+            low_life_expectancy,
         )
-        self.df[field_names.HEART_DISEASE_LOW_INCOME_FIELD] = (
-            self.df[field_names.HEART_DISEASE_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+
+        self._set_column(
+            field_names.HEALTH_THRESHOLD_EXCEEDED,
+            diabetes | asthma | heart_disease | low_life_expectancy,
         )
-        self.df[field_names.LOW_LIFE_EXPECTANCY_LOW_INCOME_FIELD] = (
-            self.df[field_names.LOW_LIFE_EXPECTANCY_PCTILE_THRESHOLD]
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED]
+
+        health_eligibility = self._set_criterion_columns(
+            {
+                field_names.DIABETES_LOW_INCOME_FIELD: diabetes,
+                field_names.ASTHMA_LOW_INCOME_FIELD: asthma,
+                field_names.HEART_DISEASE_LOW_INCOME_FIELD: heart_disease,
+                field_names.LOW_LIFE_EXPECTANCY_LOW_INCOME_FIELD: low_life_expectancy,
+            },
+            self._get_low_income(),
         )
 
         self._increment_total_eligibility_exceeded(
-            health_eligibility_columns,
+            health_eligibility,
             skip_fips=constants.DROP_FIPS_FROM_NON_WTD_THRESHOLDS,
         )
 
-        return self.df[health_eligibility_columns].any(axis="columns")
+        return np.logical_or.reduce(health_eligibility)
 
-    def _workforce_factor(self) -> bool:
+    def _workforce_factor(self) -> np.ndarray:
         # Where unemployment is above Xth percentile
         # or
         # Where median income as a percent of area median income is above Xth percentile
@@ -685,160 +713,103 @@ class ScoreNarwhal(Score):
         # (necessary to screen out university tracts)
 
         # Workforce criteria for states fields.
-        workforce_eligibility_columns = [
-            field_names.UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD,
-            field_names.POVERTY_LOW_HS_EDUCATION_FIELD,
-            field_names.LINGUISTIC_ISOLATION_LOW_HS_EDUCATION_FIELD,
-            field_names.LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD,
-        ]
-
-        pr_workforce_eligibility_columns = [
-            field_names.UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD,
-            field_names.POVERTY_LOW_HS_EDUCATION_FIELD,
-            field_names.LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD,
-        ]
-
-        self.df[field_names.LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.HIGH_SCHOOL_ED_FIELD]
+        low_hs_education = (
+            self._get_numeric_column(field_names.HIGH_SCHOOL_ED_FIELD)
             >= self.LACK_OF_HIGH_SCHOOL_MINIMUM_THRESHOLD
         )
-        self.df[field_names.UNEMPLOYMENT_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.UNEMPLOYMENT_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
-        )
+        self._set_column(field_names.LOW_HS_EDUCATION_FIELD, low_hs_education)
 
-        self.df[field_names.LOW_MEDIAN_INCOME_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.LOW_MEDIAN_INCOME_AS_PERCENT_OF_AMI_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        unemployment = self._get_burden_threshold_exceeded(
+            field_names.UNEMPLOYMENT_FIELD
         )
-
-        self.df[field_names.LINGUISTIC_ISOLATION_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.LINGUISTIC_ISO_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        low_median_income = self._get_burden_threshold_exceeded(
+            field_names.LOW_MEDIAN_INCOME_AS_PERCENT_OF_AMI_FIELD
         )
-
-        self.df[field_names.POVERTY_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.POVERTY_LESS_THAN_100_FPL_FIELD
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        linguistic_isolation = self._get_burden_threshold_exceeded(
+            field_names.LINGUISTIC_ISO_FIELD
         )
-
-        self.df[field_names.LINGUISTIC_ISOLATION_LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.LINGUISTIC_ISOLATION_PCTILE_THRESHOLD]
-            & self.df[field_names.LOW_HS_EDUCATION_FIELD]
+        poverty = self._get_burden_threshold_exceeded(
+            field_names.POVERTY_LESS_THAN_100_FPL_FIELD
         )
-
-        self.df[field_names.POVERTY_LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.POVERTY_PCTILE_THRESHOLD]
-            & self.df[field_names.LOW_HS_EDUCATION_FIELD]
+        self._set_column(
+            field_names.UNEMPLOYMENT_PCTILE_THRESHOLD, unemployment
         )
-
-        self.df[field_names.LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.LOW_MEDIAN_INCOME_PCTILE_THRESHOLD]
-            & self.df[field_names.LOW_HS_EDUCATION_FIELD]
+        self._set_column(
+            field_names.LOW_MEDIAN_INCOME_PCTILE_THRESHOLD, low_median_income
         )
-
-        self.df[field_names.UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.UNEMPLOYMENT_PCTILE_THRESHOLD]
-            & self.df[field_names.LOW_HS_EDUCATION_FIELD]
+        self._set_column(
+            field_names.LINGUISTIC_ISOLATION_PCTILE_THRESHOLD,
+            linguistic_isolation,
         )
+        self._set_column(field_names.POVERTY_PCTILE_THRESHOLD, poverty)
 
-        self.df[field_names.WORKFORCE_THRESHOLD_EXCEEDED] = (
-            ## First we calculate for the non-island areas
-            (
-                (
-                    self.df[field_names.POVERTY_PCTILE_THRESHOLD]
-                    | self.df[field_names.UNEMPLOYMENT_PCTILE_THRESHOLD]
-                )
-                | self.df[field_names.LOW_MEDIAN_INCOME_PCTILE_THRESHOLD]
-            )
-            | (
-                self.df[field_names.LINGUISTIC_ISOLATION_PCTILE_THRESHOLD]
-                & (
-                    self.df[field_names.GEOID_TRACT_FIELD].str[:2]
-                    != constants.TILES_PUERTO_RICO_FIPS_CODE[0]
-                )
-            )
+        (
+            linguistic_isolation_low_hs_education,
+            poverty_low_hs_education,
+            low_median_income_low_hs_education,
+            unemployment_low_hs_education,
+        ) = self._set_criterion_columns(
+            {
+                field_names.LINGUISTIC_ISOLATION_LOW_HS_EDUCATION_FIELD: linguistic_isolation,
+                field_names.POVERTY_LOW_HS_EDUCATION_FIELD: poverty,
+                field_names.LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD: low_median_income,
+                field_names.UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD: unemployment,
+            },
+            low_hs_education,
+        )
+
+        puerto_rico = self._get_fips_mask(constants.TILES_PUERTO_RICO_FIPS_CODE)
+        ## First we calculate for the non-island areas
+        states_threshold_exceeded = (
+            poverty | unemployment | low_median_income
+        ) | (linguistic_isolation & ~puerto_rico)
+        self._set_column(
+            field_names.WORKFORCE_THRESHOLD_EXCEEDED, states_threshold_exceeded
         )
 
         # Use only PR combined criteria for rows with PR FIPS code;
         # otherwise use all criteria.
+        pr_workforce_eligibility = [
+            unemployment_low_hs_education,
+            poverty_low_hs_education,
+            low_median_income_low_hs_education,
+        ]
+        workforce_eligibility = pr_workforce_eligibility + [
+            linguistic_isolation_low_hs_education
+        ]
         workforce_combined_criteria_for_states = (
-            (
-                self.df[field_names.GEOID_TRACT_FIELD].str[:2]
-                == constants.TILES_PUERTO_RICO_FIPS_CODE[0]
-            )
-            & self.df[pr_workforce_eligibility_columns].any(axis="columns")
-        ) | (
-            (
-                self.df[field_names.GEOID_TRACT_FIELD].str[:2]
-                != constants.TILES_PUERTO_RICO_FIPS_CODE[0]
-            )
-            & self.df[workforce_eligibility_columns].any(axis="columns")
-        )
+            puerto_rico & np.logical_or.reduce(pr_workforce_eligibility)
+        ) | (~puerto_rico & np.logical_or.reduce(workforce_eligibility))
 
-        self._increment_total_eligibility_exceeded(
-            workforce_eligibility_columns
-        )
+        self._increment_total_eligibility_exceeded(workforce_eligibility)
 
         # Now, calculate workforce criteria for island territories.
-        island_areas_workforce_eligibility_columns = [
-            field_names.ISLAND_AREAS_UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD,
-            field_names.ISLAND_AREAS_POVERTY_LOW_HS_EDUCATION_FIELD,
-            field_names.ISLAND_AREAS_LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD,
-        ]
-
         # First, combine unemployment.
         # This will include an adjusted percentile column for the island areas
         # to be used by the front end.
         (
-            self.df,
-            island_areas_unemployment_criteria_field_name,
+            _,
+            island_areas_unemployment,
         ) = self._combine_island_areas_with_states_and_set_thresholds(
-            df=self.df,
             column_from_island_areas=field_names.CENSUS_DECENNIAL_UNEMPLOYMENT_FIELD_2019,
             column_from_decennial_census=field_names.CENSUS_UNEMPLOYMENT_FIELD_2010,
             combined_column_name=field_names.COMBINED_UNEMPLOYMENT_2010,
             threshold_cutoff_for_island_areas=self.ENVIRONMENTAL_BURDEN_THRESHOLD,
         )
 
-        # TODO: Remove this, it's for checking only
-        assert (
-            island_areas_unemployment_criteria_field_name
-            == field_names.ISLAND_UNEMPLOYMENT_PCTILE_THRESHOLD
-        ), "Error combining island columns"
-
         # Next, combine poverty.
         # This will include an adjusted percentile column for the island areas
         # to be used by the front end.
         (
-            self.df,
-            island_areas_poverty_criteria_field_name,
+            _,
+            island_areas_poverty,
         ) = self._combine_island_areas_with_states_and_set_thresholds(
-            df=self.df,
             column_from_island_areas=field_names.CENSUS_DECENNIAL_POVERTY_LESS_THAN_100_FPL_FIELD_2019,
             column_from_decennial_census=field_names.CENSUS_POVERTY_LESS_THAN_100_FPL_FIELD_2010,
             combined_column_name=field_names.COMBINED_POVERTY_LESS_THAN_100_FPL_FIELD_2010,
             threshold_cutoff_for_island_areas=self.ENVIRONMENTAL_BURDEN_THRESHOLD,
         )
 
-        # TODO: Remove this, it's for checking only
-        assert (
-            island_areas_poverty_criteria_field_name
-            == field_names.ISLAND_POVERTY_PCTILE_THRESHOLD
-        ), "Error combining island columns"
-
         # Also check whether low area median income is 90th percentile or higher
         # within the islands.
 
@@ -846,44 +817,40 @@ class ScoreNarwhal(Score):
         # unlike the other fields, we do not need to create a new percentile
         # column. This code should probably be refactored when (TODO) we do the big
         # refactor.
-        self.df[field_names.ISLAND_LOW_MEDIAN_INCOME_PCTILE_THRESHOLD] = (
-            self.df[
-                field_names.LOW_CENSUS_DECENNIAL_AREA_MEDIAN_INCOME_PERCENT_FIELD_2019
-                + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
-            >= self.ENVIRONMENTAL_BURDEN_THRESHOLD
+        island_areas_low_median_income = self._get_burden_threshold_exceeded(
+            field_names.LOW_CENSUS_DECENNIAL_AREA_MEDIAN_INCOME_PERCENT_FIELD_2019
+        )
+        self._set_column(
+            field_names.ISLAND_LOW_MEDIAN_INCOME_PCTILE_THRESHOLD,
+            island_areas_low_median_income,
         )
 
-        self.df[field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD] = (
-            self.df[field_names.CENSUS_DECENNIAL_HIGH_SCHOOL_ED_FIELD_2019]
+        island_areas_low_hs_education = (
+            self._get_numeric_column(
+                field_names.CENSUS_DECENNIAL_HIGH_SCHOOL_ED_FIELD_2019
+            )
             >= self.LACK_OF_HIGH_SCHOOL_MINIMUM_THRESHOLD
         )
-
-        self.df[
-            field_names.ISLAND_AREAS_UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD
-        ] = (
-            self.df[island_areas_unemployment_criteria_field_name]
-            & self.df[field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD]
+        self._set_column(
+            field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD,
+            island_areas_low_hs_education,
         )
 
-        self.df[field_names.ISLAND_AREAS_POVERTY_LOW_HS_EDUCATION_FIELD] = (
-            self.df[island_areas_poverty_criteria_field_name]
-            & self.df[field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD]
+        island_areas_workforce_eligibility = self._set_criterion_columns(
+            {
+                field_names.ISLAND_AREAS_UNEMPLOYMENT_LOW_HS_EDUCATION_FIELD: island_areas_unemployment,
+                field_names.ISLAND_AREAS_POVERTY_LOW_HS_EDUCATION_FIELD: island_areas_poverty,
+                field_names.ISLAND_AREAS_LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD: island_areas_low_median_income,
+            },
+            island_areas_low_hs_education,
         )
 
-        self.df[
-            field_names.ISLAND_AREAS_LOW_MEDIAN_INCOME_LOW_HS_EDUCATION_FIELD
-        ] = (
-            self.df[field_names.ISLAND_LOW_MEDIAN_INCOME_PCTILE_THRESHOLD]
-            & self.df[field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD]
+        workforce_combined_criteria_for_island_areas = np.logical_or.reduce(
+            island_areas_workforce_eligibility
         )
 
-        workforce_combined_criteria_for_island_areas = self.df[
-            island_areas_workforce_eligibility_columns
-        ].any(axis="columns")
-
         self._increment_total_eligibility_exceeded(
-            island_areas_workforce_eligibility_columns
+            island_areas_workforce_eligibility
         )
 
         percent_of_island_tracts_highlighted = (
@@ -905,37 +872,22 @@ class ScoreNarwhal(Score):
         # Because these criteria are calculated differently for the islands, we also calculate the
         # thresholds to pass to the FE slightly differently
         # If it's PR, we don't use linguistic isolation.
-
-        self.df[field_names.WORKFORCE_THRESHOLD_EXCEEDED] = (
-            ## First we calculate for the non-island areas
-            (
-                (
-                    self.df[field_names.POVERTY_PCTILE_THRESHOLD]
-                    | self.df[field_names.UNEMPLOYMENT_PCTILE_THRESHOLD]
-                )
-                | self.df[field_names.LOW_MEDIAN_INCOME_PCTILE_THRESHOLD]
-            )
-            | (
-                self.df[field_names.LINGUISTIC_ISOLATION_PCTILE_THRESHOLD]
-                & (
-                    self.df[field_names.GEOID_TRACT_FIELD].str[:2]
-                    != constants.TILES_PUERTO_RICO_FIPS_CODE[0]
-                )
-            )
-        ) | (
+        self._set_column(
+            field_names.WORKFORCE_THRESHOLD_EXCEEDED,
+            states_threshold_exceeded
             ## then we calculate just for the island areas
-            (
-                self.df[field_names.ISLAND_UNEMPLOYMENT_PCTILE_THRESHOLD]
-                | self.df[field_names.ISLAND_POVERTY_PCTILE_THRESHOLD]
-            )
-            | self.df[field_names.ISLAND_LOW_MEDIAN_INCOME_PCTILE_THRESHOLD]
+            | (
+                island_areas_unemployment
+                | island_areas_poverty
+                | island_areas_low_median_income
+            ),
         )
 
         # Because of the island complications, we also have to separately calculate the threshold for
         # socioeconomic thresholds
-        self.df[field_names.WORKFORCE_SOCIO_INDICATORS_EXCEEDED] = (
-            self.df[field_names.ISLAND_AREAS_LOW_HS_EDUCATION_FIELD]
-            | self.df[field_names.LOW_HS_EDUCATION_FIELD]
+        self._set_column(
+            field_names.WORKFORCE_SOCIO_INDICATORS_EXCEEDED,
+            island_areas_low_hs_education | low_hs_education,
         )
 
         # A tract is included if it meets either the states tract criteria or the
@@ -971,13 +923,20 @@ class ScoreNarwhal(Score):
             >= self.LOW_INCOME_THRESHOLD_DONUT
         )
 
-        self.df = self.df.merge(
-            calculate_tract_adjacency_scores(
-                self.df, field_names.SCORE_N_COMMUNITIES
-            ),
-            how="left",
-            on=field_names.GEOID_TRACT_FIELD,
+        # The adjacency scores are looked up by tract, like a left merge,
+        # without copying the whole dataframe. A merge gives the rows a new
+        # index, so they get one here too.
+        adjacency_column_name = (
+            field_names.SCORE_N_COMMUNITIES + field_names.ADJACENCY_INDEX_SUFFIX
         )
+        adjacency_scores = calculate_tract_adjacency_scores(
+            self.df, field_names.SCORE_N_COMMUNITIES
+        ).set_index(field_names.GEOID_TRACT_FIELD)[adjacency_column_name]
+        if not self.df.index.equals(pd.RangeIndex(len(self.df))):
+            self.df = self.df.reset_index(drop=True)
+        self.df[adjacency_column_name] = self.df[
+            field_names.GEOID_TRACT_FIELD
+        ].map(adjacency_scores)
 
         # This is the boolean we pass to the front end for color
         self.df[field_names.ADJACENT_TRACT_SCORE_ABOVE_DONUT_THRESHOLD] = (
@@ -1022,10 +981,8 @@ class ScoreNarwhal(Score):
     def _mark_territory_dacs(self) -> None:
         """Territory tracts that are flagged as low income are Score N communities."""
         self.df[field_names.SCORE_N_COMMUNITIES] = np.where(
-            self.df[field_names.GEOID_TRACT_FIELD].str.startswith(
-                tuple(constants.TILES_ISLAND_AREA_FIPS_CODES)
-            )
-            & self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED],
+            self._get_fips_mask(constants.TILES_ISLAND_AREA_FIPS_CODES)
+            & self._get_low_income(),
             True,
             self.df[field_names.SCORE_N_COMMUNITIES],
         )
@@ -1048,37 +1005,38 @@ class ScoreNarwhal(Score):
         """Combine poverty less than 200% for territories and update the income flag."""
         # First we set the low income flag for non-territories by themselves, this
         # way we don't change the original outcome if we include territories.
-        self.df[field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED] = (
-            self.df[
+        low_income = (
+            self._get_numeric_column(
                 # UPDATE: Pull the imputed poverty statistic
                 field_names.POVERTY_LESS_THAN_200_FPL_IMPUTED_FIELD
                 + field_names.PERCENTILE_FIELD_SUFFIX
-            ]
+            )
             >= self.LOW_INCOME_THRESHOLD
         )
+        self._set_column(
+            field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED, low_income
+        )
 
         # Now we set the low income flag only for territories, but we need to rank them
         # with all other tracts.
         # Note: This specific method call will generate the
         # CENSUS_DECENNIAL_POVERTY_LESS_THAN_200_FPL_PERCENTILE column in the score.
         (
-            self.df,
-            island_areas_poverty_200_criteria_field_name,
+            _,
+            island_areas_low_income,
         ) = self._combine_island_areas_with_states_and_set_thresholds(
-            df=self.df,
             column_from_island_areas=field_names.CENSUS_DECENNIAL_ADJUSTED_POVERTY_LESS_THAN_200_FPL_FIELD_2019,
             column_from_decennial_census=field_names.POVERTY_LESS_THAN_200_FPL_IMPUTED_FIELD,
             combined_column_name=field_names.COMBINED_POVERTY_LESS_THAN_200_FPL_FIELD_2010,
             threshold_cutoff_for_island_areas=self.LOW_INCOME_THRESHOLD,
         )
-        self.df.loc[
-            self.df[field_names.GEOID_TRACT_FIELD].str.startswith(
-                tuple(constants.TILES_ISLAND_AREA_FIPS_CODES)
-            ),
-            field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED,
-        ] = (
-            self.df[island_areas_poverty_200_criteria_field_name]
-            >= self.LOW_INCOME_THRESHOLD
+        self._low_income = np.where(
+            self._get_fips_mask(constants.TILES_ISLAND_AREA_FIPS_CODES),
+            island_areas_low_income,
+            low_income,
+        )
+        self._set_column(
+            field_names.FPL_200_SERIES_IMPUTED_AND_ADJUSTED, self._low_income
         )
 
     def _get_percent_of_tract_that_is_dac(self) -> float:
@@ -1100,31 +1058,43 @@ class ScoreNarwhal(Score):
 
     def add_columns(self) -> pd.DataFrame:
         logger.debug("Adding Score Narhwal")
-        self.df[field_names.THRESHOLD_COUNT] = 0
+        # The shared masks are computed again for each score, as the
+        # thresholds may have changed since the last one
+        self._fips_masks = {}
+        self._low_income = None
+        self._burden_thresholds_exceeded = None
+        self._columns = {}
+        self._set_column(
+            field_names.THRESHOLD_COUNT, np.zeros(len(self.df), dtype=np.int64)
+        )
 
         self._mark_poverty_flag()
 
-        self.df[field_names.N_CLIMATE] = self._climate_factor()
-        self.df[field_names.N_ENERGY] = self._energy_factor()
-        self.df[field_names.N_TRANSPORTATION] = self._transportation_factor()
-        self.df[field_names.N_HOUSING] = self._housing_factor()
-        self.df[field_names.N_POLLUTION] = self._pollution_factor()
-        self.df[field_names.N_WATER] = self._water_factor()
-        self.df[field_names.N_HEALTH] = self._health_factor()
-        self.df[field_names.N_WORKFORCE] = self._workforce_factor()
-
-        factors = [
-            field_names.N_CLIMATE,
-            field_names.N_ENERGY,
-            field_names.N_TRANSPORTATION,
-            field_names.N_HOUSING,
-            field_names.N_POLLUTION,
-            field_names.N_WATER,
-            field_names.N_HEALTH,
-            field_names.N_WORKFORCE,
-        ]
-        self.df[field_names.CATEGORY_COUNT] = self.df[factors].sum(axis=1)
-        self.df[field_names.SCORE_N_COMMUNITIES] = self.df[factors].any(axis=1)
+        factors = {
+            field_names.N_CLIMATE: self._climate_factor,
+            field_names.N_ENERGY: self._energy_factor,
+            field_names.N_TRANSPORTATION: self._transportation_factor,
+            field_names.N_HOUSING: self._housing_factor,
+            field_names.N_POLLUTION: self._pollution_factor,
+            field_names.N_WATER: self._water_factor,
+            field_names.N_HEALTH: self._health_factor,
+            field_names.N_WORKFORCE: self._workforce_factor,
+        }
+        factor_values = []
+        for factor_column_name, factor in factors.items():
+            factor_values.append(factor())
+            self._set_column(factor_column_name, factor_values[-1])
+
+        self._set_column(
+            field_names.CATEGORY_COUNT,
+            np.sum(factor_values, axis=0, dtype=np.int64),
+        )
+        self._set_column(
+            field_names.SCORE_N_COMMUNITIES,
+            np.logical_or.reduce(factor_values),
+        )
+        self._add_columns_to_df()
+
         self._mark_tribal_dacs()
         self._mark_territory_dacs()
         self.df[
@@ -0,0 +1,299 @@
+"""What-if sweeps of the Score N thresholds.
+
+The score is calculated for every combination of a grid of thresholds, from
+one load of the columns it is calculated from, to show how many tracts would
+be disadvantaged communities, their population and which tracts would change.
+"""
+import collections
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from data_pipeline.etl.score import constants
+from data_pipeline.score import field_names
+from data_pipeline.score.score_narwhal import ScoreNarwhal
+from data_pipeline.utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# The thresholds of Score N that can be swept
+SWEEPABLE_THRESHOLDS = (
+    "LOW_INCOME_THRESHOLD",
+    "ENVIRONMENTAL_BURDEN_THRESHOLD",
+    "MEDIAN_HOUSE_VALUE_THRESHOLD",
+    "LACK_OF_HIGH_SCHOOL_MINIMUM_THRESHOLD",
+    "LOW_INCOME_THRESHOLD_DONUT",
+    "SCORE_THRESHOLD_DONUT",
+)
+
+DAC_COUNT_FIELD = "Disadvantaged tracts"
+DAC_POPULATION_FIELD = "Population of disadvantaged tracts"
+TRACTS_ADDED_FIELD = "Tracts added"
+TRACTS_REMOVED_FIELD = "Tracts removed"
+
+# The score dataframe of each worker process, set once when it starts
+_worker_df: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class ThresholdSweep:
+    """The results of a threshold sweep.
+
+    `summary` has a row per combination of thresholds, with the number and
+    population of the disadvantaged tracts, and how many tracts were added
+    and removed compared to the score with its own thresholds.
+    `flipped_tracts` has a row per combination and tract that changed, with
+    whether the tract is a disadvantaged community with those thresholds.
+    """
+
+    summary: pd.DataFrame
+    flipped_tracts: pd.DataFrame
+
+
+def load_score_input(
+    path: Path = constants.DATA_SCORE_CSV_FULL_FILE_PATH,
+) -> pd.DataFrame:
+    """Loads the columns of a score file that Score N is calculated from.
+
+    Args:
+        path (Path): The score parquet file; defaults to the full score (optional)
+
+    Returns:
+        pd.DataFrame: The columns Score N reads, and the population of each tract
+    """
+    logger.debug(f"Loading the score input from {path}")
+    return pd.read_parquet(
+        path, columns=ScoreNarwhal.INPUT_FIELDS + [field_names.TOTAL_POP_FIELD]
+    )
+
+
+def threshold_grid(
+    thresholds: Dict[str, Sequence[float]]
+) -> List[Dict[str, float]]:
+    """Returns every combination of the values of some thresholds.
+
+    Args:
+        thresholds (Dict[str, Sequence[float]]): The values to try, by threshold name
+
+    Returns:
+        List[Dict[str, float]]: The value of each threshold, for each combination
+    """
+    unknown_thresholds = sorted(set(thresholds) - set(SWEEPABLE_THRESHOLDS))
+    if unknown_thresholds:
+        raise ValueError(
+            f"Cannot sweep {', '.join(unknown_thresholds)}; the thresholds "
+            f"that can be swept are {', '.join(SWEEPABLE_THRESHOLDS)}"
+        )
+    empty_thresholds = sorted(
+        threshold_name
+        for threshold_name, values in thresholds.items()
+        if len(values) == 0
+    )
+    if empty_thresholds:
+        raise ValueError(
+            f"No values to sweep for {', '.join(empty_thresholds)}"
+        )
+    names = list(thresholds)
+    return [
+        dict(zip(names, [float(value) for value in values]))
+        for values in itertools.product(*thresholds.values())
+    ]
+
+
+def parse_threshold_values(options: Sequence[str]) -> Dict[str, List[float]]:
+    """Parses thresholds and their values, written like
+    `LOW_INCOME_THRESHOLD=0.6,0.65`.
+
+    Args:
+        options (Sequence[str]): The thresholds and their values
+
+    Returns:
+        Dict[str, List[float]]: The values of each threshold, by its name
+    """
+    thresholds: Dict[str, List[float]] = {}
+    for option in options:
+        threshold_name, separator, values = option.partition("=")
+        threshold_name = threshold_name.strip()
+        if not separator or threshold_name not in SWEEPABLE_THRESHOLDS:
+            raise ValueError(
+                f"Expected one of {', '.join(SWEEPABLE_THRESHOLDS)} and its "
+                f"values, like LOW_INCOME_THRESHOLD=0.6,0.65, not '{option}'"
+            )
+        try:
+            thresholds.setdefault(threshold_name, []).extend(
+                float(value) for value in values.split(",") if value.strip()
+            )
+        except ValueError as e:
+            raise ValueError(
+                f"The values of {threshold_name} are not numbers: '{values}'"
+            ) from e
+    return thresholds
+
+
+def _calculate_dacs(
+    df: pd.DataFrame, thresholds: Dict[str, float]
+) -> np.ndarray:
+    """Returns whether each tract is a disadvantaged community, with some of
+    the thresholds of Score N changed."""
+    score = ScoreNarwhal(df=df.copy(deep=False))
+    for threshold_name, value in thresholds.items():
+        setattr(score, threshold_name, value)
+    return (
+        score.add_columns()[field_names.FINAL_SCORE_N_BOOLEAN]
+        .fillna(False)
+        .to_numpy(dtype=bool)
+    )
+
+
+def _init_worker(df: pd.DataFrame) -> None:
+    global _worker_df  # pylint: disable=global-statement
+    _worker_df = df
+
+
+def _calculate_worker_dacs(thresholds: Dict[str, float]) -> np.ndarray:
+    return _calculate_dacs(_worker_df, thresholds)
+
+
+def _run_combinations(
+    df: pd.DataFrame,
+    combinations: List[Dict[str, float]],
+    max_workers: int,
+) -> Iterator[np.ndarray]:
+    """Yields the disadvantaged communities of each combination, in order, in
+    worker processes if there is more than one worker."""
+    if max_workers <= 1:
+        for thresholds in combinations:
+            yield _calculate_dacs(df, thresholds)
+        return
+
+    # Each worker is sent the dataframe once, and then only the thresholds
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(df,),
+    ) as executor:
+        pending: Deque = collections.deque()
+        for thresholds in combinations:
+            pending.append(executor.submit(_calculate_worker_dacs, thresholds))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def sweep_thresholds(
+    df: pd.DataFrame,
+    thresholds: Dict[str, Sequence[float]],
+    max_workers: Optional[int] = None,
+) -> ThresholdSweep:
+    """Calculates Score N for every combination of some thresholds.
+
+    Args:
+        df (pd.DataFrame): The score input, as loaded by `load_score_input`
+        thresholds (Dict[str, Sequence[float]]): The values to try, by threshold name; the other thresholds keep the values of the score
+        max_workers (int): How many processes calculate the scores; defaults to the number of CPUs, and 1 calculates them in this process (optional)
+
+    Returns:
+        ThresholdSweep: The summary of each combination, and the tracts that flipped
+    """
+    combinations = threshold_grid(thresholds)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(combinations) + 1)
+    logger.info(
+        f"Calculating the score for {len(combinations)} combinations of thresholds"
+    )
+
+    df = df.reset_index(drop=True)
+    tract_ids = df[field_names.GEOID_TRACT_FIELD].to_numpy()
+    population = (
+        df[field_names.TOTAL_POP_FIELD]
+        .fillna(0)
+        .to_numpy(dtype=np.float64, na_value=0)
+    )
+    # The score with its own thresholds is calculated first, to compare to
+    results = _run_combinations(
+        df[ScoreNarwhal.INPUT_FIELDS], [{}] + combinations, max_workers
+    )
+    baseline = next(results)
+
+    threshold_names = list(thresholds)
+    summary_rows = []
+    flipped_tracts = []
+    # The results are zipped first, so that the workers are shut down after
+    # the last one
+    for dacs, thresholds_used in zip(results, combinations):
+        flipped = np.flatnonzero(dacs != baseline)
+        summary_rows.append(
+            {
+                **thresholds_used,
+                DAC_COUNT_FIELD: int(dacs.sum()),
+                DAC_POPULATION_FIELD: population[dacs].sum(),
+                TRACTS_ADDED_FIELD: int(dacs[flipped].sum()),
+                TRACTS_REMOVED_FIELD: int((~dacs[flipped]).sum()),
+            }
+        )
+        flipped_tracts.append(
+            pd.DataFrame(
+                {
+                    **thresholds_used,
+                    field_names.GEOID_TRACT_FIELD: tract_ids[flipped],
+                    field_names.FINAL_SCORE_N_BOOLEAN: dacs[flipped],
+                },
+                columns=threshold_names
+                + [
+                    field_names.GEOID_TRACT_FIELD,
+                    field_names.FINAL_SCORE_N_BOOLEAN,
+                ],
+            )
+        )
+
+    summary = pd.DataFrame(
+        summary_rows,
+        columns=threshold_names
+        + [
+            DAC_COUNT_FIELD,
+            DAC_POPULATION_FIELD,
+            TRACTS_ADDED_FIELD,
+            TRACTS_REMOVED_FIELD,
+        ],
+    )
+    return ThresholdSweep(
+        summary=summary,
+        flipped_tracts=pd.concat(flipped_tracts, ignore_index=True),
+    )
+
+
+def write_threshold_sweep(sweep: ThresholdSweep, path: Path) -> None:
+    """Writes the summary and the flipped tracts of a sweep as CSV files.
+
+    Args:
+        sweep (ThresholdSweep): The results of the sweep
+        path (Path): The directory to write `summary.csv` and `flipped_tracts.csv` to
+
+    Returns:
+        None
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for file_name, sweep_df in (
+        ("summary.csv", sweep.summary),
+        ("flipped_tracts.csv", sweep.flipped_tracts),
+    ):
+        file_path = path / file_name
+        partial_path = file_path.with_name(file_path.name + ".part")
+        sweep_df.to_csv(partial_path, index=False)
+        os.replace(partial_path, file_path)
+    logger.debug(f"Wrote the threshold sweep to {path}")
@@ -1,8 +1,11 @@
 """Utilities to help generate the score."""
+from typing import Optional
+
 import data_pipeline.score.field_names as field_names
-import geopandas as gpd
+import numpy as np
 import pandas as pd
-from data_pipeline.etl.sources.geo_utils import get_tract_geojson
+from data_pipeline.etl.sources.geo_utils import get_tract_adjacency
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
 from data_pipeline.utils import get_module_logger
 
 # XXX: @jorge I am torn about the coupling that importing from
@@ -48,10 +51,14 @@ def full_geo_id_to_water_range_bool(x: str):
 
 
 def calculate_tract_adjacency_scores(
-    df: pd.DataFrame, score_column: str
+    df: pd.DataFrame,
+    score_column: str,
+    tract_adjacency: Optional[TractAdjacency] = None,
 ) -> pd.DataFrame:
     """Calculate the mean score of each tract in df based on its neighbors
 
+    Water areas (tracts without land area) do not count as neighbors.
+
     Args:
         df (pandas.DataFrame): A dataframe with at least the following columns:
           * field_names.GEOID_TRACT_FIELD
@@ -59,6 +66,8 @@ def calculate_tract_adjacency_scores(
 
         score_column (str): The name of the column that contains the scores
                             to average
+        tract_adjacency (TractAdjacency): The tract adjacency to use, which
+                            defaults to the national tract adjacency
     Returns:
         df (pandas.DataFrame): A dataframe with two columns:
           * field_names.GEOID_TRACT_FIELD
@@ -66,31 +75,27 @@ def calculate_tract_adjacency_scores(
             each tract that touches the tract identified
             in field_names.GEOID_TRACT_FIELD
     """
-    ORIGINAL_TRACT = "ORIGINAL_TRACT"
     logger.debug("Calculating tract adjacency scores")
-    tract_data = get_tract_geojson()
-
-    df: gpd.GeoDataFrame = tract_data.merge(
-        df, on=field_names.GEOID_TRACT_FIELD
-    )
-    df = df.rename(columns={field_names.GEOID_TRACT_FIELD: ORIGINAL_TRACT})
+    if tract_adjacency is None:
+        tract_adjacency = get_tract_adjacency()
 
-    # remove water areas from input frame
-    df = df[df[field_names.LAND_AREA_FIELD] > 0]
+    geoids = df[field_names.GEOID_TRACT_FIELD]
+    scores = df[[score_column]].astype(float)
 
-    logger.debug("Perfoming spatial join to find all adjacent tracts")
-    adjacent_tracts: gpd.GeoDataFrame = df.sjoin(
-        tract_data, predicate="touches"
-    )
+    # remove water areas from the neighbors
+    if tract_adjacency.land_area is not None:
+        land_area = pd.Series(
+            tract_adjacency.land_area, index=tract_adjacency.geoids
+        ).reindex(geoids.astype(str))
+        scores.loc[~(land_area > 0).to_numpy(), score_column] = np.nan
 
     logger.debug("Calculating means based on adjacency")
-    return (
-        adjacent_tracts.groupby(field_names.GEOID_TRACT_FIELD)[[score_column]]
-        .mean()
-        .reset_index()
-        .rename(
-            columns={
-                score_column: f"{score_column}{field_names.ADJACENCY_INDEX_SUFFIX}",
-            }
-        )
-    )
+    adjacency_scores = tract_adjacency.neighbor_mean(geoids, scores)
+    return pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: geoids.to_numpy(),
+            f"{score_column}{field_names.ADJACENCY_INDEX_SUFFIX}": (
+                adjacency_scores[score_column].to_numpy()
+            ),
+        }
+    ).dropna(subset=[f"{score_column}{field_names.ADJACENCY_INDEX_SUFFIX}"])
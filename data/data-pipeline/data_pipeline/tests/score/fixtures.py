@@ -2,6 +2,28 @@ import pandas as pd
 import pytest
 from data_pipeline.config import settings
 from data_pipeline.etl.score import constants
+from data_pipeline.etl.sources.cdc_life_expectancy.etl import CDCLifeExpectancy
+from data_pipeline.etl.sources.cdc_places.etl import CDCPlacesETL
+from data_pipeline.etl.sources.census_acs.etl import CensusACSETL
+from data_pipeline.etl.sources.doe_energy_burden.etl import DOEEnergyBurden
+from data_pipeline.etl.sources.dot_travel_composite.etl import (
+    TravelCompositeETL,
+)
+from data_pipeline.etl.sources.eamlis.etl import AbandonedMineETL
+from data_pipeline.etl.sources.ejscreen.etl import EJSCREENETL
+from data_pipeline.etl.sources.fsf_flood_risk.etl import FloodRiskETL
+from data_pipeline.etl.sources.fsf_wildfire_risk.etl import WildfireRiskETL
+from data_pipeline.etl.sources.geocorr.etl import GeoCorrETL
+from data_pipeline.etl.sources.historic_redlining.etl import (
+    HistoricRedliningETL,
+)
+from data_pipeline.etl.sources.hud_housing.etl import HudHousingETL
+from data_pipeline.etl.sources.national_risk_index.etl import (
+    NationalRiskIndexETL,
+)
+from data_pipeline.etl.sources.nlcd_nature_deprived.etl import NatureDeprivedETL
+from data_pipeline.etl.sources.tribal_overlap.etl import TribalOverlapETL
+from data_pipeline.etl.sources.us_army_fuds.etl import USArmyFUDS
 from data_pipeline.score.field_names import GEOID_TRACT_FIELD
 
 
@@ -19,44 +41,22 @@ def final_score_df():
 
 @pytest.fixture()
 def census_acs_df():
-    census_acs_csv = constants.DATA_PATH / "dataset" / "census_acs" / "usa.csv"
-    return pd.read_csv(
-        census_acs_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return CensusACSETL.get_data_frame()
 
 
 @pytest.fixture()
 def ejscreen_df():
-    ejscreen_csv = constants.DATA_PATH / "dataset" / "ejscreen" / "usa.csv"
-    return pd.read_csv(
-        ejscreen_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return EJSCREENETL.get_data_frame()
 
 
 @pytest.fixture()
 def hud_housing_df():
-    hud_housing_csv = (
-        constants.DATA_PATH / "dataset" / "hud_housing" / "usa.csv"
-    )
-    return pd.read_csv(
-        hud_housing_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return HudHousingETL.get_data_frame()
 
 
 @pytest.fixture()
 def cdc_places_df():
-    cdc_places_csv = constants.DATA_PATH / "dataset" / "cdc_places" / "usa.csv"
-    return pd.read_csv(
-        cdc_places_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return CDCPlacesETL.get_data_frame()
 
 
 @pytest.fixture()
@@ -76,101 +76,52 @@ def census_acs_median_incomes_df():
 
 @pytest.fixture()
 def cdc_life_expectancy_df():
-    cdc_life_expectancy_csv = (
-        constants.DATA_PATH / "dataset" / "cdc_life_expectancy" / "usa.csv"
-    )
-    return pd.read_csv(
-        cdc_life_expectancy_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return CDCLifeExpectancy.get_data_frame()
 
 
 @pytest.fixture()
 def doe_energy_burden_df():
-    doe_energy_burden_csv = (
-        constants.DATA_PATH / "dataset" / "doe_energy_burden" / "usa.csv"
-    )
-    return pd.read_csv(
-        doe_energy_burden_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return DOEEnergyBurden.get_data_frame()
 
 
 @pytest.fixture()
 def national_risk_index_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "national_risk_index" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return NationalRiskIndexETL.get_data_frame()
 
 
 @pytest.fixture()
 def dot_travel_disadvantage_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "travel_composite" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return TravelCompositeETL.get_data_frame()
 
 
 @pytest.fixture()
 def fsf_fire_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "fsf_wildfire_risk" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return WildfireRiskETL.get_data_frame()
 
 
 @pytest.fixture()
 def fsf_flood_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "fsf_flood_risk" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return FloodRiskETL.get_data_frame()
 
 
 @pytest.fixture()
 def nature_deprived_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "nlcd_nature_deprived" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return NatureDeprivedETL.get_data_frame()
 
 
 @pytest.fixture()
 def eamlis_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "eamlis" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return AbandonedMineETL.get_data_frame()
 
 
 @pytest.fixture()
 def fuds_df():
-    return pd.read_csv(
-        constants.DATA_PATH / "dataset" / "us_army_fuds" / "usa.csv",
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return USArmyFUDS.get_data_frame()
 
 
 @pytest.fixture()
 def geocorr_urban_rural_df():
-    geocorr_urban_rural_csv = (
-        constants.DATA_PATH / "dataset" / "geocorr" / "usa.csv"
-    )
-    return pd.read_csv(
-        geocorr_urban_rural_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return GeoCorrETL.get_data_frame()
 
 
 @pytest.fixture()
@@ -199,13 +150,7 @@ def census_2010_df():
 
 @pytest.fixture()
 def hrs_df():
-    hrs_csv = constants.DATA_PATH / "dataset" / "historic_redlining" / "usa.csv"
-
-    return pd.read_csv(
-        hrs_csv,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return HistoricRedliningETL.get_data_frame()
 
 
 @pytest.fixture()
@@ -222,12 +167,4 @@ def national_tract_df():
 
 @pytest.fixture()
 def tribal_overlap():
-    tribal_overlap = (
-        constants.DATA_PATH / "dataset" / "tribal_overlap" / "usa.csv"
-    )
-
-    return pd.read_csv(
-        tribal_overlap,
-        dtype={GEOID_TRACT_FIELD: "string"},
-        low_memory=False,
-    )
+    return TribalOverlapETL.get_data_frame()
@@ -1,4 +1,5 @@
 # pylint: disable=protected-access
+import numpy as np
 import pandas as pd
 import pytest
 from data_pipeline.config import settings
@@ -155,3 +156,52 @@ def test_mark_grandfathered_dacs():
     assert result[field_names.FINAL_SCORE_N_BOOLEAN][1]
     assert result[field_names.FINAL_SCORE_N_BOOLEAN][2]
     assert result[field_names.FINAL_SCORE_N_BOOLEAN][3]
+
+
+def test_burden_thresholds_exceeded():
+    test_df = pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: ["01001020100", "01001020200"],
+            **{
+                field_name + field_names.PERCENTILE_FIELD_SUFFIX: [0.95, None]
+                for field_name in ScoreNarwhal.BURDEN_PERCENTILE_FIELDS
+            },
+        }
+    )
+    test_df[field_names.PM25_FIELD + field_names.PERCENTILE_FIELD_SUFFIX] = [
+        0.5,
+        0.9,
+    ]
+    scorer = ScoreNarwhal(test_df)
+
+    assert list(
+        scorer._get_burden_threshold_exceeded(field_names.DIESEL_FIELD)
+    ) == [True, False]
+    assert list(
+        scorer._get_burden_threshold_exceeded(field_names.PM25_FIELD)
+    ) == [False, True]
+
+
+def test_increment_total_eligibility_exceeded():
+    test_df = pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: [
+                "01001020100",
+                "72001956300",
+                "78010990000",
+            ],
+            field_names.THRESHOLD_COUNT: [1, 1, 1],
+        }
+    )
+    scorer = ScoreNarwhal(test_df)
+
+    scorer._increment_total_eligibility_exceeded(
+        [
+            np.array([True, True, False]),
+            # Missing values are not counted
+            ScoreNarwhal._as_mask(pd.Series([True, None, None])),
+        ],
+        skip_fips="72",
+    )
+
+    assert list(test_df[field_names.THRESHOLD_COUNT]) == [3, 1, 1]
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.score import field_names
+from data_pipeline.score import score_narwhal
+from data_pipeline.score import threshold_sweep
+from data_pipeline.score.score_narwhal import ScoreNarwhal
+
+BOOLEAN_FIELDS = [
+    field_names.HISTORIC_REDLINING_SCORE_EXCEEDED,
+    field_names.ELIGIBLE_FUDS_BINARY_FIELD_NAME,
+    field_names.AML_BOOLEAN,
+    field_names.IS_TRIBAL_DAC,
+    field_names.FINAL_SCORE_N_BOOLEAN_V1_0,
+]
+
+
+@pytest.fixture
+def score_input_df():
+    rng = np.random.default_rng(2022)
+    state_codes = ["01", "06", "36", "72", "60", "66", "69", "78"]
+    tract_count = 400
+    df = pd.DataFrame(
+        {
+            field_names.GEOID_TRACT_FIELD: [
+                f"{state_codes[i % len(state_codes)]}{i:09d}"
+                for i in range(tract_count)
+            ]
+        }
+    )
+    for field_name in ScoreNarwhal.INPUT_FIELDS[1:]:
+        if field_name in BOOLEAN_FIELDS:
+            df[field_name] = rng.random(tract_count) < 0.05
+        else:
+            df[field_name] = rng.random(tract_count)
+    df[field_names.TOTAL_POP_FIELD] = rng.integers(0, 8000, tract_count)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def no_adjacent_tracts(monkeypatch):
+    def calculate_tract_adjacency_scores(df, score_column):
+        return pd.DataFrame(
+            {
+                field_names.GEOID_TRACT_FIELD: df[
+                    field_names.GEOID_TRACT_FIELD
+                ],
+                score_column + field_names.ADJACENCY_INDEX_SUFFIX: 0.0,
+            }
+        )
+
+    monkeypatch.setattr(
+        score_narwhal,
+        "calculate_tract_adjacency_scores",
+        calculate_tract_adjacency_scores,
+    )
+
+
+def _calculate_dacs(df, **thresholds):
+    score = ScoreNarwhal(df=df[ScoreNarwhal.INPUT_FIELDS].copy())
+    for threshold_name, value in thresholds.items():
+        setattr(score, threshold_name, value)
+    return score.add_columns()[field_names.FINAL_SCORE_N_BOOLEAN]
+
+
+def test_sweep_thresholds(score_input_df):
+    sweep = threshold_sweep.sweep_thresholds(
+        score_input_df,
+        {
+            "ENVIRONMENTAL_BURDEN_THRESHOLD": [0.8, 0.9],
+            "LOW_INCOME_THRESHOLD": [0.5, 0.65],
+        },
+        max_workers=1,
+    )
+    baseline = _calculate_dacs(score_input_df)
+
+    assert len(sweep.summary) == 4
+    for _, row in sweep.summary.iterrows():
+        thresholds = {
+            "ENVIRONMENTAL_BURDEN_THRESHOLD": row[
+                "ENVIRONMENTAL_BURDEN_THRESHOLD"
+            ],
+            "LOW_INCOME_THRESHOLD": row["LOW_INCOME_THRESHOLD"],
+        }
+        dacs = _calculate_dacs(score_input_df, **thresholds)
+        flipped = sweep.flipped_tracts[
+            (
+                sweep.flipped_tracts["ENVIRONMENTAL_BURDEN_THRESHOLD"]
+                == thresholds["ENVIRONMENTAL_BURDEN_THRESHOLD"]
+            )
+            & (
+                sweep.flipped_tracts["LOW_INCOME_THRESHOLD"]
+                == thresholds["LOW_INCOME_THRESHOLD"]
+            )
+        ]
+        assert row[threshold_sweep.DAC_COUNT_FIELD] == dacs.sum()
+        assert (
+            row[threshold_sweep.DAC_POPULATION_FIELD]
+            == score_input_df.loc[dacs, field_names.TOTAL_POP_FIELD].sum()
+        )
+        assert (
+            row[threshold_sweep.TRACTS_ADDED_FIELD] == (dacs & ~baseline).sum()
+        )
+        assert (
+            row[threshold_sweep.TRACTS_REMOVED_FIELD]
+            == (~dacs & baseline).sum()
+        )
+        assert (
+            flipped[field_names.GEOID_TRACT_FIELD].tolist()
+            == score_input_df.loc[
+                dacs != baseline, field_names.GEOID_TRACT_FIELD
+            ].tolist()
+        )
+        assert (
+            flipped[field_names.FINAL_SCORE_N_BOOLEAN].tolist()
+            == dacs[dacs != baseline].tolist()
+        )
+
+    # The thresholds of the score itself do not change any tracts, and lower
+    # thresholds only add tracts
+    default_thresholds = sweep.summary[
+        (sweep.summary["ENVIRONMENTAL_BURDEN_THRESHOLD"] == 0.9)
+        & (sweep.summary["LOW_INCOME_THRESHOLD"] == 0.65)
+    ]
+    assert default_thresholds[threshold_sweep.DAC_COUNT_FIELD].item() == (
+        baseline.sum()
+    )
+    assert default_thresholds[threshold_sweep.TRACTS_ADDED_FIELD].item() == 0
+    assert (sweep.summary[threshold_sweep.TRACTS_REMOVED_FIELD] == 0).all()
+    assert (sweep.summary[threshold_sweep.TRACTS_ADDED_FIELD] > 0).sum() == 3
+
+
+def test_threshold_grid():
+    assert threshold_sweep.threshold_grid(
+        {"LOW_INCOME_THRESHOLD": [0.6, 0.7], "SCORE_THRESHOLD_DONUT": [1]}
+    ) == [
+        {"LOW_INCOME_THRESHOLD": 0.6, "SCORE_THRESHOLD_DONUT": 1.0},
+        {"LOW_INCOME_THRESHOLD": 0.7, "SCORE_THRESHOLD_DONUT": 1.0},
+    ]
+    with pytest.raises(ValueError):
+        threshold_sweep.threshold_grid(
+            {"MAX_COLLEGE_ATTENDANCE_THRESHOLD": [1]}
+        )
+    with pytest.raises(ValueError):
+        threshold_sweep.threshold_grid({"LOW_INCOME_THRESHOLD": []})
+
+
+def test_parse_threshold_values():
+    assert threshold_sweep.parse_threshold_values(
+        [
+            "LOW_INCOME_THRESHOLD=0.6,0.65",
+            "ENVIRONMENTAL_BURDEN_THRESHOLD=0.85",
+            "LOW_INCOME_THRESHOLD=0.7",
+        ]
+    ) == {
+        "LOW_INCOME_THRESHOLD": [0.6, 0.65, 0.7],
+        "ENVIRONMENTAL_BURDEN_THRESHOLD": [0.85],
+    }
+    for option in ["LOW_INCOME_THRESHOLD", "FOO=1", "LOW_INCOME_THRESHOLD=a"]:
+        with pytest.raises(ValueError):
+            threshold_sweep.parse_threshold_values([option])
+
+
+def test_write_threshold_sweep(score_input_df, tmp_path):
+    sweep = threshold_sweep.sweep_thresholds(
+        score_input_df, {"LOW_INCOME_THRESHOLD": [0.5]}, max_workers=1
+    )
+    threshold_sweep.write_threshold_sweep(sweep, tmp_path / "sweep")
+
+    assert sorted(path.name for path in (tmp_path / "sweep").iterdir()) == [
+        "flipped_tracts.csv",
+        "summary.csv",
+    ]
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "sweep" / "summary.csv"),
+        sweep.summary,
+        check_dtype=False,
+    )
+    assert len(pd.read_csv(tmp_path / "sweep" / "flipped_tracts.csv")) == len(
+        sweep.flipped_tracts
+    )
@@ -13,7 +13,9 @@ from data_pipeline.etl.score.constants import TILES_SCORE_COLUMNS
 from data_pipeline.etl.score.constants import (
     USER_INTERFACE_EXPERIENCE_FIELD_NAME,
 )
+from data_pipeline.etl.score.geoparquet_writer import read_geoparquet
 from data_pipeline.score import field_names
+from data_pipeline.tile.mvt import read_mbtiles
 
 from .fixtures import final_score_df  # pylint: disable=unused-import
 
@@ -36,6 +38,32 @@ def tiles_geojson_df():
     )
 
 
+@pytest.fixture()
+def tiles_geoparquet_df():
+    return read_geoparquet(
+        settings.APP_ROOT / "data" / "score" / "geoparquet" / "usa-high.parquet"
+    )
+
+
+@pytest.fixture()
+def tiles_mbtiles_df():
+    # The properties of the highest zoom of the high zoom tiles, where no
+    # tract is left out
+    return read_mbtiles(
+        settings.APP_ROOT
+        / "data"
+        / "score"
+        / "tiles"
+        / "default"
+        / "legacy"
+        / "high"
+        / "usa_high.mbtiles",
+        zoom=11,
+        layer_name="blocks",
+        geometry=False,
+    )
+
+
 PERCENTILE_FIELDS = [
     "DF_PFS",
     "AF_PFS",
@@ -270,6 +298,76 @@ def test_for_geojson_fidelity_from_tiles_csv(tiles_df, tiles_geojson_df):
             ), error_message
 
 
+def _assert_column_values_equal(
+    actual: pd.Series, expected: pd.Series, col_name: str
+) -> None:
+    """Asserts that a column has the values of the tiles CSV, row by row"""
+    actual = actual.reset_index(drop=True)
+    expected = expected.reset_index(drop=True)
+    error_message = f"Column {col_name} not equal "
+    if pd.api.types.is_numeric_dtype(expected) or pd.api.types.is_bool_dtype(
+        expected
+    ):
+        # Use np.allclose so we don't get harmed by float equality weirdness
+        assert np.allclose(
+            actual.astype("float64"),
+            expected.astype("float64"),
+            equal_nan=True,
+        ), error_message
+    else:
+        assert (
+            actual.where(actual.notna(), None).tolist()
+            == expected.where(expected.notna(), None).tolist()
+        ), error_message
+
+
+def test_for_geoparquet_fidelity_from_tiles_csv(tiles_df, tiles_geoparquet_df):
+    # The GeoParquet file has the tracts in spatial order, so both are put in
+    # the order of their tract IDs
+    tiles_geoparquet_df = (
+        tiles_geoparquet_df.drop(columns=["geometry"])
+        .rename(columns={"GEOID10": "GTF"})
+        .sort_values("GTF")
+        .reset_index(drop=True)
+    )
+    tiles_df = tiles_df.sort_values("GTF").reset_index(drop=True)
+    assert set(tiles_geoparquet_df["GTF"]) == set(tiles_df["GTF"])
+    assert tiles_df.shape == tiles_geoparquet_df.shape
+    assert sorted(tiles_df.columns) == sorted(tiles_geoparquet_df.columns)
+
+    for col_name in tiles_df.columns:
+        _assert_column_values_equal(
+            tiles_geoparquet_df[col_name], tiles_df[col_name], col_name
+        )
+
+
+def test_for_mbtiles_fidelity_from_tiles_csv(tiles_df, tiles_mbtiles_df):
+    tiles_mbtiles_df = tiles_mbtiles_df.drop(
+        columns=["zoom", "column", "row", "geometry"]
+    ).rename(columns={"GEOID10": "GTF"})
+    # Every tract is in at least one tile
+    assert set(tiles_mbtiles_df["GTF"]) == set(tiles_df["GTF"])
+    # Missing values are left out of the features, so only the columns
+    # without any values are not in the tiles
+    assert set(tiles_mbtiles_df.columns) == set(
+        tiles_df.columns[tiles_df.notna().any()]
+    )
+
+    # The features of a sample of tracts, in every tile they are in, have
+    # the values of the tiles CSV
+    sample_geoids = tiles_df["GTF"].sample(
+        n=min(1000, len(tiles_df)), random_state=0
+    )
+    actual_df = tiles_mbtiles_df[
+        tiles_mbtiles_df["GTF"].isin(sample_geoids)
+    ].reindex(columns=tiles_df.columns)
+    expected_df = tiles_df.set_index("GTF", drop=False).loc[actual_df["GTF"]]
+    for col_name in tiles_df.columns:
+        _assert_column_values_equal(
+            actual_df[col_name], expected_df[col_name], col_name
+        )
+
+
 def test_for_state_names(tiles_df):
     states = tiles_df["SF"].value_counts(dropna=False).index
     assert np.nan not in states
@@ -7,7 +7,7 @@ from unittest import mock
 
 import pandas as pd
 import pytest
-from data_pipeline.etl.sources.geo_utils import get_tract_geojson
+from data_pipeline.etl.sources.geo_utils import get_tract_adjacency
 from data_pipeline.score import field_names
 from data_pipeline.score.utils import (
     calculate_tract_adjacency_scores as original_calculate_tract_adjacency_score,
@@ -19,12 +19,12 @@ def patch_calculate_tract_adjacency_scores():
     # Use fixtures for tract data.
     tract_data_path = Path(__file__).parent / "data" / "us_geo.parquet"
 
-    get_tract_geojson_mock = partial(
-        get_tract_geojson, _tract_data_path=tract_data_path
+    get_tract_adjacency_mock = partial(
+        get_tract_adjacency, _tract_data_path=tract_data_path
     )
     with mock.patch(
-        "data_pipeline.score.utils.get_tract_geojson",
-        new=get_tract_geojson_mock,
+        "data_pipeline.score.utils.get_tract_adjacency",
+        new=get_tract_adjacency_mock,
     ):
         yield original_calculate_tract_adjacency_score
 
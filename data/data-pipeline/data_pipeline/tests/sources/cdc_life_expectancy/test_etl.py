@@ -1,4 +1,5 @@
 # pylint: disable=protected-access
+import io
 import pathlib
 from unittest import mock
 
@@ -80,9 +81,12 @@ class TestCDCLifeExpectency(TestETL):
                 # pylint: disable=protected-access
                 # Return text fixture:
                 response_mock._content = file_contents
+                # Downloads are streamed from `raw`
+                response_mock.raw = io.BytesIO(file_contents)
                 return response_mock
 
             requests_mock.get = fake_get
+            requests_mock.Session.return_value.get = fake_get
 
             # fips codes mock
             mock_get_state_fips_codes.return_value = [
@@ -127,6 +131,6 @@ class TestCDCLifeExpectency(TestETL):
 
         output_file_path = etl._get_output_file_path()
         expected_output_file_path = (
-            data_path / "dataset" / "cdc_life_expectancy" / "usa.csv"
+            data_path / "dataset" / "cdc_life_expectancy" / "usa.parquet"
         )
         assert output_file_path == expected_output_file_path
@@ -0,0 +1,90 @@
+from collections import namedtuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.etl.sources.census_acs.etl_imputations import (
+    calculate_income_measures,
+)
+from shapely.geometry import box
+
+ImputeVariables = namedtuple(
+    "ImputeVariables", ["raw_field_name", "imputed_field_name"]
+)
+
+
+def _reference_imputation(
+    geo_df: gpd.GeoDataFrame, raw_field: str, tract: str
+) -> float:
+    """Imputes one tract with a geometry query: neighbors, then county, then state."""
+    row = geo_df[geo_df["GEOID10_TRACT"] == tract].iloc[0]
+    for mask in [
+        geo_df.geometry.touches(row.geometry),
+        geo_df["GEOID10_TRACT"].str[:5] == tract[:5],
+        geo_df["GEOID10_TRACT"].str[:2] == tract[:2],
+    ]:
+        if geo_df[mask][raw_field].notna().any():
+            return geo_df[mask][raw_field].mean()
+    raise AssertionError("No tracts to impute from")
+
+
+@pytest.fixture
+def grid_geo_df() -> gpd.GeoDataFrame:
+    """A 12x12 grid of tracts split over two states and several counties,
+    with nulls sprinkled through two raw fields."""
+    rng = np.random.default_rng(seed=74)
+    records = []
+    for x in range(12):
+        for y in range(12):
+            state = "01" if x < 6 else "02"
+            county = f"{y // 4:03d}"
+            records.append(
+                {
+                    "GEOID10_TRACT": f"{state}{county}{x:03d}{y:03d}",
+                    "geometry": box(x, y, x + 1, y + 1),
+                }
+            )
+    geo_df = gpd.GeoDataFrame(records, crs="EPSG:4326")
+    for raw_field, null_share in [("raw_a", 0.3), ("raw_b", 0.7)]:
+        values = rng.random(len(geo_df)) * 100
+        values[rng.random(len(geo_df)) < null_share] = np.nan
+        geo_df[raw_field] = values
+    # Leave a whole county without values so it falls back to the state
+    geo_df.loc[
+        geo_df["GEOID10_TRACT"].str.startswith("02001"), "raw_b"
+    ] = np.nan
+    geo_df["population"] = rng.integers(0, 3, len(geo_df))
+    return geo_df
+
+
+def test_calculate_income_measures_matches_reference(grid_geo_df):
+    impute_vars = [
+        ImputeVariables("raw_a", "imputed_a"),
+        ImputeVariables("raw_b", "imputed_b"),
+    ]
+    result = calculate_income_measures(
+        impute_var_named_tup_list=impute_vars,
+        geo_df=grid_geo_df.copy(),
+        geoid_field="GEOID10_TRACT",
+        population_field="population",
+    )
+
+    assert isinstance(result, pd.DataFrame)
+    assert "geometry" not in result.columns
+
+    needs_imputation = grid_geo_df[["raw_a", "raw_b"]].isna().any(axis=1) & (
+        grid_geo_df["population"] >= 1
+    )
+    for index, row in grid_geo_df.iterrows():
+        for impute_var in impute_vars:
+            if needs_imputation[index]:
+                expected = _reference_imputation(
+                    grid_geo_df, impute_var.raw_field_name, row["GEOID10_TRACT"]
+                )
+            else:
+                expected = row[impute_var.raw_field_name]
+            actual = result.loc[index, impute_var.imputed_field_name]
+            assert (actual == expected) or (
+                np.isnan(actual) and np.isnan(expected)
+            )
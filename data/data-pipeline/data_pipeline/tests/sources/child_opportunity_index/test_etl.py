@@ -64,6 +64,6 @@ class TestChildOpportunityIndexETL(TestETL):
 
         output_file_path = etl._get_output_file_path()
         expected_output_file_path = (
-            data_path / "dataset" / "child_opportunity_index" / "usa.csv"
+            data_path / "dataset" / "child_opportunity_index" / "usa.parquet"
         )
         assert output_file_path == expected_output_file_path
@@ -54,6 +54,6 @@ class TestDOEEnergyBurdenETL(TestETL):
 
         output_file_path = etl._get_output_file_path()
         expected_output_file_path = (
-            data_path / "dataset" / "doe_energy_burden" / "usa.csv"
+            data_path / "dataset" / "doe_energy_burden" / "usa.parquet"
         )
         assert output_file_path == expected_output_file_path
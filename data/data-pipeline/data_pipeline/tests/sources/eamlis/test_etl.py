@@ -81,7 +81,7 @@ class TestAbandondedLandMineETL(TestETL):
 
         output_file_path = etl._get_output_file_path()
         expected_output_file_path = (
-            data_path / "dataset" / self._ETL_CLASS.NAME / "usa.csv"
+            data_path / "dataset" / self._ETL_CLASS.NAME / "usa.parquet"
         )
         assert output_file_path == expected_output_file_path
 
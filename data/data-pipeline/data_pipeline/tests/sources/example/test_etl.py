@@ -1,5 +1,6 @@
 # pylint: disable=protected-access, unsubscriptable-object, unnecessary-dunder-call
 import copy
+import io
 import os
 import pathlib
 from typing import Optional
@@ -11,6 +12,7 @@ import pandas as pd
 import pytest
 import requests
 from data_pipeline.etl.base import ExtractTransformLoad
+from data_pipeline.etl.base import OutputFormat
 from data_pipeline.etl.base import ValidGeoLevel
 from data_pipeline.etl.score.constants import TILES_ALASKA_AND_HAWAII_FIPS_CODE
 from data_pipeline.etl.score.constants import TILES_CONTINENTAL_US_FIPS_CODE
@@ -152,12 +154,18 @@ class TestETL:
                 ) as file:
                     file_contents = file.read()
 
-            response_mock = requests.Response()
-            response_mock.status_code = 200
-            # pylint: disable=protected-access
-            response_mock._content = file_contents
+            def fake_get(*args, **kwargs):
+                response_mock = requests.Response()
+                response_mock.status_code = 200
+                # pylint: disable=protected-access
+                response_mock._content = file_contents
+                # Downloads are streamed from `raw`
+                response_mock.raw = io.BytesIO(file_contents)
+                return response_mock
+
             # Return text fixture:
-            requests_mock.get = mock.MagicMock(return_value=response_mock)
+            requests_mock.get = mock.MagicMock(side_effect=fake_get)
+            requests_mock.Session.return_value.get = requests_mock.get
             mock_get_state_fips_codes.return_value = [
                 x[0:2] for x in self._FIXTURES_SHARED_TRACT_IDS
             ]
@@ -210,14 +218,14 @@ class TestETL:
     def test_get_output_file_path_base(self, mock_etl, mock_paths):
         """Test file path method.
         Can be run without modification for all child classes,
-        except those that do not produce usa.csv files.
+        except those that do not produce usa.parquet files.
         """
         etl = self._get_instance_of_etl_class()
         data_path, tmp_path = mock_paths
 
         actual_file_path = etl._get_output_file_path()
 
-        expected_file_path = data_path / "dataset" / etl.NAME / "usa.csv"
+        expected_file_path = data_path / "dataset" / etl.NAME / "usa.parquet"
 
         logger.debug(f"Expected: {expected_file_path}")
 
@@ -364,9 +372,7 @@ class TestETL:
         assert actual_output_path.exists()
 
         # Check COLUMNS_TO_KEEP remain
-        actual_output = pd.read_csv(
-            actual_output_path, dtype={etl.GEOID_TRACT_FIELD_NAME: str}
-        )
+        actual_output = etl.get_data_frame()
 
         for col in etl.COLUMNS_TO_KEEP:
             assert col in actual_output.columns, f"{col} is missing from output"
@@ -596,3 +602,26 @@ class TestETL:
 
         else:
             raise NotImplementedError("This geo level not tested yet.")
+
+    def test_get_data_frame_columns_base(self, mock_etl, mock_paths):
+        """Every ETL class should be able to return only some of its columns,
+        and export its output as a CSV.
+        Can be run without modification for all child classes.
+        """
+        etl = self._setup_etl_instance_and_run_extract(
+            mock_etl=mock_etl, mock_paths=mock_paths
+        )
+        etl.transform()
+        etl.validate()
+        etl.load()
+
+        columns = etl.COLUMNS_TO_KEEP[-1:]
+        output_df = etl.get_data_frame(columns=columns)
+        assert list(output_df.columns) == columns
+        assert len(output_df) == len(etl.output_df)
+
+        csv_path = etl.export_csv()
+        assert csv_path == etl._get_output_file_path(OutputFormat.CSV)
+        csv_df = pd.read_csv(csv_path)
+        assert list(csv_df.columns) == etl.COLUMNS_TO_KEEP
+        assert len(csv_df) == len(etl.output_df)
@@ -52,9 +52,7 @@ class TestHistoricRedliningETL(TestETL):
         assert actual_output_path.exists()
 
         # Check COLUMNS_TO_KEEP remain
-        actual_output = pd.read_csv(
-            actual_output_path, dtype={etl.GEOID_TRACT_FIELD_NAME: str}
-        )
+        actual_output = etl.get_data_frame()
 
         for col in etl.COLUMNS_TO_KEEP:
             assert col in actual_output.columns, f"{col} is missing from output"
@@ -62,6 +62,6 @@ class TestNationalRiskIndexETL(TestETL):
 
         output_file_path = etl._get_output_file_path()
         expected_output_file_path = (
-            data_path / "dataset" / "national_risk_index" / "usa.csv"
+            data_path / "dataset" / "national_risk_index" / "usa.parquet"
         )
         assert output_file_path == expected_output_file_path
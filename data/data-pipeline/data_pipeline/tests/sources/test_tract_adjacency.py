@@ -0,0 +1,111 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.etl.sources.tract_adjacency import segment_means
+from data_pipeline.etl.sources.tract_adjacency import TractAdjacency
+from shapely.geometry import box
+
+
+@pytest.fixture
+def grid_geo_df() -> gpd.GeoDataFrame:
+    """A 3x3 grid of square tracts, numbered row by row:
+
+    06 07 08
+    03 04 05
+    00 01 02
+    """
+    return gpd.GeoDataFrame(
+        {
+            "GEOID10_TRACT": [f"010010000{i:02d}" for i in range(9)],
+            "geometry": [
+                box(i % 3, i // 3, i % 3 + 1, i // 3 + 1) for i in range(9)
+            ],
+        },
+        crs="EPSG:4326",
+    )
+
+
+def _neighbors(adjacency: TractAdjacency, geoid: str) -> set:
+    node = list(adjacency.geoids).index(geoid)
+    positions = adjacency.indices[
+        adjacency.indptr[node] : adjacency.indptr[node + 1]
+    ]
+    return set(adjacency.geoids[positions])
+
+
+def test_adjacency_matches_touches(grid_geo_df):
+    adjacency = TractAdjacency.from_geodataframe(grid_geo_df)
+
+    for _, row in grid_geo_df.iterrows():
+        expected = set(
+            grid_geo_df[grid_geo_df.geometry.touches(row.geometry)][
+                "GEOID10_TRACT"
+            ]
+        )
+        assert _neighbors(adjacency, row["GEOID10_TRACT"]) == expected
+
+    # The center tract touches every other tract, a corner touches three
+    assert len(_neighbors(adjacency, "01001000004")) == 8
+    assert len(_neighbors(adjacency, "01001000000")) == 3
+
+
+def test_neighbor_mean_skips_nulls_and_missing_tracts(grid_geo_df):
+    adjacency = TractAdjacency.from_geodataframe(grid_geo_df)
+
+    # Only keep a subset of the tracts, in a different order
+    df = grid_geo_df.iloc[[4, 0, 1, 3, 8]].reset_index(drop=True)
+    df["value"] = [np.nan, 10.0, np.nan, 20.0, 5.0]
+
+    means = adjacency.neighbor_mean(df["GEOID10_TRACT"], df[["value"]])
+
+    # Tract 04 touches 00, 01, 03 and 08 in the subset; 01 is null
+    assert means.loc[0, "value"] == pytest.approx(35.0 / 3)
+    # Tract 00 touches 01, 03 and 04, of which only 03 has a value
+    assert means.loc[1, "value"] == 20.0
+    # Tract 08 only touches 04 in the subset, which is null
+    assert np.isnan(means.loc[4, "value"])
+
+
+def test_segment_means_match_pandas():
+    rng = np.random.default_rng(seed=40)
+    lengths = np.array([0, 1, 3, 8, 9, 0, 130, 2, 0])
+    values = rng.random(lengths.sum()) * 1000
+    values[rng.random(len(values)) < 0.25] = np.nan
+    values[1:4] = np.nan
+
+    means = segment_means(values, lengths)
+
+    start = 0
+    for segment, length in enumerate(lengths):
+        expected = pd.Series(values[start : start + length], dtype=float).mean()
+        if np.isnan(expected):
+            assert np.isnan(means[segment])
+        else:
+            # Exact equality on purpose: results must be bit-identical
+            assert means[segment] == expected
+        start += length
+
+
+def test_save_and_load_round_trip(grid_geo_df, tmp_path):
+    grid_geo_df["ALAND10"] = np.arange(9) * 100
+    adjacency = TractAdjacency.from_geodataframe(grid_geo_df)
+    path = tmp_path / "us_tract_adjacency.npz"
+    adjacency.save(path)
+
+    loaded = TractAdjacency.load(path)
+
+    assert list(loaded.geoids) == list(adjacency.geoids)
+    np.testing.assert_array_equal(loaded.indptr, adjacency.indptr)
+    np.testing.assert_array_equal(loaded.indices, adjacency.indices)
+    np.testing.assert_array_equal(loaded.land_area, adjacency.land_area)
+
+
+def test_load_ignores_missing_and_outdated_files(grid_geo_df, tmp_path):
+    path = tmp_path / "us_tract_adjacency.npz"
+    assert TractAdjacency.load(path) is None
+
+    TractAdjacency.from_geodataframe(grid_geo_df).save(path)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(TractAdjacency, "FORMAT_VERSION", 0)
+        assert TractAdjacency.load(path) is None
@@ -0,0 +1,115 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from data_pipeline.etl.sources import tract_simplification
+from shapely.geometry import Polygon
+
+
+@pytest.fixture
+def tracts_df() -> gpd.GeoDataFrame:
+    """Three tracts whose shared boundaries have many tiny wiggles:
+
+    02 02
+    00 01
+    """
+    wiggle = 1e-6 * (np.arange(201) % 2)
+    # The boundary between tracts 00 and 01, from the bottom to the top
+    middle = list(zip(1 + wiggle, np.linspace(0, 1, 201)))
+    # The boundary between the bottom tracts and tract 02, from the left
+    top = list(zip(np.linspace(0, 2, 201), 1 + wiggle))
+    left_top = [point for point in top if point[0] <= 1]
+    right_top = [point for point in top if point[0] >= 1]
+    return gpd.GeoDataFrame(
+        {
+            "GEOID10": ["01001000100", "01001000200", "01001000300"],
+            "ALAND10": [1, 1, 0],
+        },
+        geometry=[
+            Polygon([(0, 0)] + middle + left_top[::-1]),
+            Polygon(middle[::-1] + [(2, 0)] + right_top[::-1]),
+            Polygon(top + [(2, 2), (0, 2)]),
+        ],
+        crs="EPSG:4326",
+    )
+
+
+def _vertex_count(geometry):
+    return sum(len(polygon.exterior.coords) for polygon in geometry)
+
+
+@pytest.mark.parametrize("by_arcs", [False, True])
+def test_simplify_coverage_keeps_boundaries_shared(
+    tracts_df, monkeypatch, by_arcs
+):
+    if by_arcs:
+        monkeypatch.delattr(tract_simplification.shapely, "coverage_simplify")
+    assert tracts_df.geometry.is_valid.all()
+
+    simplified = tract_simplification.simplify_coverage(
+        tracts_df.geometry, 1e-4
+    )
+
+    assert list(simplified.index) == list(tracts_df.index)
+    assert simplified.is_valid.all()
+    assert _vertex_count(simplified) < _vertex_count(tracts_df.geometry) / 4
+    # No gaps or overlaps opened between the tracts
+    union = simplified.unary_union
+    assert union.area == pytest.approx(simplified.area.sum())
+    assert union.equals(tracts_df.geometry.unary_union.simplify(1e-4))
+    for before, after in zip(tracts_df.geometry, simplified):
+        assert before.hausdorff_distance(after) <= 1e-4
+
+
+def test_get_simplified_tracts_caches_each_band(
+    tracts_df, tmp_path, monkeypatch
+):
+    tract_data_path = tmp_path / "us_geo.parquet"
+    tracts_df.to_parquet(tract_data_path)
+    read_paths = []
+    read_parquet = tract_simplification.gpd.read_parquet
+
+    def tracking_read_parquet(path, *args, **kwargs):
+        read_paths.append(path)
+        return read_parquet(path, *args, **kwargs)
+
+    monkeypatch.setattr(
+        tract_simplification.gpd, "read_parquet", tracking_read_parquet
+    )
+
+    simplified = tract_simplification.get_simplified_tracts(
+        tract_data_path, ["high", "low"], columns=["GEOID10", "geometry"]
+    )
+    cached = tract_simplification.get_simplified_tracts(
+        tract_data_path, ["high", "low"], columns=["GEOID10", "geometry"]
+    )
+
+    # The national tracts are read once for both bands, then the cache
+    assert read_paths == [
+        tract_data_path,
+        tract_simplification.get_simplified_tracts_path(
+            tract_data_path, "high"
+        ),
+        tract_simplification.get_simplified_tracts_path(tract_data_path, "low"),
+    ]
+    for band in ["high", "low"]:
+        assert list(simplified[band].columns) == ["GEOID10", "geometry"]
+        assert simplified[band].geometry.equals(cached[band].geometry)
+    assert _vertex_count(simplified["low"].geometry) <= _vertex_count(
+        simplified["high"].geometry
+    )
+
+    # A newer national tract file makes the bands stale
+    stat = tract_data_path.stat()
+    os.utime(tract_data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    read_paths.clear()
+    tract_simplification.get_simplified_tracts(tract_data_path, ["low"])
+    assert read_paths == [tract_data_path]
+
+
+def test_unknown_band(tmp_path):
+    with pytest.raises(ValueError, match="medium"):
+        tract_simplification.get_simplified_tracts(
+            tmp_path / "us_geo.parquet", ["medium"]
+        )
@@ -0,0 +1,163 @@
+import hashlib
+import io
+import zipfile
+
+import pytest
+import requests
+from data_pipeline.etl import downloader
+from data_pipeline.etl.downloader import Downloader
+from tenacity import RetryError
+from tenacity import stop_after_attempt
+from tenacity import wait_none
+
+FILE_CONTENTS = bytes(range(256)) * 10_000
+FILE_URL = "https://example.com/data/file.csv"
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    """Retries happen immediately, and only once."""
+    monkeypatch.setattr(Downloader.download_file.retry, "wait", wait_none())
+    monkeypatch.setattr(
+        Downloader.download_file.retry, "stop", stop_after_attempt(2)
+    )
+
+
+def _response(status_code: int, body: bytes, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class _FlakyStream(io.BytesIO):
+    """A response body that fails after `fail_after` bytes."""
+
+    def __init__(self, body: bytes, fail_after: int):
+        super().__init__(body)
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.fail_after:
+            raise requests.ConnectionError("connection reset")
+        return super().read(min(size, self.fail_after - self.tell()))
+
+
+def test_download_resumes_after_failure(monkeypatch, tmp_path):
+    requests_made = []
+
+    def fake_get(url, headers, **kwargs):
+        requests_made.append(dict(headers))
+        assert kwargs["stream"]
+        if "Range" not in headers:
+            response = _response(200, b"", {"ETag": '"v1"'})
+            response.raw = _FlakyStream(FILE_CONTENTS, fail_after=100_000)
+            return response
+        start = int(headers["Range"][len("bytes=") : -1])
+        return _response(206, FILE_CONTENTS[start:])
+
+    monkeypatch.setattr(downloader.requests, "get", fake_get)
+    download_path = tmp_path / "file.csv"
+
+    Downloader.download_file_from_url(
+        file_url=FILE_URL,
+        download_file_name=download_path,
+        expected_size=len(FILE_CONTENTS),
+        expected_sha256=hashlib.sha256(FILE_CONTENTS).hexdigest(),
+    )
+
+    assert download_path.read_bytes() == FILE_CONTENTS
+    assert [path.name for path in tmp_path.iterdir()] == ["file.csv"]
+    # The second request only asks for what is missing, if unchanged
+    assert requests_made[1]["Range"] == "bytes=100000-"
+    assert requests_made[1]["If-Range"] == '"v1"'
+
+
+def test_download_restarts_when_the_file_changed(monkeypatch, tmp_path):
+    download_path = tmp_path / "file.csv"
+    (tmp_path / "file.csv.part").write_bytes(b"old contents")
+    (tmp_path / "file.csv.part.validator").write_text('"v0"')
+
+    # The server ignores the range because the ETag does not match
+    monkeypatch.setattr(
+        downloader.requests,
+        "get",
+        lambda url, headers, **kwargs: _response(200, FILE_CONTENTS),
+    )
+
+    Downloader.download_file_from_url(
+        file_url=FILE_URL, download_file_name=download_path
+    )
+
+    assert download_path.read_bytes() == FILE_CONTENTS
+    assert not (tmp_path / "file.csv.part.validator").exists()
+
+
+def test_download_rejects_unexpected_checksum(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        downloader.requests,
+        "get",
+        lambda url, headers, **kwargs: _response(200, FILE_CONTENTS),
+    )
+    download_path = tmp_path / "file.csv"
+
+    with pytest.raises(RetryError) as error:
+        Downloader.download_file_from_url(
+            file_url=FILE_URL,
+            download_file_name=download_path,
+            expected_sha256=hashlib.sha256(b"other").hexdigest(),
+        )
+
+    assert "SHA-256" in str(error.value.last_attempt.exception())
+    assert not list(tmp_path.iterdir())
+
+
+def test_zip_download_resumes_after_failure(monkeypatch, tmp_path):
+    zip_contents = io.BytesIO()
+    with zipfile.ZipFile(zip_contents, "w") as zip_file:
+        zip_file.writestr("file.csv", FILE_CONTENTS, zipfile.ZIP_STORED)
+    zip_contents = zip_contents.getvalue()
+    requests_made = []
+
+    def fake_get(url, headers, **kwargs):
+        requests_made.append(dict(headers))
+        if "Range" not in headers:
+            response = _response(200, b"", {"ETag": '"v1"'})
+            response.raw = _FlakyStream(zip_contents, fail_after=100_000)
+            return response
+        start = int(headers["Range"][len("bytes=") : -1])
+        return _response(206, zip_contents[start:])
+
+    monkeypatch.setattr(downloader.requests, "get", fake_get)
+    monkeypatch.setattr(downloader.settings, "DATA_PATH", tmp_path / "data")
+    unzipped_path = tmp_path / "unzipped"
+
+    downloaded_file = Downloader.download_zip_file_from_url(
+        file_url=FILE_URL,
+        unzipped_file_path=unzipped_path,
+        expected_sha256=hashlib.sha256(zip_contents).hexdigest(),
+    )
+
+    assert (unzipped_path / "file.csv").read_bytes() == FILE_CONTENTS
+    assert downloaded_file.files == {"file.csv": len(FILE_CONTENTS)}
+    assert len(requests_made) == 2
+    assert requests_made[1]["Range"] == "bytes=100000-"
+    # The temporary zip file is removed
+    assert not list((tmp_path / "data" / "tmp" / "downloads").iterdir())
+
+
+def test_zip_download_removes_temporary_files_on_failure(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        downloader.requests,
+        "get",
+        lambda url, headers, **kwargs: _response(503, b""),
+    )
+    monkeypatch.setattr(downloader.settings, "DATA_PATH", tmp_path / "data")
+
+    with pytest.raises(RetryError):
+        Downloader.download_zip_file_from_url(
+            file_url=FILE_URL, unzipped_file_path=tmp_path / "unzipped"
+        )
+
+    assert not list((tmp_path / "data" / "tmp" / "downloads").iterdir())
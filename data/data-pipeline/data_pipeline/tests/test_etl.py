@@ -1,7 +1,13 @@
 # pylint: disable=protected-access
+import functools
+import os
+import threading
+import time
+
 import pytest
 from data_pipeline.etl import constants
 from data_pipeline.etl import runner
+from data_pipeline.etl import scheduler
 
 
 def test_get_datasets_to_run():
@@ -9,3 +15,166 @@ def test_get_datasets_to_run():
     assert runner._get_datasets_to_run("census") == [constants.CENSUS_INFO]
     with pytest.raises(ValueError):
         runner._get_datasets_to_run("doesnt_exist")
+
+
+def test_dataset_dependencies_exist():
+    names = {dataset["name"] for dataset in constants.DATASET_LIST}
+    names.add(constants.CENSUS_INFO["name"])
+    for dataset in constants.DATASET_LIST:
+        assert set(dataset["dependencies"]) <= names, dataset["name"]
+
+
+def test_get_job_order():
+    datasets = [
+        {"name": "overlap", "dependencies": ["census", "tribal"]},
+        {"name": "places", "dependencies": []},
+        {"name": "tribal", "dependencies": []},
+    ]
+    ordered = scheduler.get_job_order(datasets)
+    assert [dataset["name"] for dataset in ordered] == [
+        "places",
+        "tribal",
+        "overlap",
+    ]
+
+    datasets[2]["dependencies"] = ["overlap"]
+    with pytest.raises(ValueError):
+        scheduler.get_job_order(datasets)
+
+
+def test_run_jobs_respects_dependencies_and_memory_budget(tmp_path):
+    datasets = [
+        {"name": "big_1", "dependencies": [], "memory_estimate_mb": 60},
+        {"name": "big_2", "dependencies": [], "memory_estimate_mb": 60},
+        {"name": "small", "dependencies": ["big_1"]},
+    ]
+    running = set()
+    overlaps = []
+    finished = []
+    lock = threading.Lock()
+
+    def run_job(dataset):
+        with lock:
+            running.add(dataset["name"])
+            overlaps.append(set(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(dataset["name"])
+            finished.append(dataset["name"])
+
+    peak_memory_path = tmp_path / "peak_memory.json"
+    scheduler.run_jobs(
+        datasets,
+        run_job,
+        max_workers=4,
+        memory_budget_mb=100,
+        peak_memory_path=peak_memory_path,
+    )
+
+    # The two big jobs never run together, and "small" waits for "big_1"
+    assert all({"big_1", "big_2"} - overlap for overlap in overlaps)
+    assert finished.index("small") > finished.index("big_1")
+    assert set(scheduler.load_peak_memory(peak_memory_path)) == {
+        "big_1",
+        "big_2",
+        "small",
+    }
+
+
+def test_run_jobs_raises_job_errors(tmp_path):
+    datasets = [
+        {"name": "broken", "dependencies": []},
+        {"name": "dependent", "dependencies": ["broken"]},
+    ]
+    ran = []
+
+    def run_job(dataset):
+        ran.append(dataset["name"])
+        if dataset["name"] == "broken":
+            raise RuntimeError("broken ETL")
+
+    with pytest.raises(RuntimeError, match="broken ETL"):
+        scheduler.run_jobs(
+            datasets,
+            run_job,
+            max_workers=2,
+            memory_budget_mb=100,
+            peak_memory_path=tmp_path / "peak_memory.json",
+        )
+    assert ran == ["broken"]
+
+
+def _record_job_process(dataset, output_path):
+    """Job for the process executor tests; must be importable by workers."""
+    if dataset["name"] == "broken":
+        raise ValueError("broken ETL")
+    if dataset["name"] == "unpicklable":
+        error = RuntimeError("unpicklable ETL")
+        error.lock = threading.Lock()
+        raise error
+    (output_path / dataset["name"]).write_text(str(os.getpid()))
+
+
+def test_run_jobs_in_worker_processes(tmp_path):
+    datasets = [
+        {"name": "first", "dependencies": []},
+        {"name": "second", "dependencies": ["first"]},
+    ]
+    peak_memory_path = tmp_path / "peak_memory.json"
+
+    scheduler.run_jobs(
+        datasets,
+        functools.partial(_record_job_process, output_path=tmp_path),
+        max_workers=2,
+        memory_budget_mb=100_000,
+        peak_memory_path=peak_memory_path,
+        executor="process",
+    )
+
+    pids = {int((tmp_path / name).read_text()) for name in ["first", "second"]}
+    assert os.getpid() not in pids
+    assert set(scheduler.load_peak_memory(peak_memory_path)) == {
+        "first",
+        "second",
+    }
+
+
+@pytest.mark.parametrize(
+    "name, error",
+    [("broken", ValueError), ("unpicklable", RuntimeError)],
+)
+def test_run_jobs_in_worker_processes_raises_job_errors(tmp_path, name, error):
+    datasets = [
+        {"name": name, "dependencies": []},
+        {"name": "dependent", "dependencies": [name]},
+    ]
+
+    with pytest.raises(error, match=f"{name} ETL"):
+        scheduler.run_jobs(
+            datasets,
+            functools.partial(_record_job_process, output_path=tmp_path),
+            max_workers=2,
+            memory_budget_mb=100_000,
+            peak_memory_path=tmp_path / "peak_memory.json",
+            executor="process",
+        )
+    assert not (tmp_path / "dependent").exists()
+
+
+def test_process_workers_are_recycled_after_heavy_jobs(tmp_path):
+    workers = scheduler._ProcessWorkers(
+        functools.partial(_record_job_process, output_path=tmp_path),
+        recycle_mb=1_000,
+        max_jobs_per_worker=3,
+    )
+    with workers:
+        for name, peak_mb in [("a", 10), ("b", 10), ("c", 2_000), ("d", 10)]:
+            future = workers.submit({"name": name})
+            future.result()
+            workers.release(future, peak_mb)
+
+    pids = {name: (tmp_path / name).read_text() for name in "abcd"}
+    # "a" and "b" share a worker, which is recycled after the heavy "c"
+    assert pids["a"] == pids["b"] == pids["c"]
+    assert pids["d"] != pids["c"]
+    assert workers.recycled == 1
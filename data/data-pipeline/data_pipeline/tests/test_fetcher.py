@@ -0,0 +1,88 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+import requests
+from data_pipeline.etl.datasource import DataSource
+from data_pipeline.etl.downloader import DownloadedFile
+from data_pipeline.etl.fetcher import fetch_data_sources
+from data_pipeline.etl.fetcher import get_data_source_host
+
+
+class _FetchLog:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = []
+        self.most_running = []
+        self.sessions = set()
+        self.fetched = []
+
+
+@dataclass
+class _FakeDataSource(DataSource):
+    log: Optional[_FetchLog] = None
+
+    def fetch(
+        self,
+        session: Optional[requests.Session] = None,
+        validators: Optional[dict] = None,
+    ) -> DownloadedFile:
+        with self.log.lock:
+            self.log.running.append(get_data_source_host(self))
+            self.log.most_running.append(list(self.log.running))
+            self.log.sessions.add(id(session))
+        time.sleep(0.02)
+        with self.log.lock:
+            self.log.running.remove(get_data_source_host(self))
+            self.log.fetched.append(self.source)
+        if self.source.endswith("broken"):
+            raise RuntimeError(f"could not fetch {self.source}")
+        return DownloadedFile(path=self.destination, size=0, sha256="")
+
+
+def _data_sources(tmp_path, log, urls):
+    return [
+        _FakeDataSource(source=url, destination=tmp_path / str(i), log=log)
+        for i, url in enumerate(urls)
+    ]
+
+
+def test_fetch_data_sources_limits_concurrency_per_host(tmp_path):
+    log = _FetchLog()
+    urls = [f"https://www2.census.gov/tract_{i}.zip" for i in range(10)]
+    urls += [f"https://example.com/file_{i}.csv" for i in range(3)]
+
+    changed = fetch_data_sources(
+        _data_sources(tmp_path, log, urls), max_workers=4, max_per_host=2
+    )
+
+    assert sorted(log.fetched) == sorted(urls)
+    assert sorted(source.source for source in changed) == sorted(urls)
+    assert all(len(running) <= 4 for running in log.most_running)
+    assert all(
+        running.count(host) <= 2
+        for running in log.most_running
+        for host in running
+    )
+    # The other host is not held up until the census files are done
+    assert log.fetched.index("https://example.com/file_0.csv") < 4
+    # Every data source shares the same session
+    assert len(log.sessions) == 1 and id(None) not in log.sessions
+
+
+def test_fetch_data_sources_raises_after_fetching_the_rest(tmp_path):
+    log = _FetchLog()
+    urls = [
+        "https://example.com/broken",
+        "https://example.com/file.csv",
+        "https://example.org/file.csv",
+    ]
+
+    with pytest.raises(RuntimeError, match="example.com/broken"):
+        fetch_data_sources(
+            _data_sources(tmp_path, log, urls), max_workers=1, max_per_host=1
+        )
+
+    assert sorted(log.fetched) == sorted(urls)
@@ -0,0 +1,107 @@
+import pytest
+from data_pipeline.etl import fingerprint
+from data_pipeline.etl import runner
+
+
+@pytest.fixture
+def stage(tmp_path):
+    code_path = tmp_path / "etl.py"
+    code_path.write_text("print('extract')")
+    output_path = tmp_path / "usa.csv"
+    output_path.write_text("GEOID10_TRACT\n")
+    return fingerprint.Stage(
+        name="example",
+        code_paths=[code_path],
+        upstream=["census"],
+        outputs=[output_path],
+    )
+
+
+def _run_stage(stage, fingerprints_path):
+    runs = []
+
+    def run():
+        runs.append(stage.name)
+        for output_path in stage.outputs:
+            output_path.write_text("GEOID10_TRACT\n")
+
+    fingerprint.run_stage(
+        stage, run, incremental=True, fingerprints_path=fingerprints_path
+    )
+    return runs
+
+
+def test_run_stage_skips_unchanged_stage(stage, tmp_path):
+    fingerprints_path = tmp_path / "fingerprints"
+
+    assert _run_stage(stage, fingerprints_path) == ["example"]
+    assert _run_stage(stage, fingerprints_path) == []
+
+
+@pytest.mark.parametrize(
+    "change",
+    ["code", "upstream", "parameters", "missing output"],
+)
+def test_run_stage_reruns_changed_stage(stage, tmp_path, change):
+    fingerprints_path = tmp_path / "fingerprints"
+    _run_stage(stage, fingerprints_path)
+
+    if change == "code":
+        stage.code_paths[0].write_text("print('extract again')")
+    elif change == "upstream":
+        census = fingerprint.Stage(name="census", code_paths=[])
+        fingerprint.record_fingerprint(census, fingerprints_path)
+    elif change == "parameters":
+        stage.parameters = {"data_source": "aws"}
+    else:
+        stage.outputs[0].unlink()
+
+    assert _run_stage(stage, fingerprints_path) == ["example"]
+    assert _run_stage(stage, fingerprints_path) == []
+
+
+def test_out_of_date_datasets_include_downstream_datasets(monkeypatch):
+    datasets = [
+        {"name": "tribal_overlap", "dependencies": ["census", "tribal"]},
+        {"name": "census", "dependencies": []},
+        {"name": "tribal", "dependencies": []},
+        {"name": "cdc_places", "dependencies": []},
+    ]
+    monkeypatch.setattr(runner, "_fetch_data_sources", lambda *a, **k: [])
+    monkeypatch.setattr(
+        runner,
+        "_get_dataset_stage",
+        lambda dataset: fingerprint.Stage(name=dataset["name"], code_paths=[]),
+    )
+    monkeypatch.setattr(
+        fingerprint, "is_up_to_date", lambda stage: stage.name != "census"
+    )
+
+    out_of_date = runner._get_out_of_date_datasets(datasets)
+
+    assert [dataset["name"] for dataset in out_of_date] == [
+        "tribal_overlap",
+        "census",
+    ]
+
+
+def test_incremental_run_does_not_revalidate_data_sources_again(monkeypatch):
+    datasets = [{"name": "census", "dependencies": []}]
+    monkeypatch.setattr(runner, "_get_datasets_to_run", lambda name: datasets)
+    monkeypatch.setattr(
+        runner, "_get_out_of_date_datasets", lambda dataset_list: dataset_list
+    )
+    jobs = []
+    monkeypatch.setattr(
+        runner.scheduler,
+        "run_jobs",
+        lambda datasets, run_job, **kwargs: jobs.append(run_job),
+    )
+
+    runner.etl_runner(incremental=True)
+    runner.etl_runner(use_cache=True)
+
+    assert [job.keywords for job in jobs] == [
+        {"use_cache": True, "revalidate": False},
+        {"use_cache": True, "revalidate": True},
+    ]
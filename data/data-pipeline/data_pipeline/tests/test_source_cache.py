@@ -0,0 +1,160 @@
+import hashlib
+import io
+
+import pytest
+import requests
+from data_pipeline.etl import downloader
+from data_pipeline.etl import source_cache
+from data_pipeline.etl.datasource import FileDataSource
+from data_pipeline.etl.downloader import Downloader
+from data_pipeline.etl.source_cache import CacheDecision
+from tenacity import RetryError
+from tenacity import stop_after_attempt
+from tenacity import wait_none
+
+FILE_URL = "https://example.com/data/file.csv"
+
+
+class _FakeServer:
+    """Serves one file, with an ETag, and answers conditional requests."""
+
+    def __init__(self, contents: bytes):
+        self.contents = contents
+        self.requests = []
+
+    @property
+    def etag(self) -> str:
+        return f'"{hashlib.sha256(self.contents).hexdigest()[:8]}"'
+
+    def get(self, url, headers, **kwargs):
+        self.requests.append(dict(headers))
+        response = requests.Response()
+        response.headers["ETag"] = self.etag
+        if headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response.raw = io.BytesIO(b"")
+        else:
+            response.status_code = 200
+            response.raw = io.BytesIO(self.contents)
+        return response
+
+
+@pytest.fixture
+def server(monkeypatch) -> _FakeServer:
+    server = _FakeServer(b"GEOID10_TRACT,value\n01001020100,1\n")
+    monkeypatch.setattr(downloader.requests, "get", server.get)
+    return server
+
+
+def test_fetch_data_source_revalidates_and_refetches(server, tmp_path):
+    data_source = FileDataSource(FILE_URL, tmp_path / "sources" / "file.csv")
+
+    # Nothing cached yet: the file is downloaded and a manifest written
+    assert source_cache.fetch_data_source(data_source, use_cache=True)
+    manifest = source_cache.load_manifest(data_source)
+    assert manifest.etag == server.etag
+    assert manifest.sha256 == hashlib.sha256(server.contents).hexdigest()
+    assert manifest.files == {"": len(server.contents)}
+
+    # The server says the file did not change
+    assert not source_cache.fetch_data_source(data_source, use_cache=True)
+    assert server.requests[-1]["If-None-Match"] == server.etag
+
+    # The file changed on the server
+    server.contents += b"01001020200,2\n"
+    assert source_cache.fetch_data_source(data_source, use_cache=True)
+    assert data_source.destination.read_bytes() == server.contents
+
+    # A cached file that was removed is fetched again, without validators
+    data_source.destination.unlink()
+    assert not source_cache.fetch_data_source(data_source, use_cache=True)
+    assert "If-None-Match" not in server.requests[-1]
+    assert data_source.destination.read_bytes() == server.contents
+
+
+def test_pinned_data_sources_are_reused_without_requests(server, tmp_path):
+    data_source = FileDataSource(
+        FILE_URL,
+        tmp_path / "file.csv",
+        expected_sha256=hashlib.sha256(server.contents).hexdigest(),
+    )
+    source_cache.fetch_data_source(data_source)
+    request_count = len(server.requests)
+
+    assert (
+        source_cache.get_cache_decision(
+            data_source, source_cache.load_manifest(data_source)
+        )
+        is CacheDecision.REUSE
+    )
+    assert not source_cache.fetch_data_source(data_source, use_cache=True)
+    assert len(server.requests) == request_count
+
+
+def test_data_sources_sharing_a_destination_have_their_own_manifest(tmp_path):
+    first = FileDataSource("https://example.com/a.zip", tmp_path / "sources")
+    second = FileDataSource("https://example.com/b.zip", tmp_path / "sources")
+
+    assert source_cache.get_manifest_path(
+        first
+    ) != source_cache.get_manifest_path(second)
+    assert source_cache.load_manifest(first) is None
+
+
+def test_data_sources_without_validators_are_reused(server, tmp_path):
+    data_source = FileDataSource(FILE_URL, tmp_path / "file.csv")
+    source_cache.fetch_data_source(data_source)
+    manifest = source_cache.load_manifest(data_source)
+    manifest.etag = None
+    source_cache.save_manifest(data_source, manifest)
+    request_count = len(server.requests)
+
+    assert not source_cache.fetch_data_source(data_source, use_cache=True)
+    assert len(server.requests) == request_count
+
+
+def test_cached_copy_is_used_when_revalidation_fails(
+    server, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(Downloader.download_file.retry, "wait", wait_none())
+    monkeypatch.setattr(
+        Downloader.download_file.retry, "stop", stop_after_attempt(2)
+    )
+    data_source = FileDataSource(FILE_URL, tmp_path / "file.csv")
+    source_cache.fetch_data_source(data_source)
+
+    def get_offline(url, headers, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    def get_unavailable(url, headers, **kwargs):
+        response = requests.Response()
+        response.status_code = 503
+        response.raw = io.BytesIO(b"")
+        return response
+
+    for get in (get_offline, get_unavailable):
+        monkeypatch.setattr(downloader.requests, "get", get)
+        assert not source_cache.fetch_data_source(data_source, use_cache=True)
+        assert data_source.destination.read_bytes() == server.contents
+
+    # Without the cache, the error is raised
+    with pytest.raises(RetryError):
+        source_cache.fetch_data_source(data_source)
+
+
+def test_cached_copy_is_used_without_revalidating(server, tmp_path):
+    data_source = FileDataSource(FILE_URL, tmp_path / "file.csv")
+    source_cache.fetch_data_source(data_source)
+    request_count = len(server.requests)
+
+    assert not source_cache.fetch_data_source(
+        data_source, use_cache=True, revalidate=False
+    )
+    assert len(server.requests) == request_count
+
+    # A cached file that was removed is still fetched again
+    data_source.destination.unlink()
+    source_cache.fetch_data_source(
+        data_source, use_cache=True, revalidate=False
+    )
+    assert data_source.destination.read_bytes() == server.contents
@@ -0,0 +1,160 @@
+import subprocess
+import threading
+
+import geopandas as gpd
+import pytest
+from data_pipeline.tile import generate
+from data_pipeline.tile.mvt import read_mbtiles
+from shapely.geometry import box
+
+
+class FakeCommands:
+    """Records the commands `subprocess.run` is called with."""
+
+    def __init__(self, fail=None, barrier=None):
+        self.commands = []
+        self.fail = fail
+        self.barrier = barrier
+        self.lock = threading.Lock()
+
+    def __call__(self, command, env=None, **kwargs):
+        with self.lock:
+            self.commands.append((command, env))
+        if self.barrier is not None and command[0] == "tippecanoe":
+            # Every job has to be running for all of them to get past this
+            self.barrier.wait(timeout=10)
+        returncode = 1 if self.fail and self.fail in command[-1] else 0
+        return subprocess.CompletedProcess(
+            command, returncode, stdout="tippecanoe: out of memory"
+        )
+
+
+@pytest.fixture(autouse=True)
+def tippecanoe_is_installed(monkeypatch):
+    monkeypatch.setattr(generate, "tippecanoe_is_installed", lambda: True)
+
+
+def test_score_tiles(tmp_path, monkeypatch):
+    commands = FakeCommands(barrier=threading.Barrier(2))
+    monkeypatch.setattr(generate.subprocess, "run", commands)
+    monkeypatch.setattr(generate.os, "cpu_count", lambda: 8)
+    stale_tile = tmp_path / "score" / "tiles" / "gistar" / "burd" / "0.pbf"
+    stale_tile.parent.mkdir(parents=True)
+    stale_tile.touch()
+
+    generate.generate_tiles(tmp_path, False, layer="gistar_burd")
+
+    tiles_path = tmp_path / "score" / "tiles" / "gistar" / "burd"
+    geojson_path = tmp_path / "score" / "geojson" / "gistar" / "burd"
+    assert not stale_tile.exists()
+    tippecanoe = sorted(
+        (
+            command
+            for command, _ in commands.commands
+            if command[0] == "tippecanoe"
+        ),
+        key=lambda command: command[-1],
+    )
+    assert [command[-2:] for command in tippecanoe] == [
+        [
+            f"--output={tiles_path / 'high' / 'usa_high.mbtiles'}",
+            str(geojson_path / "usa-high-gistar-burd.json"),
+        ],
+        [
+            f"--output={tiles_path / 'low' / 'usa_low.mbtiles'}",
+            str(geojson_path / "usa-low-gistar-burd.json"),
+        ],
+    ]
+    assert "--no-feature-limit" in tippecanoe[0]
+    assert "--drop-densest-as-needed" in tippecanoe[1]
+    tile_join = sorted(
+        (
+            command
+            for command, _ in commands.commands
+            if command[0] == "tile-join"
+        ),
+        key=lambda command: command[-1],
+    )
+    assert [command[-2:] for command in tile_join] == [
+        [
+            f"--output-to-directory={tiles_path / 'high'}",
+            str(tiles_path / "high" / "usa_high.mbtiles"),
+        ],
+        [
+            f"--output-to-directory={tiles_path / 'low'}",
+            str(tiles_path / "low" / "usa_low.mbtiles"),
+        ],
+    ]
+    # The CPUs are shared between the two jobs
+    assert {env["TIPPECANOE_MAX_THREADS"] for _, env in commands.commands} == {
+        "4"
+    }
+
+
+def test_default_score_tiles_are_legacy(tmp_path, monkeypatch):
+    commands = FakeCommands()
+    monkeypatch.setattr(generate.subprocess, "run", commands)
+
+    generate.generate_tiles(tmp_path, False)
+
+    assert (
+        f"--output-to-directory={tmp_path / 'score' / 'tiles' / 'default' / 'legacy' / 'high'}"
+        in [command[-2] for command, _ in commands.commands]
+    )
+
+
+def test_tribal_tiles(tmp_path, monkeypatch):
+    commands = FakeCommands()
+    monkeypatch.setattr(generate.subprocess, "run", commands)
+
+    generate.generate_tiles(tmp_path, True)
+
+    (tippecanoe, _), (tile_join, _) = commands.commands
+    assert tippecanoe[-1] == str(
+        tmp_path / "tribal" / "geographic_data" / "usa.json"
+    )
+    assert "--base-zoom=3" in tippecanoe
+    assert tile_join[-1] == str(tmp_path / "tribal" / "tiles" / "usa.mbtiles")
+
+
+def test_failed_job_raises_after_the_others_finish(tmp_path, monkeypatch):
+    commands = FakeCommands(fail="usa-high")
+    monkeypatch.setattr(generate.subprocess, "run", commands)
+    jobs = generate.get_score_tile_jobs(tmp_path)
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        generate.run_tile_jobs(jobs, max_threads=1, temp_path=tmp_path)
+
+    assert error.value.output == "tippecanoe: out of memory"
+    # The low zoom tiles are still made, and the high zoom ones are not
+    # extracted from a failed mbtiles file
+    assert [
+        command[-1]
+        for command, _ in commands.commands
+        if command[0] == "tile-join"
+    ] == [str(jobs[1].mbtiles_path)]
+    assert {env["TIPPECANOE_MAX_THREADS"] for _, env in commands.commands} == {
+        "1"
+    }
+    # The temporary directory is removed
+    assert not list(tmp_path.glob("tippecanoe-*"))
+
+
+def test_tiles_without_tippecanoe(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate, "tippecanoe_is_installed", lambda: False)
+    commands = FakeCommands()
+    monkeypatch.setattr(generate.subprocess, "run", commands)
+    geojson_path = tmp_path / "tribal" / "geographic_data"
+    geojson_path.mkdir(parents=True)
+    gpd.GeoDataFrame(
+        {"tribalId": ["1"]}, geometry=[box(-100, 30, -99, 31)], crs="EPSG:4326"
+    ).to_file(geojson_path / "usa.json", driver="GeoJSON")
+
+    generate.generate_tiles(tmp_path, True)
+
+    assert not commands.commands
+    tiles_path = tmp_path / "tribal" / "tiles"
+    tiles = read_mbtiles(tiles_path / "usa.mbtiles", 11)
+    assert set(tiles["tribalId"]) == {"1"}
+    assert (tiles_path / "metadata.json").exists()
+    assert (tiles_path / "0" / "0" / "0.pbf").exists()
@@ -0,0 +1,175 @@
+import json
+import sqlite3
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from data_pipeline.tile import mvt
+from shapely.geometry import LineString
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.geometry import box
+
+
+@pytest.fixture
+def score_gdf():
+    return gpd.GeoDataFrame(
+        {
+            "GTF": ["01001020100", "01001020200", "72001956300"],
+            "SN_C": [True, False, True],
+            "TC": [3, -2, 12],
+            "EBF_PFS": [0.123456789, np.nan, 1.0],
+        },
+        geometry=[
+            box(-100, 30, -99, 31),
+            Polygon(
+                [(-90, 40), (-80, 40), (-80, 45), (-90, 45)],
+                [[(-86, 41), (-84, 41), (-84, 43)]],
+            ),
+            # Spans the antimeridian's neighbours, across many tiles
+            box(-170, -10, 170, 10),
+        ],
+        crs="EPSG:4326",
+    )
+
+
+def test_encode_tile_round_trip():
+    features = [
+        (
+            3,
+            [9, 0, 0, 26, 20, 0, 0, 20, 19, 0, 15],
+            [("GTF", ("string", "01001020100")), ("TC", ("int", -2))],
+        ),
+        (
+            2,
+            [9, 2, 2, 10, 4, 4],
+            [("EBF_PFS", ("double", 0.5)), ("SN_C", ("bool", True))],
+        ),
+        (1, [9, 50, 34], [("GTF", ("string", "01001020100"))]),
+    ]
+
+    layers = mvt.decode_tile(mvt.encode_tile("blocks", features))
+
+    assert list(layers) == ["blocks"]
+    polygon, line, point = layers["blocks"]
+    assert polygon["properties"] == {"GTF": "01001020100", "TC": -2}
+    assert polygon["geometry"].equals(box(0, 0, 10, 10))
+    assert line["properties"] == {"EBF_PFS": 0.5, "SN_C": True}
+    assert line["geometry"].equals(LineString([(1, 1), (3, 3)]))
+    assert point["geometry"].equals(Point(25, 17))
+
+
+def test_polygons_are_wound_as_mvt_requires():
+    polygon = Polygon(
+        [(0, 0), (0, 1), (1, 1), (1, 0)],
+        [[(0.25, 0.25), (0.75, 0.25), (0.75, 0.75), (0.25, 0.75)]],
+    )
+
+    geometry_type, commands = mvt._geometry_commands(polygon, 0, 0, 0)
+    (decoded,) = mvt.decode_tile(
+        mvt.encode_tile("blocks", [(geometry_type, commands, [])])
+    )["blocks"]
+
+    exterior = np.array(decoded["geometry"].exterior.coords[:-1])
+    hole = np.array(decoded["geometry"].interiors[0].coords[:-1])
+    assert mvt._ring_area(exterior) > 0
+    assert mvt._ring_area(hole) < 0
+    assert decoded["geometry"].area == pytest.approx(
+        polygon.area * mvt.TILE_EXTENT**2
+    )
+
+
+def test_collapsed_geometries_are_left_out():
+    tiny = box(0, 0, 1e-9, 1e-9)
+
+    assert mvt._geometry_commands(tiny, 0, 0, 0) is None
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_mbtiles(score_gdf, tmp_path, max_workers):
+    path = tmp_path / "usa_high.mbtiles"
+
+    mvt.write_mbtiles(
+        score_gdf,
+        path,
+        "blocks",
+        0,
+        4,
+        tiles_path=tmp_path,
+        max_workers=max_workers,
+    )
+
+    connection = sqlite3.connect(path)
+    metadata = dict(connection.execute("SELECT name, value FROM metadata"))
+    zooms = [
+        zoom
+        for (zoom,) in connection.execute(
+            "SELECT DISTINCT zoom_level FROM tiles ORDER BY zoom_level"
+        )
+    ]
+    connection.close()
+    assert zooms == [0, 1, 2, 3, 4]
+    assert metadata["format"] == "pbf"
+    (vector_layer,) = json.loads(metadata["json"])["vector_layers"]
+    assert vector_layer["id"] == "blocks"
+    assert vector_layer["fields"] == {
+        "GTF": "String",
+        "SN_C": "Boolean",
+        "TC": "Number",
+        "EBF_PFS": "Number",
+    }
+    assert not list(tmp_path.glob("*.part"))
+
+    for zoom in [0, 4]:
+        tiles = mvt.read_mbtiles(path, zoom)
+        assert set(tiles["GTF"]) == set(score_gdf["GTF"])
+        first = tiles[tiles["GTF"] == "01001020100"].iloc[0]
+        assert first["SN_C"] and first["TC"] == 3
+        assert first["EBF_PFS"] == 0.123456789
+        # The clipped parts make up the features again, to within the
+        # simplification and rounding to tile units
+        tile_unit = 360 / 2**zoom / mvt.TILE_EXTENT
+        for geoid, expected in zip(score_gdf["GTF"], score_gdf.geometry):
+            parts = tiles[tiles["GTF"] == geoid].geometry
+            assert (
+                parts.unary_union.hausdorff_distance(expected) < 2 * tile_unit
+            )
+
+    # The properties can be read without the geometries
+    properties = mvt.read_mbtiles(path, 4, geometry=False)
+    assert properties.geometry.isna().all()
+    pd.testing.assert_frame_equal(
+        properties.drop(columns="geometry"),
+        mvt.read_mbtiles(path, 4).drop(columns="geometry"),
+    )
+
+    # The uncompressed tiles are the same as the ones in the mbtiles file
+    assert mvt.decode_tile(
+        (tmp_path / "0" / "0" / "0.pbf").read_bytes()
+    ) == mvt.decode_tile(
+        sqlite3.connect(path)
+        .execute("SELECT tile_data FROM tiles WHERE zoom_level = 0")
+        .fetchone()[0]
+    )
+    assert json.loads((tmp_path / "metadata.json").read_text()) == metadata
+
+
+def test_write_mbtiles_is_the_same_in_parallel(score_gdf, tmp_path):
+    mvt.write_mbtiles(
+        score_gdf, tmp_path / "serial.mbtiles", "blocks", 2, 5, max_workers=1
+    )
+    mvt.write_mbtiles(
+        score_gdf, tmp_path / "parallel.mbtiles", "blocks", 2, 5, max_workers=2
+    )
+
+    def read_tiles(name):
+        connection = sqlite3.connect(tmp_path / name)
+        tiles = connection.execute(
+            "SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles "
+            "ORDER BY zoom_level, tile_column, tile_row"
+        ).fetchall()
+        connection.close()
+        return [(*tile[:3], mvt.decode_tile(tile[3])) for tile in tiles]
+
+    assert read_tiles("serial.mbtiles") == read_tiles("parallel.mbtiles")
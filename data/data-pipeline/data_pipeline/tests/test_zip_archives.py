@@ -0,0 +1,104 @@
+import os
+import zipfile
+
+import pytest
+from data_pipeline import utils
+
+
+@pytest.fixture
+def members(tmp_path):
+    csv_path = tmp_path / "communities.csv"
+    csv_path.write_bytes(b"GEOID10,SN_C\n" + b"01001020100,True\n" * 10_000)
+    pdf_path = tmp_path / "documentation.pdf"
+    pdf_path.write_bytes(os.urandom(10_000))
+    readme_path = tmp_path / "readme.md"
+    readme_path.write_text("# Readme\n")
+    return csv_path, pdf_path, readme_path
+
+
+def test_zip_archives(members, tmp_path):
+    csv_path, pdf_path, readme_path = members
+    codebook = b"csv_label,Description\n"
+    nested_zip = b"PK\x05\x06" + bytes(18)
+
+    utils.zip_archives(
+        {
+            tmp_path / "csv.zip": [csv_path, readme_path],
+            tmp_path
+            / "documentation.zip": [
+                csv_path,
+                pdf_path,
+                ("codebook.csv", codebook),
+                ("nested.zip", nested_zip),
+                ("notes/readme.md", readme_path),
+            ],
+        },
+        max_workers=2,
+    )
+
+    assert not list(tmp_path.glob("*.part"))
+    with zipfile.ZipFile(tmp_path / "csv.zip") as csv_zip:
+        assert csv_zip.testzip() is None
+        assert csv_zip.namelist() == ["communities.csv", "readme.md"]
+        assert csv_zip.read("communities.csv") == csv_path.read_bytes()
+    with zipfile.ZipFile(tmp_path / "documentation.zip") as documentation_zip:
+        assert documentation_zip.testzip() is None
+        compress_types = {
+            info.filename: info.compress_type
+            for info in documentation_zip.infolist()
+        }
+        # Members that are already compressed are stored as they are
+        assert compress_types == {
+            "communities.csv": zipfile.ZIP_DEFLATED,
+            "documentation.pdf": zipfile.ZIP_STORED,
+            "codebook.csv": zipfile.ZIP_DEFLATED,
+            "nested.zip": zipfile.ZIP_STORED,
+            "notes/readme.md": zipfile.ZIP_DEFLATED,
+        }
+        assert documentation_zip.read("documentation.pdf") == (
+            pdf_path.read_bytes()
+        )
+        assert documentation_zip.read("codebook.csv") == codebook
+        assert documentation_zip.read("nested.zip") == nested_zip
+
+
+def test_zip_archives_keeps_previous_zip_file_on_failure(members, tmp_path):
+    csv_path, _, _ = members
+    zip_file_path = tmp_path / "csv.zip"
+    zip_file_path.write_bytes(b"previous")
+
+    with pytest.raises(FileNotFoundError):
+        utils.zip_archives(
+            {zip_file_path: [csv_path, tmp_path / "missing.csv"]}
+        )
+
+    assert zip_file_path.read_bytes() == b"previous"
+
+
+def test_write_zip_member_with_other_members(members, tmp_path):
+    csv_path, _, _ = members
+
+    with zipfile.ZipFile(tmp_path / "usa.zip", "w") as zip_file:
+        zip_file.writestr("before.txt", "before")
+        utils.write_zip_member(zip_file, "usa.csv", csv_path)
+        utils.write_zip_member(zip_file, "codebook.csv", b"GEOID10\n" * 1000)
+        with zip_file.open("after.txt", "w") as after_file:
+            after_file.write(b"after")
+
+    with zipfile.ZipFile(tmp_path / "usa.zip") as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.read("usa.csv") == csv_path.read_bytes()
+        assert zip_file.read("codebook.csv") == b"GEOID10\n" * 1000
+        assert zip_file.read("after.txt") == b"after"
+
+
+def test_zip_directory(members, tmp_path):
+    destination = tmp_path / "zips"
+    destination.mkdir()
+
+    utils.zip_directory(tmp_path, destination)
+
+    with zipfile.ZipFile(destination / f"{tmp_path.name}.zip") as zip_file:
+        assert sorted(zip_file.namelist()) == sorted(
+            f"{tmp_path.name}/{path.name}" for path in members
+        )
@@ -1,113 +1,366 @@
+import concurrent.futures
 import os
+import shutil
+import subprocess
+import tempfile
+import typing
+from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
-from subprocess import call
 
+import geopandas as gpd
+from data_pipeline.config import settings
+from data_pipeline.etl.score.etl_score_geo import GEO_SCORE_LAYERS
+from data_pipeline.etl.score.etl_score_geo import GeoScoreETL
+from data_pipeline.tile.mvt import write_mbtiles
 from data_pipeline.utils import get_module_logger
 from data_pipeline.utils import remove_all_from_dir
 
 logger = get_module_logger(__name__)
 
+# The name of the layer in every tileset
+TILES_LAYER_NAME = "blocks"
 
-def generate_tiles(data_path: Path, generate_tribal_layer: bool) -> None:
+
+@dataclass
+class TileJob:
+    """A tileset tippecanoe makes from a GeoJSON file.
+
+    The tileset is written to an mbtiles file, and its tiles are then
+    extracted from it, uncompressed, to `tiles_path`.
+
+    Attributes:
+    name : str
+            the name of the tileset, for logs
+    geojson_path : Path
+            the GeoJSON file to make the tiles from
+    mbtiles_path : Path
+            the mbtiles file to write
+    tiles_path : Path
+            the directory to write the uncompressed tiles (MVT) to
+    min_zoom : int
+            the lowest zoom of the tiles
+    max_zoom : int
+            the highest zoom of the tiles
+    options : List[str]
+            the other tippecanoe options of the tileset (limits, etc.)
+    """
+
+    name: str
+    geojson_path: Path
+    mbtiles_path: Path
+    tiles_path: Path
+    min_zoom: int
+    max_zoom: int
+    options: typing.List[str] = field(default_factory=list)
+
+
+def _run_command(
+    command: typing.List[str], env: typing.Optional[dict] = None
+) -> None:
+    """Runs a command, and raises an error with its output if it fails."""
+    logger.debug(f"Running {' '.join(command)}")
+    result = subprocess.run(
+        command,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        logger.error(
+            f"{command[0]} exited with code {result.returncode}:\n"
+            f"{result.stdout[-4000:]}"
+        )
+        raise subprocess.CalledProcessError(
+            result.returncode, command, output=result.stdout
+        )
+
+
+def _run_tile_job(job: TileJob, threads: int, temp_path: Path) -> None:
+    logger.debug(f"Generating {job.name} mbtiles file")
+    env = dict(os.environ, TIPPECANOE_MAX_THREADS=str(threads))
+    _run_command(
+        [
+            "tippecanoe",
+            "--quiet",
+            f"--layer={TILES_LAYER_NAME}",
+            f"--temporary-directory={temp_path}",
+            f"--minimum-zoom={job.min_zoom}",
+            f"--maximum-zoom={job.max_zoom}",
+            *job.options,
+            f"--output={job.mbtiles_path}",
+            str(job.geojson_path),
+        ],
+        env=env,
+    )
+
+    # The uncompressed tiles are the same tiles, so they are copied out of
+    # the mbtiles file rather than made again from the GeoJSON file
+    logger.debug(f"Generating {job.name} mvt folders and files")
+    _run_command(
+        [
+            "tile-join",
+            "--quiet",
+            "--no-tile-compression",
+            "--no-tile-size-limit",
+            f"--output-to-directory={job.tiles_path}",
+            str(job.mbtiles_path),
+        ],
+        env=env,
+    )
+
+
+def run_tile_jobs(
+    jobs: typing.List[TileJob],
+    max_threads: typing.Optional[int] = None,
+    temp_path: typing.Optional[Path] = None,
+) -> None:
+    """Makes tilesets with tippecanoe, all at the same time
+
+    The threads tippecanoe can use are shared between the tilesets, and its
+    temporary files go to one temporary directory that is removed when
+    they are done. If a tileset cannot be made, the others are still made,
+    and the first error is raised once they are done.
+
+    Args:
+        jobs (List[TileJob]): The tilesets to make
+        max_threads (int): How many threads tippecanoe can use overall; defaults to `settings.TILE_MAX_THREADS`, or the number of CPUs (optional)
+        temp_path (Path): Where to create the temporary directory; defaults to the system's (optional)
+
+    Returns:
+        None
+    """
+    if not jobs:
+        return
+    if max_threads is None:
+        max_threads = int(settings.get("TILE_MAX_THREADS", 0))
+    if max_threads <= 0:
+        max_threads = os.cpu_count() or 1
+    threads = max(1, max_threads // len(jobs))
+
+    error: typing.Optional[BaseException] = None
+    with tempfile.TemporaryDirectory(
+        prefix="tippecanoe-", dir=temp_path
+    ) as temp_dir:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(jobs)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _run_tile_job, job, threads, Path(temp_dir)
+                ): job
+                for job in jobs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                    logger.debug(f"Generated {futures[future].name} tiles")
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error(
+                        f"Could not generate {futures[future].name} tiles: {e}"
+                    )
+                    error = error or e
+    if error is not None:
+        raise error
+
+
+def tippecanoe_is_installed() -> bool:
+    """Returns whether tippecanoe and tile-join can be run"""
+    return all(shutil.which(command) for command in ["tippecanoe", "tile-join"])
+
+
+def write_tile_jobs(
+    jobs: typing.List[TileJob],
+    frames: typing.List[gpd.GeoDataFrame],
+    max_workers: typing.Optional[int] = None,
+) -> None:
+    """Makes tilesets from frames in this process, without tippecanoe
+
+    The tiles of each tileset are made in worker processes (see
+    `data_pipeline.tile.mvt`), with the same layer and zooms as tippecanoe
+    makes them. Features are not dropped to keep tiles small, so tippecanoe's
+    limit options are ignored.
+
+    Args:
+        jobs (List[TileJob]): The tilesets to make
+        frames (List[GeoDataFrame]): The features of each tileset
+        max_workers (int): How many processes make the tiles; defaults to the number of CPUs (optional)
+
+    Returns:
+        None
+    """
+    for job, gdf in zip(jobs, frames):
+        logger.debug(f"Generating {job.name} mbtiles file and mvt files")
+        write_mbtiles(
+            gdf,
+            job.mbtiles_path,
+            TILES_LAYER_NAME,
+            job.min_zoom,
+            job.max_zoom,
+            tiles_path=job.tiles_path,
+            max_workers=max_workers,
+        )
+
+
+def get_score_tile_jobs(
+    data_path: Path, layer: str = "default"
+) -> typing.List[TileJob]:
+    """Returns the high and low zoom tilesets of a geo score layer
+
+    Args:
+        data_path (Path): Path to data folder
+        layer (str): The geo score layer (see `GEO_SCORE_LAYERS`) (optional)
+
+    Returns:
+        List[TileJob]
+    """
+    USA_HIGH_MIN_ZOOM = 5
+    USA_HIGH_MAX_ZOOM = 11
+    USA_LOW_MIN_ZOOM = 0
+    USA_LOW_MAX_ZOOM = 7
+
+    score_tiles_path = (
+        data_path / "score" / "tiles" / GEO_SCORE_LAYERS[layer].tiles_directory
+    )
+    high_tile_path = score_tiles_path / "high"
+    low_tile_path = score_tiles_path / "low"
+    geo_score = GeoScoreETL(layers=[layer])
+    geo_score.SCORE_GEOJSON_ROOT = data_path / "score" / "geojson"
+    high_geojson_path, low_geojson_path = geo_score.get_geojson_paths(layer)
+
+    return [
+        TileJob(
+            name=f"USA High ({layer})",
+            geojson_path=high_geojson_path,
+            mbtiles_path=high_tile_path / "usa_high.mbtiles",
+            tiles_path=high_tile_path,
+            min_zoom=USA_HIGH_MIN_ZOOM,
+            max_zoom=USA_HIGH_MAX_ZOOM,
+            options=[
+                "--no-feature-limit",
+                "--no-tile-size-limit",
+            ],
+        ),
+        TileJob(
+            name=f"USA Low ({layer})",
+            geojson_path=low_geojson_path,
+            mbtiles_path=low_tile_path / "usa_low.mbtiles",
+            tiles_path=low_tile_path,
+            min_zoom=USA_LOW_MIN_ZOOM,
+            max_zoom=USA_LOW_MAX_ZOOM,
+            options=["--drop-densest-as-needed"],
+        ),
+    ]
+
+
+def get_tribal_tile_jobs(data_path: Path) -> typing.List[TileJob]:
+    """Returns the tileset of the tribal layer
+
+    Args:
+        data_path (Path): Path to data folder
+
+    Returns:
+        List[TileJob]
+    """
+    USA_TRIBAL_MIN_ZOOM = 0
+    USA_TRIBAL_MAX_ZOOM = 11
+
+    tribal_tiles_path = data_path / "tribal" / "tiles"
+    tribal_geojson_dir = data_path / "tribal" / "geographic_data"
+
+    return [
+        TileJob(
+            name="Tribal",
+            geojson_path=tribal_geojson_dir / "usa.json",
+            mbtiles_path=tribal_tiles_path / "usa.mbtiles",
+            tiles_path=tribal_tiles_path,
+            min_zoom=USA_TRIBAL_MIN_ZOOM,
+            max_zoom=USA_TRIBAL_MAX_ZOOM,
+            options=["--base-zoom=3", "--drop-densest-as-needed"],
+        )
+    ]
+
+
+def _clean_tile_dirs(tiles_root: Path, jobs: typing.List[TileJob]) -> None:
+    # remove existing mbtiles file
+    remove_all_from_dir(tiles_root)
+
+    # create dirs
+    for job in jobs:
+        job.tiles_path.mkdir(parents=True, exist_ok=True)
+
+
+def generate_tiles(
+    data_path: Path, generate_tribal_layer: bool, layer: str = "default"
+) -> None:
     """Generates map tiles from geojson files
 
+    If tippecanoe is not installed, the tiles are made in this process
+    instead (see `write_tile_jobs`).
+
     Args:
         data_path (Path):  Path to data folder
         generate_tribal_layer (bool): If true, generate the tribal layer of the map
+        layer (str): The geo score layer to generate the tiles of, if not the tribal layer (optional)
 
     Returns:
         None
     """
-
-    def _generate_score_tiles() -> None:
-        """Generates score map tiles"""
-        score_tiles_path = data_path / "score" / "tiles" / "default" / "legacy"
-        high_tile_path = score_tiles_path / "high"
-        low_tile_path = score_tiles_path / "low"
-        score_geojson_dir = data_path / "score" / "geojson" / "default"
-
-        USA_HIGH_MIN_ZOOM = 5
-        USA_HIGH_MAX_ZOOM = 11
-        USA_LOW_MIN_ZOOM = 0
-        USA_LOW_MAX_ZOOM = 7
-
-        # remove existing mbtiles file
-        remove_all_from_dir(score_tiles_path)
-
-        # create dirs
-        os.mkdir(high_tile_path)
-        os.mkdir(low_tile_path)
-
-        # generate high mbtiles file
-        logger.debug("Generating USA High mbtiles file")
-        cmd = "tippecanoe "
-        cmd += f"--minimum-zoom={USA_HIGH_MIN_ZOOM} --maximum-zoom={USA_HIGH_MAX_ZOOM} --layer=blocks "
-        cmd += "--no-feature-limit --no-tile-size-limit "
-        cmd += f"--output={high_tile_path}/usa_high.mbtiles "
-        cmd += str(score_geojson_dir / "usa-high.json")
-        call(cmd, shell=True)
-
-        # generate high mvts
-        logger.debug("Generating USA High mvt folders and files")
-        cmd = "tippecanoe "
-        cmd += f"--minimum-zoom={USA_HIGH_MIN_ZOOM} --maximum-zoom={USA_HIGH_MAX_ZOOM} --no-tile-compression "
-        cmd += "--no-feature-limit  --no-tile-size-limit "
-        cmd += f"--output-to-directory={high_tile_path} --layer=blocks "
-        cmd += str(score_geojson_dir / "usa-high.json")
-        call(cmd, shell=True)
-
-        # generate low mbtiles file
-        logger.debug("Generating USA Low mbtiles file")
-        cmd = "tippecanoe "
-        cmd += f"--minimum-zoom={USA_LOW_MIN_ZOOM} --maximum-zoom={USA_LOW_MAX_ZOOM} --layer=blocks "
-        cmd += f"--output={low_tile_path}/usa_low.mbtiles "
-        cmd += str(score_geojson_dir / "usa-low.json")
-        call(cmd, shell=True)
-
-        # generate low mvts
-        logger.debug("Generating USA Low mvt folders and files")
-        cmd = "tippecanoe "
-        cmd += f"--minimum-zoom={USA_LOW_MIN_ZOOM} --maximum-zoom={USA_LOW_MAX_ZOOM} --no-tile-compression "
-        cmd += "--drop-densest-as-needed "
-        cmd += f"--output-to-directory={low_tile_path} --layer=blocks "
-        cmd += str(score_geojson_dir / "usa-low.json")
-        call(cmd, shell=True)
-
-    def _generate_tribal_tiles() -> None:
-        """Generates tribal layer tiles"""
-
-        USA_TRIBAL_MIN_ZOOM = 0
-        USA_TRIBAL_MAX_ZOOM = 11
-
-        tribal_tiles_path = data_path / "tribal" / "tiles"
-        tribal_geojson_dir = data_path / "tribal" / "geographic_data"
-
-        # remove existing mbtiles file
-        remove_all_from_dir(tribal_tiles_path)
-
-        # generate mbtiles file
-        logger.debug("Generating Tribal mbtiles file")
-        cmd = "tippecanoe "
-        cmd += "--layer=blocks "
-        cmd += "--base-zoom=3 "
-        cmd += f"--minimum-zoom={USA_TRIBAL_MIN_ZOOM} --maximum-zoom={USA_TRIBAL_MAX_ZOOM} "
-        cmd += f"--output={tribal_tiles_path}/usa.mbtiles "
-        cmd += str(tribal_geojson_dir / "usa.json")
-        call(cmd, shell=True)
-
-        # generate mvts
-        logger.debug("Generating Tribal mvt folders and files")
-        cmd = "tippecanoe "
-        cmd += "--layer=blocks "
-        cmd += "--base-zoom=3 "
-        cmd += "--no-tile-compression "
-        cmd += "--drop-densest-as-needed "
-        cmd += f"--minimum-zoom={USA_TRIBAL_MIN_ZOOM} --maximum-zoom={USA_TRIBAL_MAX_ZOOM} "
-        cmd += f"--output-to-directory={tribal_tiles_path} "
-        cmd += str(tribal_geojson_dir / "usa.json")
-        call(cmd, shell=True)
-
     if generate_tribal_layer:
-        _generate_tribal_tiles()
+        jobs = get_tribal_tile_jobs(data_path)
+        _clean_tile_dirs(data_path / "tribal" / "tiles", jobs)
     else:
-        _generate_score_tiles()
\ No newline at end of file
+        jobs = get_score_tile_jobs(data_path, layer)
+        _clean_tile_dirs(
+            data_path
+            / "score"
+            / "tiles"
+            / GEO_SCORE_LAYERS[layer].tiles_directory,
+            jobs,
+        )
+
+    if not tippecanoe_is_installed():
+        logger.warning(
+            "tippecanoe is not installed, generating tiles without it"
+        )
+        write_tile_jobs(jobs, [gpd.read_file(job.geojson_path) for job in jobs])
+        return
+
+    temp_path = data_path / "tmp"
+    temp_path.mkdir(parents=True, exist_ok=True)
+    run_tile_jobs(jobs, temp_path=temp_path)
+
+
+def generate_score_tiles_from_frames(
+    data_path: Path, geo_score: GeoScoreETL
+) -> None:
+    """Generates the map tiles of geo score layers from their frames
+
+    The tiles are made without tippecanoe from the high and low zoom frames
+    of a transformed `GeoScoreETL`, so the GeoJSON files are not read back.
+
+    Args:
+        data_path (Path): Path to data folder
+        geo_score (GeoScoreETL): The transformed geo score ETL, whose layers are made tiles of
+
+    Returns:
+        None
+    """
+    for layer in geo_score.LAYERS:
+        jobs = get_score_tile_jobs(data_path, layer)
+        _clean_tile_dirs(
+            data_path
+            / "score"
+            / "tiles"
+            / GEO_SCORE_LAYERS[layer].tiles_directory,
+            jobs,
+        )
+        write_tile_jobs(
+            jobs,
+            [
+                geo_score.geojson_score_usa_high_tiles,
+                geo_score.geojson_score_usa_lows[layer],
+            ],
+        )
@@ -0,0 +1,883 @@
+"""Writes vector tiles (MVT) and mbtiles files without tippecanoe.
+
+This is the fallback for machines where tippecanoe is not installed, like CI
+runners. Features are projected to Web Mercator once, then for each zoom the
+tiles are made a stripe of tile columns at a time in worker processes: each
+feature is simplified to the tile resolution, clipped to every tile it
+overlaps (with a buffer) and encoded in the Mapbox Vector Tile 2.1 format.
+
+The mbtiles files have the same schema and metadata as tippecanoe's, with
+gzipped tiles, and the directories of uncompressed tiles are laid out like
+`tile-join --output-to-directory` lays them out. Unlike tippecanoe, no
+features are dropped to keep tiles small, and tiles have no size limit.
+"""
+import collections
+import concurrent.futures
+import functools
+import gzip
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import struct
+import typing
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from data_pipeline.utils import get_module_logger
+from shapely import wkb as shapely_wkb
+from shapely.geometry import LineString
+from shapely.geometry import MultiLineString
+from shapely.geometry import MultiPoint
+from shapely.geometry import MultiPolygon
+from shapely.geometry import Point
+from shapely.geometry import Polygon
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import clip_by_rect
+from shapely.ops import transform
+
+logger = get_module_logger(__name__)
+
+# The size of a tile, in tile units
+TILE_EXTENT = 4096
+# How far features extend beyond the edges of a tile, in tile units; like
+# tippecanoe's default of 5 pixels of 256
+TILE_BUFFER = 80
+# Features are simplified to this many tile units at every zoom
+TILE_SIMPLIFICATION = 1
+
+# Web Mercator stops at the latitude that makes the world square
+_MAX_LATITUDE = 85.0511287798066
+
+# MVT geometry types and commands
+_POINT = 1
+_LINE_STRING = 2
+_POLYGON = 3
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+
+# Protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+# A property value, as a type tag and a value, so that equal values of
+# different types are kept apart in a tile's values
+ValueKey = typing.Tuple[str, typing.Union[bool, int, float, str]]
+Feature = typing.Tuple[bytes, typing.List[typing.Tuple[str, ValueKey]]]
+
+
+def _encode_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+# Most varints are small deltas, tags and lengths, so those are looked up
+_SMALL_VARINTS = [_encode_varint(value) for value in range(1 << 14)]
+
+
+def _varint(value: int) -> bytes:
+    if value < 1 << 14:
+        return _SMALL_VARINTS[value]
+    return _encode_varint(value)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _length_delimited(number: int, payload: bytes) -> bytes:
+    return _field(number, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values: typing.Iterable[int]) -> bytes:
+    return _length_delimited(number, b"".join(map(_varint, values)))
+
+
+def _value_key(value) -> typing.Optional[ValueKey]:
+    """Returns the key of a property value, or None for a missing value."""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, int):
+        return ("int", value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        # Like tippecanoe, whole numbers are written as integers
+        if value.is_integer() and abs(value) < 2**63:
+            return ("int", int(value))
+        return ("double", value)
+    return ("string", str(value))
+
+
+# The keys and values of a layer repeat across tiles, so their encodings are
+# cached
+@functools.lru_cache(maxsize=1 << 10)
+def _key_field(name: str) -> bytes:
+    return _length_delimited(3, name.encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _value_field(key: ValueKey) -> bytes:
+    value_type, value = key
+    if value_type == "string":
+        payload = _length_delimited(1, value.encode("utf-8"))
+    elif value_type == "double":
+        payload = _field(3, _FIXED64) + struct.pack("<d", value)
+    elif value_type == "bool":
+        payload = _field(7, _VARINT) + _varint(int(value))
+    elif value >= 0:
+        payload = _field(5, _VARINT) + _varint(value)
+    else:
+        payload = _field(6, _VARINT) + _varint(_zigzag(value))
+    return _length_delimited(4, payload)
+
+
+def _lonlat_to_world(
+    x: np.ndarray, y: np.ndarray, z: typing.Optional[np.ndarray] = None
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Projects longitudes and latitudes to Web Mercator, scaled to [0, 1].
+
+    Tiles are flat, so any z coordinate is dropped.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.clip(np.asarray(y, dtype="float64"), -_MAX_LATITUDE, _MAX_LATITUDE)
+    world_x = (x + 180) / 360
+    world_y = (1 - np.log(np.tan(np.pi / 4 + np.radians(y) / 2)) / np.pi) / 2
+    return world_x, world_y
+
+
+def _world_to_lonlat(
+    x: np.ndarray, y: np.ndarray
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    return x * 360 - 180, np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y))))
+
+
+def _ring_area(coordinates: np.ndarray) -> float:
+    """The signed area of a ring, positive if clockwise with y down."""
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    return (
+        float(
+            np.dot(x[:-1], y[1:])
+            - np.dot(x[1:], y[:-1])
+            + x[-1] * y[0]
+            - x[0] * y[-1]
+        )
+        / 2
+    )
+
+
+def _quantize(coordinates, zoom: int, tile_x: int, tile_y: int) -> np.ndarray:
+    """Converts world coordinates to integer tile units, without repeats."""
+    scale = 2**zoom
+    points = np.asarray(coordinates, dtype="float64")[:, :2]
+    points = np.rint((points * scale - (tile_x, tile_y)) * TILE_EXTENT).astype(
+        "int64"
+    )
+    if len(points) > 1:
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = (points[1:] != points[:-1]).any(axis=1)
+        points = points[keep]
+    return points
+
+
+class _CommandEncoder:
+    """Encodes geometries as MVT commands, from a cursor shared by parts."""
+
+    def __init__(self):
+        self.commands: typing.List[int] = []
+        self.cursor = (0, 0)
+
+    def _points(self, command: int, points: np.ndarray) -> None:
+        self.commands.append(command | (len(points) << 3))
+        for x, y in points.tolist():
+            self.commands.append(_zigzag(x - self.cursor[0]))
+            self.commands.append(_zigzag(y - self.cursor[1]))
+            self.cursor = (x, y)
+
+    def point(self, points: np.ndarray) -> None:
+        self._points(_MOVE_TO, points)
+
+    def line(self, points: np.ndarray) -> None:
+        self._points(_MOVE_TO, points[:1])
+        self._points(_LINE_TO, points[1:])
+
+    def ring(self, points: np.ndarray) -> None:
+        self.line(points)
+        self.commands.append(_CLOSE_PATH | (1 << 3))
+
+
+def _geometry_commands(
+    geometry: BaseGeometry, zoom: int, tile_x: int, tile_y: int
+) -> typing.Optional[typing.Tuple[int, typing.List[int]]]:
+    """Encodes a geometry clipped to a tile, or returns None if nothing is left.
+
+    Rings and lines that collapse to nothing at the tile resolution are left
+    out, and the exterior rings of polygons are wound clockwise and their
+    holes counterclockwise, as MVT requires.
+    """
+    encoder = _CommandEncoder()
+    parts = getattr(geometry, "geoms", [geometry])
+
+    if geometry.geom_type in ("Polygon", "MultiPolygon"):
+        for polygon in parts:
+            exterior = _quantize(polygon.exterior.coords, zoom, tile_x, tile_y)
+            if len(exterior) < 4:
+                continue
+            exterior = exterior[:-1]
+            area = _ring_area(exterior)
+            if area == 0:
+                continue
+            encoder.ring(exterior if area > 0 else exterior[::-1])
+            for interior in polygon.interiors:
+                hole = _quantize(interior.coords, zoom, tile_x, tile_y)
+                if len(hole) < 4:
+                    continue
+                hole = hole[:-1]
+                area = _ring_area(hole)
+                if area == 0:
+                    continue
+                encoder.ring(hole if area < 0 else hole[::-1])
+        geometry_type = _POLYGON
+    elif geometry.geom_type in ("LineString", "MultiLineString"):
+        for line in parts:
+            points = _quantize(line.coords, zoom, tile_x, tile_y)
+            if len(points) >= 2:
+                encoder.line(points)
+        geometry_type = _LINE_STRING
+    elif geometry.geom_type in ("Point", "MultiPoint"):
+        points = np.concatenate(
+            [_quantize(point.coords, zoom, tile_x, tile_y) for point in parts]
+        )
+        inside = (
+            (points >= -TILE_BUFFER) & (points <= TILE_EXTENT + TILE_BUFFER)
+        ).all(axis=1)
+        if inside.any():
+            encoder.point(points[inside])
+        geometry_type = _POINT
+    else:
+        raise ValueError(f"Unsupported geometry type {geometry.geom_type}")
+
+    if not encoder.commands:
+        return None
+    return geometry_type, encoder.commands
+
+
+def encode_tile(
+    layer_name: str,
+    features: typing.List[
+        typing.Tuple[int, typing.List[int], typing.List[typing.Tuple]]
+    ],
+) -> bytes:
+    """Encodes the features of a tile as an MVT tile with one layer.
+
+    Args:
+        layer_name (str): the name of the layer
+        features (list): the features, as their MVT geometry type, geometry commands and (name, value key) properties
+
+    Returns:
+        bytes: the uncompressed tile
+    """
+    keys: typing.Dict[str, int] = {}
+    values: typing.Dict[ValueKey, int] = {}
+    encoded_features = []
+    for geometry_type, commands, properties in features:
+        tags = []
+        for name, value in properties:
+            tags.append(keys.setdefault(name, len(keys)))
+            tags.append(values.setdefault(value, len(values)))
+        encoded_features.append(
+            _length_delimited(
+                2,
+                _packed(2, tags)
+                + _field(3, _VARINT)
+                + _varint(geometry_type)
+                + _packed(4, commands),
+            )
+        )
+
+    layer = b"".join(
+        [
+            _field(15, _VARINT) + _varint(2),
+            _length_delimited(1, layer_name.encode("utf-8")),
+            *encoded_features,
+            *map(_key_field, keys),
+            *map(_value_field, values),
+            _field(5, _VARINT) + _varint(TILE_EXTENT),
+        ]
+    )
+    return _length_delimited(3, layer)
+
+
+def _make_tiles(
+    layer_name: str,
+    zoom: int,
+    first_column: int,
+    last_column: int,
+    features: typing.List[Feature],
+) -> typing.List[typing.Tuple[int, int, int, bytes]]:
+    """Makes the tiles of a zoom in a range of tile columns.
+
+    Args:
+        layer_name (str): the name of the layer of the tiles
+        zoom (int): the zoom of the tiles
+        first_column (int): the first tile column to make the tiles of
+        last_column (int): the tile column after the last one
+        features (list): the features that may overlap the tiles, as WKB in world coordinates and their properties
+
+    Returns:
+        list: the (zoom, column, row, uncompressed tile) of the tiles that have features
+    """
+    scale = 2**zoom
+    buffer = TILE_BUFFER / TILE_EXTENT
+    tolerance = TILE_SIMPLIFICATION / TILE_EXTENT / scale
+    tiles: typing.Dict[typing.Tuple[int, int], list] = collections.defaultdict(
+        list
+    )
+
+    for feature_wkb, properties in features:
+        geometry = shapely_wkb.loads(feature_wkb)
+        if geometry.geom_type not in ("Point", "MultiPoint"):
+            geometry = geometry.simplify(tolerance, preserve_topology=True)
+        if geometry.is_empty:
+            continue
+        min_x, min_y, max_x, max_y = geometry.bounds
+        columns = range(
+            max(first_column, math.floor(min_x * scale - buffer)),
+            min(last_column, math.floor(max_x * scale + buffer) + 1, scale),
+        )
+        rows = range(
+            max(0, math.floor(min_y * scale - buffer)),
+            min(math.floor(max_y * scale + buffer) + 1, scale),
+        )
+        for column in columns:
+            for row in rows:
+                clipped = geometry
+                if not (
+                    column <= min_x * scale
+                    and max_x * scale <= column + 1
+                    and row <= min_y * scale
+                    and max_y * scale <= row + 1
+                ):
+                    clipped = clip_by_rect(
+                        geometry,
+                        (column - buffer) / scale,
+                        (row - buffer) / scale,
+                        (column + 1 + buffer) / scale,
+                        (row + 1 + buffer) / scale,
+                    )
+                    clipped = _keep_geometry_type(clipped, geometry.geom_type)
+                    if clipped is None:
+                        continue
+                commands = _geometry_commands(clipped, zoom, column, row)
+                if commands is not None:
+                    tiles[(column, row)].append((*commands, properties))
+
+    return [
+        (zoom, column, row, encode_tile(layer_name, tile_features))
+        for (column, row), tile_features in sorted(tiles.items())
+    ]
+
+
+def _keep_geometry_type(
+    geometry: BaseGeometry, geometry_type: str
+) -> typing.Optional[BaseGeometry]:
+    """Returns the parts of a clipped geometry of the type it had unclipped.
+
+    Clipping can leave parts of lower dimensions, like the edge of a polygon
+    that only touches the clipping rectangle.
+    """
+    if geometry.is_empty:
+        return None
+    geometry_type = geometry_type.replace("Multi", "")
+    if geometry.geom_type.replace("Multi", "") == geometry_type:
+        return geometry
+    parts = []
+    for part in getattr(geometry, "geoms", [geometry]):
+        parts.extend(getattr(part, "geoms", [part]))
+    parts = [
+        part
+        for part in parts
+        if part.geom_type == geometry_type and not part.is_empty
+    ]
+    if not parts:
+        return None
+    return {
+        "Point": MultiPoint,
+        "LineString": MultiLineString,
+        "Polygon": MultiPolygon,
+    }[geometry_type](parts)
+
+
+def _to_lonlat(gdf: gpd.GeoDataFrame) -> gpd.GeoSeries:
+    # Frames without a CRS are taken to be in longitudes and latitudes
+    if gdf.crs is None:
+        return gdf.geometry
+    return gdf.geometry.to_crs(epsg=4326)
+
+
+def _get_features(gdf: gpd.GeoDataFrame) -> typing.List[Feature]:
+    """Returns the features of a frame in world coordinates, with their properties."""
+    geometry_name = gdf.geometry.name
+    columns = [column for column in gdf.columns if column != geometry_name]
+    value_keys = [
+        [_value_key(value) for value in gdf[column].tolist()]
+        for column in columns
+    ]
+    features = []
+    for i, geometry in enumerate(_to_lonlat(gdf)):
+        if geometry is None or geometry.is_empty:
+            continue
+        features.append(
+            (
+                transform(_lonlat_to_world, geometry).wkb,
+                [
+                    (str(column), keys[i])
+                    for column, keys in zip(columns, value_keys)
+                    if keys[i] is not None
+                ],
+            )
+        )
+    return features
+
+
+def _get_field_types(gdf: gpd.GeoDataFrame) -> dict:
+    """The types of the properties, as tippecanoe lists them in the metadata."""
+    field_types = {}
+    for column in gdf.columns:
+        if column == gdf.geometry.name:
+            continue
+        if pd.api.types.is_bool_dtype(gdf[column]):
+            field_types[str(column)] = "Boolean"
+        elif pd.api.types.is_numeric_dtype(gdf[column]):
+            field_types[str(column)] = "Number"
+        else:
+            field_types[str(column)] = "String"
+    return field_types
+
+
+def _get_metadata(
+    gdf: gpd.GeoDataFrame,
+    path: Path,
+    layer_name: str,
+    min_zoom: int,
+    max_zoom: int,
+) -> typing.Dict[str, str]:
+    min_lon, min_lat, max_lon, max_lat = _to_lonlat(gdf).total_bounds
+    vector_layer = {
+        "id": layer_name,
+        "description": "",
+        "minzoom": min_zoom,
+        "maxzoom": max_zoom,
+        "fields": _get_field_types(gdf),
+    }
+    return {
+        "name": path.name,
+        "description": path.name,
+        "version": "2",
+        "minzoom": str(min_zoom),
+        "maxzoom": str(max_zoom),
+        "center": f"{(min_lon + max_lon) / 2},{(min_lat + max_lat) / 2},"
+        f"{max_zoom}",
+        "bounds": f"{min_lon},{min_lat},{max_lon},{max_lat}",
+        "type": "overlay",
+        "format": "pbf",
+        "json": json.dumps({"vector_layers": [vector_layer]}),
+    }
+
+
+def _tile_tasks(
+    features: typing.List[Feature],
+    min_zoom: int,
+    max_zoom: int,
+    stripes: int,
+) -> typing.Iterator[typing.Tuple[int, int, int, typing.List[Feature]]]:
+    """Splits each zoom in stripes of tile columns, with the features that may overlap them."""
+    bounds = np.array(
+        [shapely_wkb.loads(feature_wkb).bounds for feature_wkb, _ in features]
+    ).reshape(-1, 4)
+    buffer = TILE_BUFFER / TILE_EXTENT
+    for zoom in range(min_zoom, max_zoom + 1):
+        scale = 2**zoom
+        first_columns = np.floor(bounds[:, 0] * scale - buffer)
+        last_columns = np.floor(bounds[:, 2] * scale + buffer)
+        width = math.ceil(scale / min(scale, stripes))
+        for first_column in range(0, scale, width):
+            last_column = first_column + width
+            selected = np.flatnonzero(
+                (last_columns >= first_column) & (first_columns < last_column)
+            )
+            if len(selected):
+                yield zoom, first_column, last_column, [
+                    features[i] for i in selected
+                ]
+
+
+def write_mbtiles(
+    gdf: gpd.GeoDataFrame,
+    path: Path,
+    layer_name: str,
+    min_zoom: int,
+    max_zoom: int,
+    tiles_path: typing.Optional[Path] = None,
+    max_workers: typing.Optional[int] = None,
+) -> None:
+    """Writes the features of a frame to an mbtiles file, like tippecanoe.
+
+    The file is written to a temporary file that replaces `path` once it is
+    complete.
+
+    Args:
+        gdf (GeoDataFrame): the features to write
+        path (Path): the mbtiles file to write
+        layer_name (str): the name of the layer of the tiles
+        min_zoom (int): the lowest zoom to make tiles for
+        max_zoom (int): the highest zoom to make tiles for
+        tiles_path (Path): if set, the uncompressed tiles are also written to this directory, like `tile-join --output-to-directory` (optional)
+        max_workers (int): how many processes make the tiles; defaults to the number of CPUs, and 1 makes them in this process (optional)
+
+    Returns:
+        None
+    """
+    path = Path(path)
+    # Like GeoJSON files, the index is written as properties unless it is a
+    # plain integer index
+    if (
+        isinstance(gdf.index, pd.MultiIndex)
+        or gdf.index.name is not None
+        or not pd.api.types.is_integer_dtype(gdf.index)
+    ):
+        gdf = gdf.reset_index()
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    features = _get_features(gdf)
+    metadata = _get_metadata(gdf, path, layer_name, min_zoom, max_zoom)
+    tasks = _tile_tasks(features, min_zoom, max_zoom, stripes=4 * max_workers)
+
+    partial_path = path.with_name(path.name + ".part")
+    if partial_path.exists():
+        partial_path.unlink()
+    connection = sqlite3.connect(partial_path)
+    tile_count = 0
+    try:
+        connection.executescript(
+            """
+            CREATE TABLE metadata (name text, value text);
+            CREATE UNIQUE INDEX name ON metadata (name);
+            CREATE TABLE tiles (
+                zoom_level integer,
+                tile_column integer,
+                tile_row integer,
+                tile_data blob
+            );
+            CREATE UNIQUE INDEX tile_index
+                ON tiles (zoom_level, tile_column, tile_row);
+            """
+        )
+        connection.executemany(
+            "INSERT INTO metadata (name, value) VALUES (?, ?)",
+            metadata.items(),
+        )
+        for tiles in _run_tasks(layer_name, tasks, max_workers):
+            # mbtiles rows are numbered from the bottom of the world
+            connection.executemany(
+                "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                [
+                    (zoom, column, 2**zoom - 1 - row, gzip.compress(tile, 6))
+                    for zoom, column, row, tile in tiles
+                ],
+            )
+            if tiles_path is not None:
+                _write_tile_files(tiles, tiles_path)
+            tile_count += len(tiles)
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(partial_path, path)
+
+    if tiles_path is not None:
+        with open(
+            Path(tiles_path) / "metadata.json", "w", encoding="utf-8"
+        ) as metadata_file:
+            json.dump(metadata, metadata_file, indent=4)
+    logger.debug(f"Wrote {tile_count} tiles to {path}")
+
+
+def _run_tasks(
+    layer_name: str,
+    tasks: typing.Iterator,
+    max_workers: int,
+) -> typing.Iterator[typing.List[typing.Tuple[int, int, int, bytes]]]:
+    """Yields the tiles of each task, in worker processes if there is more than one worker."""
+    if max_workers <= 1:
+        for task in tasks:
+            yield _make_tiles(layer_name, *task)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        pending: typing.Deque = collections.deque()
+        for task in tasks:
+            pending.append(executor.submit(_make_tiles, layer_name, *task))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write_tile_files(
+    tiles: typing.List[typing.Tuple[int, int, int, bytes]], tiles_path: Path
+) -> None:
+    for zoom, column, row, tile in tiles:
+        tile_path = Path(tiles_path) / str(zoom) / str(column) / f"{row}.pbf"
+        tile_path.parent.mkdir(parents=True, exist_ok=True)
+        tile_path.write_bytes(tile)
+
+
+def _read_message(
+    data: bytes,
+) -> typing.Iterator[typing.Tuple[int, typing.Union[int, bytes]]]:
+    """Yields the fields of a protobuf message, as their number and raw value."""
+    offset = 0
+
+    def read_varint() -> int:
+        nonlocal offset
+        value = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    while offset < len(data):
+        key = read_varint()
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == _VARINT:
+            yield number, read_varint()
+        elif wire_type == _FIXED64:
+            yield number, data[offset : offset + 8]
+            offset += 8
+        elif wire_type == _FIXED32:
+            yield number, data[offset : offset + 4]
+            offset += 4
+        elif wire_type == _LENGTH_DELIMITED:
+            length = read_varint()
+            yield number, data[offset : offset + length]
+            offset += length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+
+
+def _read_packed(data: bytes) -> typing.List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _decode_value(data: bytes):
+    for number, value in _read_message(data):
+        if number == 1:
+            return value.decode("utf-8")
+        if number == 2:
+            return struct.unpack("<f", value)[0]
+        if number == 3:
+            return struct.unpack("<d", value)[0]
+        if number in (4, 5):
+            return value if number == 5 or value < 2**63 else value - 2**64
+        if number == 6:
+            return (value >> 1) ^ -(value & 1)
+        if number == 7:
+            return bool(value)
+    return None
+
+
+def _decode_geometry(
+    geometry_type: int, commands: typing.List[int]
+) -> typing.Optional[BaseGeometry]:
+    """Decodes MVT geometry commands into a geometry in tile units."""
+    parts: typing.List[typing.List[typing.Tuple[int, int]]] = []
+    x = y = 0
+    i = 0
+    while i < len(commands):
+        command, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command == _CLOSE_PATH:
+            continue
+        if command == _MOVE_TO:
+            parts.append([])
+        for _ in range(count):
+            x += (commands[i] >> 1) ^ -(commands[i] & 1)
+            y += (commands[i + 1] >> 1) ^ -(commands[i + 1] & 1)
+            parts[-1].append((x, y))
+            i += 2
+    if not parts:
+        return None
+
+    if geometry_type == _POINT:
+        points = [Point(point) for part in parts for point in part]
+        return points[0] if len(points) == 1 else MultiPoint(points)
+    if geometry_type == _LINE_STRING:
+        lines = [LineString(part) for part in parts]
+        return lines[0] if len(lines) == 1 else MultiLineString(lines)
+
+    polygons: typing.List[list] = []
+    for ring in parts:
+        if _ring_area(np.array(ring, dtype="float64")) > 0 or not polygons:
+            polygons.append([ring])
+        else:
+            polygons[-1].append(ring)
+    polygons = [Polygon(rings[0], rings[1:]) for rings in polygons]
+    return polygons[0] if len(polygons) == 1 else MultiPolygon(polygons)
+
+
+def decode_tile(
+    data: bytes, geometry: bool = True
+) -> typing.Dict[str, typing.List[dict]]:
+    """Decodes an MVT tile, gzipped or not.
+
+    Args:
+        data (bytes): the tile
+        geometry (bool): whether to decode the geometries; if False, the geometries are None (optional)
+
+    Returns:
+        dict: the features of each layer, as dicts with their "properties" and their "geometry" in tile units
+    """
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    layers = {}
+    for number, layer_data in _read_message(data):
+        if number != 3:
+            continue
+        name = ""
+        keys: typing.List[str] = []
+        values: list = []
+        raw_features = []
+        for field_number, value in _read_message(layer_data):
+            if field_number == 1:
+                name = value.decode("utf-8")
+            elif field_number == 2:
+                raw_features.append(value)
+            elif field_number == 3:
+                keys.append(value.decode("utf-8"))
+            elif field_number == 4:
+                values.append(_decode_value(value))
+
+        features = []
+        for feature_data in raw_features:
+            tags: typing.List[int] = []
+            geometry_type = 0
+            commands: typing.List[int] = []
+            for field_number, value in _read_message(feature_data):
+                if field_number == 2:
+                    tags.extend(_read_packed(value))
+                elif field_number == 3:
+                    geometry_type = value
+                elif field_number == 4 and geometry:
+                    commands.extend(_read_packed(value))
+            features.append(
+                {
+                    "properties": {
+                        keys[tags[i]]: values[tags[i + 1]]
+                        for i in range(0, len(tags), 2)
+                    },
+                    "geometry": _decode_geometry(geometry_type, commands)
+                    if geometry
+                    else None,
+                }
+            )
+        layers[name] = features
+    return layers
+
+
+def read_mbtiles(
+    path: Path,
+    zoom: int,
+    layer_name: typing.Optional[str] = None,
+    geometry: bool = True,
+) -> gpd.GeoDataFrame:
+    """Reads the features of the tiles of one zoom of an mbtiles file.
+
+    A feature that spans several tiles is read once per tile, clipped to it.
+
+    Args:
+        path (Path): the mbtiles file
+        zoom (int): the zoom to read the tiles of
+        layer_name (str): the layer to read; reads every layer if None (optional)
+        geometry (bool): whether to read the geometries, which is most of the work; if False, the geometries are None (optional)
+
+    Returns:
+        GeoDataFrame: the features, in EPSG:4326, with the zoom, column and row of their tile
+    """
+    connection = sqlite3.connect(Path(path))
+    try:
+        tiles = connection.execute(
+            "SELECT tile_column, tile_row, tile_data FROM tiles "
+            "WHERE zoom_level = ?",
+            (zoom,),
+        ).fetchall()
+    finally:
+        connection.close()
+
+    scale = 2**zoom
+    records = []
+    for column, tms_row, data in tiles:
+        row = scale - 1 - tms_row
+
+        def to_lonlat(x, y, column=column, row=row):
+            return _world_to_lonlat(
+                (column + np.asarray(x) / TILE_EXTENT) / scale,
+                (row + np.asarray(y) / TILE_EXTENT) / scale,
+            )
+
+        for name, features in decode_tile(data, geometry=geometry).items():
+            if layer_name is not None and name != layer_name:
+                continue
+            for feature in features:
+                feature_geometry = feature["geometry"]
+                records.append(
+                    {
+                        "zoom": zoom,
+                        "column": column,
+                        "row": row,
+                        **feature["properties"],
+                        "geometry": None
+                        if feature_geometry is None
+                        else transform(to_lonlat, feature_geometry),
+                    }
+                )
+    if not records:
+        return gpd.GeoDataFrame(
+            columns=["zoom", "column", "row", "geometry"],
+            geometry="geometry",
+            crs="EPSG:4326",
+        )
+    return gpd.GeoDataFrame(records, geometry="geometry", crs="EPSG:4326")
@@ -1,3 +1,4 @@
+import concurrent.futures
 import datetime
 import logging
 import os
@@ -6,7 +7,10 @@ import sys
 import uuid
 import zipfile
 from pathlib import Path
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import requests
@@ -25,7 +29,7 @@ from marshmallow_dataclass import class_schema
 
 ## zlib is not available on all systems
 try:
-    import zlib  # noqa # pylint: disable=unused-import
+    import zlib
 
     compression = zipfile.ZIP_DEFLATED
 except (ImportError, AttributeError):
@@ -298,6 +302,118 @@ def get_zip_info(archive_path: Path) -> list:
     return info_list
 
 
+# Members with these extensions are already compressed, so they are stored
+# in zip files as they are instead of being compressed again
+ALREADY_COMPRESSED_SUFFIXES = {
+    ".7z",
+    ".docx",
+    ".gz",
+    ".jpeg",
+    ".jpg",
+    ".mbtiles",
+    ".parquet",
+    ".pdf",
+    ".png",
+    ".pptx",
+    ".xlsx",
+    ".zip",
+}
+
+# How much of a member is read and compressed at a time
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+# A zip member: a file, stored under its name, or an (archive name, source)
+# pair whose source is a file or bytes
+ZipMember = Union[Path, Tuple[str, Union[Path, bytes]]]
+
+
+def _get_member_source(member: ZipMember) -> Tuple[str, Union[Path, bytes]]:
+    if isinstance(member, tuple):
+        return member
+    return Path(member).name, Path(member)
+
+
+def _get_compress_type(arcname: str) -> int:
+    if Path(arcname).suffix.lower() in ALREADY_COMPRESSED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return compression
+
+
+def write_zip_member(
+    zip_file: zipfile.ZipFile, arcname: str, source: Union[Path, bytes]
+) -> None:
+    """Adds a file or bytes to a zip file opened for writing.
+
+    Members that are already compressed (see `ALREADY_COMPRESSED_SUFFIXES`)
+    are stored, and others are deflated. Files are read and compressed a
+    chunk at a time.
+
+    Args:
+        zip_file (zipfile.ZipFile): the zip file to add the member to
+        arcname (str): the name of the member in the zip file
+        source (pathlib.Path or bytes): the file or bytes to add
+
+    Returns:
+        None
+    """
+    if isinstance(source, bytes):
+        zip_file.writestr(
+            arcname, source, compress_type=_get_compress_type(arcname)
+        )
+        return
+
+    info = zipfile.ZipInfo.from_file(source, arcname)
+    info.compress_type = _get_compress_type(arcname)
+    with open(source, "rb") as member_file, zip_file.open(
+        info, "w"
+    ) as zip_member:
+        shutil.copyfileobj(member_file, zip_member, ZIP_CHUNK_SIZE)
+
+
+def _write_archive(
+    zip_file_path: Path, members: List[Tuple[str, Union[Path, bytes]]]
+) -> None:
+    partial_path = zip_file_path.with_name(zip_file_path.name + ".part")
+    with zipfile.ZipFile(partial_path, "w") as zip_file:
+        for arcname, source in members:
+            write_zip_member(zip_file, arcname, source)
+    os.replace(partial_path, zip_file_path)
+
+
+def zip_archives(
+    archives: Dict[Path, List[ZipMember]], max_workers: Optional[int] = None
+) -> None:
+    """Writes zip files in parallel.
+
+    The zip files are written by a thread each, since zlib releases the GIL
+    while it compresses. Members that are already compressed are stored as
+    they are. Each zip file is written to a temporary file that replaces it
+    once it is complete.
+
+    Args:
+        archives (Dict[pathlib.Path, List[ZipMember]]): the members of each zip file to write: files, stored under their names, or (archive name, file or bytes) pairs
+        max_workers (int): how many zip files are written at once; defaults to the number of CPUs (optional)
+
+    Returns:
+        None
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        futures = [
+            executor.submit(
+                _write_archive,
+                Path(zip_file_path),
+                [_get_member_source(member) for member in members],
+            )
+            for zip_file_path, members in archives.items()
+        ]
+        for future in futures:
+            future.result()
+
+
 def zip_files(zip_file_path: Path, files_to_compress: List[Path]):
     """
     Zips a list of files in a path
@@ -308,9 +424,10 @@ def zip_files(zip_file_path: Path, files_to_compress: List[Path]):
     Returns:
         None
     """
-    with zipfile.ZipFile(zip_file_path, "w") as zf:
-        for f in files_to_compress:
-            zf.write(f, arcname=Path(f).name, compress_type=compression)
+    _write_archive(
+        Path(zip_file_path),
+        [_get_member_source(member) for member in files_to_compress],
+    )
 
 
 def zip_directory(
@@ -325,27 +442,20 @@ def zip_directory(
         None
 
     """
-
-    def zipdir(origin_directory: Path, ziph: zipfile.ZipFile):
-        for root, dirs, files in os.walk(origin_directory):
-            for file in files:
-                ziph.write(
-                    os.path.join(root, file),
-                    os.path.relpath(
-                        os.path.join(root, file),
-                        os.path.join(origin_directory, ".."),
-                    ),
-                    compress_type=compression,
+    origin_zip_directory = Path(origin_zip_directory)
+    members = []
+    for root, _, files in os.walk(origin_zip_directory):
+        for file in files:
+            path = Path(root) / file
+            members.append(
+                (
+                    os.path.relpath(path, origin_zip_directory.parent),
+                    path,
                 )
+            )
 
-    zip_file_name = f"{Path(origin_zip_directory).name}.zip"
-
-    # start archiving
-    zipf = zipfile.ZipFile(
-        destination_zip_directory / zip_file_name, "w", zipfile.ZIP_DEFLATED
-    )
-    zipdir(f"{origin_zip_directory}/", zipf)
-    zipf.close()
+    zip_file_name = f"{origin_zip_directory.name}.zip"
+    _write_archive(Path(destination_zip_directory) / zip_file_name, members)
 
 
 def load_yaml_dict_from_file(
@@ -0,0 +1 @@
+print('extract again')
\ No newline at end of file
@@ -0,0 +1 @@
+print('extract')
\ No newline at end of file